@@ -0,0 +1,221 @@
+"""
+Per-task event fan-out for live task streams.
+
+The orchestrator emits one event per generated token. Serializing each one
+separately for every subscriber, and buffering them in unbounded queues,
+lets a slow browser tab grow backend memory without limit. TaskEventBus
+instead:
+
+- coalesces consecutive token chunks into one frame per short time window
+- filters and serializes each frame once, however many subscribers there are
+- gives every subscriber a bounded buffer; a subscriber that falls behind
+  has its backlog dropped and is resynchronized with a `sync_state` event
+  (the same event a reconnecting client gets) before it receives new frames,
+  or has its stream ended if the task finished in the meantime
+
+Publishing never blocks the task that produces the events.
+"""
+import asyncio
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Callable, Deque, Dict, List, Optional
+
+from backend.agents.content_filter import filter_event
+
+logger = logging.getLogger(__name__)
+
+# Event types whose "content" is appended by the client and can be merged
+COALESCED_TYPES = frozenset({"chunk", "thinking_chunk", "orchestrator_thinking"})
+
+
+@dataclass
+class EventBusStats:
+    """Statistics for bus monitoring."""
+    published: int = 0
+    frames: int = 0       # serialized messages (after coalescing)
+    coalesced: int = 0    # events merged into an earlier frame
+    dropped: int = 0      # frames discarded for lagging subscribers
+    resyncs: int = 0
+
+
+class Subscription:
+    """One subscriber's bounded frame buffer."""
+
+    def __init__(self, max_frames: int):
+        self.max_frames = max_frames
+        self.frames: Deque[str] = deque()
+        self.ready = asyncio.Event()
+        self.needs_resync = False
+
+    def offer(self, frame: str) -> bool:
+        """Queue a frame; returns False if the subscriber had to be marked for resync."""
+        if self.needs_resync:
+            return False
+        if len(self.frames) >= self.max_frames:
+            self.frames.clear()
+            self.needs_resync = True
+            self.ready.set()
+            return False
+        self.frames.append(frame)
+        self.ready.set()
+        return True
+
+
+class TaskEventBus:
+    """
+    Event fan-out for one task.
+
+    Features:
+    - Token chunks coalesced per time window
+    - Filter + json.dumps once per frame
+    - Bounded per-subscriber buffers with drop-to-resync
+    """
+
+    def __init__(
+        self,
+        snapshot: Callable[[], Optional[Dict[str, Any]]],
+        coalesce_window: float = 0.05,
+        max_frame_chars: int = 4096,
+        subscriber_buffer: int = 512,
+    ):
+        """
+        Initialize bus.
+
+        Args:
+            snapshot: Returns the current sync_state event (None if the task is not running)
+            coalesce_window: Seconds token chunks are held to merge with the next ones
+            max_frame_chars: Flush a coalesced frame once its content reaches this size
+            subscriber_buffer: Frames buffered per subscriber before it is resynchronized
+        """
+        self.snapshot = snapshot
+        self.coalesce_window = coalesce_window
+        self.max_frame_chars = max_frame_chars
+        self.subscriber_buffer = subscriber_buffer
+
+        self.subscribers: List[Subscription] = []
+        self._pending: Optional[Dict[str, Any]] = None
+        self._pending_parts: List[str] = []
+        self._pending_chars = 0
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._stats = EventBusStats()
+
+    @staticmethod
+    def _can_merge(pending: Dict[str, Any], event: Dict[str, Any]) -> bool:
+        if pending.keys() != event.keys():
+            return False
+        return all(pending[k] == event[k] for k in pending if k != "content")
+
+    def publish(self, event: Dict[str, Any]):
+        """Queue an event for all subscribers (never blocks)."""
+        if not self.subscribers:
+            return
+        self._stats.published += 1
+
+        if event.get("type") in COALESCED_TYPES and isinstance(event.get("content"), str):
+            if self._pending is not None and self._can_merge(self._pending, event):
+                self._pending_parts.append(event["content"])
+                self._pending_chars += len(event["content"])
+                self._stats.coalesced += 1
+            else:
+                self.flush()
+                self._pending = event
+                self._pending_parts = [event["content"]]
+                self._pending_chars = len(event["content"])
+                if self.coalesce_window > 0:
+                    loop = asyncio.get_running_loop()
+                    self._flush_handle = loop.call_later(self.coalesce_window, self.flush)
+            if self._pending_chars >= self.max_frame_chars or self.coalesce_window <= 0:
+                self.flush()
+            return
+
+        self.flush()
+        self._deliver(event)
+
+    def flush(self):
+        """Send the pending coalesced frame, if any."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._pending is None:
+            return
+        frame = dict(self._pending)
+        frame["content"] = "".join(self._pending_parts)
+        self._pending = None
+        self._pending_parts = []
+        self._pending_chars = 0
+        self._deliver(frame)
+
+    def _deliver(self, event: Dict[str, Any]):
+        data = json.dumps(filter_event(event))
+        self._stats.frames += 1
+        for sub in self.subscribers:
+            if not sub.offer(data):
+                self._stats.dropped += 1
+
+    def subscribe(self) -> Subscription:
+        """Register a subscriber (call unsubscribe() when done)."""
+        sub = Subscription(self.subscriber_buffer)
+        self.subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        if sub in self.subscribers:
+            self.subscribers.remove(sub)
+        if not self.subscribers:
+            self._pending = None
+            self._pending_parts = []
+            self._pending_chars = 0
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+
+    def _sync_frame(self) -> Optional[str]:
+        event = self.snapshot()
+        return json.dumps(event) if event is not None else None
+
+    async def stream(self, sub: Subscription) -> AsyncGenerator[str, None]:
+        """
+        Yield serialized frames for a subscriber, starting with a sync_state snapshot.
+
+        Args:
+            sub: Subscription from subscribe()
+
+        Yields:
+            JSON strings, one per frame
+        """
+        # The snapshot already holds everything published so far, including
+        # the pending coalesced text: flush it and drop it for this subscriber.
+        self.flush()
+        sub.frames.clear()
+        sync = self._sync_frame()
+        if sync is not None:
+            yield sync
+
+        while True:
+            if not sub.frames and not sub.needs_resync:
+                sub.ready.clear()
+                await sub.ready.wait()
+
+            if sub.needs_resync:
+                # Everything published so far is reflected in the snapshot:
+                # flush the pending frame so it is not delivered twice.
+                self.flush()
+                sub.frames.clear()
+                sub.needs_resync = False
+                self._stats.resyncs += 1
+                logger.info("Subscriber fell behind, resynchronizing with sync_state")
+                sync = self._sync_frame()
+                if sync is None:
+                    # The task finished while its final frames were dropped:
+                    # nothing more will be published, so end the stream.
+                    return
+                yield sync
+                continue
+
+            yield sub.frames.popleft()
+
+    def get_stats(self) -> EventBusStats:
+        """Get bus statistics."""
+        return EventBusStats(**vars(self._stats))
@@ -9,21 +9,32 @@ Examples:
     - gemini::gemini-1.5-flash
 
 The think parameter is automatically parsed from the model name by OllamaClient.
+
+generate / chat / chat_stream go through the request scheduler
+(backend/agents/request_scheduler.py), which caps in-flight requests per
+model and admits them by priority lane and user.
 """
 from typing import Dict, Any, AsyncGenerator, List, Optional, Union
 import httpx
 from backend.agents.models.ollama import OllamaClient
 from backend.agents.models.gemini import GeminiClient
 from backend.agents.models.utils import parse_model_identifier
+from backend.agents.request_scheduler import Priority, RequestScheduler, model_scheduler
 from backend.models.config import ModelConfig
 from sqlmodel import Session, select
 from backend.database import engine
 
 
 class ModelRouter:
-    def __init__(self):
+    def __init__(self, scheduler: Optional[RequestScheduler] = None):
         self.ollama = OllamaClient()
         self.gemini = GeminiClient()
+        self.scheduler = scheduler or model_scheduler
+
+    def _slot(self, model_identifier: str, priority: Optional[Priority], user_id: Optional[str]):
+        """Scheduler slot for a request to model_identifier."""
+        parsed = parse_model_identifier(model_identifier)
+        return self.scheduler.slot(parsed.provider, parsed.model_name, priority=priority, user_id=user_id)
 
     def _parse_model_id(self, model_identifier: str) -> tuple[str, str]:
         """
@@ -187,7 +198,9 @@ class ModelRouter:
         prompt: str,
         system: str = None,
         options: Dict[str, Any] = None,
-        think: Union[bool, str, None] = None
+        think: Union[bool, str, None] = None,
+        priority: Optional[Priority] = None,
+        user_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Generate a completion.
@@ -201,25 +214,29 @@ class ModelRouter:
             system: Optional system message
             options: Provider-specific options
             think: Override for think parameter (auto-parsed if None)
+            priority: Scheduler lane (default: from request context)
+            user_id: Scheduler fairness key (default: from request context)
         """
         provider, model_with_suffix = self._parse_model_id(model_identifier)
 
         if provider == "ollama":
             # Pass full model name with suffix - OllamaClient handles parsing
-            return await self.ollama.generate_completion(
-                model=model_with_suffix,
-                prompt=prompt,
-                system=system,
-                options=options,
-                think=think  # None means "auto-parse from model name"
-            )
+            async with self._slot(model_identifier, priority, user_id):
+                return await self.ollama.generate_completion(
+                    model=model_with_suffix,
+                    prompt=prompt,
+                    system=system,
+                    options=options,
+                    think=think  # None means "auto-parse from model name"
+                )
         elif provider == "gemini":
             parsed = parse_model_identifier(model_identifier)
-            return await self.gemini.generate_completion(
-                model=parsed.model_name,
-                prompt=prompt,
-                system=system
-            )
+            async with self._slot(model_identifier, priority, user_id):
+                return await self.gemini.generate_completion(
+                    model=parsed.model_name,
+                    prompt=prompt,
+                    system=system
+                )
         else:
             raise ValueError(f"Unknown provider: {provider}")
 
@@ -229,7 +246,9 @@ class ModelRouter:
         messages: List[Dict[str, str]],
         tools: List[Dict[str, Any]] = None,
         options: Dict[str, Any] = None,
-        think: Union[bool, str, None] = None
+        think: Union[bool, str, None] = None,
+        priority: Optional[Priority] = None,
+        user_id: Optional[str] = None
     ) -> AsyncGenerator[str, None]:
         """
         Stream chat completion.
@@ -242,6 +261,8 @@ class ModelRouter:
             tools: Optional tool definitions
             options: Provider-specific options
             think: Override for think parameter (auto-parsed if None)
+            priority: Scheduler lane (default: from request context)
+            user_id: Scheduler fairness key (default: from request context)
         """
         provider, model_with_suffix = self._parse_model_id(model_identifier)
 
@@ -249,23 +270,25 @@ class ModelRouter:
         logging.getLogger(__name__).info(f"ROUTER chat_stream: {provider} tools={tools is not None}")
 
         if provider == "ollama":
-            async for chunk in self.ollama.chat_completion_stream(
-                model=model_with_suffix,
-                messages=messages,
-                tools=tools,
-                options=options,
-                think=think
-            ):
-                yield chunk
+            async with self._slot(model_identifier, priority, user_id):
+                async for chunk in self.ollama.chat_completion_stream(
+                    model=model_with_suffix,
+                    messages=messages,
+                    tools=tools,
+                    options=options,
+                    think=think
+                ):
+                    yield chunk
         elif provider == "gemini":
             parsed = parse_model_identifier(model_identifier)
-            async for chunk in self.gemini.chat_completion_stream(
-                model=parsed.model_name,
-                messages=messages,
-                tools=tools,
-                options=options
-            ):
-                yield chunk
+            async with self._slot(model_identifier, priority, user_id):
+                async for chunk in self.gemini.chat_completion_stream(
+                    model=parsed.model_name,
+                    messages=messages,
+                    tools=tools,
+                    options=options
+                ):
+                    yield chunk
         else:
             yield f"Error: Unknown provider {provider}"
 
@@ -275,7 +298,9 @@ class ModelRouter:
         messages: List[Dict[str, str]],
         tools: List[Dict[str, Any]] = None,
         options: Dict[str, Any] = None,
-        think: Union[bool, str, None] = None
+        think: Union[bool, str, None] = None,
+        priority: Optional[Priority] = None,
+        user_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Non-streaming chat completion (uses /api/chat endpoint).
@@ -289,6 +314,8 @@ class ModelRouter:
             tools: Optional tool definitions
             options: Provider-specific options
             think: Override for think parameter (auto-parsed if None)
+            priority: Scheduler lane (default: from request context)
+            user_id: Scheduler fairness key (default: from request context)
 
         Returns:
             Response dict with 'message' containing assistant's response
@@ -299,21 +326,23 @@ class ModelRouter:
         logging.getLogger(__name__).info(f"ROUTER chat: {provider} tools={tools is not None}")
 
         if provider == "ollama":
-            return await self.ollama.chat_completion(
-                model=model_with_suffix,
-                messages=messages,
-                tools=tools,
-                options=options,
-                think=think
-            )
+            async with self._slot(model_identifier, priority, user_id):
+                return await self.ollama.chat_completion(
+                    model=model_with_suffix,
+                    messages=messages,
+                    tools=tools,
+                    options=options,
+                    think=think
+                )
         elif provider == "gemini":
             parsed = parse_model_identifier(model_identifier)
-            response = await self.gemini.chat_completion(
-                model=parsed.model_name,
-                messages=messages,
-                tools=tools,
-                options=options
-            )
+            async with self._slot(model_identifier, priority, user_id):
+                response = await self.gemini.chat_completion(
+                    model=parsed.model_name,
+                    messages=messages,
+                    tools=tools,
+                    options=options
+                )
             import logging
             logging.getLogger(__name__).info(f"ROUTER: Gemini chat_completion returned: {response}")
             return response
@@ -0,0 +1,178 @@
+# backend/agents/models/http_pool.py
+"""
+Process-wide pooled HTTP clients for model providers.
+
+Opening an httpx.AsyncClient per request pays TCP (and TLS) setup on every
+LLM call, stream, health check and preload. This module keeps one
+keep-alive client per (event loop, base URL). How many requests run
+against a model at once is decided by the request scheduler (see
+backend/agents/request_scheduler.py), not here.
+
+Clients are bound to the event loop that created them: the backend's
+loop shares one client, and code that runs its own loop (asyncio.run in a
+worker thread) gets its own.
+"""
+import asyncio
+import logging
+import weakref
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, List
+
+import httpx
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+@dataclass
+class PoolStats:
+    """Statistics for pool monitoring."""
+    clients_created: int = 0
+    clients_open: int = 0
+    requests: int = 0
+
+
+class HTTPClientPool:
+    """
+    Shared keep-alive httpx.AsyncClient instances.
+
+    Features:
+    - One client per (event loop, base URL), reused across requests
+    - Configurable connection limits and keep-alive expiry
+    - Optional HTTP/2 (needs the `h2` package and an HTTP/2 endpoint)
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 32,
+        max_keepalive_connections: int = 16,
+        keepalive_expiry: float = 120.0,
+        http2: bool = False,
+    ):
+        """
+        Initialize pool.
+
+        Args:
+            max_connections: Connection cap per client
+            max_keepalive_connections: Idle connections kept open per client
+            keepalive_expiry: Seconds before an idle connection is closed
+            http2: Negotiate HTTP/2 when `h2` is installed
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2 and _http2_available()
+        if http2 and not self.http2:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+
+        self._lock = Lock()
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = weakref.WeakKeyDictionary()
+        self._stats = PoolStats()
+
+    def get_client(self, base_url: str) -> httpx.AsyncClient:
+        """
+        Get the shared client for base_url on the running event loop.
+
+        Per-request timeouts are passed on each call (client.post(..., timeout=...)).
+
+        Args:
+            base_url: Provider base URL (e.g. settings.OLLAMA_BASE_URL)
+
+        Returns:
+            Open httpx.AsyncClient
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._clients.setdefault(loop, {})
+            client = clients.get(base_url)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    base_url=base_url,
+                    limits=self.limits,
+                    http2=self.http2,
+                    timeout=httpx.Timeout(300.0, connect=10.0),
+                )
+                clients[base_url] = client
+                self._stats.clients_created += 1
+                logger.info(f"Opened pooled HTTP client for {base_url} (http2={self.http2})")
+            self._stats.requests += 1
+            return client
+
+    async def aclose(self, timeout: float = 5.0):
+        """
+        Close every pooled client.
+
+        Clients of other event loops (e.g. the RLM background loop) are
+        closed on their own loop; clients whose loop has stopped cannot be
+        closed cleanly and are dropped with a warning.
+
+        Args:
+            timeout: Seconds to wait for each other loop to close its clients
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            by_loop = list(self._clients.items())
+            self._clients.clear()
+
+        closed = 0
+        for owner, clients in by_loop:
+            open_clients = [c for c in clients.values() if not c.is_closed]
+            if not open_clients:
+                continue
+            if owner is loop:
+                await self._close_clients(open_clients)
+            elif owner.is_running() and not owner.is_closed():
+                future = asyncio.run_coroutine_threadsafe(self._close_clients(open_clients), owner)
+                try:
+                    await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+                except Exception as e:
+                    logger.warning(f"Could not close {len(open_clients)} pooled HTTP client(s) on another loop: {e}")
+                    continue
+            else:
+                logger.warning(
+                    f"Dropping {len(open_clients)} pooled HTTP client(s) whose event loop has stopped"
+                )
+                continue
+            closed += len(open_clients)
+
+        if closed:
+            logger.info(f"Closed {closed} pooled HTTP client(s)")
+
+    @staticmethod
+    async def _close_clients(clients: List[httpx.AsyncClient]):
+        for client in clients:
+            await client.aclose()
+
+    def get_stats(self) -> PoolStats:
+        """Get pool statistics."""
+        with self._lock:
+            open_clients = sum(
+                1 for clients in self._clients.values()
+                for c in clients.values() if not c.is_closed
+            )
+            return PoolStats(
+                clients_created=self._stats.clients_created,
+                clients_open=open_clients,
+                requests=self._stats.requests,
+            )
+
+
+# Global pool instance
+http_pool = HTTPClientPool(
+    max_connections=settings.OLLAMA_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.OLLAMA_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=settings.OLLAMA_KEEPALIVE_EXPIRY,
+    http2=settings.OLLAMA_HTTP2,
+)
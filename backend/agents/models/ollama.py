@@ -13,13 +13,27 @@ parameter to Ollama. You can also override by passing `think` explicitly.
 import httpx
 from typing import List, Dict, Any, AsyncGenerator, Union
 from backend.config import settings
+from backend.agents.models.http_pool import http_pool
 from backend.agents.models.utils import parse_model_identifier
 
 
 class OllamaClient:
+    """
+    Thin async client for the Ollama REST API.
+
+    All instances share pooled keep-alive connections (see http_pool), so
+    creating many OllamaClient objects is cheap and every request reuses
+    an open connection.
+    """
+
     def __init__(self, base_url: str = None):
         self.base_url = base_url or settings.OLLAMA_BASE_URL
 
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        """Shared pooled client for this base URL on the running loop."""
+        return http_pool.get_client(self.base_url)
+
     def _ensure_num_ctx(self, options: Dict[str, Any] | None) -> Dict[str, Any]:
         """Inject num_ctx if not already provided.
 
@@ -60,15 +74,14 @@ class OllamaClient:
 
     async def list_models(self) -> List[str]:
         """Auto-discovery: Fetches available models from Ollama."""
-        async with httpx.AsyncClient() as client:
-            try:
-                resp = await client.get(f"{self.base_url}/api/tags")
-                resp.raise_for_status()
-                data = resp.json()
-                return [model["name"] for model in data.get("models", [])]
-            except Exception as e:
-                print(f"Error fetching Ollama models: {e}")
-                return []
+        try:
+            resp = await self._client.get(f"{self.base_url}/api/tags", timeout=5.0)
+            resp.raise_for_status()
+            data = resp.json()
+            return [model["name"] for model in data.get("models", [])]
+        except Exception as e:
+            print(f"Error fetching Ollama models: {e}")
+            return []
 
     async def check_model_available(self, model: str) -> tuple[bool, List[str]]:
         """
@@ -137,20 +150,19 @@ class OllamaClient:
         if think_param is not None:
             payload["think"] = think_param
 
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            resp = await client.post(f"{self.base_url}/api/generate", json=payload)
-            if resp.status_code != 200:
-                # Capture the actual error message from Ollama
-                try:
-                    error_detail = resp.json().get("error", resp.text)
-                except Exception:
-                    error_detail = resp.text
-                raise httpx.HTTPStatusError(
-                    f"Ollama error ({resp.status_code}): {error_detail}",
-                    request=resp.request,
-                    response=resp
-                )
-            return resp.json()
+        resp = await self._client.post(f"{self.base_url}/api/generate", json=payload, timeout=timeout)
+        if resp.status_code != 200:
+            # Capture the actual error message from Ollama
+            try:
+                error_detail = resp.json().get("error", resp.text)
+            except Exception:
+                error_detail = resp.text
+            raise httpx.HTTPStatusError(
+                f"Ollama error ({resp.status_code}): {error_detail}",
+                request=resp.request,
+                response=resp
+            )
+        return resp.json()
 
     async def chat_completion_stream(
         self,
@@ -194,12 +206,13 @@ class OllamaClient:
         if think_param is not None:
             payload["think"] = think_param
 
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            async with client.stream("POST", f"{self.base_url}/api/chat", json=payload) as response:
-                response.raise_for_status()
-                async for chunk in response.aiter_lines():
-                    if chunk:
-                        yield chunk
+        async with self._client.stream(
+            "POST", f"{self.base_url}/api/chat", json=payload, timeout=timeout
+        ) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_lines():
+                if chunk:
+                    yield chunk
 
     async def chat_completion(
         self,
@@ -241,19 +254,18 @@ class OllamaClient:
         if think_param is not None:
             payload["think"] = think_param
 
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            resp = await client.post(f"{self.base_url}/api/chat", json=payload)
-            if resp.status_code != 200:
-                try:
-                    error_detail = resp.json().get("error", resp.text)
-                except Exception:
-                    error_detail = resp.text
-                raise httpx.HTTPStatusError(
-                    f"Ollama error ({resp.status_code}): {error_detail}",
-                    request=resp.request,
-                    response=resp
-                )
-            return resp.json()
+        resp = await self._client.post(f"{self.base_url}/api/chat", json=payload, timeout=timeout)
+        if resp.status_code != 200:
+            try:
+                error_detail = resp.json().get("error", resp.text)
+            except Exception:
+                error_detail = resp.text
+            raise httpx.HTTPStatusError(
+                f"Ollama error ({resp.status_code}): {error_detail}",
+                request=resp.request,
+                response=resp
+            )
+        return resp.json()
 
     # ============================================================
     # Model Management Methods (for Admin Panel)
@@ -273,18 +285,17 @@ class OllamaClient:
             - details: Model details dict
             - expires_at: ISO timestamp when model will be unloaded (if keep_alive is set)
         """
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                resp = await client.get(f"{self.base_url}/api/ps")
-                if resp.status_code == 200:
-                    data = resp.json()
-                    return data.get("models", [])
-                else:
-                    print(f"Error fetching running models: HTTP {resp.status_code}")
-                    return []
-            except Exception as e:
-                print(f"Error fetching running models: {e}")
+        try:
+            resp = await self._client.get(f"{self.base_url}/api/ps", timeout=30.0)
+            if resp.status_code == 200:
+                data = resp.json()
+                return data.get("models", [])
+            else:
+                print(f"Error fetching running models: HTTP {resp.status_code}")
                 return []
+        except Exception as e:
+            print(f"Error fetching running models: {e}")
+            return []
 
     async def preload_model(
         self,
@@ -318,16 +329,15 @@ class OllamaClient:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                resp = await client.post(f"{self.base_url}/api/chat", json=payload)
-                if resp.status_code == 200:
-                    return {"status": "loaded", "error": None, "model": clean_model}
-                else:
-                    try:
-                        error_detail = resp.json().get("error", resp.text)
-                    except Exception:
-                        error_detail = resp.text
-                    return {"status": "failed", "error": error_detail, "model": clean_model}
+            resp = await self._client.post(f"{self.base_url}/api/chat", json=payload, timeout=120.0)
+            if resp.status_code == 200:
+                return {"status": "loaded", "error": None, "model": clean_model}
+            else:
+                try:
+                    error_detail = resp.json().get("error", resp.text)
+                except Exception:
+                    error_detail = resp.text
+                return {"status": "failed", "error": error_detail, "model": clean_model}
         except httpx.TimeoutException:
             return {"status": "failed", "error": "Timeout loading model (>120s)", "model": clean_model}
         except Exception as e:
@@ -353,10 +363,9 @@ class OllamaClient:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                resp = await client.post(f"{self.base_url}/api/chat", json=payload)
-                # Ollama may return 200 or other status for unload
-                return {"status": "unloaded", "error": None, "model": clean_model}
+            resp = await self._client.post(f"{self.base_url}/api/chat", json=payload, timeout=30.0)
+            # Ollama may return 200 or other status for unload
+            return {"status": "unloaded", "error": None, "model": clean_model}
         except Exception as e:
             return {"status": "failed", "error": str(e), "model": clean_model}
 
@@ -368,8 +377,7 @@ class OllamaClient:
             True if Ollama is healthy, False otherwise
         """
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                resp = await client.get(f"{self.base_url}/api/tags")
-                return resp.status_code == 200
+            resp = await self._client.get(f"{self.base_url}/api/tags", timeout=5.0)
+            return resp.status_code == 200
         except Exception:
             return False
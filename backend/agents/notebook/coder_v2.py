@@ -779,6 +779,8 @@ async def coder_loop_v2(
     try:
         # notebook.path is relative like "notebooks/main.ipynb"
         notebook_path = workspace_path / notebook.path
+        # nbconvert reads the file: write out any debounced changes first
+        notebook_manager.export_notebook(notebook.name)
         logger.info(f"Export: notebook_path={notebook_path}, exists={notebook_path.exists()}")
         if notebook_path.exists() and check_nbconvert_available():
             exports = await export_notebook(notebook_path, output_dir, formats=["html", "markdown"])
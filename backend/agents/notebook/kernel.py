@@ -3,20 +3,24 @@
 Jupyter kernel management for the notebook-based coder agent.
 
 Manages kernel lifecycle and code execution with proper async handling.
-Uses asyncio.to_thread() for blocking jupyter_client calls to avoid
-event loop contention issues.
+Process management (start, interrupt, shutdown) runs in asyncio.to_thread();
+kernel I/O uses jupyter_client's async client, with one iopub reader task
+per kernel routing messages to the execution that produced them.
 """
 
 import asyncio
+import json
 import os
 import re
-import queue
+import tempfile
+import weakref
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, AsyncGenerator
+from typing import Dict, Any, List, Optional, AsyncGenerator, Set, Tuple
 from contextlib import asynccontextmanager
 
 from jupyter_client import KernelManager
-from jupyter_client.blocking import BlockingKernelClient
+from jupyter_client.asynchronous import AsyncKernelClient
 
 from backend.agents.notebook.schema import CellOutput, KernelState, VariableInfo
 from backend.agents.session_context import get_logger
@@ -34,11 +38,19 @@ class NotebookKernel:
     Each notebook gets its own kernel instance. The kernel maintains
     state (variables, imports) between cell executions.
 
-    Uses synchronous jupyter_client wrapped in asyncio.to_thread()
-    to avoid event loop contention issues that plague async clients.
+    The blocking KernelManager calls run in asyncio.to_thread(). Output is
+    read by a single iopub reader task (no thread, no polling) that puts
+    each message on the queue of the execution named in its parent header,
+    so cells of many notebooks can run concurrently.
     """
 
-    def __init__(self, notebook_path: str, working_dir: str, kernel_name: str = "python3"):
+    def __init__(
+        self,
+        notebook_path: str,
+        working_dir: str,
+        kernel_name: str = "python3",
+        user_dir: Optional[str] = None,
+    ):
         """
         Initialize kernel manager.
 
@@ -48,16 +60,22 @@ class NotebookKernel:
             kernel_name: Jupyter kernel spec name.
                 - "python3" → CPython 3.12 (default)
                 - "ir"      → R 4.2.2 via IRkernel (requires r-base in container)
+            user_dir: Directory holding the user's .venv / r_libs
+                (default: parent of working_dir)
         """
         self.notebook_path = notebook_path
         self.working_dir = working_dir
         self.kernel_name = kernel_name
+        self.user_dir = user_dir or os.path.dirname(os.path.abspath(working_dir))
         self.km: Optional[KernelManager] = None
-        self.kc: Optional[BlockingKernelClient] = None
+        self.kc: Optional[AsyncKernelClient] = None
         self.execution_count = 0
         self.started_at: Optional[datetime] = None
         self.last_activity: Optional[datetime] = None
         self._lock = asyncio.Lock()
+        # iopub routing: msg_id of each running execution -> its message queue
+        self._executions: Dict[str, asyncio.Queue] = {}
+        self._reader: Optional[asyncio.Task] = None
 
     async def start(self) -> None:
         """Start the kernel process."""
@@ -82,24 +100,23 @@ class NotebookKernel:
 
                 # Start kernel in working directory
                 km.start_kernel(cwd=self.working_dir)
+                return km
 
-                # Create blocking client
-                kc = km.blocking_client()
-                kc.start_channels()
+            try:
+                self.km = await asyncio.to_thread(_start_kernel)
+                await self._connect()
 
                 # Wait for kernel to be ready
-                kc.wait_for_ready(timeout=30)
-
-                return km, kc
+                await self.kc.wait_for_ready(timeout=30)
+                self._start_reader()
 
-            try:
-                self.km, self.kc = await asyncio.to_thread(_start_kernel)
                 self.started_at = datetime.now()
                 self.last_activity = datetime.now()
                 self.execution_count = 0
 
                 # Set up per-user environment and kernel-specific defaults
                 await self._setup_user_environment()
+                await self._setup_kernel_defaults()
 
                 logger.info(
                     f"Kernel '{self.kernel_name}' started successfully for {self.notebook_path}"
@@ -107,43 +124,94 @@ class NotebookKernel:
 
             except Exception as e:
                 logger.error(f"Failed to start kernel: {e}")
-                await self.stop()
+                await self._stop_unlocked()
                 raise RuntimeError(f"Kernel start failed: {e}")
 
+    async def _connect(self) -> None:
+        """Open async client channels to the running kernel (on the current loop)."""
+        info = self.km.get_connection_info(session=True)
+        self.kc = AsyncKernelClient(parent=self.km, connection_file=self.km.connection_file, **info)
+        self.kc.start_channels()
+
+    def _start_reader(self) -> None:
+        self._reader = asyncio.create_task(self._read_iopub())
+
+    async def _read_iopub(self) -> None:
+        """Route iopub messages to the queue of the execution that produced them."""
+        try:
+            while True:
+                msg = await self.kc.get_iopub_msg()
+                parent_id = msg.get("parent_header", {}).get("msg_id", "")
+                q = self._executions.get(parent_id)
+                if q is not None:
+                    q.put_nowait(msg)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"iopub reader stopped for {self.notebook_path}: {e}")
+        finally:
+            # Wake up running executions; they report the failure
+            for q in self._executions.values():
+                q.put_nowait(None)
+
+    async def _ensure_reader(self) -> None:
+        """Reconnect if the reader belongs to another (finished) event loop or has stopped."""
+        if self._reader is not None and not self._reader.done():
+            if self._reader.get_loop() is asyncio.get_running_loop():
+                return
+        if self.kc is not None:
+            try:
+                self.kc.stop_channels()
+            except Exception as e:
+                logger.warning(f"Error stopping channels: {e}")
+        await self._connect()
+        self._start_reader()
+
     async def _setup_user_environment(self) -> None:
         """
-        Configure the per-user package environment and kernel-specific defaults.
+        Configure the per-user package environment (idempotent).
 
         For Python kernels:
-          - Adds the user's persistent venv (at working_dir/../.venv) to sys.path
+          - Adds the user's persistent venv (at user_dir/.venv) to sys.path
           - Sets PIP_TARGET so !pip install goes to that same venv (per-user,
             persisted on the Docker volume at ./data/workspace/<user_id>/.venv)
-          - Configures matplotlib for inline output
 
         For R kernels:
-          - Adds working_dir/../r_libs to .libPaths() so install.packages()
+          - Adds user_dir/r_libs to .libPaths() so install.packages()
             and library() use the user's persistent R library directory
         """
+        if self.kernel_name == "ir":
+            await self._setup_r_libs()
+        else:
+            await self._setup_venv()
+
+    async def _setup_kernel_defaults(self) -> None:
+        """Configure display defaults (matplotlib inline / R plot options)."""
         if self.kernel_name == "ir":
             await self._setup_r_environment()
         else:
             await self._setup_matplotlib()
 
-    async def _setup_r_environment(self) -> None:
-        """Configure R kernel: per-user library path + display options."""
-        setup_code = r"""
+    async def _setup_r_libs(self) -> None:
+        """Configure R kernel: per-user library path."""
+        setup_code = f"""
 # ── Per-user persistent R library ───────────────────────────────────────────
-# working dir is /workspace_data/{user_id}/{task_id}; user dir is one level up
-.mentori_user_dir <- dirname(getwd())
-.mentori_r_libs   <- file.path(.mentori_user_dir, "r_libs")
+# user dir is /workspace_data/{{user_id}} (shared by all of the user's tasks)
+.mentori_r_libs <- file.path({json.dumps(self.user_dir)}, "r_libs")
 dir.create(.mentori_r_libs, recursive = TRUE, showWarnings = FALSE)
 # Prepend to .libPaths() so install.packages() and library() use it first
-if (!(.mentori_r_libs %in% .libPaths())) {
+if (!(.mentori_r_libs %in% .libPaths())) {{
     .libPaths(c(.mentori_r_libs, .libPaths()))
-}
+}}
 # Clean up helper vars
-rm(.mentori_user_dir, .mentori_r_libs)
+rm(.mentori_r_libs)
+"""
+        async for _ in self.execute(setup_code, timeout=15, silent=True):
+            pass
 
+    async def _setup_r_environment(self) -> None:
+        """Configure R kernel: display options."""
+        setup_code = r"""
 # ── Display options ──────────────────────────────────────────────────────────
 options(warn = 1)          # Print warnings immediately
 options(width = 120)       # Wide output
@@ -157,8 +225,8 @@ par(bg = "white", fg = "black", col.axis = "black", col.lab = "black")
             pass
         logger.info(f"R environment configured for {self.notebook_path}")
 
-    async def _setup_matplotlib(self) -> None:
-        """Configure Python kernel: per-user venv on sys.path + matplotlib inline."""
+    async def _setup_venv(self) -> None:
+        """Configure Python kernel: per-user venv on sys.path."""
         # ── Per-user venv injection ──────────────────────────────────────────
         # working_dir = /workspace_data/{user_id}/{task_id}
         # user_dir    = /workspace_data/{user_id}
@@ -166,7 +234,7 @@ par(bg = "white", fg = "black", col.axis = "black", col.lab = "black")
         venv_injection = f"""
 import os as _os, sys as _sys
 from pathlib import Path as _Path
-_user_dir  = _Path({repr(self.working_dir)}).parent
+_user_dir  = _Path({repr(self.user_dir)})
 _venv_pkgs = _user_dir / ".venv" / "lib"
 if _venv_pkgs.exists():
     # Find the actual python3.x subdirectory inside lib/
@@ -185,6 +253,8 @@ del _os, _sys, _Path, _user_dir, _venv_pkgs, _venv_root
         async for _ in self.execute(venv_injection, timeout=10, silent=True):
             pass
 
+    async def _setup_matplotlib(self) -> None:
+        """Configure Python kernel: matplotlib inline + pandas display options."""
         setup_code = """
 import warnings
 warnings.filterwarnings('ignore')
@@ -251,24 +321,67 @@ except ImportError:
     async def stop(self) -> None:
         """Stop the kernel."""
         async with self._lock:
-            if self.kc:
-                try:
-                    self.kc.stop_channels()
-                except Exception as e:
-                    logger.warning(f"Error stopping channels: {e}")
-                self.kc = None
+            await self._stop_unlocked()
 
-            if self.km:
+    async def _stop_unlocked(self) -> None:
+        if self._reader is not None:
+            if self._reader.get_loop() is asyncio.get_running_loop():
+                self._reader.cancel()
                 try:
-                    def _shutdown():
-                        self.km.shutdown_kernel(now=True)
+                    await self._reader
+                except (asyncio.CancelledError, Exception):
+                    pass
+            self._reader = None
 
-                    await asyncio.to_thread(_shutdown)
-                except Exception as e:
-                    logger.warning(f"Error shutting down kernel: {e}")
-                self.km = None
+        if self.kc:
+            try:
+                self.kc.stop_channels()
+            except Exception as e:
+                logger.warning(f"Error stopping channels: {e}")
+            self.kc = None
+
+        if self.km:
+            try:
+                def _shutdown():
+                    self.km.shutdown_kernel(now=True)
+
+                await asyncio.to_thread(_shutdown)
+            except Exception as e:
+                logger.warning(f"Error shutting down kernel: {e}")
+            self.km = None
+
+        logger.info(f"Kernel stopped for {self.notebook_path}")
+
+    async def adopt(self, notebook_path: str, working_dir: str) -> None:
+        """
+        Hand a pre-started kernel to a notebook.
+
+        Moves the kernel into the notebook's working directory and re-applies
+        the per-user environment (picks up a venv created since warm-up).
+
+        Args:
+            notebook_path: Path to the notebook (registry key)
+            working_dir: Directory the kernel should run in (cwd)
+        """
+        os.makedirs(working_dir, exist_ok=True)
+        self.notebook_path = notebook_path
+        self.working_dir = working_dir
+        self.execution_count = 0
+        self.last_activity = datetime.now()
+
+        if self.kernel_name == "ir":
+            chdir_code = f"setwd({json.dumps(working_dir)})"
+        else:
+            chdir_code = f"import os as _os; _os.chdir({repr(working_dir)}); del _os"
+
+        errors = []
+        async for output in self.execute(chdir_code, timeout=10, silent=True):
+            if output.output_type == "error":
+                errors.append(output.evalue)
+        if errors:
+            raise RuntimeError(f"Could not move kernel to {working_dir}: {errors[0]}")
 
-            logger.info(f"Kernel stopped for {self.notebook_path}")
+        await self._setup_user_environment()
 
     async def restart(self) -> None:
         """Restart the kernel (clears all state)."""
@@ -309,134 +422,116 @@ except ImportError:
         if not self.is_alive():
             raise RuntimeError("Kernel is not running")
 
+        await self._ensure_reader()
         self.last_activity = datetime.now()
 
         if not silent:
             self.execution_count += 1
 
-        # Queue for inter-thread communication
-        q = queue.Queue()
-        sentinel = object()
+        loop = asyncio.get_running_loop()
+        q: asyncio.Queue = asyncio.Queue()
+        # Register before yielding control so no iopub message for it is missed
+        msg_id = self.kc.execute(code, silent=silent, store_history=not silent)
+        self._executions[msg_id] = q
+        deadline = loop.time() + timeout
 
-        def _worker():
-            """
-            Producer thread: executes code and puts outputs into queue.
-            """
-            try:
-                # Submit execution
-                msg_id = self.kc.execute(code, silent=silent, store_history=not silent)
-                start_time = datetime.now()
-
-                while True:
-                    # Check timeout
-                    elapsed = (datetime.now() - start_time).total_seconds()
-                    if elapsed > timeout:
-                        q.put(CellOutput(
+        try:
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    yield CellOutput(
+                        output_type="error",
+                        ename="TimeoutError",
+                        evalue=f"Execution timed out after {timeout}s",
+                        traceback=[f"TimeoutError: Cell execution exceeded {timeout}s limit"]
+                    )
+                    # Try to interrupt, and let the cell wind down: the kernel
+                    # aborts requests that arrive while it is still failing.
+                    await self.interrupt()
+                    await self._wait_idle(q, timeout=5.0)
+                    break
+
+                try:
+                    # Wake up now and then to notice a dead kernel
+                    msg = await asyncio.wait_for(q.get(), timeout=min(remaining, 5.0))
+                except asyncio.TimeoutError:
+                    if not self.is_alive():
+                        yield CellOutput(
                             output_type="error",
-                            ename="TimeoutError",
-                            evalue=f"Execution timed out after {timeout}s",
-                            traceback=[f"TimeoutError: Cell execution exceeded {timeout}s limit"]
-                        ))
-                        # Try to interrupt
-                        self.km.interrupt_kernel()
+                            ename="DeadKernelError",
+                            evalue="Kernel died during execution",
+                            traceback=["DeadKernelError: Kernel died during execution"]
+                        )
                         break
+                    continue
+
+                if msg is None:
+                    yield CellOutput(
+                        output_type="error",
+                        ename="SystemError",
+                        evalue="Kernel connection lost",
+                        traceback=["SystemError: iopub reader stopped"]
+                    )
+                    break
 
-                    try:
-                        # Get message with short timeout to allow loop to check timeout
-                        msg = self.kc.get_iopub_msg(timeout=0.5)
-                    except queue.Empty:
-                        continue
-
-                    msg_type = msg.get("msg_type", "")
-                    content = msg.get("content", {})
-                    parent_id = msg.get("parent_header", {}).get("msg_id", "")
-
-                    # Only process messages for our execution
-                    if parent_id != msg_id:
-                        continue
-
-                    if msg_type == "status":
-                        if content.get("execution_state") == "idle":
-                            break
-
-                    elif msg_type == "stream":
-                        q.put(CellOutput(
-                            output_type="stream",
-                            stream_name=content.get("name", "stdout"),
-                            text=content.get("text", "")
-                        ))
-
-                    elif msg_type == "execute_result":
-                        q.put(CellOutput(
-                            output_type="execute_result",
-                            data=content.get("data", {}),
-                            execution_count=content.get("execution_count")
-                        ))
-
-                    elif msg_type == "display_data":
-                        q.put(CellOutput(
-                            output_type="display_data",
-                            data=content.get("data", {})
-                        ))
-
-                    elif msg_type == "error":
-                        # Clean ANSI codes from traceback
-                        traceback = content.get("traceback", [])
-                        clean_traceback = [
-                            ANSI_ESCAPE.sub("", line)
-                            for line in traceback
-                        ]
-
-                        q.put(CellOutput(
-                            output_type="error",
-                            ename=content.get("ename", "Error"),
-                            evalue=content.get("evalue", ""),
-                            traceback=clean_traceback
-                        ))
+                msg_type = msg.get("msg_type", "")
+                content = msg.get("content", {})
 
-            except Exception as e:
-                logger.error(f"Worker execution error: {e}")
-                q.put(CellOutput(
-                    output_type="error",
-                    ename=type(e).__name__,
-                    evalue=str(e),
-                    traceback=[f"SystemError: {e}"]
-                ))
-            finally:
-                q.put(sentinel)
-
-        # Run worker in separate thread
-        loop = asyncio.get_running_loop()
-        future = loop.run_in_executor(None, _worker)
+                if msg_type == "status":
+                    if content.get("execution_state") == "idle":
+                        break
 
-        # Consumer loop: yield from queue
-        while True:
+                elif msg_type == "stream":
+                    yield CellOutput(
+                        output_type="stream",
+                        stream_name=content.get("name", "stdout"),
+                        text=content.get("text", "")
+                    )
+
+                elif msg_type == "execute_result":
+                    yield CellOutput(
+                        output_type="execute_result",
+                        data=content.get("data", {}),
+                        execution_count=content.get("execution_count")
+                    )
+
+                elif msg_type == "display_data":
+                    yield CellOutput(
+                        output_type="display_data",
+                        data=content.get("data", {})
+                    )
+
+                elif msg_type == "error":
+                    # Clean ANSI codes from traceback
+                    traceback = content.get("traceback", [])
+                    clean_traceback = [
+                        ANSI_ESCAPE.sub("", line)
+                        for line in traceback
+                    ]
+
+                    yield CellOutput(
+                        output_type="error",
+                        ename=content.get("ename", "Error"),
+                        evalue=content.get("evalue", ""),
+                        traceback=clean_traceback
+                    )
+        finally:
+            self._executions.pop(msg_id, None)
+
+    @staticmethod
+    async def _wait_idle(q: asyncio.Queue, timeout: float) -> None:
+        """Discard an execution's messages until the kernel reports it idle."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while (remaining := deadline - loop.time()) > 0:
             try:
-                # Non-blocking check
-                item = q.get_nowait()
-                
-                if item is sentinel:
-                    break
-                    
-                yield item
-                
-            except queue.Empty:
-                if future.done():
-                    # Thread finished but queue is empty (and we haven't seen sentinel?)
-                    # This implies _worker finished. Wait one more loop for sentinel.
-                    if future.exception():
-                        # If thread crashed without finally block (unlikely)
-                         logger.error(f"Execution thread failed: {future.exception()}")
-                         yield CellOutput(
-                             output_type="error",
-                             ename="SystemError",
-                             evalue="Execution thread failed",
-                             traceback=[str(future.exception())]
-                         )
-                         break
-                
-                # Yield control to event loop
-                await asyncio.sleep(0.05)
+                msg = await asyncio.wait_for(q.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return
+            if msg is None:
+                return
+            if msg.get("msg_type") == "status" and msg.get("content", {}).get("execution_state") == "idle":
+                return
 
     def get_idle_time(self) -> timedelta:
         """Get time since last activity."""
@@ -617,23 +712,179 @@ print(_mentori_get_kernel_state())
             )
 
 
+@dataclass
+class KernelPoolStats:
+    """Statistics for kernel pool monitoring."""
+    warm_hits: int = 0     # notebooks handed a pre-started kernel
+    cold_starts: int = 0   # notebooks that had to start their own kernel
+    prestarted: int = 0
+    failed: int = 0
+    reaped: int = 0
+
+
+class KernelPool:
+    """
+    Pre-started kernels, ready to hand to a notebook.
+
+    Kernels are keyed by (kernel spec, user dir): the per-user venv / R
+    library and the matplotlib / display defaults are applied while the
+    kernel warms up, so a notebook only has to chdir into its task
+    directory. Taking a kernel starts a replacement in the background.
+    Until then a pooled kernel runs (and keeps its connection files) in the
+    pool's runtime directory, never in the user's directory.
+    """
+
+    def __init__(
+        self,
+        sizes: Dict[str, int],
+        idle_timeout: timedelta,
+        runtime_dir: Optional[str] = None,
+    ):
+        """
+        Initialize pool.
+
+        Args:
+            sizes: Ready kernels kept per kernel spec and user (missing spec = 0)
+            idle_timeout: Drop a user's ready kernels after this long without a take
+            runtime_dir: cwd of kernels waiting in the pool (default: a temp dir)
+        """
+        self.sizes = sizes
+        self.idle_timeout = idle_timeout
+        self.runtime_dir = runtime_dir or os.path.join(tempfile.gettempdir(), "mentori_kernel_pool")
+        self._ready: Dict[Tuple[str, str], List[NotebookKernel]] = {}
+        self._warming: Dict[Tuple[str, str], Set[asyncio.Task]] = {}
+        self._last_used: Dict[Tuple[str, str], datetime] = {}
+        # Bumped when a key is reaped; warm-ups from an older generation stop their kernel
+        self._generation: Dict[Tuple[str, str], int] = {}
+        self._stats = KernelPoolStats()
+
+    def size_for(self, kernel_name: str) -> int:
+        return max(0, self.sizes.get(kernel_name, 0))
+
+    def take(self, kernel_name: str, user_dir: str) -> Optional[NotebookKernel]:
+        """Pop a live ready kernel, or None (caller cold-starts)."""
+        key = (kernel_name, user_dir)
+        self._last_used[key] = datetime.now()
+        ready = self._ready.get(key, [])
+        while ready:
+            kernel = ready.pop(0)
+            if kernel.is_alive():
+                self._stats.warm_hits += 1
+                return kernel
+            logger.warning(f"Discarding dead pooled '{kernel_name}' kernel for {user_dir}")
+            asyncio.create_task(kernel.stop())
+        self._stats.cold_starts += 1
+        return None
+
+    def replenish(self, kernel_name: str, user_dir: str) -> None:
+        """Start background warm-ups until the key has its configured size."""
+        key = (kernel_name, user_dir)
+        size = self.size_for(kernel_name)
+        if size == 0:
+            return
+        # Only take() counts as use; a prewarm starts the idle clock
+        self._last_used.setdefault(key, datetime.now())
+        warming = self._warming.setdefault(key, set())
+        missing = size - len(self._ready.get(key, [])) - len(warming)
+        for _ in range(missing):
+            task = asyncio.create_task(self._warm(key, self._generation.get(key, 0)))
+            warming.add(task)
+            task.add_done_callback(warming.discard)
+
+    async def _warm(self, key: Tuple[str, str], generation: int) -> None:
+        kernel_name, user_dir = key
+        kernel = NotebookKernel(
+            notebook_path=f"<pool:{kernel_name}:{user_dir}>",
+            working_dir=os.path.join(self.runtime_dir, kernel_name),
+            kernel_name=kernel_name,
+            user_dir=user_dir,
+        )
+        try:
+            await kernel.start()
+        except Exception as e:
+            self._stats.failed += 1
+            logger.warning(f"Pre-starting '{kernel_name}' kernel for {user_dir} failed: {e}")
+            return
+
+        if self._generation.get(key, 0) != generation:
+            # Reaped (or shut down) while warming
+            await kernel.stop()
+            return
+        self._ready.setdefault(key, []).append(kernel)
+        self._stats.prestarted += 1
+        logger.info(f"Pre-started '{kernel_name}' kernel ready for {user_dir}")
+
+    async def _drop(self, key: Tuple[str, str]) -> int:
+        self._generation[key] = self._generation.get(key, 0) + 1
+        self._last_used.pop(key, None)
+        kernels = self._ready.pop(key, [])
+        for kernel in kernels:
+            await kernel.stop()
+        return len(kernels)
+
+    async def reap_idle(self) -> int:
+        """
+        Stop ready kernels of users that have not taken one for idle_timeout.
+
+        Returns number of kernels stopped.
+        """
+        now = datetime.now()
+        stale = [k for k, used in self._last_used.items() if now - used > self.idle_timeout]
+        reaped = 0
+        for key in stale:
+            reaped += await self._drop(key)
+        self._stats.reaped += reaped
+        return reaped
+
+    async def stop_all(self) -> None:
+        """Stop ready kernels and wait for in-flight warm-ups to stop theirs."""
+        keys = set(self._ready) | set(self._warming) | set(self._last_used)
+        for key in keys:
+            await self._drop(key)
+        warming = [t for tasks in self._warming.values() for t in tasks]
+        if warming:
+            await asyncio.gather(*warming, return_exceptions=True)
+
+    def ready_count(self) -> int:
+        return sum(len(kernels) for kernels in self._ready.values())
+
+    def get_stats(self) -> KernelPoolStats:
+        """Get pool statistics."""
+        return KernelPoolStats(**vars(self._stats))
+
+
 class KernelRegistry:
     """
     Global registry of running kernels.
 
     Manages kernel lifecycle across the application.
-    Keyed by notebook path for proper isolation.
+    Keyed by notebook path for proper isolation. Each notebook has its own
+    lock, so a slow kernel start never blocks other notebooks. Locks live only
+    while someone holds or waits on them.
     """
 
     _kernels: Dict[str, NotebookKernel] = {}
-    _lock: Optional[asyncio.Lock] = None
+    _locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+    _pool: Optional[KernelPool] = None
+
+    @classmethod
+    def _get_lock(cls, notebook_path: str) -> asyncio.Lock:
+        """Lazily create the lock for a notebook."""
+        lock = cls._locks.get(notebook_path)
+        if lock is None:
+            lock = cls._locks[notebook_path] = asyncio.Lock()
+        return lock
 
     @classmethod
-    def _get_lock(cls) -> asyncio.Lock:
-        """Lazily create the lock in the current event loop."""
-        if cls._lock is None:
-            cls._lock = asyncio.Lock()
-        return cls._lock
+    def _get_pool(cls) -> KernelPool:
+        """Lazily create the warm kernel pool from settings."""
+        if cls._pool is None:
+            from backend.config import settings
+            cls._pool = KernelPool(
+                sizes=settings.NOTEBOOK_KERNEL_POOL_SIZES,
+                idle_timeout=timedelta(minutes=settings.NOTEBOOK_KERNEL_POOL_IDLE_MINUTES),
+            )
+        return cls._pool
 
     # Idle timeout (30 minutes)
     IDLE_TIMEOUT = timedelta(minutes=30)
@@ -648,6 +899,9 @@ class KernelRegistry:
         """
         Get or create kernel for a notebook.
 
+        A pre-started kernel for the same user and kernel spec is used when
+        one is ready; otherwise the kernel is started here.
+
         Args:
             notebook_path: Path to the notebook (used as registry key)
             working_dir: Directory where kernel should run (cwd)
@@ -656,7 +910,7 @@ class KernelRegistry:
         Returns:
             NotebookKernel instance
         """
-        async with cls._get_lock():
+        async with cls._get_lock(notebook_path):
             kernel = cls._kernels.get(notebook_path)
 
             if kernel:
@@ -667,66 +921,109 @@ class KernelRegistry:
                     logger.warning(f"Kernel for {notebook_path} died, restarting...")
                     await cls._cleanup_kernel(notebook_path)
 
-            # Create new kernel with the requested kernel spec
-            logger.info(f"Creating new '{kernel_name}' kernel for {notebook_path}")
-            kernel = NotebookKernel(notebook_path, working_dir, kernel_name=kernel_name)
-            await kernel.start()
+            pool = cls._get_pool()
+            user_dir = os.path.dirname(os.path.abspath(working_dir))
+
+            kernel = pool.take(kernel_name, user_dir)
+            if kernel is not None:
+                try:
+                    await kernel.adopt(notebook_path, working_dir)
+                    logger.info(f"Using pre-started '{kernel_name}' kernel for {notebook_path}")
+                except Exception as e:
+                    logger.warning(f"Pre-started kernel could not be adopted: {e}")
+                    await kernel.stop()
+                    kernel = None
+
+            if kernel is None:
+                # Create new kernel with the requested kernel spec
+                logger.info(f"Creating new '{kernel_name}' kernel for {notebook_path}")
+                kernel = NotebookKernel(notebook_path, working_dir, kernel_name=kernel_name)
+                await kernel.start()
+
             cls._kernels[notebook_path] = kernel
+            pool.replenish(kernel_name, user_dir)
 
             return kernel
 
+    @classmethod
+    async def prewarm(cls, working_dir: str, kernel_name: str = "python3") -> None:
+        """
+        Start pooled kernels for the user owning working_dir, in the background.
+
+        Args:
+            working_dir: A task directory of the user (the kernel cwd to be)
+            kernel_name: Jupyter kernel spec name ("python3" or "ir")
+        """
+        user_dir = os.path.dirname(os.path.abspath(working_dir))
+        cls._get_pool().replenish(kernel_name, user_dir)
+
     @classmethod
     async def stop_kernel(cls, notebook_path: str) -> None:
         """Stop kernel for a specific notebook."""
-        async with cls._get_lock():
+        async with cls._get_lock(notebook_path):
             await cls._cleanup_kernel(notebook_path)
 
     @classmethod
     async def _cleanup_kernel(cls, notebook_path: str) -> None:
-        """Internal cleanup (must be called with lock held)."""
+        """Internal cleanup (must be called with the notebook's lock held)."""
         kernel = cls._kernels.pop(notebook_path, None)
         if kernel:
             await kernel.stop()
 
     @classmethod
     async def stop_all(cls) -> None:
-        """Stop all kernels (for shutdown)."""
-        async with cls._get_lock():
-            paths = list(cls._kernels.keys())
-            for path in paths:
+        """Stop all kernels, including pre-started ones (for shutdown)."""
+        for path in list(cls._kernels.keys()):
+            async with cls._get_lock(path):
                 await cls._cleanup_kernel(path)
 
-            logger.info("All kernels stopped")
+        if cls._pool is not None:
+            await cls._pool.stop_all()
+
+        logger.info("All kernels stopped")
 
     @classmethod
     async def cleanup_idle_kernels(cls) -> int:
         """
         Stop kernels that have been idle too long.
 
+        Also stops pre-started kernels of users that have not opened a
+        notebook for the pool's idle timeout.
+
         Returns number of kernels cleaned up.
         """
-        async with cls._get_lock():
-            cleaned = 0
-            paths_to_cleanup = []
+        cleaned = 0
+        paths_to_cleanup = [
+            path for path, kernel in list(cls._kernels.items())
+            if kernel.get_idle_time() > cls.IDLE_TIMEOUT
+        ]
 
-            for path, kernel in cls._kernels.items():
-                if kernel.get_idle_time() > cls.IDLE_TIMEOUT:
-                    paths_to_cleanup.append(path)
+        for path in paths_to_cleanup:
+            async with cls._get_lock(path):
+                kernel = cls._kernels.get(path)
+                # Re-check: the kernel may have been used while we waited
+                if kernel and kernel.get_idle_time() > cls.IDLE_TIMEOUT:
+                    await cls._cleanup_kernel(path)
+                    cleaned += 1
 
-            for path in paths_to_cleanup:
-                await cls._cleanup_kernel(path)
-                cleaned += 1
+        if cls._pool is not None:
+            cleaned += await cls._pool.reap_idle()
 
-            if cleaned > 0:
-                logger.info(f"Cleaned up {cleaned} idle kernel(s)")
+        if cleaned > 0:
+            logger.info(f"Cleaned up {cleaned} idle kernel(s)")
 
-            return cleaned
+        return cleaned
 
     @classmethod
     def get_active_count(cls) -> int:
         """Get number of active kernels."""
         return len(cls._kernels)
 
+    @classmethod
+    def get_pool_stats(cls) -> KernelPoolStats:
+        """Get warm kernel pool statistics."""
+        return cls._get_pool().get_stats()
+
     @classmethod
     def list_kernels(cls) -> List[Dict[str, Any]]:
         """List all active kernels with info."""
@@ -3,7 +3,9 @@
 Notebook file management for the coder agent.
 
 Handles loading, saving, creating, and tracking notebooks for tasks.
-Notebooks are stored as .ipynb files in the task workspace.
+Notebooks are stored as .ipynb files in the task workspace. In "journal"
+storage mode (NOTEBOOK_STORAGE_MODE) saves go through a NotebookStore that
+writes only changed cells and exports the .ipynb on a debounce.
 """
 
 import json
@@ -16,6 +18,7 @@ import nbformat
 from nbformat import v4 as nbf
 
 from backend.agents.notebook.schema import Notebook, Cell, NotebookState
+from backend.agents.notebook import store as notebook_store
 from backend.agents.session_context import get_logger
 
 logger = get_logger(__name__)
@@ -47,6 +50,9 @@ class NotebookManager:
         self.task_id = task_id
         self.notebooks_dir = self.workspace_path / "notebooks"
 
+        from backend.config import settings
+        self.journaled = settings.NOTEBOOK_STORAGE_MODE == "journal"
+
         # Ensure notebooks directory exists
         self.notebooks_dir.mkdir(parents=True, exist_ok=True)
 
@@ -113,6 +119,9 @@ class NotebookManager:
 
         if path.exists():
             raise FileExistsError(f"Notebook '{name}' already exists")
+        if self.journaled:
+            # Leftover store of a deleted notebook with the same name
+            notebook_store.discard_store(path)
 
         logger.info(f"Creating new notebook: {name}")
 
@@ -143,13 +152,16 @@ class NotebookManager:
         path = self._get_notebook_path(name)
         relative_path = self._get_relative_path(name)
 
-        if not path.exists():
+        nb_data = notebook_store.get_store(path).load() if self.journaled else None
+
+        if nb_data is None and not path.exists():
             raise FileNotFoundError(f"Notebook '{name}' not found at {path}")
 
         logger.info(f"Loading notebook: {name}")
 
-        with open(path, "r", encoding="utf-8") as f:
-            nb_data = nbformat.read(f, as_version=4)
+        if nb_data is None:
+            with open(path, "r", encoding="utf-8") as f:
+                nb_data = nbformat.read(f, as_version=4)
 
         # Convert nbformat to our Notebook class
         notebook = Notebook.from_nbformat(
@@ -177,6 +189,11 @@ class NotebookManager:
         # Convert to nbformat
         nb_data = notebook.to_nbformat()
 
+        if self.journaled:
+            # Changed cells only; validated when the .ipynb is exported
+            notebook_store.get_store(path).save(nb_data)
+            return
+
         # Validate notebook
         try:
             nbformat.validate(nb_data)
@@ -188,6 +205,21 @@ class NotebookManager:
         with open(path, "w", encoding="utf-8") as f:
             nbformat.write(nbformat.from_dict(nb_data), f)
 
+    def export_notebook(self, name: str) -> Path:
+        """
+        Make sure the .ipynb file reflects every saved change.
+
+        Args:
+            name: Notebook name
+
+        Returns:
+            Path to the up-to-date .ipynb file
+        """
+        path = self._get_notebook_path(name)
+        if self.journaled:
+            notebook_store.get_store(path).flush()
+        return path
+
     def delete_notebook(self, name: str) -> bool:
         """
         Delete a notebook file.
@@ -205,6 +237,8 @@ class NotebookManager:
             return False
 
         logger.info(f"Deleting notebook: {name}")
+        if self.journaled:
+            notebook_store.discard_store(path)
         path.unlink()
 
         # If this was the active notebook, clear active
@@ -0,0 +1,463 @@
+# backend/agents/notebook/store.py
+"""
+Incremental notebook persistence.
+
+Rewriting a whole .ipynb (every base64 figure included) after each cell
+makes long analysis notebooks expensive to save. In journal mode a notebook
+is stored next to its .ipynb as:
+
+    notebooks/.<name>.store/
+        base.json       compacted snapshot (cells with blob references)
+        journal.jsonl   append-only records since the snapshot
+        blobs/<sha256>  large output payloads, content-addressed
+
+A save appends only the cells whose content changed. Large output values
+(images, HTML, JSON) are written once per distinct content. The standard
+.ipynb is exported from this state at most every `export_interval` seconds
+(trailing-edge debounce) and on demand, so other readers of the file stay
+within one interval of the live notebook.
+"""
+
+import atexit
+import copy
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import nbformat
+
+from backend.agents.session_context import get_logger
+
+logger = get_logger(__name__)
+
+# Marker replacing an externalized output value inside stored cells
+BLOB_KEY = "$blob"
+
+
+def _digest(data: str) -> str:
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _dumps(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
+
+class NotebookStore:
+    """
+    Journal + blob storage for one notebook.
+
+    Features:
+    - Per-cell change detection (only changed cells are journaled)
+    - Content-addressed side files for large outputs
+    - Debounced .ipynb export, plus export on demand
+    - Periodic compaction of the journal into a snapshot
+    """
+
+    def __init__(
+        self,
+        ipynb_path: Path,
+        export_interval: float = 5.0,
+        blob_min_chars: int = 4096,
+        compact_after: int = 200,
+    ):
+        """
+        Initialize store.
+
+        Args:
+            ipynb_path: The notebook's .ipynb file
+            export_interval: Minimum seconds between .ipynb exports
+            blob_min_chars: Output values at least this long go to blob files
+            compact_after: Journal records before it is folded into base.json
+        """
+        self.ipynb_path = Path(ipynb_path)
+        self.store_dir = self.ipynb_path.parent / f".{self.ipynb_path.stem}.store"
+        self.blobs_dir = self.store_dir / "blobs"
+        self.base_path = self.store_dir / "base.json"
+        self.journal_path = self.store_dir / "journal.jsonl"
+        self.export_interval = export_interval
+        self.blob_min_chars = blob_min_chars
+        self.compact_after = compact_after
+
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._header: Dict[str, Any] = {}
+        self._cells: Dict[str, Dict[str, Any]] = {}
+        self._order: List[str] = []
+        self._cell_digests: Dict[str, str] = {}
+        self._header_digest: Optional[str] = None
+        self._exported: Optional[Tuple[int, int]] = None  # (mtime_ns, size) of our last export
+        self._journal_records = 0
+        # id(value) -> (value, sha): skip re-hashing output values we already stored
+        self._blob_memo: Dict[int, Tuple[str, str]] = {}
+
+        self._dirty = False
+        self._last_export = 0.0
+        self._timer: Optional[threading.Timer] = None
+
+    # ── Blobs ────────────────────────────────────────────────────────────────
+
+    def _put_blob(self, value: str) -> str:
+        memo = self._blob_memo.get(id(value))
+        if memo is not None and memo[0] is value:
+            return memo[1]
+        sha = _digest(value)
+        path = self.blobs_dir / sha
+        if not path.exists():
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(value, encoding="utf-8")
+            os.replace(tmp, path)
+        self._blob_memo[id(value)] = (value, sha)
+        return sha
+
+    def _get_blob(self, sha: str) -> str:
+        return (self.blobs_dir / sha).read_text(encoding="utf-8")
+
+    def _externalize(self, cell: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of an nbformat cell with large output values replaced by blob references."""
+        outputs = cell.get("outputs")
+        if not outputs:
+            return cell
+        stored_outputs = []
+        for output in outputs:
+            data = output.get("data")
+            if data:
+                data = {
+                    mime: {BLOB_KEY: self._put_blob(value)}
+                    if isinstance(value, str) and len(value) >= self.blob_min_chars else value
+                    for mime, value in data.items()
+                }
+                output = {**output, "data": data}
+            stored_outputs.append(output)
+        return {**cell, "outputs": stored_outputs}
+
+    def _inline(self, cell: Dict[str, Any]) -> Dict[str, Any]:
+        """Inverse of _externalize."""
+        outputs = cell.get("outputs")
+        if not outputs:
+            return cell
+        inlined = []
+        for output in outputs:
+            data = output.get("data")
+            if data:
+                data = {
+                    mime: self._get_blob(value[BLOB_KEY])
+                    if isinstance(value, dict) and BLOB_KEY in value else value
+                    for mime, value in data.items()
+                }
+                output = {**output, "data": data}
+            inlined.append(output)
+        return {**cell, "outputs": inlined}
+
+    # ── State ────────────────────────────────────────────────────────────────
+
+    def _reset(self) -> None:
+        self._header = {}
+        self._cells = {}
+        self._order = []
+        self._cell_digests = {}
+        self._header_digest = None
+        self._exported = None
+        self._journal_records = 0
+        self._blob_memo = {}
+        self._dirty = False
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        op = record.get("op")
+        # Any change since the last export record means the .ipynb is behind
+        self._dirty = op != "export"
+        if op == "header":
+            self._header = record["header"]
+            self._header_digest = _digest(_dumps(self._header))
+        elif op == "cell":
+            self._cells[record["id"]] = record["cell"]
+            self._cell_digests[record["id"]] = _digest(_dumps(record["cell"]))
+        elif op == "order":
+            self._order = record["ids"]
+            self._cells = {cid: self._cells[cid] for cid in self._order if cid in self._cells}
+            self._cell_digests = {cid: self._cell_digests[cid] for cid in self._cells}
+        elif op == "export":
+            self._exported = (record["mtime_ns"], record["size"])
+
+    def _load_state(self) -> bool:
+        """Replay base.json + journal. Returns False if there is no usable store."""
+        self._reset()
+        if not self.base_path.exists():
+            return False
+        try:
+            with open(self.base_path, "r", encoding="utf-8") as f:
+                base = json.load(f)
+            self._apply({"op": "header", "header": base["header"]})
+            for cell in base["cells"]:
+                self._apply({"op": "cell", "id": cell["id"], "cell": cell})
+            self._apply({"op": "order", "ids": [c["id"] for c in base["cells"]]})
+            if base.get("exported"):
+                self._exported = tuple(base["exported"])
+            self._dirty = base.get("dirty", True)
+
+            if self.journal_path.exists():
+                with open(self.journal_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            # Torn final write: everything before it is intact
+                            logger.warning(f"Ignoring truncated journal record in {self.journal_path}")
+                            break
+                        self._apply(record)
+                        self._journal_records += 1
+        except (OSError, KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Notebook store {self.store_dir} unreadable, falling back to .ipynb: {e}")
+            self._reset()
+            return False
+        return True
+
+    def _ipynb_stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = self.ipynb_path.stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _ensure_loaded(self) -> None:
+        """Load the store, discarding it whenever the .ipynb was changed by someone else."""
+        if self._loaded:
+            if self._has_state():
+                self._discard_if_edited()
+            return
+        if self._load_state():
+            self._discard_if_edited()
+        self._loaded = True
+        if self._dirty and self._has_state():
+            # Journaled before a restart but never exported
+            self._schedule_export()
+
+    def _discard_if_edited(self) -> None:
+        """Drop the store if the .ipynb differs from our last export (the file wins)."""
+        current = self._ipynb_stat()
+        if current is not None and current != self._exported:
+            logger.info(f"{self.ipynb_path.name} changed outside the notebook store, rebuilding it")
+            self.remove()
+
+    def _has_state(self) -> bool:
+        return bool(self._header)
+
+    def _snapshot(self) -> Dict[str, Any]:
+        return {
+            **self._header,
+            # Callers may mutate the result (Cell.from_nbformat_cell pops metadata keys)
+            "cells": [self._inline(copy.deepcopy(self._cells[cid])) for cid in self._order],
+        }
+
+    # ── Public API ───────────────────────────────────────────────────────────
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Current notebook as an nbformat dict, or None if the .ipynb is authoritative.
+
+        Returns:
+            Notebook dict with outputs inlined, or None (read the .ipynb)
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if not self._has_state():
+                return None
+            return self._snapshot()
+
+    def save(self, nb_data: Dict[str, Any]) -> None:
+        """
+        Persist a notebook, writing only what changed since the last save.
+
+        Args:
+            nb_data: nbformat v4 notebook dict
+        """
+        with self._lock:
+            self._ensure_loaded()
+            self.blobs_dir.mkdir(parents=True, exist_ok=True)
+
+            cells = nb_data.get("cells", [])
+            ids = [c.get("id") for c in cells]
+            if not self._has_state() or None in ids or len(set(ids)) != len(ids):
+                # First save, or cells without unique ids: start from a full snapshot
+                self._write_base(nb_data)
+            else:
+                records = self._diff(nb_data)
+                if records:
+                    with open(self.journal_path, "a", encoding="utf-8") as f:
+                        f.write("".join(_dumps(r) + "\n" for r in records))
+                    for record in records:
+                        self._apply(record)
+                    self._journal_records += len(records)
+                    if self._journal_records >= self.compact_after:
+                        self._compact()
+                elif self.ipynb_path.exists():
+                    return
+
+            self._dirty = True
+            self._schedule_export()
+
+    def _diff(self, nb_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        # Records are decoded from their serialized form so that the stored
+        # state never aliases objects the caller keeps mutating.
+        records = []
+        header = _dumps({k: v for k, v in nb_data.items() if k != "cells"})
+        if _digest(header) != self._header_digest:
+            records.append({"op": "header", "header": json.loads(header)})
+
+        ids = []
+        for cell in nb_data.get("cells", []):
+            stored = _dumps(self._externalize(cell))
+            cid = cell["id"]
+            ids.append(cid)
+            if _digest(stored) != self._cell_digests.get(cid):
+                records.append({"op": "cell", "id": cid, "cell": json.loads(stored)})
+
+        if ids != self._order:
+            records.append({"op": "order", "ids": ids})
+        return records
+
+    def _write_base(self, nb_data: Dict[str, Any]) -> None:
+        self._reset()
+        # The caller built nb_data from the current .ipynb (or a new notebook)
+        self._exported = self._ipynb_stat()
+        header = {k: v for k, v in nb_data.items() if k != "cells"}
+        self._apply({"op": "header", "header": json.loads(_dumps(header))})
+        for index, cell in enumerate(nb_data.get("cells", [])):
+            cid = cell.get("id")
+            if cid is None or cid in self._cells:
+                cid = f"cell-{index}"
+                cell = {**cell, "id": cid}
+            self._apply({"op": "cell", "id": cid, "cell": json.loads(_dumps(self._externalize(cell)))})
+        self._order = list(self._cells)
+        self._compact()
+
+    def _compact(self) -> None:
+        """Fold the journal into base.json and drop unreferenced blobs."""
+        base = {
+            "header": self._header,
+            "cells": [self._cells[cid] for cid in self._order],
+            "exported": list(self._exported) if self._exported else None,
+            "dirty": self._dirty,
+        }
+        tmp = self.base_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(_dumps(base))
+        os.replace(tmp, self.base_path)
+        self.journal_path.unlink(missing_ok=True)
+        self._journal_records = 0
+
+        referenced = set()
+        for cell in base["cells"]:
+            for output in cell.get("outputs", []):
+                for value in (output.get("data") or {}).values():
+                    if isinstance(value, dict) and BLOB_KEY in value:
+                        referenced.add(value[BLOB_KEY])
+        for path in self.blobs_dir.iterdir():
+            if path.name not in referenced:
+                path.unlink(missing_ok=True)
+        self._blob_memo = {k: v for k, v in self._blob_memo.items() if v[1] in referenced}
+
+    # ── .ipynb export ────────────────────────────────────────────────────────
+
+    def _schedule_export(self) -> None:
+        wait = self._last_export + self.export_interval - time.monotonic()
+        if wait <= 0 or not self.ipynb_path.exists():
+            self._export()
+            return
+        if self._timer is None:
+            self._timer = threading.Timer(wait, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _export(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        nb = nbformat.from_dict(self._snapshot())
+        try:
+            nbformat.validate(nb)
+        except nbformat.ValidationError as e:
+            logger.warning(f"Notebook validation warning: {e}")
+
+        tmp = self.ipynb_path.with_name(f".{self.ipynb_path.name}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            nbformat.write(nb, f)
+        os.replace(tmp, self.ipynb_path)
+
+        self._exported = self._ipynb_stat()
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(_dumps({"op": "export", "mtime_ns": self._exported[0], "size": self._exported[1]}) + "\n")
+        self._journal_records += 1
+        self._dirty = False
+        self._last_export = time.monotonic()
+
+    def flush(self) -> None:
+        """Export the .ipynb now if there are unexported changes."""
+        with self._lock:
+            if self._has_state():
+                self._discard_if_edited()
+            if self._dirty and self._has_state():
+                self._export()
+
+    def remove(self) -> None:
+        """Delete the store (the .ipynb is left alone)."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            shutil.rmtree(self.store_dir, ignore_errors=True)
+            self._reset()
+            self._dirty = False
+
+
+_stores: Dict[str, NotebookStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(ipynb_path: Path) -> NotebookStore:
+    """
+    Get the shared store for a notebook (one per file per process).
+
+    Args:
+        ipynb_path: The notebook's .ipynb file
+
+    Returns:
+        NotebookStore configured from settings
+    """
+    key = os.path.abspath(ipynb_path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            from backend.config import settings
+            store = NotebookStore(
+                Path(key),
+                export_interval=settings.NOTEBOOK_EXPORT_INTERVAL,
+                blob_min_chars=settings.NOTEBOOK_BLOB_MIN_CHARS,
+                compact_after=settings.NOTEBOOK_JOURNAL_COMPACT_RECORDS,
+            )
+            _stores[key] = store
+        return store
+
+
+def discard_store(ipynb_path: Path) -> None:
+    """Delete a notebook's store and forget it (used when the notebook is deleted)."""
+    key = os.path.abspath(ipynb_path)
+    with _stores_lock:
+        store = _stores.pop(key, None)
+    (store or NotebookStore(Path(key))).remove()
+
+
+@atexit.register
+def flush_all() -> None:
+    """Export every notebook with pending changes."""
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        try:
+            store.flush()
+        except Exception as e:
+            logger.warning(f"Failed to export {store.ipynb_path}: {e}")
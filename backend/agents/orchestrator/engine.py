@@ -52,6 +52,7 @@ from backend.agents.orchestrator.executor import (
     get_agent_display_name,
 )
 from backend.agents.orchestrator.coder import execute_coder_step
+from backend.agents.orchestrator.parallel import StepPrefetcher
 from backend.agents.orchestrator.synthesizer import (
     synthesize_answer,
     generate_direct_answer,
@@ -98,7 +99,7 @@ async def orchestrated_chat(
     Replaces chat_loop.py with a structured, phase-based approach:
     - Phase 0: Analyze query (direct answer vs needs plan)
     - Phase 1: Generate plan (if needed)
-    - Phase 2: Execute steps sequentially
+    - Phase 2: Execute steps (independent steps of a DAG plan run concurrently)
     - Phase 3: Synthesize final answer
 
     All thinking is streamed to UI. All phases save to history_log for full audit trail.
@@ -487,6 +488,29 @@ async def orchestrated_chat(
 
         cumulative_tokens = 0
 
+        COLLABORATION_TOOLS = ["ask_user", "present_plan", "share_progress", "report_failure", "propose_pivot"]
+
+        def _is_collaboration_step(s) -> bool:
+            return s.tool_name in COLLABORATION_TOOLS and collaboration_context is not None
+
+        # Steps whose depends_on prerequisites are done start ahead of the cursor
+        # and share the MCP session; coder and collaboration steps always run in turn.
+        prefetcher = StepPrefetcher(
+            run_step=lambda s: execute_step(
+                step=s,
+                model_router=model_router,
+                session_context=session_context,
+                mcp_session=mcp_session,
+                previous_results=state.step_results,
+            ),
+            can_prefetch=lambda s: not _is_collaboration_step(s) and not (
+                s.agent_role == "coder" and s.tool_name == "execute_python"
+            ),
+            is_barrier=_is_collaboration_step,
+            max_parallel=settings.ORCHESTRATOR_MAX_PARALLEL_STEPS,
+        )
+        stack.push_async_callback(prefetcher.aclose)
+
         while not plan.is_complete():
             # Check for task cancellation
             task_manager = _get_task_manager()
@@ -499,9 +523,10 @@ async def orchestrated_chat(
             if step is None:
                 break
 
+            prefetcher.launch_ready(plan)
+
             # COLLABORATION TOOL INTERCEPTION
-            COLLABORATION_TOOLS = ["ask_user", "present_plan", "share_progress", "report_failure", "propose_pivot"]
-            if step.tool_name in COLLABORATION_TOOLS and collaboration_context:
+            if _is_collaboration_step(step):
                 yield {
                     "type": "collaboration_required",
                     "tool": step.tool_name,
@@ -602,6 +627,7 @@ async def orchestrated_chat(
                     raise
 
                 # Replace the current plan with the new one
+                await prefetcher.aclose()
                 plan = new_plan
                 state.plan = plan
 
@@ -656,8 +682,9 @@ async def orchestrated_chat(
                     event_callback=emit_event,
                 )
             else:
-                # Use standard executor for non-coding steps
-                step_generator = execute_step(
+                # Use standard executor for non-coding steps (possibly already
+                # running ahead of the cursor - its events are replayed in order)
+                step_generator = prefetcher.take(step) or execute_step(
                     step=step,
                     model_router=model_router,
                     session_context=session_context,
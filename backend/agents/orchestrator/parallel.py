@@ -0,0 +1,142 @@
+"""
+Parallel step execution for DAG plans.
+
+The engine walks a plan one step at a time: execute, evaluate with the
+Supervisor, maybe retry, advance. For plans whose steps declare depends_on
+edges, StepPrefetcher starts later steps as soon as their prerequisites have
+finished, so independent work (e.g. a web search and a query_documents call
+against another index) runs while earlier steps are still executing or being
+evaluated.
+
+Prefetched steps run concurrently over the shared MCP session. Their events
+are buffered and handed back in order when the engine's cursor reaches the
+step, so each step's events stay contiguous and every step still gets its
+own Supervisor evaluation, retries and history entries.
+"""
+
+import asyncio
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
+
+from backend.agents.orchestrator.schemas import ExecutionPlan, PlanStep
+from backend.agents.session_context import get_logger
+
+logger = get_logger(__name__)
+
+StepRunner = Callable[[PlanStep], AsyncGenerator[Dict[str, Any], None]]
+
+_DONE = object()
+
+
+class _Prefetched:
+    """A step running ahead of the cursor, with its buffered events."""
+
+    def __init__(self, step: PlanStep, events: AsyncGenerator[Dict[str, Any], None]):
+        self.step = step
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.error: Optional[BaseException] = None
+        self.task = asyncio.create_task(self._run(events))
+
+    async def _run(self, events: AsyncGenerator[Dict[str, Any], None]):
+        try:
+            async for event in events:
+                self.queue.put_nowait(event)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.queue.put_nowait(_DONE)
+
+    async def replay(self) -> AsyncGenerator[Dict[str, Any], None]:
+        """Yield the step's events (buffered first, then live) in order."""
+        while True:
+            event = await self.queue.get()
+            if event is _DONE:
+                break
+            yield event
+        if self.error is not None:
+            raise self.error
+
+
+class StepPrefetcher:
+    """
+    Starts ready plan steps ahead of the engine's cursor.
+
+    A step after the cursor is started when:
+    - every step it depends on (ExecutionPlan.dependencies_of) is behind the
+      cursor, i.e. has been executed, evaluated and accepted or given up on
+    - `can_prefetch(step)` allows it (the engine excludes collaboration and coder steps)
+    - no collaboration step lies between the cursor and it (it may trigger a re-plan)
+    - fewer than max_parallel steps would be running, counting the cursor's own step
+    """
+
+    def __init__(
+        self,
+        run_step: StepRunner,
+        can_prefetch: Callable[[PlanStep], bool],
+        is_barrier: Callable[[PlanStep], bool],
+        max_parallel: int = 3,
+    ):
+        """
+        Initialize prefetcher.
+
+        Args:
+            run_step: Returns the event generator that executes a step
+            can_prefetch: Whether a step may run ahead of the cursor
+            is_barrier: Whether nothing after this step may run ahead of it
+            max_parallel: Concurrently running steps, including the cursor's (1 = sequential)
+        """
+        self.run_step = run_step
+        self.can_prefetch = can_prefetch
+        self.is_barrier = is_barrier
+        self.max_parallel = max_parallel
+        self._running: Dict[int, _Prefetched] = {}  # id(step) -> prefetched run
+
+    def launch_ready(self, plan: ExecutionPlan) -> List[str]:
+        """
+        Start every step that is ready to run ahead of the cursor.
+
+        Args:
+            plan: The plan being executed
+
+        Returns:
+            IDs of the steps started by this call
+        """
+        started: List[str] = []
+        slots = self.max_parallel - 1 - sum(1 for p in self._running.values() if not p.task.done())
+        if slots <= 0:
+            return started
+
+        cursor = plan.current_step_index
+        finished_ids = {s.step_id for s in plan.steps[:cursor]}
+        for index in range(cursor, len(plan.steps)):
+            step = plan.steps[index]
+            if index > cursor and slots > 0 and id(step) not in self._running:
+                if (
+                    self.can_prefetch(step)
+                    and all(dep in finished_ids for dep in plan.dependencies_of(step))
+                ):
+                    self._running[id(step)] = _Prefetched(step, self.run_step(step))
+                    started.append(step.step_id)
+                    slots -= 1
+            if self.is_barrier(step):
+                break
+
+        if started:
+            logger.info(f"Started {len(started)} independent step(s) in parallel: {', '.join(started)}")
+        return started
+
+    def take(self, step: PlanStep) -> Optional[AsyncGenerator[Dict[str, Any], None]]:
+        """Hand over a prefetched step's events, or None if it was not prefetched."""
+        prefetched = self._running.pop(id(step), None)
+        if prefetched is None or prefetched.step is not step:
+            return None
+        return prefetched.replay()
+
+    async def aclose(self):
+        """Cancel steps that were started but never taken (plan aborted or replaced)."""
+        pending = list(self._running.values())
+        self._running.clear()
+        for prefetched in pending:
+            prefetched.task.cancel()
+        if pending:
+            await asyncio.gather(*(p.task for p in pending), return_exceptions=True)
+            logger.info(f"Cancelled {len(pending)} prefetched step(s)")
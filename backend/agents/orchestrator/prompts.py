@@ -91,6 +91,7 @@ Rules (ALWAYS apply):
 - Each plan step uses exactly ONE tool
 - Provide concrete argument values, not placeholders (except {{step_N.result}} for cross-step references)
 - Use the fewest steps necessary — do not over-engineer
+- Give every step a depends_on list: the step_ids whose results it needs ([] if none). Steps that do not depend on each other (e.g. a web search and a document query) run in parallel
 - When the user's request is ambiguous, make ask_user the FIRST step
 - Do NOT use query_documents, deep_research_rlm, cross_document_analysis, or analyze_corpus directly — always route through smart_query
 - Respond with ONLY valid JSON, no markdown, no explanation
@@ -140,7 +141,8 @@ Each tool is executed by a specialized agent:
             "tool_name": "exact_tool_name_from_list",
             "tool_args": {{"arg1": "value1"}},
             "expected_output": "What we expect back",
-            "reasoning": "Why this step is needed (1 sentence)"
+            "reasoning": "Why this step is needed (1 sentence)",
+            "depends_on": []
         }}
     ]
 }}
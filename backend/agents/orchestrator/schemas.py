@@ -12,9 +12,14 @@ from enum import Enum
 from datetime import datetime
 import uuid
 import json
+import re
 import asyncio
 
 
+# Cross-step references in tool_args, e.g. "summarize {{step_1.result}}"
+_STEP_REFERENCE_RE = re.compile(r"\{\{(\w+)\.result\}\}")
+
+
 class PlanStatus(Enum):
     """Status of the overall execution plan."""
     PENDING = "pending"
@@ -39,6 +44,11 @@ class PlanStep:
     A single step in the execution plan.
 
     Each step represents one tool call to be executed by a specific agent.
+
+    depends_on lists the step_ids whose results this step needs. None (the
+    default, and what older plans carry) means "after the previous step";
+    an explicit list - possibly empty - lets the engine run the step as soon
+    as those steps are done, concurrently with other ready steps.
     """
     step_id: str                              # "step_1", "step_2", etc.
     description: str                          # Human-readable description
@@ -47,6 +57,7 @@ class PlanStep:
     tool_args: Dict[str, Any]                 # Arguments for the tool
     expected_output: str                      # What we expect to get back
     reasoning: str                            # Why this step is needed
+    depends_on: Optional[List[str]] = None    # Prerequisite step_ids (None = previous step)
 
     # Runtime fields (set during execution)
     status: StepStatus = StepStatus.PENDING
@@ -66,6 +77,7 @@ class PlanStep:
             "tool_args": self.tool_args,
             "expected_output": self.expected_output,
             "reasoning": self.reasoning,
+            "depends_on": self.depends_on,
             "status": self.status.value,
             "result": self.result,
             "error": self.error,
@@ -77,6 +89,9 @@ class PlanStep:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "PlanStep":
         """Create PlanStep from dictionary."""
+        depends_on = data.get("depends_on")
+        if isinstance(depends_on, str):
+            depends_on = [depends_on]
         return cls(
             step_id=data["step_id"],
             description=data["description"],
@@ -85,6 +100,7 @@ class PlanStep:
             tool_args=data.get("tool_args", {}),
             expected_output=data.get("expected_output", ""),
             reasoning=data.get("reasoning", ""),
+            depends_on=[str(d) for d in depends_on] if depends_on is not None else None,
             status=StepStatus(data.get("status", "pending")),
             result=data.get("result"),
             error=data.get("error"),
@@ -128,6 +144,32 @@ class ExecutionPlan:
         """Check if all steps are done."""
         return self.current_step_index >= len(self.steps)
 
+    def dependencies_of(self, step: PlanStep) -> List[str]:
+        """
+        Step IDs that must finish before `step` can run.
+
+        Combines the declared depends_on edges (or the previous step when
+        none are declared) with any {{step_N.result}} references in the
+        step's arguments. Unknown IDs are ignored.
+
+        Args:
+            step: A step of this plan
+
+        Returns:
+            Prerequisite step IDs in plan order
+        """
+        index = next((i for i, s in enumerate(self.steps) if s is step), None)
+        if index is None:
+            return []
+
+        if step.depends_on is None:
+            wanted = {self.steps[index - 1].step_id} if index > 0 else set()
+        else:
+            wanted = set(step.depends_on)
+        wanted.update(_STEP_REFERENCE_RE.findall(json.dumps(step.tool_args, default=str)))
+
+        return [s.step_id for s in self.steps if s.step_id in wanted and s is not step]
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
         return {
@@ -159,6 +201,8 @@ class ExecutionPlan:
             }.get(step.status, "")
             lines.append(f"{i}. {status_icon} **{step.description}**")
             lines.append(f"   - Agent: `{step.agent_role}` → Tool: `{step.tool_name}`")
+            if step.depends_on:
+                lines.append(f"   - After: {', '.join(step.depends_on)}")
         return "\n".join(lines)
 
     @classmethod
@@ -11,6 +11,7 @@ import json
 from typing import List, Dict, Any, Optional, AsyncGenerator, Union
 
 from backend.agents.model_router import ModelRouter
+from backend.agents.request_scheduler import Priority
 from backend.agents.session_context import SessionContext, get_logger
 from backend.agents.orchestrator.schemas import OrchestratorState, ExecutionPlan
 from backend.agents.orchestrator.prompts import (
@@ -87,6 +88,7 @@ async def synthesize_answer(
             messages=synthesis_messages,
             tools=None,
             think=think,
+            priority=Priority.INTERACTIVE,  # the user is watching these tokens
         ):
             try:
                 data = json.loads(chunk)
@@ -197,6 +199,7 @@ async def generate_direct_answer(
             messages=direct_messages,
             tools=None,
             think=think,
+            priority=Priority.INTERACTIVE,  # the user is watching these tokens
         ):
             try:
                 data = json.loads(chunk)
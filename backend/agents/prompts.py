@@ -454,6 +454,10 @@ LLM CALLS:
   llm_query(prompt, context_chunks=[]) → returns string answer
   llm_summarize(chunks, task="...") → returns dict: {{"summary": str, "citations": list}}
   llm_extract(chunks, schema={{}}) → returns dict with extracted fields
+  llm_query_batch(prompts, context_chunks=[[...], ...]) → list of string answers, calls run in parallel
+  llm_map(task, chunk_groups, mode="summarize") → list of results (one per chunk group, run in parallel);
+      mode is "summarize", "query" or "extract" (extract also needs schema={{...}})
+  Prefer llm_map / llm_query_batch over calling llm_* in a loop.
 
 REPORT:
   cite(doc_name, page, quote) → registers a citation, returns Citation object
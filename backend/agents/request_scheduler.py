@@ -0,0 +1,393 @@
+# backend/agents/request_scheduler.py
+"""
+Admission control for model requests.
+
+Page analysis, RLM sub-queries, supervisor evaluations and interactive chat
+all share the same model servers. Without admission control an ingestion
+job's VLM calls can fill Ollama's parallel slots and interactive latency
+collapses. The scheduler caps in-flight requests per provider (every model
+served by one provider draws from the same slots, optionally capped per
+model as well) and hands free slots out by priority lane:
+
+    INTERACTIVE > ORCHESTRATION > BACKGROUND
+
+Within a lane, waiting requests are served round-robin across users, so one
+user's fan-out cannot starve another user's requests. BACKGROUND requests
+never take the last free slot of a provider or capped model (when it has
+more than one), so an
+interactive request always finds room within one request's latency.
+
+Priority and user are usually taken from the ambient context, so callers
+deep inside a task do not have to pass them explicitly:
+
+    set_request_priority(Priority.BACKGROUND, user_id=...)   # once per task
+    async with model_scheduler.slot("ollama", "llama3.2"):   # per request
+        ...
+
+Resources are bound to the event loop that created them, like the pooled
+HTTP clients (see backend/agents/models/http_pool.py).
+"""
+import asyncio
+import logging
+import time
+import weakref
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from enum import IntEnum
+from threading import Lock
+from typing import AsyncIterator, Deque, Dict, Iterator, Optional, Tuple
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Request lanes, most urgent first."""
+    INTERACTIVE = 0     # tokens a user is watching (final answers)
+    ORCHESTRATION = 1   # planning, supervision, tool sub-queries
+    BACKGROUND = 2      # ingestion (page analysis, transcription)
+
+
+_request_priority: ContextVar[Optional[Tuple[Priority, Optional[str]]]] = ContextVar(
+    "request_priority", default=None
+)
+
+
+def set_request_priority(priority: Priority, user_id: Optional[str] = None) -> Token:
+    """
+    Set the lane (and fairness key) for model requests made from this context.
+
+    Applies to the current task and to tasks/threads spawned from it.
+
+    Args:
+        priority: Lane for subsequent requests
+        user_id: User to account requests to (default: session context user)
+
+    Returns:
+        Token for reset_request_priority()
+    """
+    return _request_priority.set((Priority(priority), user_id))
+
+
+def reset_request_priority(token: Token):
+    """Restore the priority that was active before set_request_priority()."""
+    _request_priority.reset(token)
+
+
+@contextmanager
+def request_priority(priority: Priority, user_id: Optional[str] = None) -> Iterator[None]:
+    """Scoped form of set_request_priority()."""
+    token = set_request_priority(priority, user_id)
+    try:
+        yield
+    finally:
+        reset_request_priority(token)
+
+
+def get_request_priority() -> Tuple[Optional[Priority], Optional[str]]:
+    """Current (priority, user_id) from context; either may be None."""
+    current = _request_priority.get()
+    return current if current is not None else (None, None)
+
+
+@dataclass
+class LaneStats:
+    """Statistics for one priority lane."""
+    submitted: int = 0
+    granted: int = 0
+    cancelled: int = 0
+    queued: int = 0  # current queue depth
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def avg_wait(self) -> float:
+        """Mean seconds between submission and admission."""
+        return self.total_wait / self.granted if self.granted > 0 else 0.0
+
+
+@dataclass
+class SchedulerStats:
+    """Statistics for scheduler monitoring."""
+    lanes: Dict[str, LaneStats] = field(default_factory=dict)
+    # "provider" and "provider::model" -> {"limit", "active", "queued"}
+    resources: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+
+class _Waiter:
+    __slots__ = ("future", "priority", "user", "model", "enqueued_at")
+
+    def __init__(self, future: asyncio.Future, priority: Priority, user: str, model: str):
+        self.future = future
+        self.priority = priority
+        self.user = user
+        self.model = model
+        self.enqueued_at = time.monotonic()
+
+
+def _has_room(active: int, limit: int, priority: Priority) -> bool:
+    """Whether a request in this lane fits under a cap (0 = unlimited)."""
+    if limit <= 0:
+        return True
+    if active >= limit:
+        return False
+    if priority == Priority.BACKGROUND and limit > 1:
+        return active < limit - 1
+    return True
+
+
+class _Resource:
+    """Slots and per-lane, per-user queues for one provider on one loop."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        # model -> optional nested cap (0 = only the provider cap applies) / in-flight count
+        self.model_limits: Dict[str, int] = {}
+        self.model_active: Dict[str, int] = {}
+        # lane -> user -> FIFO of waiters; OrderedDict order is the round-robin order
+        self.lanes: Dict[Priority, "OrderedDict[str, Deque[_Waiter]]"] = {
+            p: OrderedDict() for p in Priority
+        }
+
+    @property
+    def queued(self) -> int:
+        return sum(len(q) for users in self.lanes.values() for q in users.values())
+
+    def queued_for(self, model: str) -> int:
+        return sum(
+            1 for users in self.lanes.values() for q in users.values() for w in q if w.model == model
+        )
+
+    def can_admit(self, priority: Priority, model: Optional[str] = None) -> bool:
+        if not _has_room(self.active, self.limit, priority):
+            return False
+        if model is None:
+            return True
+        return _has_room(self.model_active.get(model, 0), self.model_limits.get(model, 0), priority)
+
+    def pop_next(self) -> Optional[_Waiter]:
+        """Next waiter to admit: strict priority across lanes, round-robin across users."""
+        for priority in Priority:
+            users = self.lanes[priority]
+            if not users:
+                continue
+            if not self.can_admit(priority):
+                # Lower lanes must not overtake a lane that is waiting for provider slots
+                return None
+            for user, queue in users.items():
+                for waiter in queue:
+                    if not self.can_admit(priority, waiter.model):
+                        continue
+                    queue.remove(waiter)
+                    if queue:
+                        users.move_to_end(user)
+                    else:
+                        del users[user]
+                    return waiter
+            # Everything in this lane is held back by a per-model cap; other models may go
+        return None
+
+    def remove(self, waiter: _Waiter):
+        users = self.lanes[waiter.priority]
+        queue = users.get(waiter.user)
+        if queue is None:
+            return
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            return
+        if not queue:
+            del users[waiter.user]
+
+
+class RequestScheduler:
+    """
+    Priority- and fairness-aware concurrency limiter for model requests.
+
+    Features:
+    - Concurrency caps per provider, with optional per-model caps nested inside
+    - Strict priority lanes (interactive > orchestration > background)
+    - Round-robin between users within a lane
+    - Last slot reserved from background work
+    - Queue-depth and wait-time metrics per lane
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, int]] = None,
+        default_limit: int = 4,
+        default_priority: Priority = Priority.ORCHESTRATION,
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            limits: Caps keyed by "provider" (shared by all its models) or
+                    "provider::model" (extra cap within the provider's; 0 = unlimited)
+            default_limit: Cap for providers not listed in limits
+            default_priority: Lane for requests with no priority in context
+        """
+        self.limits = dict(limits or {})
+        self.default_limit = default_limit
+        self.default_priority = Priority(default_priority)
+
+        self._lock = Lock()
+        self._resources: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, _Resource]]" = weakref.WeakKeyDictionary()
+        self._lanes: Dict[Priority, LaneStats] = {p: LaneStats() for p in Priority}
+
+    def provider_limit(self, provider: str) -> int:
+        """Cap shared by every model of a provider (0 = unlimited)."""
+        return self.limits.get(provider, self.default_limit)
+
+    def model_limit(self, provider: str, model: str) -> int:
+        """Per-model cap nested inside the provider cap (0 = none)."""
+        return self.limits.get(f"{provider}::{model}", 0)
+
+    def limit_for(self, provider: str, model: str) -> int:
+        """Effective concurrency cap for a provider/model pair (0 = unlimited)."""
+        caps = [c for c in (self.provider_limit(provider), self.model_limit(provider, model)) if c > 0]
+        return min(caps) if caps else 0
+
+    def _resolve(self, priority: Optional[Priority], user_id: Optional[str]) -> Tuple[Priority, str]:
+        ctx_priority, ctx_user = get_request_priority()
+        if priority is None:
+            priority = ctx_priority if ctx_priority is not None else self.default_priority
+        if user_id is None:
+            user_id = ctx_user
+        if user_id is None:
+            from backend.agents.session_context import get_session_context
+            session = get_session_context()
+            user_id = session.user_id if session else None
+        return Priority(priority), user_id or "anonymous"
+
+    def _get_resource(self, provider: str, model: str) -> _Resource:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            resources = self._resources.setdefault(loop, {})
+            resource = resources.get(provider)
+            if resource is None:
+                resource = _Resource(self.provider_limit(provider))
+                resources[provider] = resource
+            if model not in resource.model_limits:
+                resource.model_limits[model] = self.model_limit(provider, model)
+                resource.model_active[model] = 0
+            return resource
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        provider: str,
+        model: str,
+        priority: Optional[Priority] = None,
+        user_id: Optional[str] = None,
+    ) -> AsyncIterator[None]:
+        """
+        Hold one of the provider's request slots for the duration of a call.
+
+        Args:
+            provider: Provider name ("ollama", "gemini", ...)
+            model: Model name without provider prefix or think suffix
+            priority: Lane (default: from context, else default_priority)
+            user_id: Fairness key (default: from context / session)
+        """
+        if self.limit_for(provider, model) <= 0:
+            yield
+            return
+
+        priority, user = self._resolve(priority, user_id)
+        resource = self._get_resource(provider, model)
+        lane = self._lanes[priority]
+
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), priority, user, model)
+        resource.lanes[priority].setdefault(user, deque()).append(waiter)
+        with self._lock:
+            lane.submitted += 1
+            lane.queued += 1
+        self._dispatch(resource)
+
+        if not waiter.future.done():
+            logger.debug(
+                f"Queued {priority.name.lower()} request for {provider}::{model} "
+                f"(user={user}, active={resource.active}/{resource.limit}, queued={resource.queued})"
+            )
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                if waiter.future.done() and not waiter.future.cancelled():
+                    # Admitted just as we were cancelled: hand the slot on
+                    self._release(resource, model)
+                else:
+                    resource.remove(waiter)
+                    with self._lock:
+                        lane.queued -= 1
+                        lane.cancelled += 1
+                raise
+
+        try:
+            yield
+        finally:
+            self._release(resource, model)
+
+    def _dispatch(self, resource: _Resource):
+        """Admit waiters while the resource has room."""
+        while True:
+            waiter = resource.pop_next()
+            if waiter is None:
+                return
+            if waiter.future.done():
+                continue
+            resource.active += 1
+            resource.model_active[waiter.model] += 1
+            waiter.future.set_result(None)
+            wait = time.monotonic() - waiter.enqueued_at
+            with self._lock:
+                lane = self._lanes[waiter.priority]
+                lane.queued -= 1
+                lane.granted += 1
+                lane.total_wait += wait
+                lane.max_wait = max(lane.max_wait, wait)
+
+    def _release(self, resource: _Resource, model: str):
+        resource.active -= 1
+        resource.model_active[model] -= 1
+        self._dispatch(resource)
+
+    def get_stats(self) -> SchedulerStats:
+        """Get scheduler statistics (lane counters and live per-provider/model state)."""
+        with self._lock:
+            lanes = {
+                p.name.lower(): LaneStats(
+                    submitted=s.submitted,
+                    granted=s.granted,
+                    cancelled=s.cancelled,
+                    queued=s.queued,
+                    total_wait=s.total_wait,
+                    max_wait=s.max_wait,
+                )
+                for p, s in self._lanes.items()
+            }
+            resources: Dict[str, Dict[str, int]] = {}
+            for per_loop in self._resources.values():
+                for provider, r in per_loop.items():
+                    entry = resources.setdefault(provider, {"limit": r.limit, "active": 0, "queued": 0})
+                    entry["active"] += r.active
+                    entry["queued"] += r.queued
+                    for model, active in r.model_active.items():
+                        entry = resources.setdefault(
+                            f"{provider}::{model}",
+                            {"limit": self.limit_for(provider, model), "active": 0, "queued": 0},
+                        )
+                        entry["active"] += active
+                        entry["queued"] += r.queued_for(model)
+            return SchedulerStats(lanes=lanes, resources=resources)
+
+
+# Global scheduler instance
+model_scheduler = RequestScheduler(
+    limits=settings.MODEL_SCHEDULER_LIMITS,
+    default_limit=settings.MODEL_SCHEDULER_DEFAULT_LIMIT,
+)
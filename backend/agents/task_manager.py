@@ -2,11 +2,11 @@ import asyncio
 import logging
 from datetime import datetime
 from typing import Dict, List, Any, AsyncGenerator, Optional, Union
-import json
 
 from backend.agents.model_router import ModelRouter
 from backend.agents.session_context import SessionContext
-from backend.agents.content_filter import filter_event
+from backend.agents.request_scheduler import Priority, set_request_priority
+from backend.agents.event_bus import TaskEventBus
 from backend.logging_config import logger
 from backend.agents.orchestrator.schemas import CollaborationContext, CollaborationResponse
 
@@ -46,10 +46,11 @@ class TaskManager:
         # Active background tasks: {task_id: asyncio.Task}
         self.active_tasks: Dict[str, asyncio.Task] = {}
         
-        # Subscriber queues for each task: {task_id: List[asyncio.Queue]}
-        self.subscribers: Dict[str, List[asyncio.Queue]] = {}
+        # Event fan-out for each task with live subscribers: {task_id: TaskEventBus}
+        self.buses: Dict[str, TaskEventBus] = {}
         
         # Live State Tracking for reconnection: {task_id: dict}
+        # "content" / "thinking" are lists of streamed segments (joined on demand)
         self.task_states: Dict[str, Dict] = {}
         
     async def start_chat_task(
@@ -182,10 +183,12 @@ class TaskManager:
         """
         Drives the coder_loop generator and broadcasts events.
         """
+        set_request_priority(Priority.ORCHESTRATION, user_id=session_context.user_id)
+
         # Init State
         self.task_states[task_id] = {
-            "content": "",
-            "thinking": "",
+            "content": [],
+            "thinking": [],
             "tool_calls": [],
             "current_agent_role": "coder",
             "current_model": None,
@@ -227,9 +230,9 @@ class TaskManager:
                 state = self.task_states[task_id]
 
                 if etype == "chunk":
-                    state["content"] += event.get("content", "")
+                    state["content"].append(event.get("content", ""))
                 elif etype == "thinking_chunk":
-                    state["thinking"] += event.get("content", "")
+                    state["thinking"].append(event.get("content", ""))
                 elif etype == "tool_call":
                     tool_info = {
                         "name": event.get("tool_name"),
@@ -265,8 +268,8 @@ class TaskManager:
                             # Save assistant message with this tool call
                             history_log.append({
                                 "role": "assistant",
-                                "content": state["content"],
-                                "thinking": state.get("thinking", ""),
+                                "content": "".join(state["content"]),
+                                "thinking": "".join(state["thinking"]),
                                 "tool_calls": [{
                                     "function": {
                                         "name": matching_tool["name"],
@@ -304,8 +307,8 @@ class TaskManager:
                             )
 
                             # Reset content for next turn
-                            state["content"] = ""
-                            state["thinking"] = ""
+                            state["content"] = []
+                            state["thinking"] = []
 
                 elif etype == "session_info":
                     if "session_info" in event:
@@ -379,11 +382,12 @@ class TaskManager:
 
                 elif etype == "complete":
                     # Add final assistant message to history for persistence
-                    if state["content"]:
+                    final_content = "".join(state["content"])
+                    if final_content:
                         history_log.append({
                             "role": "assistant",
-                            "content": state["content"],
-                            "thinking": state.get("thinking", ""),
+                            "content": final_content,
+                            "thinking": "".join(state["thinking"]),
                             "metadata_blob": {
                                 "mode": "coder",
                                 "phase": "synthesizing",
@@ -431,10 +435,13 @@ class TaskManager:
         """
         Drives the orchestrated_chat generator and broadcasts events.
         """
+        # Runs in its own asyncio task, so this only affects this chat's model requests
+        set_request_priority(Priority.ORCHESTRATION, user_id=session_context.user_id)
+
         # Init State
         self.task_states[task_id] = {
-            "content": "",
-            "thinking": "",
+            "content": [],
+            "thinking": [],
             "tool_calls": [],
             "current_agent_role": None,
             "current_model": None,
@@ -472,9 +479,9 @@ class TaskManager:
                 state = self.task_states[task_id]
 
                 if etype == "chunk":
-                    state["content"] += event.get("content", "")
+                    state["content"].append(event.get("content", ""))
                 elif etype == "orchestrator_thinking":
-                    state["thinking"] += event.get("content", "")
+                    state["thinking"].append(event.get("content", ""))
                     state["phase"] = event.get("phase", state["phase"])
                 elif etype == "orchestrator_thinking_start":
                     state["phase"] = event.get("phase", "thinking")
@@ -548,70 +555,58 @@ class TaskManager:
     async def broadcast_event(self, task_id: str, event: Dict[str, Any]):
         """
         Send event to all active subscribers for this task.
-        Applies content filtering before broadcasting.
-        """
-        if task_id not in self.subscribers:
-            return
 
-        # Filter sensitive content (API keys, etc.) before broadcasting
-        event = filter_event(event)
+        Content filtering and serialization happen once per frame in the
+        task's TaskEventBus; token chunks are coalesced. Never blocks on
+        slow subscribers.
+        """
+        bus = self.buses.get(task_id)
+        if bus is not None:
+            bus.publish(event)
 
-        json_event = json.dumps(event)
-        
-        # Copy list to iterate safely
-        queues = self.subscribers[task_id][:]
-        for q in queues:
-            try:
-                await q.put(json_event)
-            except Exception as e:
-                logger.error(f"Failed to put to queue: {e}")
+    def _sync_state_event(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Snapshot of a running task for (re)connecting or lagging subscribers."""
+        if task_id not in self.task_states:
+            return None
+        state = self.task_states[task_id]
+        sync_event = {
+            "type": "sync_state",
+            "content": "".join(state["content"]),
+            "thinking": "".join(state["thinking"]),
+        }
+        if state.get("current_agent_role"):
+            sync_event["agent_role"] = state["current_agent_role"]
+        if state.get("current_model"):
+            sync_event["model"] = state["current_model"]
+        # Include orchestrator state for proper frontend handling
+        if state.get("orchestrated"):
+            sync_event["orchestrated"] = True
+            sync_event["phase"] = state.get("phase")
+            if state.get("current_step"):
+                sync_event["step_id"] = state["current_step"]
+        if state.get("mode") == "coder":
+            sync_event["mode"] = "coder"
+        return sync_event
 
     async def subscribe(self, task_id: str) -> AsyncGenerator[str, None]:
         """
-        Yields SSE formatted events for a task.
+        Yields JSON events for a task, starting with a sync_state if it is running.
         """
-        queue = asyncio.Queue()
-        
-        if task_id not in self.subscribers:
-            self.subscribers[task_id] = []
-        self.subscribers[task_id].append(queue)
-        
-        # Send Sync Event if task is active
-        if task_id in self.task_states:
-            state = self.task_states[task_id]
-            # Construct sync event
-            sync_event = {
-                "type": "sync_state",
-                "content": state["content"],
-                "thinking": state["thinking"],
-            }
-            if state.get("current_agent_role"):
-                sync_event["agent_role"] = state["current_agent_role"]
-            if state.get("current_model"):
-                sync_event["model"] = state["current_model"]
-            # Include orchestrator state for proper frontend handling
-            if state.get("orchestrated"):
-                sync_event["orchestrated"] = True
-                sync_event["phase"] = state.get("phase")
-                if state.get("current_step"):
-                    sync_event["step_id"] = state["current_step"]
-            if state.get("mode") == "coder":
-                sync_event["mode"] = "coder"
-
-            yield json.dumps(sync_event)
-        
+        bus = self.buses.get(task_id)
+        if bus is None:
+            bus = TaskEventBus(snapshot=lambda: self._sync_state_event(task_id))
+            self.buses[task_id] = bus
+        subscription = bus.subscribe()
+
         try:
-            while True:
-                data = await queue.get()
+            async for data in bus.stream(subscription):
                 yield data
         except asyncio.CancelledError:
             pass
         finally:
-            if task_id in self.subscribers:
-                if queue in self.subscribers[task_id]:
-                    self.subscribers[task_id].remove(queue)
-                if not self.subscribers[task_id]:
-                    del self.subscribers[task_id]
+            bus.unsubscribe(subscription)
+            if not bus.subscribers and self.buses.get(task_id) is bus:
+                del self.buses[task_id]
 
     def _cleanup_task(self, task_id):
         if task_id in self.active_tasks:
@@ -629,6 +624,7 @@ class TaskManager:
         try:
             from backend.database import engine
             from backend.models.telemetry import TelemetrySnapshot
+            from backend.telemetry import record_snapshot
             from sqlmodel import Session
 
             state = self.task_states.get(task_id, {})
@@ -664,7 +660,7 @@ class TaskManager:
             )
 
             with Session(engine) as db_session:
-                db_session.add(snap)
+                record_snapshot(db_session, snap)
                 db_session.commit()
 
             logger.info(
@@ -680,8 +676,9 @@ class TaskManager:
 
     def _persist_history(self, task_id, history_log, session_context, accumulated_tokens=None):
         # Need to import DB stuff inside method to avoid circular imports or context issues
-        from sqlmodel import Session, select
+        from sqlmodel import Session
         from backend.database import engine
+        from backend.message_history import message_sequence
         from backend.models.task import Message, Task
 
         # Replicates logic from tasks.py persistence
@@ -693,9 +690,7 @@ class TaskManager:
 
         try:
             with Session(engine) as session:
-                # Get last sequence
-                last_msg = session.exec(select(Message).where(Message.task_id == task_id).order_by(Message.sequence.desc())).first()
-                next_seq = (last_msg.sequence + 1) if last_msg else 1
+                next_seq = message_sequence.reserve(session, task_id, len(history_log))
 
                 resolved_model = session_context.agent_roles.get("_resolved_model")
                 resolved_role = session_context.agent_roles.get("_resolved_role")
@@ -753,18 +748,15 @@ class TaskManager:
         if start_idx >= len(history_log):
             return start_idx
 
-        from sqlmodel import Session, select
+        from sqlmodel import Session
         from backend.database import engine
+        from backend.message_history import message_sequence
         from backend.models.task import Message
 
         new_entries = history_log[start_idx:]
         try:
             with Session(engine) as session:
-                last_msg = session.exec(
-                    select(Message).where(Message.task_id == task_id)
-                    .order_by(Message.sequence.desc())
-                ).first()
-                next_seq = (last_msg.sequence + 1) if last_msg else 1
+                next_seq = message_sequence.reserve(session, task_id, len(new_entries))
 
                 resolved_model = session_context.agent_roles.get("_resolved_model")
                 resolved_role = session_context.agent_roles.get("_resolved_role")
@@ -1,6 +1,6 @@
 # backend/config.py
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional
 import os
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -16,10 +16,30 @@ class Settings(BaseSettings):
     
     # LLM Services
     OLLAMA_BASE_URL: str = "http://localhost:11434"
+    # Pooled HTTP client (shared keep-alive connections to Ollama)
+    OLLAMA_MAX_CONNECTIONS: int = 32
+    OLLAMA_MAX_KEEPALIVE_CONNECTIONS: int = 16
+    OLLAMA_KEEPALIVE_EXPIRY: float = 120.0
+    OLLAMA_HTTP2: bool = False  # needs the h2 package and an HTTP/2 endpoint (e.g. TLS proxy)
     GEMINI_API_KEY: Optional[str] = None
+    # Model request scheduler: in-flight caps keyed by "provider" (shared by all its models)
+    # or "provider::model" (extra cap within the provider's; the only per-model concurrency
+    # limit; keep "ollama" at or below OLLAMA_NUM_PARALLEL)
+    MODEL_SCHEDULER_LIMITS: Dict[str, int] = {"ollama": 4, "gemini": 16}
+    MODEL_SCHEDULER_DEFAULT_LIMIT: int = 8
+    # Orchestrator: plan steps run concurrently when their depends_on edges allow (1 = sequential)
+    ORCHESTRATOR_MAX_PARALLEL_STEPS: int = 3
+    # RLM REPL: sub-LLM calls in flight at once per llm_query_batch / llm_map call
+    RLM_BATCH_CONCURRENCY: int = 8
+    # RLM report verification: LLM calls in flight, and claims packed per verification prompt (1 = one call per claim)
+    RLM_VERIFY_CONCURRENCY: int = 4
+    RLM_VERIFY_BATCH_SIZE: int = 5
 
     # RAG / Vector DB
     CHROMA_PERSIST_DIRECTORY: str = f"{BASE_DIR}/data/chroma_db" if os.path.exists(f"{BASE_DIR}/data/chroma_db") else f"{BASE_DIR}/chroma_db"
+    # Chunk embedding cache (re-ingestion skips the model for unchanged text)
+    EMBEDDING_CACHE_MAX_MB: int = 2048
+    EMBEDDING_CACHE_DTYPE: str = "float32"  # "float16" halves disk use
     
     # Tool Server
     TOOL_SERVER_URL: str = "http://tool-server:8777"
@@ -31,6 +51,30 @@ class Settings(BaseSettings):
     # Default to data/workspace locally if exists, else root workspace, allowing override
     _default_ws = f"{BASE_DIR}/data/workspace" if os.path.exists(f"{BASE_DIR}/data/workspace") else f"{BASE_DIR}/workspace"
     WORKSPACE_DIR: str = os.getenv("WORKSPACE_DIR", _default_ws)
+    # execute_python: pre-warmed worker interpreters per user venv (0 = cold subprocess per call)
+    PYTHON_WORKER_POOL_SIZE: int = 1
+    PYTHON_WORKER_MAX_ENVS: int = 8
+    PYTHON_WORKER_PRELOAD: List[str] = ["numpy", "pandas", "matplotlib", "matplotlib.pyplot"]
+    # Notebook kernels pre-started per user and kernel spec ("ir" needs r-base + IRkernel)
+    NOTEBOOK_KERNEL_POOL_SIZES: Dict[str, int] = {"python3": 1, "ir": 0}
+    NOTEBOOK_KERNEL_POOL_IDLE_MINUTES: int = 15
+    # Notebook persistence: "journal" (changed cells + output blobs, debounced .ipynb export) or "ipynb"
+    NOTEBOOK_STORAGE_MODE: str = "journal"
+    NOTEBOOK_EXPORT_INTERVAL: float = 5.0
+    NOTEBOOK_BLOB_MIN_CHARS: int = 4096
+    NOTEBOOK_JOURNAL_COMPACT_RECORDS: int = 200
+    # Task logs: rows buffered and inserted in batches by a background thread
+    TASK_LOG_BATCH_SIZE: int = 200
+    TASK_LOG_FLUSH_INTERVAL: float = 0.5
+    TASK_LOG_MAX_QUEUE: int = 10000  # when full, INFO/DEBUG are dropped
+    TASK_LOG_BLOCK_TIMEOUT: float = 0.1  # max wait for WARNING+ records
+    # SQLite profile (app database and document registries)
+    SQLITE_WAL: bool = True
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_CACHE_MB: int = 64
+    SQLITE_MMAP_MB: int = 256
+    SQLITE_BUSY_TIMEOUT_MS: int = 15000
+    SQLITE_LOCK_RETRIES: int = 3
     
     class Config:
         env_file = ".env"
@@ -1,8 +1,9 @@
 # backend/database.py
 import logging
 from sqlmodel import SQLModel, create_engine, Session, select
-from sqlalchemy import text, inspect
+from sqlalchemy import event, text, inspect
 from backend.config import settings
+from backend.sqlite_tuning import apply_pragmas
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +13,12 @@ engine = create_engine(
     echo=False
 )
 
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _configure_sqlite(dbapi_connection, connection_record):
+        """WAL journaling, busy timeout and cache pragmas for every pooled connection."""
+        apply_pragmas(dbapi_connection)
+
 
 def _run_migrations():
     """Run database migrations for schema changes."""
@@ -53,6 +60,16 @@ def _run_migrations():
                 conn.commit()
             logger.info("Migration complete: 'sort_order' column added")
 
+    # --- Message migrations ---
+    if 'message' in table_names:
+        indexes = [ix['name'] for ix in inspector.get_indexes('message')]
+        if 'ix_message_task_id_sequence' not in indexes:
+            logger.info("Running migration: Adding (task_id, sequence) index to message table")
+            with engine.connect() as conn:
+                conn.execute(text("CREATE INDEX IF NOT EXISTS ix_message_task_id_sequence ON message (task_id, sequence)"))
+                conn.commit()
+            logger.info("Migration complete: message index added")
+
     # --- UserCollection migrations ---
     if 'user_collections' in table_names:
         columns = [col['name'] for col in inspector.get_columns('user_collections')]
@@ -140,3 +157,7 @@ def init_db():
     _run_migrations()
     SQLModel.metadata.create_all(engine)
     _create_default_admin()
+    # Telemetry rollups for snapshots written before the rollup tables existed
+    from backend.telemetry import backfill_rollups
+    with Session(engine) as session:
+        backfill_rollups(session)
@@ -0,0 +1,197 @@
+# backend/db_export.py
+"""
+Streaming database export.
+
+Rows are read with yield_per and serialized one at a time, so memory stays
+flat regardless of database size. Formats:
+
+- json:   {"users": [...], "tasks": [...], ...} (same layout as before)
+- ndjson: one {"table": ..., "row": {...}} object per line
+- zip:    one <table>.ndjson member per table, deflated
+"""
+
+import json
+import zipfile
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Table, select
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from backend.models.config import ModelConfig
+from backend.models.task import Message, Task
+from backend.models.user import User
+
+EXPORT_FORMATS = ("json", "ndjson", "zip")
+
+# Never exported
+_EXCLUDED_COLUMNS = {"user": {"password_hash"}}
+
+
+def json_serial(obj):
+    """JSON serializer for objects not serializable by default json code"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Type {type(obj)} not serializable")
+
+
+def _dumps(row: Dict[str, Any]) -> str:
+    return json.dumps(row, default=json_serial, ensure_ascii=False)
+
+
+def _queries(
+    user_id: Optional[str],
+    since: Optional[datetime],
+    until: Optional[datetime],
+) -> List[Tuple[str, Any]]:
+    """(section name, Core select) per exported table, with filters applied."""
+
+    def columns(table: Table):
+        excluded = _EXCLUDED_COLUMNS.get(table.name, set())
+        return [c for c in table.c if c.name not in excluded]
+
+    def in_range(query, column):
+        if since is not None:
+            query = query.where(column >= since)
+        if until is not None:
+            query = query.where(column < until)
+        return query
+
+    users, tasks, messages = User.__table__, Task.__table__, Message.__table__
+
+    user_q = in_range(select(*columns(users)), users.c.created_at)
+    task_q = in_range(select(*columns(tasks)), tasks.c.created_at)
+    message_q = in_range(select(*columns(messages)), messages.c.timestamp)
+    if user_id is not None:
+        user_q = user_q.where(users.c.id == user_id)
+        task_q = task_q.where(tasks.c.user_id == user_id)
+        message_q = message_q.where(
+            messages.c.task_id.in_(select(tasks.c.id).where(tasks.c.user_id == user_id))
+        )
+
+    return [
+        ("users", user_q.order_by(users.c.created_at, users.c.id)),
+        ("tasks", task_q.order_by(tasks.c.created_at, tasks.c.id)),
+        ("messages", message_q.order_by(messages.c.id)),
+        ("model_configs", select(*columns(ModelConfig.__table__)).order_by(ModelConfig.__table__.c.id)),
+    ]
+
+
+def iter_tables(
+    engine: Engine,
+    user_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    chunk_size: int = 500,
+) -> Iterator[Tuple[str, Iterator[Dict[str, Any]]]]:
+    """
+    Yield (section, rows) per exported table; rows are fetched lazily.
+
+    Each rows iterator must be consumed before advancing to the next table.
+
+    Args:
+        engine: Database to export
+        user_id: Only this user, their tasks and their tasks' messages
+        since: Only rows created at or after this time
+        until: Only rows created before this time
+        chunk_size: Rows fetched per round trip (yield_per)
+    """
+    with Session(engine) as session:
+        for section, query in _queries(user_id, since, until):
+            result = session.execute(query.execution_options(yield_per=chunk_size))
+            yield section, (dict(row) for row in result.mappings())
+
+
+class _StreamBuffer:
+    """Write-only, unseekable file that zipfile writes into and we drain."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._offset = 0
+        self.pending = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        self.pending += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        self.pending = 0
+        return data
+
+
+def stream_export(
+    engine: Engine,
+    fmt: str = "json",
+    user_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    chunk_size: int = 500,
+    flush_bytes: int = 256 * 1024,
+) -> Iterator[bytes]:
+    """
+    Serialize the export as a stream of byte chunks.
+
+    Args:
+        engine: Database to export
+        fmt: One of EXPORT_FORMATS
+        user_id: Optional user filter (see iter_tables)
+        since: Optional lower bound on creation time
+        until: Optional upper bound on creation time
+        chunk_size: Rows fetched per round trip
+        flush_bytes: Approximate size of each yielded chunk
+
+    Yields:
+        Encoded chunks of the export file
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    tables = iter_tables(engine, user_id=user_id, since=since, until=until, chunk_size=chunk_size)
+    if fmt == "zip":
+        yield from _stream_zip(tables, flush_bytes)
+        return
+
+    pending: List[str] = ["{"] if fmt == "json" else []
+    size = 0
+    for index, (section, rows) in enumerate(tables):
+        if fmt == "json":
+            pending.append(f'{"," if index else ""}\n  "{section}": [')
+        for position, row in enumerate(rows):
+            if fmt == "ndjson":
+                line = _dumps({"table": section, "row": row}) + "\n"
+            else:
+                line = f'{"," if position else ""}\n    {_dumps(row)}'
+            pending.append(line)
+            size += len(line)
+            if size >= flush_bytes:
+                yield "".join(pending).encode("utf-8")
+                pending, size = [], 0
+        if fmt == "json":
+            pending.append("\n  ]")
+    if fmt == "json":
+        pending.append("\n}\n")
+    if pending:
+        yield "".join(pending).encode("utf-8")
+
+
+def _stream_zip(tables: Iterator[Tuple[str, Iterator[Dict[str, Any]]]], flush_bytes: int) -> Iterator[bytes]:
+    buffer = _StreamBuffer()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for section, rows in tables:
+            # force_zip64: the member size is unknown until the table is done
+            with archive.open(f"{section}.ndjson", "w", force_zip64=True) as member:
+                for row in rows:
+                    member.write((_dumps(row) + "\n").encode("utf-8"))
+                    if buffer.pending >= flush_bytes:
+                        yield buffer.drain()
+    yield buffer.drain()
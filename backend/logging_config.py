@@ -1,6 +1,11 @@
 import logging
+import queue
 import sys
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime
+from typing import List, Optional, Tuple
 from backend.agents.session_context import get_session_context
 
 class UserContextFilter(logging.Filter):
@@ -74,8 +79,18 @@ def setup_logging():
     except Exception as e:
         print(f"Failed to setup file logging: {e}")
     
-    # Database Handler
-    db_handler = DatabaseHandler()
+    # Database Handler (batched in a background thread)
+    global db_handler
+    if db_handler is not None:
+        # setup_logging() ran before: flush and stop the previous writer
+        db_handler.close()
+    from backend.config import settings
+    db_handler = DatabaseHandler(
+        batch_size=settings.TASK_LOG_BATCH_SIZE,
+        flush_interval=settings.TASK_LOG_FLUSH_INTERVAL,
+        max_queue=settings.TASK_LOG_MAX_QUEUE,
+        block_timeout=settings.TASK_LOG_BLOCK_TIMEOUT,
+    )
     logger.addHandler(db_handler)
     backend_logger.addHandler(db_handler)
     
@@ -89,30 +104,165 @@ def setup_logging():
     # Usually we return one, but the side effect of configuring 'backend' is what matters.
     return logger
 
+@dataclass
+class LogSinkStats:
+    """Statistics for task log sink monitoring."""
+    enqueued: int = 0
+    written: int = 0
+    batches: int = 0
+    dropped: int = 0   # records discarded because the queue was full
+    failed: int = 0    # records lost to database errors
+
+
+# Queue control items (records are plain tuples)
+_FLUSH = "flush"
+_STOP = "stop"
+
+
 class DatabaseHandler(logging.Handler):
     """
     Custom handler to save logs to the database using SQLModel.
     Imports are done lazily to avoid circular dependencies during startup.
+
+    emit() only puts a small tuple on a bounded queue. A background thread
+    inserts the rows in batches, flushing when batch_size records are
+    waiting or flush_interval seconds after the first one arrived, so
+    logging never waits on an SQLite commit. When the queue is full,
+    records below WARNING are dropped at once; WARNING and above wait up
+    to block_timeout for room (back-pressure) before being dropped.
     """
-    def emit(self, record):
-        from sqlmodel import Session
-        from backend.database import engine
-        from backend.models.log import TaskLog
 
+    def __init__(
+        self,
+        batch_size: int = 200,
+        flush_interval: float = 0.5,
+        max_queue: int = 10000,
+        block_timeout: float = 0.1,
+        engine=None,
+    ):
+        """
+        Initialize handler.
+
+        Args:
+            batch_size: Rows per INSERT transaction (flush when reached)
+            flush_interval: Max seconds a record waits before its batch is written
+            max_queue: Records buffered before the drop policy applies
+            block_timeout: Seconds a WARNING+ record may wait for queue space
+            engine: SQLAlchemy engine (default: backend.database.engine)
+        """
+        super().__init__()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.block_timeout = block_timeout
+        self._engine = engine
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._stats = LogSinkStats()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="task-log-writer", daemon=True)
+        self._thread.start()
+
+    def emit(self, record):
         try:
             # Only log if task_id is present and valid
-            if hasattr(record, 'task_id') and record.task_id != 'N/A':
-                 log_entry = TaskLog(
-                     task_id=record.task_id,
-                     level=record.levelname,
-                     message=record.getMessage(),
-                     timestamp=datetime.fromtimestamp(record.created)
-                 )
-                 # Use a short-lived session for safety
-                 with Session(engine) as session:
-                     session.add(log_entry)
-                     session.commit()
+            if not hasattr(record, 'task_id') or record.task_id == 'N/A' or self._closed:
+                return
+            row = (
+                record.task_id,
+                record.levelname,
+                record.getMessage(),
+                datetime.fromtimestamp(record.created),
+            )
+            try:
+                if record.levelno >= logging.WARNING:
+                    self._queue.put(row, timeout=self.block_timeout)
+                else:
+                    self._queue.put_nowait(row)
+                self._stats.enqueued += 1
+            except queue.Full:
+                self._stats.dropped += 1
         except Exception:
             self.handleError(record)
 
+    # ── Writer thread ────────────────────────────────────────────────────────
+
+    def _run(self):
+        batch: List[Tuple[str, str, str, datetime]] = []
+        deadline: Optional[float] = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, tuple):
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(batch) < self.batch_size:
+                    continue
+
+            # Size reached, interval elapsed, or a flush/stop request
+            if batch:
+                self._write_batch(batch)
+                batch = []
+            deadline = None
+
+            if isinstance(item, list):
+                kind, done = item
+                done.set()
+                if kind == _STOP:
+                    return
+
+    def _write_batch(self, batch: List[Tuple[str, str, str, datetime]]):
+        from sqlmodel import Session
+        from backend.models.log import TaskLog
+
+        engine = self._engine
+        if engine is None:
+            from backend.database import engine
+
+        try:
+            with Session(engine) as session:
+                session.add_all([
+                    TaskLog(task_id=task_id, level=level, message=message, timestamp=timestamp)
+                    for task_id, level, message, timestamp in batch
+                ])
+                session.commit()
+            self._stats.written += len(batch)
+            self._stats.batches += 1
+        except Exception as e:
+            # Can't log through logging from here: it would feed this handler
+            self._stats.failed += len(batch)
+            sys.stderr.write(f"Task log sink: failed to write {len(batch)} record(s): {e}\n")
+
+    def _request(self, kind: str, timeout: Optional[float]) -> bool:
+        if not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        try:
+            # Control items must not be dropped: wait for room
+            self._queue.put([kind, done], timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Write everything queued so far. Returns False on timeout."""
+        return self._request(_FLUSH, timeout)
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Flush remaining records and stop the writer thread."""
+        if not self._closed:
+            self._closed = True
+            self._request(_STOP, timeout)
+        super().close()
+
+    def get_stats(self) -> LogSinkStats:
+        """Get sink statistics."""
+        return LogSinkStats(**vars(self._stats))
+
+
+db_handler: Optional[DatabaseHandler] = None
+
 logger = setup_logging()
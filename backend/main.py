@@ -25,6 +25,21 @@ from backend.database import init_db
 from backend.retrieval.models import UserCollection
 from backend.models.telemetry import TelemetrySnapshot  # noqa: F401 — registers table with SQLModel
 from backend.agents.preload_manager import preload_manager
+from backend.agents.models.http_pool import http_pool
+from backend.agents.notebook.kernel import KernelRegistry
+
+# Seconds between sweeps for idle notebook kernels (running and pre-started)
+KERNEL_REAP_INTERVAL = 60
+
+
+async def reap_idle_kernels(interval: float = KERNEL_REAP_INTERVAL):
+    """Periodically stop idle notebook kernels until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await KernelRegistry.cleanup_idle_kernels()
+        except Exception as e:
+            logger.warning(f"Idle kernel cleanup failed: {e}")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -32,7 +47,21 @@ async def lifespan(app: FastAPI):
     # Start model preloading in background (non-blocking)
     asyncio.create_task(preload_manager.startup_preload())
     logger.info("Model preload task started in background")
+    kernel_reaper = asyncio.create_task(reap_idle_kernels())
     yield
+    kernel_reaper.cancel()
+    try:
+        await kernel_reaper
+    except asyncio.CancelledError:
+        pass
+    # Close pooled keep-alive connections to model providers
+    await http_pool.aclose()
+    # Stop notebook kernels (including pre-started ones)
+    await KernelRegistry.stop_all()
+    # Write buffered task logs
+    from backend import logging_config
+    if logging_config.db_handler is not None:
+        await asyncio.to_thread(logging_config.db_handler.close)
 
 app = FastAPI(title="Mentori Backend (Minimal)", lifespan=lifespan)
 
@@ -371,22 +371,35 @@ builtins.__import__ = _safe_import
             f.write(safe_code)
             temp_file = f.name
 
-        # Execute in subprocess
-        result = subprocess.run(
-            [python_exec, temp_file],
-            cwd=working_dir,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            env={
-                **os.environ,
-                "PYTHONDONTWRITEBYTECODE": "1",
-                "PYTHONUNBUFFERED": "1",
-                # Ensure VIRTUAL_ENV is set for the subprocess
-                "VIRTUAL_ENV": os.path.dirname(os.path.dirname(python_exec)) if ".venv" in python_exec else "",
-                "PATH": f"{os.path.dirname(python_exec)}:{os.environ.get('PATH', '')}"
-            }
-        )
+        exec_env = {
+            **os.environ,
+            "PYTHONDONTWRITEBYTECODE": "1",
+            "PYTHONUNBUFFERED": "1",
+            # Ensure VIRTUAL_ENV is set for the subprocess
+            "VIRTUAL_ENV": os.path.dirname(os.path.dirname(python_exec)) if ".venv" in python_exec else "",
+            "PATH": f"{os.path.dirname(python_exec)}:{os.environ.get('PATH', '')}"
+        }
+
+        if settings.PYTHON_WORKER_POOL_SIZE > 0:
+            # Pre-warmed single-use worker (scientific stack already imported)
+            from backend.mcp.custom.python_workers import python_workers
+            result = python_workers.run(
+                python_exec,
+                temp_file,
+                cwd=working_dir,
+                timeout=timeout,
+                env=exec_env,
+            )
+        else:
+            # Execute in subprocess
+            result = subprocess.run(
+                [python_exec, temp_file],
+                cwd=working_dir,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+                env=exec_env
+            )
 
         output = ""
         if result.stdout:
@@ -1,8 +1,13 @@
 import os
+import json
+import hashlib
 import subprocess
 import logging
 import sys
-from typing import List
+import threading
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -17,13 +22,26 @@ DEFAULT_PACKAGES = [
     "requests"
 ]
 
-def _run_uv_command(args: List[str], cwd: str) -> str:
-    """Run a uv command in the specified directory."""
+# Written inside .venv once DEFAULT_PACKAGES are installed; removed with the venv
+READY_MARKER = ".mentori_ready"
+
+_provision_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+_provision_locks_guard = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _uv_version() -> str:
+    """Check once per process that uv is installed (failures are not cached)."""
     try:
-        # Check if uv is installed
-        subprocess.run(["uv", "--version"], check=True, capture_output=True)
+        result = subprocess.run(["uv", "--version"], check=True, capture_output=True, text=True)
     except (subprocess.CalledProcessError, FileNotFoundError):
         raise RuntimeError("uv is not installed or not in PATH")
+    return result.stdout.strip()
+
+
+def _run_uv_command(args: List[str], cwd: str) -> str:
+    """Run a uv command in the specified directory."""
+    _uv_version()
 
     cmd = ["uv"] + args
     logger.info(f"Running uv command: {' '.join(cmd)} in {cwd}")
@@ -43,29 +61,88 @@ def _run_uv_command(args: List[str], cwd: str) -> str:
         
     return result.stdout
 
+def env_fingerprint(python_exec: str, packages: Optional[List[str]] = None) -> str:
+    """
+    Fingerprint of what a provisioned venv must contain.
+
+    Changes when the default package set changes or when the venv's base
+    interpreter is replaced (e.g. a Python upgrade behind the symlink).
+    """
+    payload = json.dumps({
+        "interpreter": os.path.realpath(python_exec),
+        "packages": sorted(set(DEFAULT_PACKAGES if packages is None else packages)),
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _read_marker(venv_path: str) -> Optional[str]:
+    try:
+        with open(os.path.join(venv_path, READY_MARKER), "r", encoding="utf-8") as f:
+            return json.load(f).get("fingerprint")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _write_marker(venv_path: str, fingerprint: str):
+    marker = os.path.join(venv_path, READY_MARKER)
+    tmp = f"{marker}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"fingerprint": fingerprint, "packages": sorted(DEFAULT_PACKAGES)}, f)
+    os.replace(tmp, marker)
+
+
+def is_venv_ready(path_identifier: str) -> bool:
+    """True if the venv at path_identifier is provisioned for the current package set."""
+    venv_path = os.path.join(path_identifier, ".venv")
+    python_exec = os.path.join(venv_path, "bin", "python")
+    if not os.path.exists(python_exec):
+        return False
+    return _read_marker(venv_path) == env_fingerprint(python_exec)
+
+
 def ensure_venv(path_identifier: str) -> str:
     """
     Ensure a .venv exists at the specified path (usually user workspace root).
     Returns the path to the python executable.
+
+    Provisioning (venv creation + DEFAULT_PACKAGES install) only runs when the
+    readiness marker is missing or its fingerprint no longer matches.
     
     Args:
         path_identifier: The absolute path where .venv should exist (e.g. /data/workspace/user_id)
     """
     venv_path = os.path.join(path_identifier, ".venv")
     python_exec = os.path.join(venv_path, "bin", "python")
-    
-    if not os.path.isdir(path_identifier):
-         os.makedirs(path_identifier, exist_ok=True)
 
-    # 1. Create venv if missing
-    if not os.path.exists(python_exec):
-        logger.info(f"Creating User Venv in {path_identifier}")
-        _run_uv_command(["venv", ".venv"], cwd=path_identifier)
-        
-    # 2. Install default packages (idempotent via uv)
-    logger.info(f"Ensuring default packages in {path_identifier}")
-    _run_uv_command(["pip", "install"] + DEFAULT_PACKAGES, cwd=path_identifier)
-    
+    if is_venv_ready(path_identifier):
+        return python_exec
+
+    with _provision_locks_guard:
+        lock = _provision_locks[os.path.abspath(path_identifier)]
+
+    with lock:
+        # Another caller may have finished provisioning while we waited
+        if is_venv_ready(path_identifier):
+            return python_exec
+
+        if not os.path.isdir(path_identifier):
+             os.makedirs(path_identifier, exist_ok=True)
+
+        # 1. Create venv if missing
+        if not os.path.exists(python_exec):
+            logger.info(f"Creating User Venv in {path_identifier}")
+            _run_uv_command(["venv", ".venv"], cwd=path_identifier)
+
+        # 2. Install default packages (idempotent via uv)
+        logger.info(f"Ensuring default packages in {path_identifier}")
+        _run_uv_command(["pip", "install"] + DEFAULT_PACKAGES, cwd=path_identifier)
+
+        _write_marker(venv_path, env_fingerprint(python_exec))
+
+        # Idle workers were started before the install
+        from backend.mcp.custom.python_workers import python_workers
+        python_workers.invalidate(python_exec)
+
     return python_exec
 
 from backend.mcp.decorator import mentori_tool
@@ -111,6 +188,10 @@ def install_package(
     
     logger.info(f"Installing {package_name} in User Env: {target_path}")
     _run_uv_command(["pip", "install", package_name], cwd=target_path)
+
+    # Warm workers may already have imported an older version
+    from backend.mcp.custom.python_workers import python_workers
+    python_workers.invalidate(python_exec)
     
     return f"Successfully installed {package_name} in user environment"
 
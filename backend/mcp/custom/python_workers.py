@@ -0,0 +1,234 @@
+"""
+Pre-warmed Python worker processes for execute_python.
+
+Starting a fresh interpreter and importing pandas/numpy/matplotlib takes
+seconds per call. Instead, each user environment keeps a few idle worker
+processes that have already imported the scientific stack and are blocked
+reading a job from stdin. A job is the path of a script to run. The worker
+changes into the job's directory, runs the script as __main__ and exits.
+
+Every worker runs exactly one job, so executions stay isolated from each
+other, just like the cold subprocess they replace. A replacement worker
+starts warming as soon as one is taken from the pool.
+"""
+import atexit
+import json
+import logging
+import os
+import subprocess
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Runs inside the worker interpreter (the user's venv python)
+WORKER_BOOTSTRAP = r'''
+import importlib, json, os, runpy, sys, traceback
+for _name in json.loads(sys.argv[1]):
+    try:
+        importlib.import_module(_name)
+    except Exception:
+        pass
+_job = json.loads(sys.stdin.readline() or "null")
+if not _job:
+    sys.exit(0)
+os.chdir(_job["cwd"])
+sys.argv = [_job["path"]]
+sys.path[0] = os.path.dirname(_job["path"])
+importlib.invalidate_caches()
+try:
+    runpy.run_path(_job["path"], run_name="__main__")
+except SystemExit:
+    raise
+except BaseException as _e:
+    # Report the traceback from the user's script down, as `python script.py` would
+    _tb = _e.__traceback__
+    while _tb is not None and _tb.tb_frame.f_code.co_filename != _job["path"]:
+        _tb = _tb.tb_next
+    traceback.print_exception(type(_e), _e, _tb)
+    sys.exit(1)
+'''
+
+DEFAULT_PRELOAD = ["numpy", "pandas", "matplotlib", "matplotlib.pyplot"]
+
+
+@dataclass
+class WorkerPoolStats:
+    """Statistics for worker pool monitoring."""
+    spawned: int = 0
+    warm_starts: int = 0   # jobs served by an idle, pre-started worker
+    cold_starts: int = 0   # jobs that had to start a worker on demand
+    timeouts: int = 0
+    discarded: int = 0     # idle workers killed (invalidated, evicted, died)
+
+
+class PythonWorkerPool:
+    """
+    Idle single-use worker processes, keyed by interpreter.
+
+    Features:
+    - Scientific stack imported before the job arrives
+    - One process per job (no state leaks between executions)
+    - Same timeout semantics as subprocess.run (worker is killed)
+    - LRU cap on the number of environments kept warm
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 1,
+        max_envs: int = 8,
+        preload: Optional[Sequence[str]] = None,
+    ):
+        """
+        Initialize pool.
+
+        Args:
+            pool_size: Idle workers kept per interpreter (0 disables warming)
+            max_envs: Interpreters kept warm at once (least recently used is dropped)
+            preload: Modules imported by each worker before it accepts a job
+        """
+        self.pool_size = pool_size
+        self.max_envs = max_envs
+        self.preload = list(DEFAULT_PRELOAD if preload is None else preload)
+
+        self._idle: "OrderedDict[str, List[subprocess.Popen]]" = OrderedDict()
+        self._envs: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+        self._stats = WorkerPoolStats()
+
+    def _spawn(self, python_exec: str, env: Dict[str, str]) -> subprocess.Popen:
+        proc = subprocess.Popen(
+            [python_exec, "-c", WORKER_BOOTSTRAP, json.dumps(self.preload)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            env=env,
+        )
+        self._stats.spawned += 1
+        return proc
+
+    @staticmethod
+    def _kill(proc: subprocess.Popen):
+        try:
+            proc.kill()
+            proc.communicate(timeout=5)
+        except Exception:
+            pass
+
+    def _acquire(self, python_exec: str, env: Dict[str, str]) -> subprocess.Popen:
+        """Take an idle worker (or start one) and top the pool back up."""
+        stale: List[subprocess.Popen] = []
+        proc = None
+        with self._lock:
+            if self._envs.get(python_exec) != env:
+                # Environment changed (PATH, VIRTUAL_ENV...): idle workers are stale
+                stale.extend(self._idle.pop(python_exec, []))
+                self._envs[python_exec] = env
+
+            idle = self._idle.setdefault(python_exec, [])
+            self._idle.move_to_end(python_exec)
+            while idle:
+                candidate = idle.pop(0)
+                if candidate.poll() is None:
+                    proc = candidate
+                    break
+                stale.append(candidate)
+
+            if proc is not None:
+                self._stats.warm_starts += 1
+            else:
+                self._stats.cold_starts += 1
+                proc = self._spawn(python_exec, env)
+
+            while len(idle) < self.pool_size:
+                idle.append(self._spawn(python_exec, env))
+
+            while len(self._idle) > self.max_envs:
+                evicted_exec, evicted = self._idle.popitem(last=False)
+                self._envs.pop(evicted_exec, None)
+                stale.extend(evicted)
+
+            self._stats.discarded += len(stale)
+
+        for old in stale:
+            self._kill(old)
+        return proc
+
+    def run(
+        self,
+        python_exec: str,
+        script_path: str,
+        cwd: str,
+        timeout: float,
+        env: Dict[str, str],
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a script in a warm worker.
+
+        Args:
+            python_exec: Interpreter of the user's environment
+            script_path: Absolute path of the script to run as __main__
+            cwd: Working directory for the script
+            timeout: Seconds before the worker is killed
+            env: Environment of the worker process
+
+        Returns:
+            CompletedProcess with text stdout/stderr
+
+        Raises:
+            subprocess.TimeoutExpired: If the script ran longer than timeout
+        """
+        proc = self._acquire(python_exec, env)
+        job = json.dumps({"path": os.path.abspath(script_path), "cwd": cwd}) + "\n"
+        try:
+            stdout, stderr = proc.communicate(input=job, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self._stats.timeouts += 1
+            self._kill(proc)
+            raise
+        except BaseException:
+            self._kill(proc)
+            raise
+        return subprocess.CompletedProcess(proc.args, proc.returncode, stdout, stderr)
+
+    def invalidate(self, python_exec: Optional[str] = None):
+        """
+        Kill idle workers so the next job sees a fresh environment.
+
+        Args:
+            python_exec: Interpreter whose workers to drop (None = all)
+        """
+        with self._lock:
+            if python_exec is None:
+                stale = [p for procs in self._idle.values() for p in procs]
+                self._idle.clear()
+                self._envs.clear()
+            else:
+                stale = self._idle.pop(python_exec, [])
+                self._envs.pop(python_exec, None)
+            self._stats.discarded += len(stale)
+        for proc in stale:
+            self._kill(proc)
+        if stale:
+            logger.info(f"Discarded {len(stale)} idle Python worker(s)")
+
+    def get_stats(self) -> WorkerPoolStats:
+        """Get pool statistics."""
+        return WorkerPoolStats(**vars(self._stats))
+
+
+def _build_pool() -> PythonWorkerPool:
+    from backend.config import settings
+    return PythonWorkerPool(
+        pool_size=settings.PYTHON_WORKER_POOL_SIZE,
+        max_envs=settings.PYTHON_WORKER_MAX_ENVS,
+        preload=settings.PYTHON_WORKER_PRELOAD,
+    )
+
+
+# Global pool instance
+python_workers = _build_pool()
+atexit.register(python_workers.invalidate)
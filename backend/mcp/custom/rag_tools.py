@@ -142,7 +142,7 @@ async def query_documents(
     logger.info(f"Querying documents: query='{query[:50]}...', index='{index_name}', max_results={max_results}, mode={retrieval_mode}")
 
     try:
-        from backend.retrieval.retriever import SimpleRetriever
+        from backend.retrieval.retriever_pool import retriever_pool
         from backend.retrieval.models import UserCollection, IndexStatus
         from backend.database import engine
         from sqlmodel import Session, select
@@ -209,11 +209,13 @@ async def query_documents(
             except Exception as e:
                 logger.warning(f"Error checking corpus size for reranker: {e}")
 
-        retriever = SimpleRetriever(embedding_model=embedding_model, use_reranker=use_reranker)
+        # Pooled retriever keeps its BM25 index warm between calls
+        retriever = retriever_pool.get(target_collection, embedding_model)
         results = retriever.retrieve(
             query=query,
             collection_name=target_collection,
-            top_k=max_results
+            top_k=max_results,
+            use_reranker=use_reranker
         )
 
         if not results:
@@ -852,6 +854,12 @@ async def deep_research_rlm(
                         if res.get("status") == "error":
                             return f"[Error] Failed to ingest file: {res.get('error')}"
 
+                        from backend.retrieval.retriever_pool import retriever_pool
+                        from backend.retrieval.corpus_cache import corpus_cache
+                        retriever_pool.invalidate(target_collection)
+                        response_cache.invalidate(target_collection)
+                        corpus_cache.invalidate(target_collection)
+
                         # Create a UserCollection record so from_index() can find it
                         with DBSession(db_engine) as db_session:
                             existing = db_session.get(UserCollection, target_collection)
@@ -0,0 +1,176 @@
+# backend/message_history.py
+"""
+Message history access for long-running tasks.
+
+- message_sequence hands out per-task sequence numbers from memory, so
+  persisting a turn no longer scans the task's messages for the last one
+  (and concurrent writers in this process never reuse a number).
+- fetch_message_page() reads one keyset page on the (task_id, sequence)
+  index. Heavy metadata fields (thinking text, tool calls) are stripped in
+  SQL unless requested, and are available per message via
+  get_message_metadata().
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import JSON, func, type_coerce
+from sqlmodel import Session, select
+
+from backend.models.task import Message
+
+# metadata_blob keys left out of list responses unless include_heavy is set
+HEAVY_METADATA_KEYS = ("thinking", "tool_calls")
+
+
+class MessageSequence:
+    """
+    In-memory next-sequence counter per task.
+
+    A task is seeded once from MAX(sequence) (an index lookup) and then
+    counted in memory. Numbers are reserved before the insert commits; a
+    failed transaction leaves a gap, which only affects numbering, not order.
+    """
+
+    def __init__(self, max_tasks: int = 4096):
+        """
+        Initialize counter.
+
+        Args:
+            max_tasks: Tasks kept in memory (least recently used are re-seeded)
+        """
+        self.max_tasks = max_tasks
+        self._last: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def reserve(self, session: Session, task_id: str, count: int = 1) -> int:
+        """
+        Reserve `count` consecutive sequence numbers for a task.
+
+        Args:
+            session: Session used to seed the counter on first use
+            task_id: Task the messages belong to
+            count: Numbers to reserve
+
+        Returns:
+            First reserved sequence number
+        """
+        with self._lock:
+            last = self._last.get(task_id)
+            if last is None:
+                last = session.exec(
+                    select(func.max(Message.sequence)).where(Message.task_id == task_id)
+                ).one() or 0
+            else:
+                self._last.move_to_end(task_id)
+            self._last[task_id] = last + count
+            while len(self._last) > self.max_tasks:
+                self._last.popitem(last=False)
+            return last + 1
+
+    def forget(self, task_id: str) -> None:
+        """Drop a task's counter (e.g. after its messages were deleted)."""
+        with self._lock:
+            self._last.pop(task_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._last.clear()
+
+
+message_sequence = MessageSequence()
+
+
+@dataclass
+class MessageRow:
+    """One message as returned by fetch_message_page()."""
+    id: int
+    sequence: int
+    role: str
+    content: str
+    timestamp: datetime
+    metadata_blob: Dict[str, Any]
+    omitted_fields: List[str] = field(default_factory=list)
+
+
+def fetch_message_page(
+    session: Session,
+    task_id: str,
+    before: Optional[int] = None,
+    after: Optional[int] = None,
+    limit: int = 50,
+    include_heavy: bool = False,
+) -> Tuple[List[MessageRow], bool]:
+    """
+    Read one page of a task's messages by sequence (keyset pagination).
+
+    Without `after`, returns the newest messages older than `before` (the
+    latest page when `before` is None). With `after`, returns the messages
+    following that sequence. Either way the page is in chronological order.
+
+    Args:
+        session: Database session
+        task_id: Task to read
+        before: Only messages with a lower sequence
+        after: Only messages with a higher sequence (pages forward)
+        limit: Page size
+        include_heavy: Keep HEAVY_METADATA_KEYS in metadata_blob
+
+    Returns:
+        Tuple of (messages, has_more in the paging direction)
+    """
+    meta = Message.__table__.c.metadata_blob
+    columns = [Message.id, Message.sequence, Message.role, Message.content, Message.timestamp]
+    if include_heavy:
+        columns.append(meta)
+    else:
+        # Strip heavy keys inside SQLite so their text never leaves the database
+        paths = [f"$.{key}" for key in HEAVY_METADATA_KEYS]
+        columns.append(type_coerce(func.json_remove(meta, *paths), JSON).label("light_meta"))
+        columns += [
+            (func.coalesce(func.json_type(meta, path), "null") != "null").label(f"has_{key}")
+            for key, path in zip(HEAVY_METADATA_KEYS, paths)
+        ]
+
+    query = select(*columns).where(Message.task_id == task_id)
+    if after is not None:
+        query = query.where(Message.sequence > after).order_by(Message.sequence)
+    else:
+        if before is not None:
+            query = query.where(Message.sequence < before)
+        query = query.order_by(Message.sequence.desc())
+    rows = session.exec(query.limit(limit + 1)).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if after is None:
+        rows.reverse()
+
+    messages = []
+    for row in rows:
+        omitted = [] if include_heavy else [
+            key for key, present in zip(HEAVY_METADATA_KEYS, row[6:]) if present
+        ]
+        messages.append(MessageRow(
+            id=row[0], sequence=row[1], role=row[2], content=row[3], timestamp=row[4],
+            metadata_blob=row[5] or {}, omitted_fields=omitted,
+        ))
+    return messages, has_more
+
+
+def get_message_metadata(session: Session, task_id: str, message_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Full metadata_blob of one message (for lazily loading heavy fields).
+
+    Returns:
+        The metadata dict, or None if the message is not in this task
+    """
+    message = session.exec(
+        select(Message).where(Message.id == message_id, Message.task_id == task_id)
+    ).first()
+    if message is None:
+        return None
+    return message.metadata_blob or {}
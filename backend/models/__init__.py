@@ -4,6 +4,12 @@ from .task import Task, Message
 from .audit import AuditLog
 from .config import ModelConfig, UserModelPreference
 from .system_settings import SystemSettings
-from .telemetry import TelemetrySnapshot
+from .telemetry import (
+    TelemetrySnapshot,
+    TelemetryToolCall,
+    TelemetryDailyRollup,
+    TelemetryToolDailyRollup,
+)
 
-__all__ = ["User", "Task", "Message", "AuditLog", "ModelConfig", "UserModelPreference", "SystemSettings", "TelemetrySnapshot"]
+__all__ = ["User", "Task", "Message", "AuditLog", "ModelConfig", "UserModelPreference", "SystemSettings", "TelemetrySnapshot",
+           "TelemetryToolCall", "TelemetryDailyRollup", "TelemetryToolDailyRollup"]
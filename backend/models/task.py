@@ -1,5 +1,5 @@
 # backend/models/task.py
-from sqlmodel import SQLModel, Field, Column, JSON
+from sqlmodel import SQLModel, Field, Column, JSON, Index
 from datetime import datetime
 from typing import Optional, Dict
 
@@ -20,6 +20,9 @@ class Task(SQLModel, table=True):
     sort_order: int = Field(default=0)  # User-defined sort order (lower = higher in list)
 
 class Message(SQLModel, table=True):
+    # History is always read per task in sequence order
+    __table_args__ = (Index("ix_message_task_id_sequence", "task_id", "sequence"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     task_id: str = Field(foreign_key="task.id")
     role: str  # "user", "assistant", "system", "tool"
@@ -38,3 +38,53 @@ class TelemetrySnapshot(SQLModel, table=True):
     # Quality / error tracking
     error_count: int = Field(default=0)
     step_count: int = Field(default=0)
+
+
+class TelemetryToolCall(SQLModel, table=True):
+    """
+    TelemetrySnapshot.tool_calls exploded to one row per (snapshot, tool),
+    so tool usage can be filtered and grouped in SQL.
+    """
+
+    __tablename__ = "telemetry_tool_calls"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    snapshot_id: int = Field(foreign_key="telemetry_snapshots.id", index=True)
+    day: str = Field(index=True)  # "YYYY-MM-DD" (UTC) of the snapshot
+    user_id: str = Field(index=True)
+    tool_name: str = Field(index=True)
+    call_count: int = Field(default=0)
+
+
+class TelemetryDailyRollup(SQLModel, table=True):
+    """
+    Per-day totals by user and model, updated with every snapshot.
+    Dashboard queries aggregate these instead of the raw snapshots.
+    """
+
+    __tablename__ = "telemetry_daily_rollups"
+
+    day: str = Field(primary_key=True)  # "YYYY-MM-DD" (UTC)
+    user_id: str = Field(primary_key=True)
+    model_identifier: str = Field(primary_key=True)
+
+    task_count: int = Field(default=0)
+    error_tasks: int = Field(default=0)  # turns with error_count > 0
+    error_count: int = Field(default=0)
+    step_count: int = Field(default=0)
+    input_tokens: int = Field(default=0)
+    output_tokens: int = Field(default=0)
+    total_tokens: int = Field(default=0)
+    duration_seconds: float = Field(default=0.0)
+
+
+class TelemetryToolDailyRollup(SQLModel, table=True):
+    """Per-day tool usage, updated with every snapshot."""
+
+    __tablename__ = "telemetry_tool_daily_rollups"
+
+    day: str = Field(primary_key=True)
+    tool_name: str = Field(primary_key=True)
+
+    call_count: int = Field(default=0)
+    task_count: int = Field(default=0)  # turns that called the tool
@@ -5,6 +5,8 @@ import os
 import aiohttp
 import json
 
+from backend.agents.request_scheduler import model_scheduler
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -118,7 +120,7 @@ class DeepSeekTranscriber(TranscriberAgent):
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
+            async with model_scheduler.slot("ollama", self.model_name), aiohttp.ClientSession() as session:
                 async with session.post(f"{self.ollama_url}/api/generate", json=payload) as response:
                     if response.status != 200:
                         error_text = await response.text()
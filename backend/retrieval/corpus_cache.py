@@ -0,0 +1,617 @@
+"""
+Process-wide cache of compact corpus snapshots for RLMContext.
+
+Every RLM tool call (deep_research_rlm, cross_document_analysis,
+paper_triage, analyze_corpus, summarize_document_pages) used to pull the
+whole collection out of Chroma and rebuild one Python dict per chunk. A
+single plan often runs several of them against the same index.
+
+A CorpusSnapshot stores the collection once per process:
+
+- every chunk text concatenated into one string, addressed by an offset array
+- columnar arrays for doc code, page and chunk index
+- chunk ids and metadata dicts as plain lists
+- rows grouped by document (first-seen order) and sorted by chunk index, so
+  each document is one contiguous row range
+
+RLMContext instances share the snapshot and read it through lightweight
+views (`CorpusView` -> `DocChunksView` -> `ChunkView`) that behave like the
+old `Dict[str, List[Dict]]`; a chunk's text is only sliced out of the buffer
+when it is read.
+
+search_keyword and search_regex go through a trigram index over the
+lowercased chunks (built on first search, shared with the snapshot): keyword
+lookups intersect the postings of the term's trigrams and regexes are
+narrowed to chunks containing their required literals. Candidates are then
+checked with the original per-chunk `count` / `finditer`, so results and
+scores are unchanged.
+
+Snapshots are keyed by collection name and a version counter. Ingestion
+calls `invalidate()` after adding or deleting chunks, which bumps the
+version; as with the retriever pool, the chunk count is also compared on
+every lookup so writes from other processes are picked up.
+"""
+
+import logging
+import os
+import time
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from re import _parser as _sre_parser
+except ImportError:  # Python < 3.11
+    import sre_parse as _sre_parser
+
+logger = logging.getLogger(__name__)
+
+_CHUNK_KEYS = ("id", "text", "chunk_idx", "page", "metadata")
+
+
+@dataclass
+class DocSpan:
+    """A document's contiguous row range in a snapshot plus its summary fields."""
+    name: str
+    start: int
+    end: int
+    total_pages: int
+    file_path: str = ""
+    title: Optional[str] = None
+    author: Optional[str] = None
+
+
+@dataclass
+class CorpusCacheStats:
+    """Statistics for cache monitoring."""
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    evictions: int = 0
+    current_entries: int = 0
+    current_chars: int = 0
+
+
+class CorpusSnapshot:
+    """Immutable, columnar copy of one collection's chunks."""
+
+    def __init__(
+        self,
+        collection_name: str,
+        ids: List[str],
+        documents: List[Optional[str]],
+        metadatas: List[Optional[Dict[str, Any]]],
+        version: int = 0,
+    ):
+        """
+        Build a snapshot from the output of `collection.get()`.
+
+        Args:
+            collection_name: ChromaDB collection name
+            ids: Chunk ids
+            documents: Chunk texts
+            metadatas: Chunk metadata dicts
+            version: Cache version the snapshot was built for
+        """
+        self.collection_name = collection_name
+        self.version = version
+        self.created_at = time.time()
+
+        metadatas = [meta or {} for meta in metadatas]
+        doc_codes: Dict[str, int] = {}
+        rows: List[Tuple[int, int, int, int]] = []  # (doc code, chunk_idx, page, source position)
+        for i, meta in enumerate(metadatas):
+            source = meta.get("file_path") or meta.get("source") or "unknown"
+            doc_name = meta.get("file_name") or os.path.basename(source)
+            code = doc_codes.setdefault(doc_name, len(doc_codes))
+            rows.append((code, int(meta.get("chunk_index", i)), int(meta.get("page", 1)), i))
+        rows.sort(key=lambda r: (r[0], r[1]))
+
+        self.doc_names: List[str] = list(doc_codes)
+        self.doc_codes = array("i", (r[0] for r in rows))
+        self.chunk_idx = array("q", (r[1] for r in rows))
+        self.pages = array("q", (r[2] for r in rows))
+        self.ids: List[str] = [ids[r[3]] for r in rows]
+        self.metadatas: List[Dict[str, Any]] = [metadatas[r[3]] for r in rows]
+
+        texts = [documents[r[3]] or "" for r in rows]
+        self.offsets = array("q", [0])
+        self.empty_chunks = 0
+        position = 0
+        for chunk_text in texts:
+            position += len(chunk_text)
+            self.offsets.append(position)
+            if not chunk_text.strip():
+                self.empty_chunks += 1
+        self.text = "".join(texts)
+        del texts
+        self._lowered: Optional[str] = None
+        self._trigram_index: Optional[TrigramIndex] = None
+        self._index_lock = Lock()
+        self._special_folds: Optional[bool] = None
+
+        self.docs: Dict[str, DocSpan] = {}
+        start = 0
+        for code, doc_name in enumerate(self.doc_names):
+            end = start
+            while end < len(rows) and self.doc_codes[end] == code:
+                end += 1
+            first_meta = self.metadatas[start]
+            self.docs[doc_name] = DocSpan(
+                name=doc_name,
+                start=start,
+                end=end,
+                total_pages=max(self.pages[start:end]),
+                file_path=first_meta.get("file_path", ""),
+                title=first_meta.get("title"),
+                author=first_meta.get("author"),
+            )
+            start = end
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def chunk_text(self, row: int) -> str:
+        """Text of one row, sliced out of the shared buffer."""
+        return self.text[self.offsets[row]:self.offsets[row + 1]]
+
+    def view(self) -> "CorpusView":
+        """Dict-of-lists view for RLMContext._chunks_by_doc."""
+        return CorpusView(self)
+
+    def count_matches(
+        self,
+        term: str,
+        doc_name: Optional[str] = None,
+        case_sensitive: bool = False,
+    ) -> List[Tuple[int, int]]:
+        """
+        Non-overlapping occurrences of `term` per row.
+
+        Counts are exactly `text.count(term)` (or the lowercased equivalent)
+        per chunk. Terms of three or more characters are looked up in the
+        trigram index and only the candidate rows are counted; shorter terms
+        scan the buffer once.
+
+        Args:
+            term: Substring to look for
+            doc_name: Optional - only this document's rows
+            case_sensitive: Whether to match case
+
+        Returns:
+            (row, match count) pairs in row order
+        """
+        row_range = self._row_range(doc_name)
+        if row_range is None:
+            return []
+        start_row, end_row = row_range
+
+        needle = term if case_sensitive else term.lower()
+        # An ASCII substring survives lowercasing, so the lowercase index is a
+        # superset for case-sensitive ASCII terms too
+        if len(needle) >= 3 and (not case_sensitive or needle.isascii()):
+            rows = self.trigram_index().candidates([needle.lower()], start_row, end_row)
+            return self._count_in_rows(needle, rows, case_sensitive)
+
+        haystack = self.text if case_sensitive else self._lowered_text()
+        # Empty terms count positions; sigma lowercases differently at chunk ends
+        if not needle or haystack is None or (not case_sensitive and ("σ" in needle or "ς" in needle)):
+            return self._count_in_rows(needle, range(start_row, end_row), case_sensitive)
+
+        offsets = self.offsets
+        counts: Dict[int, int] = {}
+        position = offsets[start_row]
+        stop = offsets[end_row]
+        while True:
+            position = haystack.find(needle, position, stop)
+            if position < 0:
+                break
+            row = bisect_right(offsets, position, start_row, end_row + 1) - 1
+            if position + len(needle) <= offsets[row + 1]:
+                counts[row] = counts.get(row, 0) + 1
+                position += len(needle)
+            else:
+                position = offsets[row + 1]
+        return sorted(counts.items())
+
+    def regex_candidates(self, pattern: str, flags: int = 0, doc_name: Optional[str] = None) -> Sequence[int]:
+        """
+        Rows that can match `pattern`, narrowed by the literals it requires.
+
+        Args:
+            pattern: Regex source
+            flags: Flags the regex is compiled with
+            doc_name: Optional - only this document's rows
+
+        Returns:
+            Candidate rows in row order (every row if nothing can be ruled out)
+        """
+        row_range = self._row_range(doc_name)
+        if row_range is None:
+            return []
+        # i and s are safe to index unless the corpus holds the other characters they match
+        literals = required_literals(pattern, flags, strict=self._has_special_folds())
+        if not literals:
+            return range(*row_range)
+        return self.trigram_index().candidates(literals, *row_range)
+
+    def trigram_index(self) -> "TrigramIndex":
+        """Trigram index over the lowercased chunks, built on first use and shared."""
+        if self._trigram_index is None:
+            with self._index_lock:
+                if self._trigram_index is None:
+                    started = time.time()
+                    self._trigram_index = TrigramIndex(self)
+                    logger.info(
+                        f"Built trigram index for '{self.collection_name}': "
+                        f"{len(self._trigram_index)} trigrams, {self._trigram_index.nbytes // 1024} KiB "
+                        f"in {time.time() - started:.2f}s"
+                    )
+        return self._trigram_index
+
+    def _has_special_folds(self) -> bool:
+        if self._special_folds is None:
+            self._special_folds = any(c in self.text for c in _SPECIAL_FOLDS)
+        return self._special_folds
+
+    def _row_range(self, doc_name: Optional[str]) -> Optional[Tuple[int, int]]:
+        if doc_name is None:
+            return 0, len(self.ids)
+        span = self.docs.get(doc_name)
+        return (span.start, span.end) if span is not None else None
+
+    def _count_in_rows(self, term: str, rows: Iterable[int], case_sensitive: bool) -> List[Tuple[int, int]]:
+        matches = []
+        for row in rows:
+            text = self.chunk_text(row)
+            count = (text if case_sensitive else text.lower()).count(term)
+            if count:
+                matches.append((row, count))
+        return matches
+
+    def _lowered_text(self) -> Optional[str]:
+        """Lowercased buffer, built on first use; None if lowercasing is not length-preserving."""
+        if self._lowered is None:
+            lowered = self.text.lower()
+            self._lowered = lowered if len(lowered) == len(self.text) else ""
+        return self._lowered if len(self._lowered) == len(self.text) else None
+
+
+def _gram_keys(codes: np.ndarray) -> np.ndarray:
+    """Pack each run of three code points into one int64 (code points fit in 21 bits)."""
+    return (codes[:-2] << 42) | (codes[1:-1] << 21) | codes[2:]
+
+
+def _code_points(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32).astype(np.int64)
+
+
+class TrigramIndex:
+    """
+    Trigram postings over the lowercased chunk texts, in CSR layout.
+
+    `grams` holds the sorted distinct trigram keys; the postings of grams[i]
+    are the sorted rows in rows[indptr[i]:indptr[i + 1]].
+    """
+
+    def __init__(self, snapshot: CorpusSnapshot):
+        lowered = [snapshot.chunk_text(row).lower() for row in range(len(snapshot))]
+        lengths = np.fromiter((len(t) for t in lowered), dtype=np.int64, count=len(lowered))
+        codes = _code_points("".join(lowered))
+        del lowered
+
+        if len(codes) >= 3:
+            ends = np.cumsum(lengths)
+            row_of = np.repeat(np.arange(len(lengths), dtype=np.int32), lengths)[:-2]
+            inside = np.arange(2, len(codes)) < ends[row_of]  # trigram stays within its chunk
+            keys = _gram_keys(codes)[inside]
+            rows = row_of[inside]
+        else:
+            keys = np.empty(0, dtype=np.int64)
+            rows = np.empty(0, dtype=np.int32)
+
+        order = np.lexsort((rows, keys))
+        keys, rows = keys[order], rows[order]
+        distinct = np.ones(len(keys), dtype=bool)
+        distinct[1:] = (keys[1:] != keys[:-1]) | (rows[1:] != rows[:-1])
+        keys, self.rows = keys[distinct], rows[distinct]
+
+        self.grams, starts = np.unique(keys, return_index=True)
+        self.indptr = np.append(starts, len(keys))
+
+    def __len__(self) -> int:
+        """Number of distinct trigrams."""
+        return len(self.grams)
+
+    @property
+    def nbytes(self) -> int:
+        return self.grams.nbytes + self.indptr.nbytes + self.rows.nbytes
+
+    def candidates(self, literals: List[str], start_row: int, end_row: int) -> List[int]:
+        """
+        Rows in [start_row, end_row) containing every trigram of every literal.
+
+        Args:
+            literals: Lowercase strings of at least three characters
+            start_row: First row to consider
+            end_row: Row after the last one to consider
+
+        Returns:
+            Candidate rows in row order
+        """
+        wanted = np.unique(np.concatenate([_gram_keys(_code_points(literal)) for literal in literals]))
+        slots = np.searchsorted(self.grams, wanted)
+        if np.any(slots >= len(self.grams)) or np.any(self.grams[np.minimum(slots, len(self.grams) - 1)] != wanted):
+            return []  # some trigram occurs nowhere
+
+        sizes = self.indptr[slots + 1] - self.indptr[slots]
+        rows = None
+        for slot in slots[np.argsort(sizes, kind="stable")]:  # shortest postings first
+            postings = self.rows[self.indptr[slot]:self.indptr[slot + 1]]
+            if rows is None:
+                rows = postings[np.searchsorted(postings, start_row):np.searchsorted(postings, end_row)]
+            else:
+                rows = np.intersect1d(rows, postings, assume_unique=True)
+            if not len(rows):
+                break
+        return rows.tolist()
+
+
+# ASCII literals whose re.IGNORECASE matches are exactly the characters that
+# lowercase to them, except i and s, which also match these
+_SPECIAL_FOLDS = "İıſ"
+_ASCII_LITERALS = frozenset(chr(c) for c in range(128))
+_STRICT_LITERALS = _ASCII_LITERALS - set("iIsS")
+_REQUIRED_REPEATS = {"MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT"}
+
+
+def required_literals(pattern: str, flags: int = 0, strict: bool = True) -> List[str]:
+    """
+    Lowercased literal runs (3+ chars) that every match of `pattern` contains.
+
+    Only runs of plain ASCII literals in required positions are collected;
+    alternations, optional parts and character classes end a run. Returns an
+    empty list when nothing useful can be extracted.
+
+    Args:
+        pattern: Regex source
+        flags: Compile flags
+        strict: Also end runs at i/s (needed if the text may contain İ, ı or ſ)
+    """
+    indexable = _STRICT_LITERALS if strict else _ASCII_LITERALS
+    try:
+        parsed = _sre_parser.parse(pattern, flags)
+    except Exception:
+        return []
+    runs: List[str] = []
+    _collect_literals(parsed, runs, indexable)
+    return [run for run in runs if len(run) >= 3]
+
+
+def _collect_literals(items, runs: List[str], indexable: frozenset) -> None:
+    current: List[str] = []
+    for op, arg in items:
+        name = str(op)
+        if name == "LITERAL" and chr(arg) in indexable:
+            current.append(chr(arg).lower())
+            continue
+        if current:
+            runs.append("".join(current))
+            current = []
+        if name == "SUBPATTERN":
+            _collect_literals(arg[-1], runs, indexable)
+        elif name == "ATOMIC_GROUP":
+            _collect_literals(arg, runs, indexable)
+        elif name in _REQUIRED_REPEATS and arg[0] >= 1:
+            _collect_literals(arg[2], runs, indexable)
+    if current:
+        runs.append("".join(current))
+
+
+class ChunkView(Mapping):
+    """Read-only dict view of one snapshot row (id, text, chunk_idx, page, metadata)."""
+
+    __slots__ = ("_snapshot", "_row")
+
+    def __init__(self, snapshot: CorpusSnapshot, row: int):
+        self._snapshot = snapshot
+        self._row = row
+
+    def __getitem__(self, key: str) -> Any:
+        snapshot, row = self._snapshot, self._row
+        if key == "text":
+            return snapshot.chunk_text(row)
+        if key == "chunk_idx":
+            return snapshot.chunk_idx[row]
+        if key == "page":
+            return snapshot.pages[row]
+        if key == "metadata":
+            return snapshot.metadatas[row]
+        if key == "id":
+            return snapshot.ids[row]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_CHUNK_KEYS)
+
+    def __len__(self) -> int:
+        return len(_CHUNK_KEYS)
+
+    def __repr__(self):
+        return f"ChunkView({self._snapshot.ids[self._row]!r})"
+
+
+class DocChunksView(Sequence):
+    """The chunks of one document, in chunk_idx order."""
+
+    __slots__ = ("_snapshot", "_start", "_end")
+
+    def __init__(self, snapshot: CorpusSnapshot, start: int, end: int):
+        self._snapshot = snapshot
+        self._start = start
+        self._end = end
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return ChunkView(self._snapshot, self._start + index)
+
+    def __iter__(self) -> Iterator[ChunkView]:
+        snapshot = self._snapshot
+        for row in range(self._start, self._end):
+            yield ChunkView(snapshot, row)
+
+
+class CorpusView(Mapping):
+    """Read-only `Dict[str, List[Dict]]` view of a snapshot, keyed by document name."""
+
+    __slots__ = ("snapshot",)
+
+    def __init__(self, snapshot: CorpusSnapshot):
+        self.snapshot = snapshot
+
+    def __getitem__(self, doc_name: str) -> DocChunksView:
+        span = self.snapshot.docs[doc_name]
+        return DocChunksView(self.snapshot, span.start, span.end)
+
+    def __contains__(self, doc_name) -> bool:
+        return doc_name in self.snapshot.docs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.snapshot.docs)
+
+    def __len__(self) -> int:
+        return len(self.snapshot.docs)
+
+
+class CorpusCache:
+    """
+    Snapshot cache keyed by collection name and version.
+
+    Features:
+    - One snapshot per collection shared by every RLMContext in the process
+    - Explicit invalidation per collection (called by ingestion)
+    - Chunk-count staleness check on every lookup
+    - LRU eviction
+    """
+
+    def __init__(self, max_entries: int = 8):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of snapshots kept in memory
+        """
+        self._entries: "OrderedDict[str, CorpusSnapshot]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = Lock()
+        self.max_entries = max_entries
+        self._stats = CorpusCacheStats()
+
+    def get(self, collection_name: str, vector_store, chunk_count: Optional[int] = None) -> CorpusSnapshot:
+        """
+        Return the snapshot for a collection, loading it from Chroma if needed.
+
+        Args:
+            collection_name: ChromaDB collection name
+            vector_store: VectorStore used to count and load the collection
+            chunk_count: Current chunk count, if the caller already has it
+
+        Returns:
+            Shared CorpusSnapshot (treat as read-only)
+        """
+        if chunk_count is None:
+            chunk_count = vector_store.count(collection_name)
+
+        with self._lock:
+            version = self._versions.get(collection_name, 0)
+            snapshot = self._entries.get(collection_name)
+            if snapshot is not None:
+                if snapshot.version == version and len(snapshot) == chunk_count:
+                    self._entries.move_to_end(collection_name)
+                    self._stats.hits += 1
+                    return snapshot
+                logger.info(
+                    f"Collection '{collection_name}' changed "
+                    f"({len(snapshot)} -> {chunk_count} chunks), reloading corpus snapshot"
+                )
+                del self._entries[collection_name]
+            self._stats.misses += 1
+
+        # Load outside the lock; other collections stay readable meanwhile
+        collection = vector_store.get_collection(collection_name)
+        data = collection.get(include=["metadatas", "documents"])
+        snapshot = CorpusSnapshot(
+            collection_name,
+            data.get("ids") or [],
+            data.get("documents") or [],
+            data.get("metadatas") or [],
+            version=version,
+        )
+
+        with self._lock:
+            # Only cache it if nobody invalidated the collection while we were loading
+            if self._versions.get(collection_name, 0) == version:
+                self._entries[collection_name] = snapshot
+                self._entries.move_to_end(collection_name)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._stats.evictions += 1
+
+        logger.info(
+            f"Loaded corpus snapshot for '{collection_name}': "
+            f"{len(snapshot)} chunks, {len(snapshot.docs)} documents, {len(snapshot.text)} chars"
+        )
+        return snapshot
+
+    def invalidate(self, collection_name: str):
+        """
+        Drop a collection's snapshot and bump its version.
+
+        Call this when documents are added to or removed from a collection.
+
+        Args:
+            collection_name: ChromaDB collection name
+        """
+        with self._lock:
+            self._versions[collection_name] = self._versions.get(collection_name, 0) + 1
+            if self._entries.pop(collection_name, None) is not None:
+                self._stats.invalidations += 1
+                logger.info(f"Invalidated corpus snapshot for '{collection_name}'")
+
+    def clear(self):
+        """Drop every snapshot."""
+        with self._lock:
+            for name in self._entries:
+                self._versions[name] = self._versions.get(name, 0) + 1
+            self._stats.evictions += len(self._entries)
+            self._entries.clear()
+
+    def get_stats(self) -> CorpusCacheStats:
+        """Get cache statistics."""
+        with self._lock:
+            return CorpusCacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                invalidations=self._stats.invalidations,
+                evictions=self._stats.evictions,
+                current_entries=len(self._entries),
+                current_chars=sum(len(s.text) for s in self._entries.values()),
+            )
+
+
+# Global singleton instance
+corpus_cache = CorpusCache()
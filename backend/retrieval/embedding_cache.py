@@ -0,0 +1,280 @@
+"""
+On-disk embedding cache for ingestion.
+
+Caches chunk embeddings by hash of (model name + normalization flag +
+normalized chunk text), so re-ingesting or re-indexing unchanged documents
+skips the embedding model entirely.
+
+Storage is a single SQLite file next to the Chroma data; vectors are kept
+as raw float32 (or float16) blobs. Entries are evicted least-recently-used
+once the store grows past its size budget.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# SQLite caps the number of bound parameters per statement
+_QUERY_BATCH = 500
+
+
+@dataclass
+class EmbeddingCacheStats:
+    """Statistics for cache monitoring."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    current_entries: int = 0
+    current_bytes: int = 0
+
+
+class EmbeddingCache:
+    """
+    Persistent content-addressed embedding cache.
+
+    Features:
+    - Key = sha256(model name, normalize flag, normalized text)
+    - float32 or float16 vector storage
+    - LRU eviction bounded by total vector bytes
+    - Thread-safe operations
+    - Hit/miss statistics for monitoring
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_bytes: int = 2 * 1024 ** 3,
+        dtype: str = "float32",
+    ):
+        """
+        Open (or create) the cache.
+
+        Args:
+            db_path: SQLite file path
+            max_bytes: Upper bound for stored vector bytes (default 2 GiB)
+            dtype: "float32" (exact) or "float16" (half the size)
+        """
+        if dtype not in ("float32", "float16"):
+            raise ValueError(f"Unsupported embedding cache dtype: {dtype}")
+
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.dtype = np.dtype(dtype)
+        self._lock = Lock()
+        self._stats = EmbeddingCacheStats()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                dim INTEGER NOT NULL,
+                dtype TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                nbytes INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)"
+        )
+        self._conn.commit()
+
+        row = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM embeddings"
+        ).fetchone()
+        self._stats.current_entries, self._stats.current_bytes = row[0], row[1]
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Canonical form used for hashing (NFC, collapsed whitespace)."""
+        text = unicodedata.normalize("NFC", text or "")
+        return _WHITESPACE_RE.sub(" ", text).strip()
+
+    @classmethod
+    def make_key(cls, model_name: str, text: str, normalize: bool = True) -> str:
+        """Deterministic cache key for a chunk under a given model."""
+        content = f"{model_name}\x00{int(normalize)}\x00{cls.normalize_text(text)}"
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get_many(
+        self,
+        model_name: str,
+        texts: Sequence[str],
+        normalize: bool = True,
+    ) -> List[Optional[np.ndarray]]:
+        """
+        Look up embeddings for a batch of texts.
+
+        Args:
+            model_name: Embedding model identifier
+            texts: Chunk texts
+            normalize: Whether embeddings are L2-normalized
+
+        Returns:
+            One float32 vector per text, or None where not cached
+        """
+        keys = [self.make_key(model_name, t, normalize) for t in texts]
+        found: Dict[str, np.ndarray] = {}
+
+        with self._lock:
+            unique_keys = list(dict.fromkeys(keys))
+            for start in range(0, len(unique_keys), _QUERY_BATCH):
+                batch = unique_keys[start:start + _QUERY_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, dim, dtype, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for key, dim, dtype, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=dtype, count=dim).astype(np.float32)
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, k) for k in found],
+                )
+                self._conn.commit()
+
+            results = [found.get(k) for k in keys]
+            hits = sum(1 for r in results if r is not None)
+            self._stats.hits += hits
+            self._stats.misses += len(results) - hits
+
+        return results
+
+    def put_many(
+        self,
+        model_name: str,
+        texts: Sequence[str],
+        embeddings: np.ndarray,
+        normalize: bool = True,
+    ):
+        """
+        Store embeddings for a batch of texts.
+
+        Args:
+            model_name: Embedding model identifier
+            texts: Chunk texts
+            embeddings: Array of shape (len(texts), dimension)
+            normalize: Whether embeddings are L2-normalized
+        """
+        if len(texts) == 0:
+            return
+
+        now = time.time()
+        rows = []
+        for text, vec in zip(texts, embeddings):
+            blob = np.ascontiguousarray(vec, dtype=self.dtype).tobytes()
+            rows.append((
+                self.make_key(model_name, text, normalize),
+                int(vec.shape[0]),
+                self.dtype.name,
+                blob,
+                len(blob),
+                now,
+            ))
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, dim, dtype, vector, nbytes, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+            self._refresh_size()
+            if self._stats.current_bytes > self.max_bytes:
+                self._evict()
+
+    def _refresh_size(self):
+        """Re-read entry count and byte total. Caller holds the lock."""
+        row = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM embeddings"
+        ).fetchone()
+        self._stats.current_entries, self._stats.current_bytes = row[0], row[1]
+
+    def _evict(self):
+        """Drop least-recently-used entries down to 90% of the budget. Caller holds the lock."""
+        target = int(self.max_bytes * 0.9)
+        excess = self._stats.current_bytes - target
+        removed = 0
+        freed = 0
+
+        cursor = self._conn.execute(
+            "SELECT key, nbytes FROM embeddings ORDER BY last_used ASC"
+        )
+        victims = []
+        for key, nbytes in cursor:
+            if freed >= excess:
+                break
+            victims.append((key,))
+            freed += nbytes
+            removed += 1
+
+        self._conn.executemany("DELETE FROM embeddings WHERE key = ?", victims)
+        self._conn.commit()
+        self._stats.evictions += removed
+        self._refresh_size()
+        logger.info(f"Embedding cache evicted {removed} entries ({freed / 1024 ** 2:.1f} MB)")
+
+    def clear(self):
+        """Remove every cached embedding."""
+        with self._lock:
+            count = self._stats.current_entries
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self._stats.evictions += count
+            self._refresh_size()
+            logger.info(f"Cleared embedding cache ({count} entries)")
+
+    def get_stats(self) -> EmbeddingCacheStats:
+        """Get cache statistics."""
+        with self._lock:
+            return EmbeddingCacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                current_entries=self._stats.current_entries,
+                current_bytes=self._stats.current_bytes,
+            )
+
+    @property
+    def hit_rate(self) -> float:
+        """Calculate cache hit rate."""
+        total = self._stats.hits + self._stats.misses
+        return self._stats.hits / total if total > 0 else 0.0
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_lock = Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Process-wide embedding cache stored under the Chroma persist directory."""
+    global _embedding_cache
+    with _embedding_cache_lock:
+        if _embedding_cache is None:
+            from backend.config import settings
+            _embedding_cache = EmbeddingCache(
+                db_path=os.path.join(
+                    settings.CHROMA_PERSIST_DIRECTORY, "embedding_cache", "embeddings.db"
+                ),
+                max_bytes=settings.EMBEDDING_CACHE_MAX_MB * 1024 ** 2,
+                dtype=settings.EMBEDDING_CACHE_DTYPE,
+            )
+        return _embedding_cache
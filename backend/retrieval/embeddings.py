@@ -141,7 +141,8 @@ class EmbeddingEngine:
         self,
         texts: List[str],
         batch_size: int = 32,
-        show_progress: bool = False
+        show_progress: bool = False,
+        use_cache: bool = False
     ) -> np.ndarray:
         """
         Embed a batch of documents.
@@ -150,6 +151,8 @@ class EmbeddingEngine:
             texts: List of document texts
             batch_size: Batch size for encoding
             show_progress: Show progress bar
+            use_cache: Look up / store embeddings in the on-disk
+                       content-hash cache (used by ingestion)
 
         Returns:
             Array of embeddings, shape (N, dimension)
@@ -157,6 +160,9 @@ class EmbeddingEngine:
         if not texts:
             return np.array([])
 
+        if use_cache:
+            return self._embed_documents_cached(texts, batch_size, show_progress)
+
         self._ensure_model()
         embeddings = self.model.encode(
             texts,
@@ -168,6 +174,49 @@ class EmbeddingEngine:
 
         return embeddings
 
+    def _embed_documents_cached(
+        self,
+        texts: List[str],
+        batch_size: int,
+        show_progress: bool
+    ) -> np.ndarray:
+        """Encode only the texts missing from the embedding cache.
+
+        The model is not even loaded when every chunk is a hit, so
+        re-indexing an unchanged corpus costs a few SQLite reads.
+        """
+        from backend.retrieval.embedding_cache import get_embedding_cache
+
+        cache = get_embedding_cache()
+        vectors = cache.get_many(self.model_name, texts, self.normalize)
+
+        # Deduplicate misses so repeated chunks are encoded once
+        missing: Dict[str, List[int]] = {}
+        for i, vec in enumerate(vectors):
+            if vec is None:
+                missing.setdefault(texts[i], []).append(i)
+
+        if missing:
+            to_encode = list(missing)
+            self._ensure_model()
+            encoded = self.model.encode(
+                to_encode,
+                batch_size=batch_size,
+                show_progress_bar=show_progress,
+                normalize_embeddings=self.normalize,
+                convert_to_numpy=True
+            )
+            cache.put_many(self.model_name, to_encode, encoded, self.normalize)
+            for text, vec in zip(to_encode, encoded):
+                for i in missing[text]:
+                    vectors[i] = vec
+
+        logger.debug(
+            f"Embedding cache: {len(texts) - sum(len(v) for v in missing.values())}"
+            f"/{len(texts)} hits for {self.model_name}"
+        )
+        return np.vstack(vectors).astype(np.float32, copy=False)
+
     def embed_query(self, query: str) -> np.ndarray:
         """
         Embed a single query.
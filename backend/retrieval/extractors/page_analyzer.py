@@ -21,9 +21,12 @@ from typing import List, Optional, Dict, Any
 from pathlib import Path
 
 import aiohttp
+import fitz  # pymupdf
 import httpx
-from pdf2image import convert_from_path
 
+from backend.agents.request_scheduler import model_scheduler
+from backend.retrieval.parsers.pdf import ParsedDocument
+from backend.retrieval.parsers.rasterize import render_page
 from backend.retrieval.schema.document import (
     PageAnalysisResult,
     FigureDescription,
@@ -300,13 +303,15 @@ class PageAnalyzer:
 
         # Run synchronous HTTP call in thread pool to avoid event loop contention
         # This fixes "Connection closed" errors when running in FastAPI BackgroundTasks
-        logger.info(f"Analyzing page {page_number} with VLM (running in thread pool)...")
-        result = await asyncio.to_thread(
-            self._sync_vlm_call,
-            payload,
-            page_number,
-            max_retries
-        )
+        # Scheduler slot: page analysis queues behind interactive and orchestration requests
+        async with model_scheduler.slot("ollama", self.model_name):
+            logger.info(f"Analyzing page {page_number} with VLM (running in thread pool)...")
+            result = await asyncio.to_thread(
+                self._sync_vlm_call,
+                payload,
+                page_number,
+                max_retries
+            )
 
         if result is None:
             return PageAnalysisResult(page_number=page_number, ocr_text=ocr_text)
@@ -448,7 +453,8 @@ class PageAnalyzer:
         self,
         pdf_path: str,
         ocr_texts: Optional[List[str]] = None,
-        max_concurrent: int = 2
+        max_concurrent: int = 2,
+        document: Optional[ParsedDocument] = None
     ) -> List[PageAnalysisResult]:
         """
         Analyze all pages of a PDF document with parallel processing.
@@ -458,6 +464,8 @@ class PageAnalyzer:
             ocr_texts: Optional list of OCR text per page (for validation)
             max_concurrent: Maximum concurrent page analyses (default 2)
                            Set to 1 for sequential processing.
+            document: Already parsed document; pages are rendered from its
+                      open handle instead of re-reading the file
 
         Returns:
             List of PageAnalysisResult, one per page (ordered by page number)
@@ -466,46 +474,57 @@ class PageAnalyzer:
 
         results = []
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Convert PDF to images
-            try:
-                images = convert_from_path(pdf_path, dpi=self.dpi)
-                logger.info(f"Converted {len(images)} pages from {Path(pdf_path).name}")
-            except Exception as e:
-                logger.error(f"Failed to convert PDF to images: {e}")
-                return results
-
-            # Save all images first
-            page_data = []
-            for i, image in enumerate(images):
-                page_num = i + 1
-                page_path = os.path.join(temp_dir, f"page_{page_num}.png")
-                image.save(page_path, "PNG")
-                ocr_text = ocr_texts[i] if ocr_texts and i < len(ocr_texts) else None
-                page_data.append((page_path, page_num, ocr_text))
-
-            # Process pages with limited concurrency
-            # Ollama queues requests internally, so we can overlap upload/processing
-            semaphore = asyncio.Semaphore(max_concurrent)
-
-            async def analyze_with_semaphore(page_path: str, page_num: int, ocr_text: Optional[str]):
-                async with semaphore:
-                    logger.info(f"Starting analysis of page {page_num}/{len(images)}")
-                    result = await self.analyze_page(page_path, page_num, ocr_text)
-                    logger.info(f"Completed page {page_num}/{len(images)}")
-                    return result
-
-            # Run all pages concurrently (semaphore limits actual parallelism)
-            tasks = [
-                analyze_with_semaphore(page_path, page_num, ocr_text)
-                for page_path, page_num, ocr_text in page_data
-            ]
-            results = await asyncio.gather(*tasks)
-
-            logger.info(f"Analyzed all {len(images)} pages")
+        # Open once; each page is rendered only when a semaphore slot frees
+        # up, so at most max_concurrent page images exist at any time
+        try:
+            doc = document.document if document is not None else fitz.open(pdf_path)
+        except Exception as e:
+            logger.error(f"Failed to open PDF for rendering: {e}")
+            return results
+        num_pages = len(doc)
+        render_lock = asyncio.Lock()  # fitz documents are not thread-safe
+
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                # Process pages with limited concurrency
+                # Ollama queues requests internally, so we can overlap upload/processing
+                semaphore = asyncio.Semaphore(max_concurrent)
+
+                async def analyze_with_semaphore(page_num: int):
+                    i = page_num - 1
+                    ocr_text = ocr_texts[i] if ocr_texts and i < len(ocr_texts) else None
+                    async with semaphore:
+                        page_path = os.path.join(temp_dir, f"page_{page_num}.png")
+                        try:
+                            async with render_lock:
+                                await asyncio.to_thread(self._render_to_png, doc, page_num, page_path)
+                        except Exception as e:
+                            logger.error(f"Failed to render page {page_num}: {e}")
+                            return PageAnalysisResult(page_number=page_num, ocr_text=ocr_text)
+
+                        try:
+                            logger.info(f"Starting analysis of page {page_num}/{num_pages}")
+                            result = await self.analyze_page(page_path, page_num, ocr_text)
+                            logger.info(f"Completed page {page_num}/{num_pages}")
+                            return result
+                        finally:
+                            os.remove(page_path)
+
+                # Run all pages concurrently (semaphore limits actual parallelism)
+                tasks = [analyze_with_semaphore(n) for n in range(1, num_pages + 1)]
+                results = await asyncio.gather(*tasks)
+
+                logger.info(f"Analyzed all {num_pages} pages of {Path(pdf_path).name}")
+        finally:
+            if document is None:
+                doc.close()
 
         return list(results)
 
+    def _render_to_png(self, doc: "fitz.Document", page_num: int, page_path: str):
+        """Render one page and write it as PNG (runs in a worker thread)."""
+        render_page(doc, page_num, dpi=self.dpi).save(page_path, "PNG")
+
 
 async def create_page_analyzer(agent_roles: Dict[str, str]) -> Optional[PageAnalyzer]:
     """
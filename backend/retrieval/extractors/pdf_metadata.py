@@ -15,7 +15,8 @@ from backend.retrieval.schema.document import (
     DocumentMetadata, DocumentType, PaperMetadata
 )
 from backend.retrieval.agents.transcriber import AgentFactory
-from backend.retrieval.parsers.pdf import PDFParser
+from backend.retrieval.parsers.pdf import PDFParser, ParsedDocument
+from backend.retrieval.parsers.rasterize import iter_page_images
 
 logger = logging.getLogger(__name__)
 
@@ -60,7 +61,8 @@ Only include fields you can confidently extract. Leave blank if not visible.'''
         pdf_path: str,
         use_vlm: bool = True,
         collection_name: Optional[str] = None,
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        parsed: Optional[ParsedDocument] = None
     ) -> DocumentMetadata:
         """
         Extract metadata from a PDF.
@@ -70,6 +72,7 @@ Only include fields you can confidently extract. Leave blank if not visible.'''
             use_vlm: Whether to use VLM (slower but more accurate)
             collection_name: Collection this document belongs to
             user_id: User who owns this document
+            parsed: Already parsed document (avoids parsing the file again)
 
         Returns:
             DocumentMetadata object
@@ -77,10 +80,14 @@ Only include fields you can confidently extract. Leave blank if not visible.'''
         path = Path(pdf_path)
 
         # Parse PDF for basic info and text
-        parsed = self.pdf_parser.parse(pdf_path)
+        if parsed is None:
+            parsed = self.pdf_parser.parse(pdf_path)
 
         # Compute file hash for deduplication
-        file_hash = self._compute_file_hash(pdf_path)
+        if isinstance(parsed, ParsedDocument):
+            file_hash = parsed.file_hash
+        else:
+            file_hash = self._compute_file_hash(pdf_path)
 
         # Start with base metadata
         metadata = DocumentMetadata(
@@ -96,7 +103,7 @@ Only include fields you can confidently extract. Leave blank if not visible.'''
         # Try VLM extraction first
         vlm_succeeded = False
         if use_vlm and self.agent_roles:
-            vlm_metadata = await self._extract_with_vlm(pdf_path)
+            vlm_metadata = await self._extract_with_vlm(pdf_path, parsed)
             if vlm_metadata:
                 metadata = self._merge_metadata(metadata, vlm_metadata)
                 vlm_succeeded = True
@@ -137,10 +144,13 @@ Only include fields you can confidently extract. Leave blank if not visible.'''
                 hash_md5.update(chunk)
         return hash_md5.hexdigest()
 
-    async def _extract_with_vlm(self, pdf_path: str) -> Optional[Dict[str, Any]]:
+    async def _extract_with_vlm(
+        self,
+        pdf_path: str,
+        parsed: Optional[ParsedDocument] = None
+    ) -> Optional[Dict[str, Any]]:
         """Use VLM to extract metadata from first page."""
         try:
-            from pdf2image import convert_from_path
             import tempfile
             import os
 
@@ -153,7 +163,10 @@ Only include fields you can confidently extract. Leave blank if not visible.'''
 
             # Convert first page to image
             with tempfile.TemporaryDirectory() as temp_dir:
-                images = convert_from_path(pdf_path, dpi=200, first_page=1, last_page=1)
+                if isinstance(parsed, ParsedDocument):
+                    images = [img for _, img in parsed.iter_page_images([1], dpi=200)]
+                else:
+                    images = [img for _, img in iter_page_images(pdf_path, [1], dpi=200)]
                 if not images:
                     return None
 
@@ -167,9 +180,6 @@ Only include fields you can confidently extract. Leave blank if not visible.'''
                 # Parse the response
                 return self._parse_vlm_response(response)
 
-        except ImportError:
-            logger.warning("pdf2image not installed, skipping VLM extraction")
-            return None
         except Exception as e:
             logger.warning(f"VLM extraction failed: {e}")
             return None
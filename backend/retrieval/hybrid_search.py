@@ -4,7 +4,7 @@ Hybrid Search: Dense (embeddings) + Sparse (BM25)
 Combines semantic similarity with keyword matching for scientific accuracy.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Tuple
 import re as _re
 import numpy as np
 from rank_bm25 import BM25Okapi
@@ -245,6 +245,31 @@ class RRFHybridSearch:
         self.documents = []
         self.doc_ids = []
         self.doc_metadatas = []
+        # Persistent index alternative to self.bm25 (see attach_index)
+        self.sparse_index = None
+        self._fetch_documents = None
+
+    def attach_index(
+        self,
+        sparse_index,
+        fetch_documents: Callable[[List[str]], Dict[str, Tuple[str, Dict]]],
+    ):
+        """
+        Use a persistent SparseIndex instead of an in-memory BM25Okapi.
+
+        Only the postings of the query terms are scored, and texts are no
+        longer held in memory: BM25-only hits are fetched by ID on demand.
+
+        Args:
+            sparse_index: backend.retrieval.sparse_index.SparseIndex
+            fetch_documents: Callable mapping chunk IDs to {id: (text, metadata)}
+        """
+        self.sparse_index = sparse_index
+        self._fetch_documents = fetch_documents
+        self.bm25 = None
+        self.documents = []
+        self.doc_ids = []
+        self.doc_metadatas = []
 
     def index_documents(
         self,
@@ -267,6 +292,7 @@ class RRFHybridSearch:
         # Tokenize and build BM25
         tokenized = [self._tokenize(doc) for doc in documents]
         self.bm25 = BM25Okapi(tokenized)
+        self.sparse_index = None
 
     def _tokenize(self, text: str) -> List[str]:
         """Tokenize text for BM25 (delegates to shared scientific tokenizer)."""
@@ -291,7 +317,7 @@ class RRFHybridSearch:
         Returns:
             Merged results with RRF scores
         """
-        if not self.bm25:
+        if not self.bm25 and not self.sparse_index:
             # No BM25 index, return dense only
             return dense_results[:top_k]
 
@@ -304,15 +330,12 @@ class RRFHybridSearch:
 
         # Step 1: Get BM25 results INDEPENDENTLY
         query_tokens = self._tokenize(query)
-        bm25_scores = self.bm25.get_scores(query_tokens)
-
-        # Get top BM25 results (more than top_k for better fusion)
-        n_sparse = min(top_k * 3, len(self.documents))
-        sparse_ranking = sorted(
-            enumerate(bm25_scores),
-            key=lambda x: x[1],
-            reverse=True
-        )[:n_sparse]
+        sparse_ranking = self._sparse_ranking(query_tokens, top_k * 3)
+        dense_ids = {result.get("id", str(rank)) for rank, result in enumerate(dense_results)}
+        sparse_docs = self._sparse_documents(
+            [idx for idx, score in sparse_ranking if score > 0],
+            exclude=dense_ids,
+        )
 
         # Step 2: Build RRF scores
         rrf_scores = {}
@@ -335,17 +358,21 @@ class RRFHybridSearch:
             if bm25_score <= 0:
                 continue  # Skip zero-score results
 
-            doc_id = self.doc_ids[idx]
+            doc_id = self._sparse_doc_id(idx)
+            if doc_id not in result_data and doc_id not in sparse_docs:
+                continue  # Chunk vanished from the store since indexing
+
             rrf_score = sparse_w * (1.0 / (self.k + rank + 1))
 
             rrf_scores[doc_id] = rrf_scores.get(doc_id, 0) + rrf_score
 
             # If this doc wasn't in dense results, add it
             if doc_id not in result_data:
+                text, metadata = sparse_docs[doc_id]
                 result_data[doc_id] = {
                     "id": doc_id,
-                    "text": self.documents[idx],
-                    "metadata": self.doc_metadatas[idx],
+                    "text": text,
+                    "metadata": metadata,
                     "score": 0,  # No dense score
                     "dense_rank": None,
                     "dense_score": 0,
@@ -372,6 +399,42 @@ class RRFHybridSearch:
 
         return final_results
 
+    def _sparse_ranking(self, query_tokens: List[str], n: int) -> List[Tuple[int, float]]:
+        """Top-n (doc index, BM25 score) pairs from whichever index is active."""
+        if self.sparse_index is not None:
+            return self.sparse_index.top_n(query_tokens, min(n, len(self.sparse_index)))
+
+        bm25_scores = self.bm25.get_scores(query_tokens)
+        n_sparse = min(n, len(self.documents))
+        return sorted(
+            enumerate(bm25_scores),
+            key=lambda x: x[1],
+            reverse=True
+        )[:n_sparse]
+
+    def _sparse_doc_id(self, idx: int) -> str:
+        if self.sparse_index is not None:
+            return self.sparse_index.doc_id(idx)
+        return self.doc_ids[idx]
+
+    def _sparse_documents(
+        self,
+        indices: List[int],
+        exclude: set,
+    ) -> Dict[str, Tuple[str, Dict]]:
+        """Text and metadata for BM25 hits that dense search did not return."""
+        if self.sparse_index is None:
+            return {
+                self.doc_ids[idx]: (self.documents[idx], self.doc_metadatas[idx])
+                for idx in indices
+            }
+
+        missing = [self.sparse_index.doc_id(idx) for idx in indices]
+        missing = [doc_id for doc_id in missing if doc_id not in exclude]
+        if not missing:
+            return {}
+        return self._fetch_documents(missing)
+
     def _adjust_weights(self, query: str) -> tuple:
         """
         Adjust dense/sparse weights based on query characteristics.
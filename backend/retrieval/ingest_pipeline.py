@@ -0,0 +1,368 @@
+"""
+Pipelined batch ingestion.
+
+Runs SmartIngestor over many files as three overlapping stages:
+
+    parse + chunk (process pool) -> embed (one batched stage) -> write (batched)
+
+- PDFs are parsed and chunked with PyMuPDF in worker processes, while the
+  event loop extracts metadata and registers documents.
+- A single embedding stage gathers chunks from several files into large
+  batches so the model stays busy across file boundaries.
+- A single writer stores embedded chunks with batched VectorStore.add_documents
+  calls and reports each file as soon as its chunks are stored.
+
+Stages are connected by bounded queues, so memory stays flat however many
+files are queued.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from backend.retrieval.smart_ingestor import SmartIngestor
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[str, str], None]
+FileDoneCallback = Callable[[str, Dict[str, Any]], None]
+
+_DONE = object()
+
+# Per-process chunker, built once per worker
+_worker_chunker = None
+_worker_chunker_config: Optional[Tuple] = None
+
+
+def _get_worker_chunker(chunker_config: Tuple):
+    global _worker_chunker, _worker_chunker_config
+    if _worker_chunker is None or _worker_chunker_config != chunker_config:
+        strategy, chunk_size, chunk_overlap = chunker_config
+        if strategy == "semantic":
+            from backend.retrieval.semantic_chunker import SemanticChunker
+            _worker_chunker = SemanticChunker(
+                target_chunk_size=chunk_size,
+                overlap_sentences=chunk_overlap,
+            )
+        else:
+            from backend.retrieval.chunking import SimpleChunker
+            _worker_chunker = SimpleChunker(chunk_size=chunk_size, chunk_overlap=50)
+        _worker_chunker_config = chunker_config
+    return _worker_chunker
+
+
+def parse_and_chunk(
+    file_path: str,
+    chunker_config: Optional[Tuple],
+) -> Tuple[Dict[str, Any], Optional[Dict[int, List[Dict[str, Any]]]]]:
+    """
+    Parse a PDF and chunk its pages (runs in a worker process).
+
+    Args:
+        file_path: Path to the PDF
+        chunker_config: (strategy, chunk_size, chunk_overlap), or None to
+                        leave chunking to the ingestor's own chunker
+
+    Returns:
+        (PDFParser.parse() result, {page_number: raw chunks} or None)
+    """
+    from backend.retrieval.parsers.pdf import PDFParser
+
+    parsed = PDFParser(extract_citations=True).parse(file_path)
+    if chunker_config is None:
+        return parsed, None
+
+    chunker = _get_worker_chunker(chunker_config)
+    page_chunks = {}
+    for page in parsed["pages"]:
+        page_text = page.get("text", "")
+        if page_text.strip():
+            page_chunks[page["page_number"]] = chunker.chunk_text(
+                text=page_text, page_num=page["page_number"]
+            )
+    return parsed, page_chunks
+
+
+def default_parse_workers() -> int:
+    """Leave one core for the event loop and the embedding stage."""
+    return max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+class IngestionPipeline:
+    """
+    Overlapping parse / embed / write stages over a SmartIngestor.
+
+    Results match SmartIngestor.ingest_file, one per input file. They are
+    reported through on_file_done in completion order and returned in input
+    order.
+    """
+
+    def __init__(
+        self,
+        ingestor: "SmartIngestor",
+        parse_workers: Optional[int] = None,
+        embed_batch_size: int = 256,
+        write_batch_size: int = 512,
+        queue_size: int = 4,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Initialize pipeline.
+
+        Args:
+            ingestor: Configured SmartIngestor (embedder, vector store, registry)
+            parse_workers: Parse/chunk processes (default: cores - 1, max 4)
+            embed_batch_size: Chunks gathered before each embedding call
+            write_batch_size: Chunks gathered before each vector store write
+            queue_size: Documents buffered between stages
+            executor: Optional executor for parsing (default: process pool)
+        """
+        self.ingestor = ingestor
+        self.parse_workers = parse_workers or default_parse_workers()
+        self.embed_batch_size = embed_batch_size
+        self.write_batch_size = write_batch_size
+        self.queue_size = queue_size
+        self._executor = executor
+
+    def _chunker_config(self) -> Optional[Tuple]:
+        """Chunker settings shippable to workers (None for custom chunkers)."""
+        from backend.retrieval.chunking import SimpleChunker
+        from backend.retrieval.semantic_chunker import SemanticChunker
+
+        ing = self.ingestor
+        if type(ing.chunker) not in (SimpleChunker, SemanticChunker):
+            return None
+        return (ing.chunking_strategy, ing.chunk_size, ing.chunk_overlap)
+
+    async def run(
+        self,
+        file_paths: List[str],
+        use_vlm: bool = False,
+        collection_name: Optional[str] = None,
+        user_id: Optional[str] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        on_file_done: Optional[FileDoneCallback] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Ingest files through the pipeline.
+
+        Args:
+            file_paths: Files to ingest
+            use_vlm: Whether to use VLM for metadata extraction
+            collection_name: Override the ingestor's collection
+            user_id: Override the ingestor's user
+            on_progress: Called with (file_name, status) on stage changes
+            on_file_done: Called with (file_name, result) once a file is finished
+
+        Returns:
+            Ingestion results in input order
+        """
+        results: List[Tuple[str, Dict[str, Any]]] = []
+        if not file_paths:
+            return []
+
+        loop = asyncio.get_running_loop()
+        chunker_config = self._chunker_config()
+        workers = min(self.parse_workers, len(file_paths))
+
+        executor = self._executor
+        owns_executor = executor is None and workers > 1
+        if owns_executor:
+            # Never fork: the backend process runs uvicorn and other threads
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+
+        pending: asyncio.Queue = asyncio.Queue()
+        for fp in file_paths:
+            pending.put_nowait(fp)
+        embed_q: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        write_q: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        def progress(file_name: str, status: str):
+            if on_progress:
+                on_progress(file_name, status)
+
+        def finish(file_path: str, result: Dict[str, Any]):
+            results.append((file_path, result))
+            if on_file_done:
+                on_file_done(Path(file_path).name, result)
+
+        def failure(file_path: str, error: str) -> Dict[str, Any]:
+            return {
+                "doc_id": None,
+                "file_path": file_path,
+                "file_name": Path(file_path).name,
+                "error": error,
+                "chunk_count": 0,
+            }
+
+        async def prepare_worker():
+            while True:
+                try:
+                    fp = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                file_name = Path(fp).name
+                try:
+                    parsed, page_chunks = None, None
+                    if fp.lower().endswith(".pdf"):
+                        progress(file_name, "parsing")
+                        parsed, page_chunks = await loop.run_in_executor(
+                            executor, parse_and_chunk, fp, chunker_config
+                        )
+                    progress(file_name, "analyzing with VLM" if use_vlm else "extracting metadata")
+                    prepared = await self.ingestor.prepare_file(
+                        fp,
+                        use_vlm=use_vlm,
+                        collection_name=collection_name,
+                        user_id=user_id,
+                        parsed=parsed,
+                        page_chunks=page_chunks,
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to prepare {fp}: {e}")
+                    finish(fp, failure(fp, str(e)))
+                    continue
+
+                if prepared.get("error"):
+                    finish(fp, prepared)
+                elif not prepared["chunks"]:
+                    finish(fp, self.ingestor.build_result(prepared, 0))
+                elif not any(
+                    c["text_with_prefix"] and c["text_with_prefix"].strip()
+                    for c in prepared["chunks"]
+                ):
+                    logger.error(
+                        f"All {len(prepared['chunks'])} chunks have empty text for {file_name}"
+                    )
+                    finish(fp, self.ingestor.build_result(prepared, 0))
+                else:
+                    progress(file_name, "embedding")
+                    await embed_q.put(prepared)
+
+        async def run_prepare_stage():
+            await asyncio.gather(*(prepare_worker() for _ in range(max(1, workers))))
+            await embed_q.put(_DONE)
+
+        async def embed_stage():
+            done = False
+            while not done:
+                batch, done = await self._drain(embed_q, self.embed_batch_size)
+                if not batch:
+                    continue
+                texts = [c["text_with_prefix"] for p in batch for c in p["chunks"]]
+                try:
+                    embeddings = await asyncio.to_thread(
+                        self.ingestor.embedder.embed_documents, texts, use_cache=True
+                    )
+                except Exception as e:
+                    logger.error(f"Embedding failed for {len(batch)} files: {e}")
+                    for p in batch:
+                        finish(p["file_path"], failure(p["file_path"], f"Embedding failed: {e}"))
+                    continue
+
+                offset = 0
+                for p in batch:
+                    n = len(p["chunks"])
+                    p["embeddings"] = embeddings[offset:offset + n]
+                    offset += n
+                    await write_q.put(p)
+            await write_q.put(_DONE)
+
+        async def write_stage():
+            done = False
+            while not done:
+                batch, done = await self._drain(write_q, self.write_batch_size)
+                if not batch:
+                    continue
+                await self._write_batch(batch, collection_name, finish, failure)
+
+        stages = [
+            asyncio.create_task(run_prepare_stage()),
+            asyncio.create_task(embed_stage()),
+            asyncio.create_task(write_stage()),
+        ]
+        try:
+            done, _ = await asyncio.wait(stages, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                # A failed stage would leave the others blocked on their queues
+                task.result()
+        finally:
+            for task in stages:
+                task.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
+            if owns_executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        position = {}
+        for i, fp in enumerate(file_paths):
+            position.setdefault(fp, i)
+        results.sort(key=lambda item: position.get(item[0], len(file_paths)))
+        return [result for _, result in results]
+
+    @staticmethod
+    async def _drain(queue: asyncio.Queue, max_chunks: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Wait for one document, then take whatever else is ready up to max_chunks.
+
+        Returns:
+            (documents, whether the upstream stage has finished)
+        """
+        item = await queue.get()
+        if item is _DONE:
+            return [], True
+
+        batch = [item]
+        n_chunks = len(item["chunks"])
+        while n_chunks < max_chunks:
+            try:
+                item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if item is _DONE:
+                return batch, True
+            batch.append(item)
+            n_chunks += len(item["chunks"])
+        return batch, False
+
+    async def _write_batch(
+        self,
+        batch: List[Dict[str, Any]],
+        collection_name: Optional[str],
+        finish: Callable[[str, Dict[str, Any]], None],
+        failure: Callable[[str, str], Dict[str, Any]],
+    ):
+        """Store a batch of embedded documents with one add_documents call."""
+        import numpy as np
+
+        ing = self.ingestor
+        texts: List[str] = []
+        metadatas: List[Dict[str, Any]] = []
+        for p in batch:
+            texts.extend(c["text_with_prefix"] for c in p["chunks"])
+            metadatas.extend(ing.build_chunk_metadatas(p["chunks"], p["metadata"]))
+        embeddings = np.vstack([p["embeddings"] for p in batch])
+
+        target = collection_name or ing.collection_name
+        try:
+            await asyncio.to_thread(
+                ing.vector_store.add_documents,
+                texts=texts,
+                embeddings=embeddings,
+                metadatas=metadatas,
+                collection_name=target,
+            )
+        except Exception as e:
+            logger.error(f"Vector store write failed for {len(batch)} files: {e}")
+            for p in batch:
+                finish(p["file_path"], failure(p["file_path"], f"Vector store write failed: {e}"))
+            return
+
+        logger.info(f"Stored {len(texts)} chunks from {len(batch)} files in '{target}'")
+        for p in batch:
+            finish(p["file_path"], ing.build_result(p, len(p["chunks"])))
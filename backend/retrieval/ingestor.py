@@ -194,14 +194,13 @@ class SimpleIngestor:
                     logger.info("⚡️ Complex Document detected. Engaging Transcriber Agent.")
                     full_text_transcribed = []
                     
-                    from pdf2image import convert_from_path
+                    from backend.retrieval.parsers.rasterize import iter_page_images
                     try:
                         with tempfile.TemporaryDirectory() as temp_dir:
-                            images = convert_from_path(file_path, dpi=300)
-                            for i, image in enumerate(images):
+                            # Rendered one page at a time to keep memory flat
+                            for page_num, image in iter_page_images(file_path, dpi=300):
                                 # Page logic: If mixed, we might only want to transcribe specific pages
                                 # For now, transcribe all pages if document is marked scanned/complex
-                                page_num = i + 1
                                 img_path = os.path.join(temp_dir, f"page_{page_num}.png")
                                 image.save(img_path, "PNG")
                                 
@@ -292,7 +291,8 @@ class SimpleIngestor:
             chunk_texts = [chunk["text"] for chunk in chunks]
             embeddings = self.embedder.embed_documents(
                 chunk_texts,
-                show_progress=False
+                show_progress=False,
+                use_cache=True
             )
 
             # Step 4: Store in vector DB
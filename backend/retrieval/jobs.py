@@ -97,9 +97,22 @@ from backend.models.user import User
 from backend.retrieval.agents.transcriber import AgentFactory
 from backend.retrieval.schema.registry import DocumentRegistry
 from backend.retrieval.smart_ingestor import SmartIngestor
+from backend.retrieval.ingest_pipeline import IngestionPipeline
 from backend.retrieval.vector_store import VectorStore
+from backend.retrieval.retriever_pool import retriever_pool
+from backend.retrieval.response_cache import response_cache
+from backend.retrieval.corpus_cache import corpus_cache
+from backend.agents.request_scheduler import Priority, reset_request_priority, set_request_priority
 import asyncio
 
+
+def invalidate_collection_caches(chroma_collection_name: str):
+    """Drop warm retrievers, cached answers and corpus snapshots after the collection's chunks changed."""
+    retriever_pool.invalidate(chroma_collection_name)
+    response_cache.invalidate(chroma_collection_name)
+    corpus_cache.invalidate(chroma_collection_name)
+
+
 async def run_ingestion_job(
     collection_id: str,
     file_paths: List[str],
@@ -171,6 +184,9 @@ async def run_ingestion_job(
     )
     logger.info(f"Starting ingestion job for collection {collection_name} ({collection_id}). Est: {est_time}s")
 
+    # VLM page analysis / transcription yields to interactive and orchestration requests
+    priority_token = set_request_priority(Priority.BACKGROUND, user_id=collection_user_id)
+
     try:
         # --- 3. Configure Team ---
         transcriber_agent = None
@@ -234,52 +250,83 @@ async def run_ingestion_job(
         total_references = 0
         vlm_model_used = transcriber_model_name
 
-        for fp in file_paths:
-            file_name = os.path.basename(fp)
-
+        def checkpoint(file_name: str):
+            """Write progress after each finished file."""
             _write_collection(collection_id, metrics_update={
+                "processed_files": processed_count,
+                "status": "processing",
+                "total_chunks": total_chunks,
+                "documents_registered": documents_registered,
+                "file_errors": file_errors,
                 "current_file": file_name,
-                "current_file_status": "starting",
+                "current_file_status": "completed",
+                "total_figures": total_figures,
+                "total_tables": total_tables,
+                "total_references": total_references,
+                "vlm_model": vlm_model_used,
             })
 
-            if not os.path.exists(fp):
-                file_errors.append({"file": file_name, "error": "File not found"})
+        existing_paths = []
+        for fp in file_paths:
+            if os.path.exists(fp):
+                existing_paths.append(fp)
+            else:
+                file_errors.append({"file": os.path.basename(fp), "error": "File not found"})
                 processed_count += 1
-                continue
 
-            try:
-                if use_smart_ingestor:
-                    _write_collection(collection_id, metrics_update={
-                        "current_file": file_name,
-                        "current_file_status": "analyzing with VLM" if use_vlm else "extracting metadata",
-                    })
-
-                    result = await ingestor.ingest_file(
-                        fp,
-                        use_vlm=use_vlm,
-                        collection_name=chroma_collection_name,
-                        user_id=collection_user_id,
+        if use_smart_ingestor:
+            # Parse/chunk, embed and store run as overlapping stages across files
+            def on_progress(file_name: str, file_status: str):
+                _write_collection(collection_id, metrics_update={
+                    "current_file": file_name,
+                    "current_file_status": file_status,
+                })
+
+            def on_file_done(file_name: str, result: dict):
+                nonlocal total_chunks, documents_registered, processed_count
+                nonlocal total_figures, total_tables, total_references, vlm_model_used
+
+                if result.get("doc_id"):
+                    chunks_added = result.get("chunk_count", 0)
+                    total_chunks += chunks_added
+                    documents_registered += 1
+                    total_figures += result.get("figure_count", 0)
+                    total_tables += result.get("table_count", 0)
+                    total_references += result.get("reference_count", 0)
+                    if result.get("vlm_model"):
+                        vlm_model_used = result.get("vlm_model")
+                    logger.info(
+                        f"Ingested: {result.get('file_name')} | "
+                        f"Title: {(result.get('title') or 'N/A')[:30]}... | "
+                        f"Chunks: {chunks_added}"
                     )
-
-                    if result.get("doc_id"):
-                        chunks_added = result.get("chunk_count", 0)
-                        total_chunks += chunks_added
-                        documents_registered += 1
-                        total_figures += result.get("figure_count", 0)
-                        total_tables += result.get("table_count", 0)
-                        total_references += result.get("reference_count", 0)
-                        if result.get("vlm_model"):
-                            vlm_model_used = result.get("vlm_model")
-                        logger.info(
-                            f"Ingested: {result.get('file_name')} | "
-                            f"Title: {result.get('title', 'N/A')[:30]}... | "
-                            f"Chunks: {chunks_added}"
-                        )
-                    else:
-                        error_msg = result.get("error", "Unknown ingestion error")
-                        file_errors.append({"file": file_name, "error": error_msg})
-                        logger.error(f"Ingestion failed for {fp}: {error_msg}")
                 else:
+                    error_msg = result.get("error", "Unknown ingestion error")
+                    file_errors.append({"file": file_name, "error": error_msg})
+                    logger.error(f"Ingestion failed for {result.get('file_path')}: {error_msg}")
+
+                processed_count += 1
+                checkpoint(file_name)
+
+            pipeline = IngestionPipeline(ingestor)
+            await pipeline.run(
+                existing_paths,
+                use_vlm=use_vlm,
+                collection_name=chroma_collection_name,
+                user_id=collection_user_id,
+                on_progress=on_progress,
+                on_file_done=on_file_done,
+            )
+        else:
+            for fp in existing_paths:
+                file_name = os.path.basename(fp)
+
+                _write_collection(collection_id, metrics_update={
+                    "current_file": file_name,
+                    "current_file_status": "starting",
+                })
+
+                try:
                     result = await ingestor.ingest_file(fp)
                     if result.get("status") == "success":
                         total_chunks += result.get("num_chunks", 0)
@@ -287,28 +334,18 @@ async def run_ingestion_job(
                         error_msg = result.get("error", "Unknown ingestion error")
                         file_errors.append({"file": file_name, "error": error_msg})
                         logger.error(f"Ingestion failed for {fp}: {error_msg}")
+                except Exception as e:
+                    file_errors.append({"file": file_name, "error": str(e)})
+                    logger.error(f"Exception during ingestion of {fp}: {e}")
 
-            except Exception as e:
-                file_errors.append({"file": file_name, "error": str(e)})
-                logger.error(f"Exception during ingestion of {fp}: {e}")
-
-            # CHECKPOINT: write progress after each file
-            processed_count += 1
-            _write_collection(collection_id, metrics_update={
-                "processed_files": processed_count,
-                "status": "processing",
-                "total_chunks": total_chunks,
-                "documents_registered": documents_registered,
-                "file_errors": file_errors,
-                "current_file": file_name,
-                "current_file_status": "completed",
-                "total_figures": total_figures,
-                "total_tables": total_tables,
-                "total_references": total_references,
-                "vlm_model": vlm_model_used,
-            })
+                # CHECKPOINT: write progress after each file
+                processed_count += 1
+                checkpoint(file_name)
 
         # --- 7. Finalize ---
+        if total_chunks > 0:
+            invalidate_collection_caches(chroma_collection_name)
+
         final_status = IndexStatus.FAILED if total_chunks == 0 else IndexStatus.READY
         if total_chunks == 0:
             logger.warning(f"Job finished but index is empty. Marking as FAILED. Errors: {file_errors}")
@@ -345,3 +382,5 @@ async def run_ingestion_job(
             status=IndexStatus.FAILED,
             error_message=f"System Error: {str(e)}",
         )
+    finally:
+        reset_request_priority(priority_token)
@@ -4,6 +4,6 @@ Document Parsers for RAG
 Handles extraction of text from various document formats.
 """
 
-from backend.retrieval.parsers.pdf import PDFParser
+from backend.retrieval.parsers.pdf import PDFParser, ParsedDocument
 
-__all__ = ["PDFParser"]
+__all__ = ["PDFParser", "ParsedDocument"]
@@ -1,19 +1,25 @@
 import pytesseract
-from pdf2image import convert_from_path
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import List, Dict, Any, Tuple
 import logging
 from pathlib import Path
 import os
 
+from backend.retrieval.parsers.rasterize import iter_page_images
+
 logger = logging.getLogger(__name__)
 
 class OCRParser:
     """
     Extracts text from scanned PDFs/images using Tesseract OCR.
+
+    Pages are rendered one at a time and only the requested ones; at most
+    `max_concurrent` page images are in memory while tesseract runs.
     """
     
-    def __init__(self, dpi: int = 300):
+    def __init__(self, dpi: int = 300, max_concurrent: int = 2):
         self.dpi = dpi
+        self.max_concurrent = max(1, max_concurrent)
         
     def parse(self, file_path: str, page_numbers: List[int] = None) -> List[Dict[str, Any]]:
         """
@@ -25,50 +31,46 @@ class OCRParser:
             
         logger.info(f"Running OCR on {path.name} (pages: {page_numbers or 'all'})")
         
-        # Convert PDF to images
-        # Note: pdf2image requires poppler installed on system too! 
-        # We should add that to the list of requirements for the user.
-        try:
-            images = convert_from_path(file_path, dpi=self.dpi)
-        except Exception as e:
-            logger.error(f"Failed to convert PDF to images: {e}")
-            raise RuntimeError(f"pdf2image failed. Is poppler installed? Error: {e}")
-
         results = []
-        
-        # Determine pages to process
-        if page_numbers:
-            # Filter images. Page numbers are 1-indexed.
-            # safe guard against out of bounds
-            pages_to_process = []
-            for p in page_numbers:
-                idx = p - 1
-                if 0 <= idx < len(images):
-                    pages_to_process.append((p, images[idx]))
-        else:
-            pages_to_process = [(i+1, img) for i, img in enumerate(images)]
-            
-        for page_num, image in pages_to_process:
+        in_flight: List[Tuple[int, Future]] = []
+
+        # Tesseract runs as a subprocess, so threads give real parallelism.
+        # Rendering waits while max_concurrent pages are in flight.
+        with ThreadPoolExecutor(max_workers=self.max_concurrent) as executor:
             try:
-                # Run Tesseract
-                text = pytesseract.image_to_string(image)
-                
-                # Get detailed data for confidence (optional, skipped for speed for now)
-                # data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
-                
-                results.append({
-                    "page_number": page_num,
-                    "text": text,
-                    "method": "ocr",
-                    "char_count": len(text)
-                })
+                for page_num, image in iter_page_images(file_path, page_numbers or None, dpi=self.dpi):
+                    if len(in_flight) >= self.max_concurrent:
+                        results.append(self._collect(*in_flight.pop(0)))
+                    in_flight.append((page_num, executor.submit(pytesseract.image_to_string, image)))
+                    del image
             except Exception as e:
-                logger.error(f"OCR failed on page {page_num}: {e}")
-                results.append({
-                    "page_number": page_num,
-                    "text": "",
-                    "error": str(e),
-                    "method": "ocr_failed"
-                })
-                
+                logger.error(f"Failed to render PDF pages: {e}")
+                raise RuntimeError(f"Failed to render PDF pages for OCR: {e}")
+            finally:
+                results.extend(self._collect(p, f) for p, f in in_flight)
+
         return results
+
+    def _collect(self, page_num: int, future: Future) -> Dict[str, Any]:
+        """Wait for one page's OCR and build its result."""
+        try:
+            # Run Tesseract
+            text = future.result()
+            
+            # Get detailed data for confidence (optional, skipped for speed for now)
+            # data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
+            
+            return {
+                "page_number": page_num,
+                "text": text,
+                "method": "ocr",
+                "char_count": len(text)
+            }
+        except Exception as e:
+            logger.error(f"OCR failed on page {page_num}: {e}")
+            return {
+                "page_number": page_num,
+                "text": "",
+                "error": str(e),
+                "method": "ocr_failed"
+            }
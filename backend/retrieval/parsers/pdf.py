@@ -6,6 +6,7 @@ Extracts text from PDF files using pymupdf (fitz).
 
 from typing import Dict, Any, List, Optional
 import fitz  # pymupdf
+import hashlib
 import logging
 from pathlib import Path
 
@@ -15,6 +16,80 @@ from backend.retrieval.parsers.citations import CitationExtractor
 logger = logging.getLogger(__name__)
 
 
+class ParsedDocument(dict):
+    """
+    A PDF parsed once and shared by every ingestion stage.
+
+    Behaves exactly like the dict returned by PDFParser.parse (text, pages,
+    metadata, num_pages, ...) and adds lazily computed extras so later
+    stages never re-open or re-parse the file:
+    - file_hash: MD5 of the file (for registry deduplication)
+    - render_page(): page image for VLM / transcription
+
+    The underlying fitz.Document is opened on first use and dropped when the
+    object is pickled (e.g. returned from a parser worker process).
+    """
+
+    def __init__(self, data: Dict[str, Any], file_path: str):
+        super().__init__(data)
+        self.file_path = str(file_path)
+        self._doc: Optional[fitz.Document] = None
+        self._file_hash: Optional[str] = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_doc"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    @property
+    def document(self) -> fitz.Document:
+        """Open fitz.Document (opened on first access)."""
+        if self._doc is None:
+            self._doc = fitz.open(self.file_path)
+        return self._doc
+
+    @property
+    def file_hash(self) -> str:
+        """MD5 hash of the file, computed once."""
+        if self._file_hash is None:
+            hash_md5 = hashlib.md5()
+            with open(self.file_path, "rb") as f:
+                for chunk in iter(lambda: f.read(65536), b""):
+                    hash_md5.update(chunk)
+            self._file_hash = hash_md5.hexdigest()
+        return self._file_hash
+
+    def render_page(self, page_number: int, dpi: int = 200):
+        """
+        Render a page to a PIL image.
+
+        Args:
+            page_number: 1-indexed page number
+            dpi: Render resolution
+
+        Returns:
+            PIL.Image.Image in RGB
+        """
+        from backend.retrieval.parsers.rasterize import render_page
+
+        return render_page(self.document, page_number, dpi)
+
+    def iter_page_images(self, page_numbers: Optional[List[int]] = None, dpi: int = 200):
+        """Render pages one at a time from the open document (see parsers.rasterize)."""
+        from backend.retrieval.parsers.rasterize import iter_page_images
+
+        return iter_page_images(self.file_path, page_numbers, dpi=dpi, doc=self.document)
+
+    def close(self):
+        """Release the open fitz.Document (reopened lazily if needed again)."""
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+
+
 class PDFParser:
     """
     Extracts text and metadata from PDF files.
@@ -58,7 +133,7 @@ class PDFParser:
         
         self.transcriber = None # Placeholder for type checking/future use
 
-    def parse(self, file_path: str) -> Dict[str, Any]:
+    def parse(self, file_path: str) -> ParsedDocument:
         """
         Parse PDF file.
 
@@ -66,7 +141,7 @@ class PDFParser:
             file_path: Path to PDF file
 
         Returns:
-            Dictionary with:
+            ParsedDocument (a dict) with:
             - text: Full extracted text
             - pages: List of page texts
             - metadata: PDF metadata (title, author, etc.)
@@ -145,7 +220,7 @@ class PDFParser:
                 if dois:
                     metadata["found_dois"] = dois[:5] # Store first 5 for preview
             
-            result = {
+            result = ParsedDocument({
                 "text": full_text,
                 "pages": pages,
                 "metadata": metadata,
@@ -155,7 +230,7 @@ class PDFParser:
                 "file_name": path.name,
                 "file_size": path.stat().st_size,
                 "is_scanned": is_scanned
-            }
+            }, file_path)
 
             logger.info(f"✓ Parsed {path.name}: {len(pages)} pages, "
                        f"{len(citations)} citations, {len(references)} references")
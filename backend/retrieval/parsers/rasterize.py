@@ -0,0 +1,76 @@
+"""
+Page rasterization for OCR and VLM analysis.
+
+Renders PDF pages with PyMuPDF one at a time, so only the pages that are
+asked for are ever rendered and at most one page image per consumer is
+alive at once, whatever the page count. (pdf2image.convert_from_path
+renders the whole document into memory.)
+"""
+
+from typing import Iterator, List, Optional, Tuple
+import logging
+
+import fitz  # pymupdf
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+def render_page(doc: fitz.Document, page_number: int, dpi: int = 200) -> Image.Image:
+    """
+    Render one page to a PIL image.
+
+    Args:
+        doc: Open PyMuPDF document
+        page_number: 1-indexed page number
+        dpi: Render resolution
+
+    Returns:
+        RGB PIL image
+    """
+    pix = doc[page_number - 1].get_pixmap(dpi=dpi, alpha=False)
+    return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+
+
+def iter_page_images(
+    file_path: str,
+    page_numbers: Optional[List[int]] = None,
+    dpi: int = 200,
+    doc: Optional[fitz.Document] = None,
+) -> Iterator[Tuple[int, Image.Image]]:
+    """
+    Lazily render pages of a PDF, one at a time.
+
+    Args:
+        file_path: Path to PDF (ignored when `doc` is given)
+        page_numbers: 1-indexed pages to render. None = all pages.
+                      Out-of-range pages are skipped.
+        dpi: Render resolution
+        doc: Already open document to render from (left open)
+
+    Yields:
+        (page_number, image) in the requested order
+    """
+    owns_doc = doc is None
+    if owns_doc:
+        doc = fitz.open(file_path)
+
+    try:
+        total = len(doc)
+        if page_numbers is None:
+            page_numbers = list(range(1, total + 1))
+
+        for page_number in page_numbers:
+            if not 1 <= page_number <= total:
+                logger.warning(f"Page {page_number} out of range (1-{total}), skipping")
+                continue
+            yield page_number, render_page(doc, page_number, dpi)
+    finally:
+        if owns_doc:
+            doc.close()
+
+
+def count_pages(file_path: str) -> int:
+    """Number of pages in a PDF without extracting anything."""
+    with fitz.open(file_path) as doc:
+        return len(doc)
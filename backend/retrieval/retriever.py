@@ -7,6 +7,7 @@ optionally enhanced with CrossEncoder reranking for higher precision.
 
 from typing import List, Dict, Any, Optional
 import logging
+import threading
 
 from backend.retrieval.embeddings import EmbeddingEngine
 from backend.retrieval.vector_store import VectorStore
@@ -90,6 +91,8 @@ class SimpleRetriever:
 
         # Index documents for BM25 (lazy initialization)
         self._bm25_indexed = False
+        self._bm25_lock = threading.Lock()
+        self.bm25_build_count = 0
 
         logger.info(
             f"Initialized SimpleRetriever "
@@ -381,6 +384,21 @@ class SimpleRetriever:
         if self._bm25_indexed:
             return
 
+        # Pooled retrievers are shared across tool calls, so only one
+        # caller should pay for the build.
+        with self._bm25_lock:
+            if self._bm25_indexed:
+                return
+            self._build_bm25_index(collection_name)
+
+    def _build_bm25_index(self, collection_name: str):
+        """
+        Prepare BM25 for the collection.
+
+        With RRF, the collection's persistent SparseIndex is attached and
+        only rebuilt (from a full collection.get()) when it still does not
+        cover every chunk after re-reading its manifest. Otherwise an in-memory index is built from all chunks.
+        """
         logger.info(f"Building BM25 index for collection: {collection_name}")
 
         # Get all documents from collection
@@ -390,9 +408,32 @@ class SimpleRetriever:
             logger.warning(f"Collection {collection_name} is empty")
             return
 
+        collection = self.vector_store.get_collection(collection_name)
+
+        if self.use_rrf and hasattr(self.hybrid_search, 'attach_index'):
+            sparse_index = self.vector_store.get_sparse_index(collection_name)
+            if len(sparse_index) != count:
+                # Another process (backend / tool server) may have appended to it
+                sparse_index.reload()
+            if len(sparse_index) != count:
+                logger.info(
+                    f"Sparse index for {collection_name} covers {len(sparse_index)}/{count} "
+                    f"chunks, rebuilding"
+                )
+                all_docs = collection.get(include=["documents"])
+                sparse_index.rebuild(all_docs.get("ids", []), all_docs.get("documents", []))
+                self.bm25_build_count += 1
+
+            self.hybrid_search.attach_index(
+                sparse_index,
+                fetch_documents=lambda ids: self._fetch_chunks(ids, collection_name)
+            )
+            self._bm25_indexed = True
+            logger.info(f"✓ BM25 index ready ({len(sparse_index)} documents, persistent)")
+            return
+
         # Fetch all documents (in batches for large collections)
         # For now, fetch all at once (optimize later for production)
-        collection = self.vector_store.get_collection(collection_name)
         all_docs = collection.get()
 
         documents = all_docs.get("documents", [])
@@ -416,9 +457,35 @@ class SimpleRetriever:
             self.hybrid_search.index_documents(documents)
 
         self._bm25_indexed = True
+        self.bm25_build_count += 1
 
         logger.info(f"✓ BM25 index built ({len(documents)} documents)")
 
+    def _fetch_chunks(
+        self,
+        ids: List[str],
+        collection_name: str
+    ) -> Dict[str, tuple]:
+        """
+        Load text and metadata for BM25-only hits.
+
+        Args:
+            ids: Chunk IDs
+            collection_name: Target collection
+
+        Returns:
+            {id: (text, metadata)} for the IDs that still exist
+        """
+        results = self.vector_store.get_by_ids(ids=ids, collection_name=collection_name)
+        return {
+            doc_id: (text, meta or {})
+            for doc_id, text, meta in zip(
+                results.get("ids", []),
+                results.get("documents", []),
+                results.get("metadatas", []),
+            )
+        }
+
     def get_document_by_id(
         self,
         doc_id: str,
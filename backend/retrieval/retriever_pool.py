@@ -0,0 +1,203 @@
+"""
+Process-wide pool of warm SimpleRetriever instances.
+
+Building a retriever is cheap, but its first hybrid query is not:
+`_ensure_bm25_index` pulls every chunk out of Chroma and re-tokenizes the
+whole collection. Tools like query_documents and RLMContext used to build a
+fresh retriever per call and therefore paid that cost on every question.
+
+The pool keeps one retriever (with its BM25 index) per
+(collection, embedding model) and hands the same instance back until the
+collection changes. Ingestion code calls `invalidate()` after adding or
+deleting chunks; as a safety net the pool also compares the collection's
+chunk count against the count at build time, so writes from other
+processes are picked up as well.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Optional, Tuple
+
+from backend.retrieval.retriever import SimpleRetriever
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = "BAAI/bge-m3"
+
+
+@dataclass
+class PoolEntry:
+    """A pooled retriever plus the collection state it was built against."""
+    retriever: SimpleRetriever
+    chunk_count: int
+    created_at: float
+    hit_count: int = 0
+
+
+@dataclass
+class PoolStats:
+    """Statistics for pool monitoring."""
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    evictions: int = 0
+    rebuilds: int = 0
+    current_entries: int = 0
+
+
+class RetrieverPool:
+    """
+    Long-lived retriever/BM25 cache keyed by (collection, embedding model).
+
+    Features:
+    - Warm BM25 index reused across tool calls
+    - Explicit invalidation per collection (called by ingestion)
+    - Chunk-count staleness check on every lookup
+    - LRU eviction (each entry holds a full copy of the collection text)
+    - Hit/miss/rebuild statistics for monitoring
+    """
+
+    def __init__(self, max_entries: int = 16):
+        """
+        Initialize the pool.
+
+        Args:
+            max_entries: Maximum number of warm retrievers kept in memory
+        """
+        self._entries: "OrderedDict[Tuple[str, str], PoolEntry]" = OrderedDict()
+        self._lock = Lock()
+        self.max_entries = max_entries
+        self._stats = PoolStats()
+        # BM25 builds performed by retrievers that have since left the pool
+        self._retired_rebuilds = 0
+
+    def get(
+        self,
+        collection_name: str,
+        embedding_model: Optional[str] = None,
+    ) -> SimpleRetriever:
+        """
+        Return a warm retriever for a collection, creating one if needed.
+
+        The returned retriever is built with reranking enabled so the
+        CrossEncoder can be loaded lazily; callers pass `use_reranker=`
+        to `retrieve()` to decide per query.
+
+        Args:
+            collection_name: ChromaDB collection name
+            embedding_model: Embedding model used at ingestion time
+
+        Returns:
+            Shared SimpleRetriever instance
+        """
+        model = embedding_model or DEFAULT_EMBEDDING_MODEL
+        key = (collection_name, model)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                current_count = self._safe_count(entry.retriever, collection_name)
+                if current_count == entry.chunk_count:
+                    entry.hit_count += 1
+                    self._entries.move_to_end(key)
+                    self._stats.hits += 1
+                    return entry.retriever
+
+                logger.info(
+                    f"Collection '{collection_name}' changed "
+                    f"({entry.chunk_count} -> {current_count} chunks), rebuilding retriever"
+                )
+                self._retire(key)
+                self._stats.invalidations += 1
+
+            self._stats.misses += 1
+            retriever = SimpleRetriever(
+                embedding_model=model,
+                collection_name=collection_name,
+                use_reranker=True,
+            )
+            self._entries[key] = PoolEntry(
+                retriever=retriever,
+                chunk_count=self._safe_count(retriever, collection_name),
+                created_at=time.time(),
+            )
+
+            while len(self._entries) > self.max_entries:
+                oldest_key = next(iter(self._entries))
+                self._retire(oldest_key)
+                self._stats.evictions += 1
+                logger.debug(f"Evicted pooled retriever for {oldest_key}")
+
+            self._stats.current_entries = len(self._entries)
+            logger.info(f"Pooled new retriever for '{collection_name}' ({model})")
+            return retriever
+
+    def invalidate(self, collection_name: str):
+        """
+        Drop all pooled retrievers for a collection.
+
+        Call this when documents are added to or removed from a collection.
+
+        Args:
+            collection_name: ChromaDB collection name
+        """
+        with self._lock:
+            keys = [k for k in self._entries if k[0] == collection_name]
+            for key in keys:
+                self._retire(key)
+            self._stats.invalidations += len(keys)
+            self._stats.current_entries = len(self._entries)
+
+        if keys:
+            logger.info(f"Invalidated {len(keys)} pooled retriever(s) for '{collection_name}'")
+
+    def clear(self):
+        """Drop every pooled retriever."""
+        with self._lock:
+            count = len(self._entries)
+            for key in list(self._entries):
+                self._retire(key)
+            self._stats.evictions += count
+            self._stats.current_entries = 0
+            logger.info(f"Cleared retriever pool ({count} entries)")
+
+    def get_stats(self) -> PoolStats:
+        """Get pool statistics."""
+        with self._lock:
+            live_rebuilds = sum(e.retriever.bm25_build_count for e in self._entries.values())
+            return PoolStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                invalidations=self._stats.invalidations,
+                evictions=self._stats.evictions,
+                rebuilds=self._retired_rebuilds + live_rebuilds,
+                current_entries=len(self._entries),
+            )
+
+    @property
+    def hit_rate(self) -> float:
+        """Calculate pool hit rate."""
+        total = self._stats.hits + self._stats.misses
+        return self._stats.hits / total if total > 0 else 0.0
+
+    def _retire(self, key: Tuple[str, str]):
+        """Remove an entry, keeping its rebuild count for the stats. Caller holds the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._retired_rebuilds += entry.retriever.bm25_build_count
+
+    @staticmethod
+    def _safe_count(retriever: SimpleRetriever, collection_name: str) -> int:
+        """Chunk count of the collection, or -1 if it cannot be read."""
+        try:
+            return retriever.vector_store.count(collection_name)
+        except Exception as e:
+            logger.warning(f"Could not count collection '{collection_name}': {e}")
+            return -1
+
+
+# Global singleton instance
+retriever_pool = RetrieverPool()
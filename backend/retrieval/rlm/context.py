@@ -7,13 +7,15 @@ forcing explicit retrieval and citation.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Set
+from typing import Dict, List, Mapping, Optional, Any, Sequence, Set
 from datetime import datetime
 from enum import Enum
 import re
 import json
 import logging
 
+from backend.retrieval.corpus_cache import CorpusView
+
 logger = logging.getLogger(__name__)
 
 
@@ -135,7 +137,8 @@ class RLMContext:
 
     # Lazy-loaded document data
     _documents: Dict[str, DocumentInfo] = field(default_factory=dict)
-    _chunks_by_doc: Dict[str, List[Dict]] = field(default_factory=dict)
+    # Dict of lists of chunk dicts, or a CorpusView over the shared snapshot
+    _chunks_by_doc: Mapping[str, Sequence[Mapping]] = field(default_factory=dict)
     _chunk_cache: Dict[str, str] = field(default_factory=dict)
     _initialized: bool = False
 
@@ -151,6 +154,7 @@ class RLMContext:
 
     # Retriever reference (set during initialization)
     _retriever: Any = None
+    _use_reranker: bool = False
     _vector_store: Any = None
     _collection_name: str = ""
 
@@ -166,7 +170,7 @@ class RLMContext:
         """
         from backend.retrieval.models import UserCollection, IndexStatus
         from backend.retrieval.vector_store import VectorStore
-        from backend.retrieval.retriever import SimpleRetriever
+        from backend.retrieval.retriever_pool import retriever_pool
         from backend.database import engine
         from sqlmodel import Session, select
 
@@ -201,11 +205,12 @@ class RLMContext:
         if use_reranker:
             logger.info(f"Large corpus detected ({chunk_count} chunks). Enabling reranker for RLMContext.")
         
-        # Initialize retriever with the correct embedding model and reranker setting
-        context._retriever = SimpleRetriever(embedding_model=embedding_model, use_reranker=use_reranker)
+        # Shared retriever for the collection's embedding model (warm BM25 index)
+        context._retriever = retriever_pool.get(context._collection_name, embedding_model)
+        context._use_reranker = use_reranker
 
         # Load document metadata
-        await context._load_documents()
+        await context._load_documents(chunk_count)
         context._initialized = True
 
         logger.info(f"RLMContext initialized: {len(context._documents)} documents, "
@@ -213,72 +218,44 @@ class RLMContext:
 
         return context
 
-    async def _load_documents(self):
-        """Load document metadata from vector store."""
-        import os
+    async def _load_documents(self, chunk_count: Optional[int] = None):
+        """
+        Load document metadata from the shared corpus snapshot.
+
+        The snapshot is cached per collection for the whole process, so
+        several RLM tools run against the same index load it from Chroma once.
+        """
+        from backend.retrieval.corpus_cache import corpus_cache
 
-        # Get all metadata from collection
         logger.info(f"Loading documents from collection '{self._collection_name}'")
         try:
-            collection = self._vector_store.get_collection(self._collection_name)
-            all_data = collection.get(include=["metadatas", "documents"])
+            snapshot = corpus_cache.get(self._collection_name, self._vector_store, chunk_count)
         except Exception as e:
             logger.error(f"Failed to get collection '{self._collection_name}': {e}")
             return
 
-        metadatas = all_data.get("metadatas", [])
-        documents = all_data.get("documents", [])
-        ids = all_data.get("ids", [])
-
-        logger.info(f"Found {len(documents)} chunks in collection '{self._collection_name}'")
+        logger.info(f"Found {len(snapshot)} chunks in collection '{self._collection_name}'")
 
-        if not documents:
+        if not len(snapshot):
             logger.warning(f"Collection '{self._collection_name}' is empty - no documents found")
             return
 
         # Check for empty documents
-        empty_count = sum(1 for d in documents if not d or not d.strip())
-        if empty_count > 0:
-            logger.warning(f"{empty_count}/{len(documents)} chunks have empty text")
-
-        # Aggregate by source document
-        doc_chunks: Dict[str, List[Dict]] = {}
-
-        for i, (meta, text, chunk_id) in enumerate(zip(metadatas, documents, ids)):
-            source = meta.get("file_path") or meta.get("source") or "unknown"
-            doc_name = meta.get("file_name") or os.path.basename(source)
-
-            if doc_name not in doc_chunks:
-                doc_chunks[doc_name] = []
-
-            doc_chunks[doc_name].append({
-                "id": chunk_id,
-                "text": text,
-                "chunk_idx": meta.get("chunk_index", i),
-                "page": meta.get("page", 1),
-                "metadata": meta
-            })
-
-        # Create DocumentInfo for each
-        for doc_name, chunks in doc_chunks.items():
-            # Sort chunks by index
-            chunks.sort(key=lambda c: c["chunk_idx"])
-
-            # Extract document metadata from first chunk
-            first_meta = chunks[0]["metadata"]
-            pages = set(c["page"] for c in chunks)
+        if snapshot.empty_chunks > 0:
+            logger.warning(f"{snapshot.empty_chunks}/{len(snapshot)} chunks have empty text")
 
+        for doc_name, span in snapshot.docs.items():
             self._documents[doc_name] = DocumentInfo(
                 name=doc_name,
-                file_path=first_meta.get("file_path", ""),
-                total_chunks=len(chunks),
-                total_pages=max(pages) if pages else 1,
-                title=first_meta.get("title"),
-                author=first_meta.get("author"),
+                file_path=span.file_path,
+                total_chunks=span.end - span.start,
+                total_pages=span.total_pages,
+                title=span.title,
+                author=span.author,
                 sections=[]  # TODO: Extract TOC structure
             )
 
-            self._chunks_by_doc[doc_name] = chunks
+        self._chunks_by_doc = snapshot.view()
 
     # ============== NAVIGATION FUNCTIONS ==============
 
@@ -416,6 +393,9 @@ class RLMContext:
         Returns:
             List of matching ChunkResult objects
         """
+        if isinstance(self._chunks_by_doc, CorpusView):
+            return self._search_keyword_snapshot(keyword, doc_name, case_sensitive)
+
         results = []
         search_term = keyword if case_sensitive else keyword.lower()
 
@@ -441,6 +421,28 @@ class RLMContext:
 
         return sorted(results, key=lambda r: -r.score)
 
+    def _search_keyword_snapshot(self, keyword: str, doc_name: Optional[str],
+                                 case_sensitive: bool) -> List[ChunkResult]:
+        """search_keyword over the shared snapshot, via its trigram index."""
+        snapshot = self._chunks_by_doc.snapshot
+        results = [
+            self._snapshot_result(snapshot, row, count, snapshot.metadatas[row])
+            for row, count in snapshot.count_matches(keyword, doc_name, case_sensitive)
+        ]
+        return sorted(results, key=lambda r: -r.score)
+
+    @staticmethod
+    def _snapshot_result(snapshot, row: int, score: float, metadata: Dict[str, Any],
+                         text: str = None) -> ChunkResult:
+        return ChunkResult(
+            doc_name=snapshot.doc_names[snapshot.doc_codes[row]],
+            chunk_idx=snapshot.chunk_idx[row],
+            text=text if text is not None else snapshot.chunk_text(row),
+            page=snapshot.pages[row],
+            score=score,
+            metadata=metadata
+        )
+
     def search_regex(self, pattern: str, doc_name: str = None) -> List[ChunkResult]:
         """
         Regex search across chunks.
@@ -459,6 +461,20 @@ class RLMContext:
             logger.error(f"Invalid regex pattern: {e}")
             return []
 
+        if isinstance(self._chunks_by_doc, CorpusView):
+            # Only chunks containing the pattern's required literals can match
+            snapshot = self._chunks_by_doc.snapshot
+            for row in snapshot.regex_candidates(pattern, regex.flags, doc_name):
+                text = snapshot.chunk_text(row)
+                matches = list(regex.finditer(text))
+                if matches:
+                    results.append(self._snapshot_result(
+                        snapshot, row, len(matches),
+                        {**snapshot.metadatas[row], "matches": [m.group() for m in matches[:5]]},
+                        text=text,
+                    ))
+            return sorted(results, key=lambda r: -r.score)
+
         docs_to_search = [doc_name] if doc_name else self._chunks_by_doc.keys()
 
         for dname in docs_to_search:
@@ -507,7 +523,8 @@ class RLMContext:
             query=query,
             collection_name=self._collection_name,
             top_k=top_k,
-            where=where_filter
+            where=where_filter,
+            use_reranker=self._use_reranker
         )
 
         return [
@@ -9,7 +9,9 @@ The executor provides a restricted namespace where the LLM can:
 5. Build the output report
 """
 
-from typing import Dict, Any, Callable, Tuple, List, Optional
+from typing import Dict, Any, Awaitable, Callable, Tuple, List, Optional
+import ast
+import copy
 import io
 import sys
 import traceback
@@ -19,6 +21,8 @@ import asyncio
 import threading
 import logging
 from contextlib import redirect_stdout, redirect_stderr
+from functools import lru_cache
+from types import CodeType
 
 from .context import RLMContext, ChunkResult, Citation
 
@@ -57,6 +61,16 @@ def _run_async(coro) -> Any:
     return future.result()  # blocks until done
 
 
+_BUDGET_EXHAUSTED = "[ERROR] Token budget exhausted"
+
+
+def _as_chunk_group(group: Any) -> List[Any]:
+    """A chunk group is a list of chunks; a lone ChunkResult or string is a group of one."""
+    if isinstance(group, (ChunkResult, str)):
+        return [group]
+    return list(group or [])
+
+
 _SYNC_GEMINI_MAX_RETRIES = 5
 _SYNC_GEMINI_BASE_DELAY = 5  # seconds
 _SYNC_GEMINI_RETRYABLE = {"500", "503", "429", "INTERNAL", "UNAVAILABLE", "RESOURCE_EXHAUSTED"}
@@ -68,29 +82,20 @@ def _is_retryable_sync(exc: Exception) -> bool:
     return any(code in msg for code in _SYNC_GEMINI_RETRYABLE)
 
 
-def _run_sync_gemini(model: str, prompt: str, options: dict = None) -> dict:
-    """Make a synchronous Gemini call from REPL context with retry logic.
-
-    Uses the sync API (client.models.generate_content) instead of the async
-    API (client.aio.models) to avoid event-loop conflicts when called from
-    within asyncio.gather batches.
-
-    Includes retry with exponential backoff for transient errors (500, 503, 429),
-    matching the retry behavior of the async GeminiClient.
-    """
-    import time as _time
+def _gemini_client():
+    """Lazy singleton google-genai client for sub-calls (None without an API key)."""
     from google import genai
-    from google.genai import types
     from backend.config import settings
 
-    # Lazy singleton client for sync sub-calls
-    if not hasattr(_run_sync_gemini, "_client"):
+    if not hasattr(_gemini_client, "_client"):
         api_key = settings.GEMINI_API_KEY
-        _run_sync_gemini._client = genai.Client(api_key=api_key) if api_key else None
+        _gemini_client._client = genai.Client(api_key=api_key) if api_key else None
+    return _gemini_client._client
 
-    client = _run_sync_gemini._client
-    if client is None:
-        return {"error": "No Gemini API key", "response": ""}
+
+def _gemini_request(model: str) -> Tuple[str, Any]:
+    """Model name without the gemini:: prefix, plus the generation config."""
+    from google.genai import types
 
     # Strip gemini:: prefix
     if "::" in model:
@@ -100,7 +105,41 @@ def _run_sync_gemini(model: str, prompt: str, options: dict = None) -> dict:
     # to Gemini. The router.generate → gemini.generate_completion path passes
     # only model + prompt + system (no options). Restricting these params was
     # causing short/degraded answers compared to the router path.
-    config = types.GenerateContentConfig()
+    return model, types.GenerateContentConfig()
+
+
+def _gemini_result(response) -> dict:
+    """Convert a generate_content response to the router's response dict."""
+    text = ""
+    try:
+        text = response.text or ""
+    except (ValueError, AttributeError):
+        pass
+    result = {"response": text}
+    if hasattr(response, "usage_metadata") and response.usage_metadata:
+        um = response.usage_metadata
+        result["prompt_eval_count"] = getattr(um, "prompt_token_count", 0) or 0
+        result["eval_count"] = getattr(um, "candidates_token_count", 0) or 0
+    return result
+
+
+def _run_sync_gemini(model: str, prompt: str, options: dict = None) -> dict:
+    """Make a synchronous Gemini call from REPL context with retry logic.
+
+    Uses the sync API (client.models.generate_content) instead of the async
+    API (client.aio.models) to avoid event-loop conflicts when called from
+    within asyncio.gather batches on an arbitrary loop. Sub-calls running on
+    the shared background loop use `_run_async_gemini` instead.
+
+    Includes retry with exponential backoff for transient errors (500, 503, 429),
+    matching the retry behavior of the async GeminiClient.
+    """
+    import time as _time
+
+    client = _gemini_client()
+    if client is None:
+        return {"error": "No Gemini API key", "response": ""}
+    model, config = _gemini_request(model)
 
     last_exc = None
     for attempt in range(_SYNC_GEMINI_MAX_RETRIES + 1):
@@ -108,17 +147,7 @@ def _run_sync_gemini(model: str, prompt: str, options: dict = None) -> dict:
             response = client.models.generate_content(
                 model=model, contents=prompt, config=config,
             )
-            text = ""
-            try:
-                text = response.text or ""
-            except (ValueError, AttributeError):
-                pass
-            result = {"response": text}
-            if hasattr(response, "usage_metadata") and response.usage_metadata:
-                um = response.usage_metadata
-                result["prompt_eval_count"] = getattr(um, "prompt_token_count", 0) or 0
-                result["eval_count"] = getattr(um, "candidates_token_count", 0) or 0
-            return result
+            return _gemini_result(response)
         except Exception as e:
             last_exc = e
             if attempt < _SYNC_GEMINI_MAX_RETRIES and _is_retryable_sync(e):
@@ -135,6 +164,63 @@ def _run_sync_gemini(model: str, prompt: str, options: dict = None) -> dict:
     return {"error": str(last_exc), "response": ""}
 
 
+async def _run_async_gemini(model: str, prompt: str, options: dict = None) -> dict:
+    """Async twin of `_run_sync_gemini` (client.aio), for the background loop.
+
+    Only awaited on `_bg_loop`, so the client's async transport is always
+    bound to the same loop; concurrent sub-calls then overlap instead of
+    blocking the loop one request at a time.
+    """
+    client = _gemini_client()
+    if client is None:
+        return {"error": "No Gemini API key", "response": ""}
+    model, config = _gemini_request(model)
+
+    last_exc = None
+    for attempt in range(_SYNC_GEMINI_MAX_RETRIES + 1):
+        try:
+            response = await client.aio.models.generate_content(
+                model=model, contents=prompt, config=config,
+            )
+            return _gemini_result(response)
+        except Exception as e:
+            last_exc = e
+            if attempt < _SYNC_GEMINI_MAX_RETRIES and _is_retryable_sync(e):
+                delay = _SYNC_GEMINI_BASE_DELAY * (2 ** attempt)
+                logger.warning(
+                    f"[RLM async Gemini] Retryable error (attempt {attempt+1}/"
+                    f"{_SYNC_GEMINI_MAX_RETRIES+1}): {e}. Retrying in {delay}s..."
+                )
+                await asyncio.sleep(delay)
+            else:
+                break
+
+    logger.error(f"[RLM async Gemini] EXCEPTION after {attempt+1} attempts: {last_exc}")
+    return {"error": str(last_exc), "response": ""}
+
+
+@lru_cache(maxsize=256)
+def _compile_snippet(code: str) -> Tuple[Optional[CodeType], Optional[CodeType]]:
+    """
+    Compile a REPL snippet once, splitting off a trailing expression.
+
+    Generated code repeats a lot across turns and sessions (list_documents(),
+    get_report(), ...), so compiled snippets are kept in an LRU.
+
+    Returns:
+        (statements to exec or None, final expression to eval or None)
+
+    Raises:
+        SyntaxError: If the snippet does not parse
+    """
+    tree = ast.parse(code, "<repl>", "exec")
+    last_expr = None
+    if tree.body and isinstance(tree.body[-1], ast.Expr):
+        last_expr = compile(ast.Expression(tree.body.pop().value), "<repl>", "eval")
+    body = compile(tree, "<repl>", "exec") if tree.body else None
+    return body, last_expr
+
+
 class RLMExecutor:
     """
     Executes LLM-generated code in a sandboxed environment.
@@ -168,8 +254,9 @@ class RLMExecutor:
         # Variables created by LLM code (persistent across executions)
         self._user_namespace: Dict[str, Any] = {}
 
-        # Build the execution namespace
+        # Build the execution namespace; everything in it now is off-limits for capture
         self.namespace = self._build_namespace()
+        self._reserved_names = frozenset(self.namespace)
 
     def _build_namespace(self) -> Dict[str, Any]:
         """
@@ -197,6 +284,8 @@ class RLMExecutor:
             "llm_query": self._sync_llm_query,
             "llm_extract": self._sync_llm_extract,
             "llm_summarize": self._sync_llm_summarize,
+            "llm_query_batch": self._sync_llm_query_batch,
+            "llm_map": self._sync_llm_map,
 
             # Citation Tracking
             "cite": self.context.cite,
@@ -275,6 +364,23 @@ class RLMExecutor:
     # The LLM generates sync code, but our LLM calls are async.
     # These wrappers handle the async execution.
 
+    async def _generate(self, prompt: str, options: Dict[str, Any]) -> dict:
+        """
+        One sub-LLM call through the router, or straight to Gemini.
+
+        Gemini uses the async client when running on the shared background
+        loop (so batched calls overlap) and the sync client anywhere else.
+        """
+        if "gemini" in self.model_identifier:
+            if asyncio.get_running_loop() is _bg_loop:
+                return await _run_async_gemini(self.model_identifier, prompt, options)
+            return _run_sync_gemini(self.model_identifier, prompt, options)
+        return await self.router.generate(
+            model_identifier=self.model_identifier,
+            prompt=prompt,
+            options=options,
+        )
+
     def _sync_llm_query(self, prompt: str, context_chunks: List[Any] = None,
                         max_tokens: int = 2000) -> str:
         """
@@ -323,23 +429,10 @@ class RLMExecutor:
 Task: {prompt}"""
 
         # Make the LLM call
-        # Use sync Gemini to avoid event-loop conflicts in concurrent contexts
         try:
-            if "gemini" in self.model_identifier:
-                response = _run_sync_gemini(
-                    self.model_identifier, full_prompt,
-                    {"temperature": 0.1, "num_predict": max_tokens},
-                )
-            else:
-                response = await self.router.generate(
-                    model_identifier=self.model_identifier,
-                    prompt=full_prompt,
-                    options={
-                        "temperature": 0.1,
-                        "num_predict": max_tokens,
-                        "num_ctx": 24576,
-                    }
-                )
+            response = await self._generate(
+                full_prompt, {"temperature": 0.1, "num_predict": max_tokens, "num_ctx": 24576}
+            )
 
             result = response.get("response", "")
 
@@ -353,6 +446,100 @@ Task: {prompt}"""
             logger.error(f"LLM query failed: {e}")
             return f"[ERROR] LLM call failed: {str(e)}"
 
+    def _sync_llm_query_batch(self, prompts: List[str], context_chunks: List[List[Any]] = None,
+                              max_tokens: int = 2000, concurrency: int = None) -> List[str]:
+        """
+        Run several llm_query calls concurrently.
+
+        Args:
+            prompts: One prompt per call
+            context_chunks: Optional list of chunk groups, one per prompt
+            max_tokens: Maximum response tokens per call
+            concurrency: Calls in flight at once (default RLM_BATCH_CONCURRENCY)
+
+        Returns:
+            Answers in the same order as `prompts`
+        """
+        prompts = list(prompts)
+        if context_chunks is None:
+            groups = [None] * len(prompts)
+        else:
+            groups = [_as_chunk_group(g) for g in context_chunks]
+            if len(groups) != len(prompts):
+                raise ValueError(
+                    f"context_chunks must have one chunk group per prompt "
+                    f"({len(groups)} groups for {len(prompts)} prompts)"
+                )
+        calls = [
+            (lambda p=p, g=g: self._async_llm_query(p, g, max_tokens))
+            for p, g in zip(prompts, groups)
+        ]
+        return _run_async(self._gather_limited(calls, concurrency, _BUDGET_EXHAUSTED))
+
+    def _sync_llm_map(self, task: str, chunk_groups: List[Any], mode: str = "summarize",
+                      schema: Dict[str, str] = None, max_tokens: int = None,
+                      concurrency: int = None) -> List[Any]:
+        """
+        Apply the same task to every chunk group concurrently.
+
+        Args:
+            task: Instruction for each call (prompt, summarization or extraction task)
+            chunk_groups: List of chunk lists (a single chunk or string is one group)
+            mode: "summarize" (llm_summarize), "query" (llm_query) or "extract" (llm_extract)
+            schema: Fields to extract, required for mode="extract"
+            max_tokens: Per-call limit (defaults: query 2000, summarize 500)
+            concurrency: Calls in flight at once (default RLM_BATCH_CONCURRENCY)
+
+        Returns:
+            One result per group, in order, of the type the single-call function returns
+        """
+        groups = [_as_chunk_group(g) for g in chunk_groups]
+        if mode == "query":
+            calls = [(lambda g=g: self._async_llm_query(task, g, max_tokens or 2000)) for g in groups]
+            exhausted = _BUDGET_EXHAUSTED
+        elif mode == "summarize":
+            calls = [(lambda g=g: self._async_llm_summarize(g, max_tokens or 500, task)) for g in groups]
+            exhausted = {"summary": _BUDGET_EXHAUSTED, "citations": [], "uncited_claims": []}
+        elif mode == "extract":
+            if not schema:
+                raise ValueError('llm_map(mode="extract") needs a schema')
+            calls = [(lambda g=g: self._async_llm_extract(g, schema, task)) for g in groups]
+            exhausted = {"error": "Token budget exhausted"}
+        else:
+            raise ValueError(f'Unknown llm_map mode "{mode}" (use "summarize", "query" or "extract")')
+        return _run_async(self._gather_limited(calls, concurrency, exhausted))
+
+    async def _gather_limited(self, calls: List[Callable[[], Awaitable[Any]]],
+                              concurrency: Optional[int], exhausted: Any) -> List[Any]:
+        """
+        Await sub-calls with at most `concurrency` in flight, preserving order.
+
+        Token usage is accounted as each call finishes; calls that have not
+        started once the context's max_tokens budget is spent are skipped and
+        get a copy of `exhausted` instead.
+        """
+        from backend.config import settings
+
+        limit = concurrency or settings.RLM_BATCH_CONCURRENCY
+        semaphore = asyncio.Semaphore(max(1, limit))
+        skipped = 0
+
+        async def run(call):
+            nonlocal skipped
+            async with semaphore:
+                if self.context.total_tokens_used >= self.context.max_tokens:
+                    skipped += 1
+                    return copy.deepcopy(exhausted)
+                return await call()
+
+        results = await asyncio.gather(*(run(call) for call in calls))
+        if skipped:
+            logger.warning(
+                f"Token budget exhausted ({self.context.total_tokens_used}/{self.context.max_tokens}): "
+                f"skipped {skipped}/{len(calls)} batched LLM calls"
+            )
+        return results
+
     def _sync_llm_extract(self, chunks: List[Any], schema: Dict[str, str],
                           task: str = None) -> Dict[str, Any]:
         """
@@ -397,17 +584,9 @@ Output as JSON with the requested fields. If a field cannot be found, use null.
 Include a "source_chunks" field listing which chunk numbers contained the information."""
 
         try:
-            if "gemini" in self.model_identifier:
-                response = _run_sync_gemini(
-                    self.model_identifier, prompt,
-                    {"temperature": 0.1},
-                )
-            else:
-                response = await self.router.generate(
-                    model_identifier=self.model_identifier,
-                    prompt=prompt,
-                    options={"temperature": 0.1, "num_ctx": 24576}
-                )
+            response = await self._generate(
+                prompt, {"temperature": 0.1, "num_ctx": 24576}
+            )
 
             result_text = response.get("response", "{}")
 
@@ -480,17 +659,9 @@ CITATIONS_USED:
 [List the chunk numbers you cited, comma-separated]"""
 
         try:
-            if "gemini" in self.model_identifier:
-                response = _run_sync_gemini(
-                    self.model_identifier, prompt,
-                    {"temperature": 0.2, "num_predict": max_tokens + 200},
-                )
-            else:
-                response = await self.router.generate(
-                    model_identifier=self.model_identifier,
-                    prompt=prompt,
-                    options={"temperature": 0.2, "num_predict": max_tokens + 200, "num_ctx": 24576}
-                )
+            response = await self._generate(
+                prompt, {"temperature": 0.2, "num_predict": max_tokens + 200, "num_ctx": 24576}
+            )
 
             result_text = response.get("response", "")
 
@@ -562,52 +733,25 @@ CITATIONS_USED:
         # Clear output buffer
         self._output_buffer = io.StringIO()
 
-        # Refresh namespace with any user variables
-        self.namespace.update(self._user_namespace)
-
         result = None
         error = None
 
         try:
-            # Compile the code
-            # Try as expression first (to capture return value)
-            try:
-                compiled = compile(code, "<repl>", "eval")
-                result = eval(compiled, self.namespace)
-            except SyntaxError:
-                # Not a single expression - try to execute statements and evaluate last line
-                lines = code.strip().split('\n')
-
-                # Execute all but the last line
-                if len(lines) > 1:
-                    setup_code = '\n'.join(lines[:-1])
-                    compiled = compile(setup_code, "<repl>", "exec")
-                    exec(compiled, self.namespace)
-
-                    # Try to evaluate the last line as an expression
-                    last_line = lines[-1].strip()
-                    if last_line and not last_line.startswith('#'):
-                        try:
-                            compiled_last = compile(last_line, "<repl>", "eval")
-                            result = eval(compiled_last, self.namespace)
-                        except SyntaxError:
-                            # Last line is also a statement, just execute it
-                            compiled_last = compile(last_line, "<repl>", "exec")
-                            exec(compiled_last, self.namespace)
-                else:
-                    # Single statement, just execute
-                    compiled = compile(code, "<repl>", "exec")
-                    exec(compiled, self.namespace)
-
-            # Capture any new variables created
-            for key, value in self.namespace.items():
-                if key not in self._build_namespace() and not key.startswith('_'):
-                    self._user_namespace[key] = value
-
+            # Statements run with exec; a trailing expression is evaluated for its value
+            body, last_expr = _compile_snippet(code)
+            if body is not None:
+                exec(body, self.namespace)
+            if last_expr is not None:
+                result = eval(last_expr, self.namespace)
         except Exception as e:
             error = f"Error: {type(e).__name__}: {str(e)}\n{traceback.format_exc()}"
             self._safe_print(error)
 
+        # Capture new or reassigned variables (including those set before an error)
+        for key in self.namespace.keys() - self._reserved_names:
+            if not key.startswith('_'):
+                self._user_namespace[key] = self.namespace[key]
+
         output = self._output_buffer.getvalue()
 
         # If result is meaningful, show it
@@ -7,15 +7,29 @@ actually supports the claim.
 
 This is an opt-in step (doubles LLM cost) that adds a "Verification
 Summary" section to the report.
+
+Claims are verified concurrently (RLM_VERIFY_CONCURRENCY calls in flight)
+and packed RLM_VERIFY_BATCH_SIZE to a prompt that asks for a JSON verdict
+per claim. Claims whose verdict cannot be parsed from a batched answer are
+re-checked with the single-claim prompt.
 """
 
 import re
+import json
+import asyncio
 import logging
+from contextlib import nullcontext
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+_STATUS_BY_VERDICT = {"YES": "verified", "PARTIAL": "partial", "NO": "unverified"}
+_CONFIDENCE_BY_VERDICT = {"YES": 1.0, "PARTIAL": 0.5, "NO": 0.0}
+
+# (claim text, source excerpts, citation numbers) awaiting an LLM verdict
+_PendingClaim = Tuple[str, List[str], List[int]]
+
 
 @dataclass
 class VerifiedClaim:
@@ -48,12 +62,25 @@ class ReportVerifier:
     2. For each claim, identify corpus citations via [N] references
     3. Retrieve the actual source chunk text from RLMContext
     4. LLM call: "Does this source support this claim? YES / NO / PARTIAL"
+       (several claims per prompt, several prompts in flight)
     5. Return VerificationResult with per-claim confidence
     """
 
-    def __init__(self, model_router, model_identifier: str):
+    def __init__(self, model_router, model_identifier: str,
+                 concurrency: int = None, batch_size: int = None):
+        """
+        Args:
+            model_router: ModelRouter for verification calls
+            model_identifier: Model to verify with
+            concurrency: LLM calls in flight (default RLM_VERIFY_CONCURRENCY)
+            batch_size: Claims per verification prompt (default RLM_VERIFY_BATCH_SIZE)
+        """
+        from backend.config import settings
+
         self.router = model_router
         self.model_identifier = model_identifier
+        self.concurrency = max(1, concurrency or settings.RLM_VERIFY_CONCURRENCY)
+        self.batch_size = max(1, batch_size or settings.RLM_VERIFY_BATCH_SIZE)
 
     async def verify_report(
         self,
@@ -90,18 +117,21 @@ class ReportVerifier:
             if c.citation_type == CitationType.CORPUS
         ]
 
+        # Verdicts in claim order; None marks claims waiting for the LLM
+        verdicts: List[Optional[VerifiedClaim]] = []
+        pending: List[Tuple[int, _PendingClaim]] = []
+
         for claim_text in claims:
             # 2. Find citation numbers referenced in this claim
             citation_nums = [int(n) for n in re.findall(r'\[(\d+)\]', claim_text)]
 
             if not citation_nums:
                 # Claim has no corpus citation — note it but don't flag
-                vc = VerifiedClaim(
+                verdicts.append(VerifiedClaim(
                     claim_text=claim_text,
                     status="no_citation",
                     confidence=0.5,
-                )
-                result.no_citation += 1
+                ))
                 continue
 
             # 3. Gather source text for each cited number
@@ -115,23 +145,32 @@ class ReportVerifier:
                     )
 
             if not source_texts:
-                vc = VerifiedClaim(
+                verdicts.append(VerifiedClaim(
                     claim_text=claim_text,
                     status="unverified",
                     confidence=0.0,
                     citation_numbers=citation_nums,
                     evidence="Citation number(s) out of range",
-                )
-                result.unverified += 1
-                result.flagged_claims.append(vc)
+                ))
                 continue
 
-            # 4. LLM verification call
-            vc = await self._verify_single_claim(
-                claim_text, source_texts, citation_nums
-            )
-
-            if vc.status == "verified":
+            pending.append((len(verdicts), (claim_text, source_texts, citation_nums)))
+            verdicts.append(None)
+
+        # 4. LLM verification calls: batches of claims, bounded concurrency
+        limiter = asyncio.Semaphore(self.concurrency)
+        groups = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        group_results = await asyncio.gather(*(
+            self._verify_batch([item for _, item in group], limiter) for group in groups
+        ))
+        for group, group_verdicts in zip(groups, group_results):
+            for (position, _), vc in zip(group, group_verdicts):
+                verdicts[position] = vc
+
+        for vc in verdicts:
+            if vc.status == "no_citation":
+                result.no_citation += 1
+            elif vc.status == "verified":
                 result.verified += 1
             elif vc.status == "partial":
                 result.partial += 1
@@ -157,11 +196,118 @@ class ReportVerifier:
 
         return result
 
+    async def _verify_batch(
+        self,
+        items: List[_PendingClaim],
+        limiter: asyncio.Semaphore = None,
+    ) -> List[VerifiedClaim]:
+        """
+        Verify several claims with one structured prompt.
+
+        Claims missing from the answer (or all of them, if it does not parse)
+        are re-checked one at a time with `_verify_single_claim`.
+
+        Returns:
+            One VerifiedClaim per item, in order
+        """
+        if len(items) == 1:
+            return [await self._verify_single_claim(*items[0], limiter=limiter)]
+
+        blocks = []
+        for number, (claim, source_texts, _) in enumerate(items, start=1):
+            sources_block = "\n".join(source_texts)
+            blocks.append(f"CLAIM {number}: {claim}\nSOURCE TEXT FOR CLAIM {number}:\n{sources_block}")
+        claims_block = "\n\n".join(blocks)
+
+        prompt = f"""You are a fact-checking assistant. For each numbered claim, determine whether ITS OWN source text supports it.
+
+{claims_block}
+
+For every claim answer with exactly one verdict:
+- YES — the source directly supports this claim
+- PARTIAL — the source partially supports it or the claim extrapolates slightly
+- NO — the source does not support this claim or contradicts it
+
+Output ONLY a JSON array with one object per claim, in order:
+[{{"claim": 1, "verdict": "YES", "reason": "one sentence"}}, ...]
+"""
+
+        parsed: Dict[int, Tuple[str, str]] = {}
+        try:
+            async with limiter or nullcontext():
+                response = await self.router.generate(
+                    model_identifier=self.model_identifier,
+                    prompt=prompt,
+                    options={"temperature": 0.0, "num_predict": 150 * len(items) + 100, "num_ctx": 24576},
+                )
+            parsed = self._parse_batch_verdicts(response.get("response", ""), len(items))
+        except Exception as e:
+            logger.error(f"Batched verification LLM call failed: {e}")
+
+        missing = [i for i in range(len(items)) if i + 1 not in parsed]
+        if missing:
+            logger.warning(
+                f"Batched verification returned no verdict for {len(missing)}/{len(items)} claims, "
+                f"verifying them one by one"
+            )
+        retried = await asyncio.gather(*(
+            self._verify_single_claim(*items[i], limiter=limiter) for i in missing
+        ))
+        retried_by_index = dict(zip(missing, retried))
+
+        verdicts = []
+        for i, (claim, _, citation_nums) in enumerate(items):
+            if i in retried_by_index:
+                verdicts.append(retried_by_index[i])
+            else:
+                raw_verdict, reason = parsed[i + 1]
+                verdicts.append(self._verified_claim(claim, citation_nums, raw_verdict, reason))
+        return verdicts
+
+    @staticmethod
+    def _parse_batch_verdicts(text: str, count: int) -> Dict[int, Tuple[str, str]]:
+        """claim number -> (YES/PARTIAL/NO, reason) for the well-formed entries of a batched answer."""
+        match = re.search(r"\[.*\]", text, re.DOTALL)
+        if not match:
+            return {}
+        try:
+            entries = json.loads(match.group())
+        except json.JSONDecodeError:
+            return {}
+        if not isinstance(entries, list):
+            return {}
+
+        verdicts = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            try:
+                number = int(entry.get("claim"))
+            except (TypeError, ValueError):
+                continue
+            raw_verdict = str(entry.get("verdict", "")).strip().upper()
+            if 1 <= number <= count and raw_verdict in _STATUS_BY_VERDICT:
+                verdicts[number] = (raw_verdict, str(entry.get("reason") or "").strip())
+        return verdicts
+
+    @staticmethod
+    def _verified_claim(claim: str, citation_nums: List[int], raw_verdict: Optional[str],
+                        reason: str) -> VerifiedClaim:
+        """Map a YES/PARTIAL/NO verdict (None if unparsed) to a VerifiedClaim."""
+        return VerifiedClaim(
+            claim_text=claim,
+            status=_STATUS_BY_VERDICT.get(raw_verdict, "unverified"),
+            confidence=_CONFIDENCE_BY_VERDICT.get(raw_verdict, 0.0),
+            citation_numbers=citation_nums,
+            evidence=reason,
+        )
+
     async def _verify_single_claim(
         self,
         claim: str,
         source_texts: List[str],
         citation_nums: List[int],
+        limiter: asyncio.Semaphore = None,
     ) -> VerifiedClaim:
         """Verify a single claim against its source text via LLM."""
         sources_block = "\n".join(source_texts)
@@ -186,11 +332,12 @@ REASON: ...
 """
 
         try:
-            response = await self.router.generate(
-                model_identifier=self.model_identifier,
-                prompt=prompt,
-                options={"temperature": 0.0, "num_predict": 200, "num_ctx": 24576},
-            )
+            async with limiter or nullcontext():
+                response = await self.router.generate(
+                    model_identifier=self.model_identifier,
+                    prompt=prompt,
+                    options={"temperature": 0.0, "num_predict": 200, "num_ctx": 24576},
+                )
 
             result_text = response.get("response", "")
 
@@ -198,25 +345,10 @@ REASON: ...
             verdict_match = re.search(r"VERDICT:\s*(YES|PARTIAL|NO)", result_text, re.IGNORECASE)
             reason_match = re.search(r"REASON:\s*(.+)", result_text, re.IGNORECASE)
 
-            if verdict_match:
-                raw_verdict = verdict_match.group(1).upper()
-                status_map = {"YES": "verified", "PARTIAL": "partial", "NO": "unverified"}
-                status = status_map.get(raw_verdict, "unverified")
-                confidence_map = {"YES": 1.0, "PARTIAL": 0.5, "NO": 0.0}
-                confidence = confidence_map.get(raw_verdict, 0.0)
-            else:
-                status = "unverified"
-                confidence = 0.0
-
+            raw_verdict = verdict_match.group(1).upper() if verdict_match else None
             reason = reason_match.group(1).strip() if reason_match else ""
 
-            return VerifiedClaim(
-                claim_text=claim,
-                status=status,
-                confidence=confidence,
-                citation_numbers=citation_nums,
-                evidence=reason,
-            )
+            return self._verified_claim(claim, citation_nums, raw_verdict, reason)
 
         except Exception as e:
             logger.error(f"Verification LLM call failed: {e}")
@@ -7,18 +7,155 @@ Separate from vector store. Enables queries like:
 - "Show meeting notes with action items"
 """
 
+import os
 import sqlite3
 import json
 import logging
-from typing import List, Optional, Dict, Any
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Dict, Any, Tuple
 from pathlib import Path
 from contextlib import contextmanager
 
 from backend.retrieval.schema.document import DocumentMetadata, DocumentType
+from backend.sqlite_tuning import apply_pragmas, retry_on_locked
 
 logger = logging.getLogger(__name__)
 
 
+class _ConnectionPool:
+    """
+    One open SQLite connection per (thread, database file).
+
+    Opening a connection (and re-reading the schema) on every registry call
+    dominates short queries; reusing the thread's connection also keeps the
+    page cache warm. Connections are never shared between threads, and are
+    reopened after a fork. Connections of exited threads are closed the next
+    time any thread opens one.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # id(conn) -> (db_path, owning thread, conn), so close_all() can reach other threads' ones
+        self._all: Dict[int, Tuple[str, threading.Thread, sqlite3.Connection]] = {}
+        # Bumped by close_all(); threads then drop cached connections it closed
+        self._generation = 0
+
+    def get(self, db_path: str) -> sqlite3.Connection:
+        db_path = os.path.abspath(db_path)
+        conns = getattr(self._local, "conns", None)
+        if conns is None or getattr(self._local, "pid", None) != os.getpid():
+            conns = self._local.conns = {}
+            self._local.pid = os.getpid()
+            self._local.generation = self._generation
+        if self._local.generation != self._generation:
+            with self._lock:
+                live = set(self._all)
+                self._local.generation = self._generation
+            for path in [p for p, c in conns.items() if id(c) not in live]:
+                del conns[path]
+        conn = conns.get(db_path)
+        if conn is None:
+            from backend.config import settings
+            conn = sqlite3.connect(
+                db_path,
+                timeout=settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+                check_same_thread=False,  # only so close_all() may close it
+            )
+            conn.row_factory = sqlite3.Row
+            apply_pragmas(conn, settings)
+            conns[db_path] = conn
+            with self._lock:
+                dead = self._pop_dead_threads()
+                self._all[id(conn)] = (db_path, threading.current_thread(), conn)
+            self._close(dead)
+        return conn
+
+    def _pop_dead_threads(self) -> List[sqlite3.Connection]:
+        """Forget connections whose thread has exited. Caller holds the lock."""
+        dead = [key for key, (_, thread, _) in self._all.items() if not thread.is_alive()]
+        return [self._all.pop(key)[2] for key in dead]
+
+    @staticmethod
+    def _close(conns: List[sqlite3.Connection]):
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def close_all(self, db_path: Optional[str] = None) -> int:
+        """Close pooled connections (all, or those for one file). Returns the count."""
+        if db_path is not None:
+            db_path = os.path.abspath(db_path)
+        with self._lock:
+            keys = [k for k, (p, _, _) in self._all.items() if db_path is None or p == db_path]
+            closing = [self._all.pop(k)[2] for k in keys]
+            self._generation += 1
+        self._close(closing)
+        return len(closing)
+
+
+_pool = _ConnectionPool()
+
+
+class _AuthorCache:
+    """
+    doc_id -> primary author names, shared by every registry on one file.
+
+    Filled lazily by result queries; entries are dropped when a document is
+    re-registered or deleted through any registry in this process.
+    """
+
+    def __init__(self, max_docs: int = 50000):
+        self.max_docs = max_docs
+        self._authors: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by invalidate(): rows read before a change must not be cached after it
+        self._generation = 0
+
+    def get_many(self, doc_ids: List[str]) -> Tuple[Dict[str, Tuple[str, ...]], int]:
+        """Cached authors for the given documents, plus the generation to pass to put_many()."""
+        with self._lock:
+            found = {}
+            for doc_id in doc_ids:
+                authors = self._authors.get(doc_id)
+                if authors is not None:
+                    self._authors.move_to_end(doc_id)
+                    found[doc_id] = authors
+            return found, self._generation
+
+    def put_many(self, authors: Dict[str, Tuple[str, ...]], generation: int) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._authors.update(authors)
+            while len(self._authors) > self.max_docs:
+                self._authors.popitem(last=False)
+
+    def invalidate(self, doc_id: Optional[str] = None) -> None:
+        with self._lock:
+            self._generation += 1
+            if doc_id is None:
+                self._authors.clear()
+            else:
+                self._authors.pop(doc_id, None)
+
+
+_author_caches: Dict[str, _AuthorCache] = {}
+_author_caches_lock = threading.Lock()
+
+
+def _get_author_cache(db_path: str) -> _AuthorCache:
+    key = os.path.abspath(db_path)
+    with _author_caches_lock:
+        cache = _author_caches.get(key)
+        if cache is None:
+            cache = _author_caches[key] = _AuthorCache()
+        return cache
+
+
 class DocumentRegistry:
     """
     SQLite-based document registry for fast metadata queries.
@@ -37,23 +174,69 @@ class DocumentRegistry:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path
+        self._author_cache = _get_author_cache(db_path)
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         self._ensure_tables()
 
     @contextmanager
     def _get_connection(self):
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """Context manager for a transaction on this thread's pooled connection."""
+        conn = _pool.get(self.db_path)
         try:
             yield conn
             conn.commit()
         except Exception:
             conn.rollback()
             raise
-        finally:
-            conn.close()
 
+    def close(self) -> None:
+        """Close the pooled connections to this registry's database (all threads)."""
+        _pool.close_all(self.db_path)
+
+    # Max bound parameters per IN (...) lookup (SQLite's default limit is 999 on old builds)
+    _IN_BATCH = 500
+
+    def _attach_authors(self, cursor, rows) -> List[Dict[str, Any]]:
+        """
+        Convert result rows to dicts with an 'authors' list.
+
+        Authors come from the in-memory cache, with one batched query for
+        the documents not cached yet (instead of one query per row).
+        """
+        docs = [dict(row) for row in rows]
+        doc_ids = [doc['doc_id'] for doc in docs]
+        authors, generation = self._author_cache.get_many(doc_ids)
+
+        missing = [doc_id for doc_id in dict.fromkeys(doc_ids) if doc_id not in authors]
+        for start in range(0, len(missing), self._IN_BATCH):
+            batch = missing[start:start + self._IN_BATCH]
+            loaded: Dict[str, List[str]] = {doc_id: [] for doc_id in batch}
+            cursor.execute(
+                f'SELECT doc_id, author_name FROM document_authors '
+                f'WHERE is_variant = 0 AND doc_id IN ({",".join("?" * len(batch))}) ORDER BY id',
+                batch
+            )
+            for row in cursor.fetchall():
+                loaded[row['doc_id']].append(row['author_name'])
+            fetched = {doc_id: tuple(names) for doc_id, names in loaded.items()}
+            self._author_cache.put_many(fetched, generation)
+            authors.update(fetched)
+
+        for doc in docs:
+            doc['authors'] = list(authors[doc['doc_id']])
+        return docs
+
+    @staticmethod
+    def _page(query: str, params: List[Any], limit: Optional[int], offset: int) -> str:
+        if limit is not None:
+            query += ' LIMIT ? OFFSET ?'
+            params.extend([limit, offset])
+        elif offset:
+            query += ' LIMIT -1 OFFSET ?'
+            params.append(offset)
+        return query
+
+    @retry_on_locked
     def _ensure_tables(self):
         """Create tables if they don't exist."""
         with self._get_connection() as conn:
@@ -185,6 +368,7 @@ class DocumentRegistry:
                 except sqlite3.OperationalError:
                     pass  # Column already exists
 
+    @retry_on_locked
     def register(self, metadata: DocumentMetadata) -> str:
         """
         Register a document in the registry.
@@ -301,6 +485,7 @@ class DocumentRegistry:
                     (metadata.doc_id, section, i)
                 )
 
+        self._author_cache.invalidate(metadata.doc_id)
         logger.info(f"Registered document: {metadata.file_name} ({metadata.doc_type.value}) - {len(metadata.authors)} authors")
         return metadata.doc_id
 
@@ -308,7 +493,9 @@ class DocumentRegistry:
         self,
         author_query: str,
         collection_name: Optional[str] = None,
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
     ) -> List[Dict[str, Any]]:
         """
         Find all documents by author name (fuzzy match).
@@ -317,6 +504,8 @@ class DocumentRegistry:
             author_query: Author name to search (matches variants too)
             collection_name: Optional filter by collection
             user_id: Optional filter by user
+            limit: Optional maximum number of documents
+            offset: Documents to skip (with limit, for paging)
 
         Returns:
             List of matching document metadata dicts
@@ -324,12 +513,15 @@ class DocumentRegistry:
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
-            # Use LIKE for fuzzy matching (case-insensitive via COLLATE NOCASE index)
+            # Use LIKE for fuzzy matching (case-insensitive via COLLATE NOCASE index).
+            # EXISTS instead of JOIN + DISTINCT: one row per document, no dedup sort.
             query = '''
-                SELECT DISTINCT d.*
+                SELECT d.*
                 FROM documents d
-                JOIN document_authors a ON d.doc_id = a.doc_id
-                WHERE a.author_name LIKE ?
+                WHERE EXISTS (
+                    SELECT 1 FROM document_authors a
+                    WHERE a.doc_id = d.doc_id AND a.author_name LIKE ?
+                )
             '''
             params = [f'%{author_query}%']
 
@@ -341,20 +533,10 @@ class DocumentRegistry:
                 params.append(user_id)
 
             query += ' ORDER BY d.created_at DESC'
+            query = self._page(query, params, limit, offset)
 
             cursor.execute(query, params)
-            results = []
-            for row in cursor.fetchall():
-                doc = dict(row)
-                # Get authors for this document
-                cursor.execute(
-                    'SELECT author_name FROM document_authors WHERE doc_id = ? AND is_variant = 0',
-                    (doc['doc_id'],)
-                )
-                doc['authors'] = [r['author_name'] for r in cursor.fetchall()]
-                results.append(doc)
-
-            return results
+            return self._attach_authors(cursor, cursor.fetchall())
 
     def get_by_type(
         self,
@@ -379,74 +561,74 @@ class DocumentRegistry:
             query += ' ORDER BY created_at DESC'
 
             cursor.execute(query, params)
-            results = []
-            for row in cursor.fetchall():
-                doc = dict(row)
-                cursor.execute(
-                    'SELECT author_name FROM document_authors WHERE doc_id = ? AND is_variant = 0',
-                    (doc['doc_id'],)
-                )
-                doc['authors'] = [r['author_name'] for r in cursor.fetchall()]
-                results.append(doc)
-
-            return results
+            return self._attach_authors(cursor, cursor.fetchall())
 
     def search_title(
         self,
         title_query: str,
         collection_name: Optional[str] = None,
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0
     ) -> List[Dict[str, Any]]:
-        """Full-text search on document titles."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
+        """Full-text phrase search on document titles, best matches first."""
+        # Quote for phrase match; restrict to the title column
+        phrase = title_query.replace('"', '""')
+        return self._search_fts(
+            f'title : "{phrase}"', collection_name, user_id, limit, offset, snippet=False
+        )
 
-            # Use FTS for fast title search
-            query = '''
-                SELECT d.* FROM documents d
-                WHERE d.doc_id IN (
-                    SELECT doc_id FROM documents_fts WHERE title MATCH ?
-                )
-            '''
-            params = [f'"{title_query}"']  # Quote for phrase match
+    def search_fulltext(
+        self,
+        query: str,
+        collection_name: Optional[str] = None,
+        user_id: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+        snippet: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Full-text search on title and searchable_text, ranked by BM25.
 
-            if collection_name:
-                query += ' AND d.collection_name = ?'
-                params.append(collection_name)
-            if user_id:
-                query += ' AND d.user_id = ?'
-                params.append(user_id)
+        Args:
+            query: FTS5 query expression
+            collection_name: Optional filter by collection
+            user_id: Optional filter by user
+            limit: Maximum number of documents
+            offset: Documents to skip (for paging)
+            snippet: Add a 'snippet' with the matched terms in [brackets]
 
-            cursor.execute(query, params)
-            results = []
-            for row in cursor.fetchall():
-                doc = dict(row)
-                cursor.execute(
-                    'SELECT author_name FROM document_authors WHERE doc_id = ? AND is_variant = 0',
-                    (doc['doc_id'],)
-                )
-                doc['authors'] = [r['author_name'] for r in cursor.fetchall()]
-                results.append(doc)
+        Returns:
+            Matching document dicts, best first, each with a 'score' (higher is better)
+        """
+        return self._search_fts(query, collection_name, user_id, limit, offset, snippet)
 
-            return results
+    # bm25() column weights for (doc_id, title, searchable_text)
+    _BM25_WEIGHTS = (0.0, 10.0, 1.0)
 
-    def search_fulltext(
+    def _search_fts(
         self,
-        query: str,
-        collection_name: Optional[str] = None,
-        user_id: Optional[str] = None
+        match: str,
+        collection_name: Optional[str],
+        user_id: Optional[str],
+        limit: Optional[int],
+        offset: int,
+        snippet: bool
     ) -> List[Dict[str, Any]]:
-        """Full-text search on title and searchable_text."""
+        weights = ", ".join(str(w) for w in self._BM25_WEIGHTS)
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
-            sql = '''
-                SELECT d.* FROM documents d
-                WHERE d.doc_id IN (
-                    SELECT doc_id FROM documents_fts WHERE documents_fts MATCH ?
-                )
+            # Join the FTS index to its content table on rowid: one query,
+            # ranked in SQLite, instead of an IN (subquery) plus per-row lookups
+            sql = f'''
+                SELECT d.*, -bm25(documents_fts, {weights}) AS score
+                    {", snippet(documents_fts, -1, '[', ']', '…', 16) AS snippet" if snippet else ""}
+                FROM documents_fts
+                JOIN documents d ON d.rowid = documents_fts.rowid
+                WHERE documents_fts MATCH ?
             '''
-            params = [query]
+            params: List[Any] = [match]
 
             if collection_name:
                 sql += ' AND d.collection_name = ?'
@@ -455,18 +637,11 @@ class DocumentRegistry:
                 sql += ' AND d.user_id = ?'
                 params.append(user_id)
 
-            cursor.execute(sql, params)
-            results = []
-            for row in cursor.fetchall():
-                doc = dict(row)
-                cursor.execute(
-                    'SELECT author_name FROM document_authors WHERE doc_id = ? AND is_variant = 0',
-                    (doc['doc_id'],)
-                )
-                doc['authors'] = [r['author_name'] for r in cursor.fetchall()]
-                results.append(doc)
+            sql += ' ORDER BY bm25(documents_fts, ' + weights + ')'
+            sql = self._page(sql, params, limit, offset)
 
-            return results
+            cursor.execute(sql, params)
+            return self._attach_authors(cursor, cursor.fetchall())
 
     def get_doc_ids_by_author(
         self,
@@ -488,12 +663,7 @@ class DocumentRegistry:
             if not row:
                 return None
 
-            doc = dict(row)
-            cursor.execute(
-                'SELECT author_name FROM document_authors WHERE doc_id = ? AND is_variant = 0',
-                (doc_id,)
-            )
-            doc['authors'] = [r['author_name'] for r in cursor.fetchall()]
+            doc = self._attach_authors(cursor, [row])[0]
 
             cursor.execute(
                 'SELECT section_name FROM document_sections WHERE doc_id = ? ORDER BY section_order',
@@ -533,17 +703,7 @@ class DocumentRegistry:
             params.extend([limit, offset])
 
             cursor.execute(query, params)
-            results = []
-            for row in cursor.fetchall():
-                doc = dict(row)
-                cursor.execute(
-                    'SELECT author_name FROM document_authors WHERE doc_id = ? AND is_variant = 0',
-                    (doc['doc_id'],)
-                )
-                doc['authors'] = [r['author_name'] for r in cursor.fetchall()]
-                results.append(doc)
-
-            return results
+            return self._attach_authors(cursor, cursor.fetchall())
 
     def get_stats(
         self,
@@ -617,6 +777,7 @@ class DocumentRegistry:
                 "vlm_models": vlm_models
             }
 
+    @retry_on_locked
     def delete_document(self, doc_id: str) -> bool:
         """Delete a document from the registry."""
         with self._get_connection() as conn:
@@ -626,10 +787,12 @@ class DocumentRegistry:
             deleted = cursor.rowcount > 0
 
             if deleted:
+                self._author_cache.invalidate(doc_id)
                 logger.info(f"Deleted document: {doc_id}")
 
             return deleted
 
+    @retry_on_locked
     def delete_by_file_path(self, file_path: str, user_id: Optional[str] = None) -> bool:
         """Delete document by file path."""
         with self._get_connection() as conn:
@@ -643,4 +806,7 @@ class DocumentRegistry:
             else:
                 cursor.execute('DELETE FROM documents WHERE file_path = ?', (file_path,))
 
-            return cursor.rowcount > 0
+            deleted = cursor.rowcount > 0
+            if deleted:
+                self._author_cache.invalidate()
+            return deleted
@@ -31,11 +31,11 @@ from backend.retrieval.chunking import SimpleChunker
 from backend.retrieval.semantic_chunker import SemanticChunker
 from backend.retrieval.embeddings import EmbeddingEngine
 from backend.retrieval.vector_store import VectorStore
-from backend.retrieval.parsers.pdf import PDFParser
+from backend.retrieval.parsers.pdf import PDFParser, ParsedDocument
 from backend.retrieval.agents.transcriber import AgentFactory, TranscriberAgent
 import tempfile
 import os
-from pdf2image import convert_from_path
+from backend.retrieval.parsers.rasterize import iter_page_images
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +57,12 @@ class SmartIngestor:
     - Hybrid queries: Filter by author, then search within their papers
     """
 
+    # Document types whose content is extracted from a PDF
+    _PDF_DOC_TYPES = (
+        DocumentType.PAPER, DocumentType.REPORT, DocumentType.GRANT,
+        DocumentType.MEETING, DocumentType.PRESENTATION,
+    )
+
     def __init__(
         self,
         registry: DocumentRegistry,
@@ -171,6 +177,54 @@ class SmartIngestor:
         Returns:
             Ingestion result with doc_id, metadata, chunk_count
         """
+        prepared = await self.prepare_file(
+            file_path,
+            use_vlm=use_vlm,
+            collection_name=collection_name,
+            user_id=user_id,
+            refine_type=refine_type,
+        )
+        if prepared.get("error"):
+            return prepared
+
+        metadata = prepared["metadata"]
+        chunks = prepared["chunks"]
+
+        # Step 5: Embed and store chunks
+        chunk_count = 0
+        if chunks:
+            chunk_count = await self._store_chunks(chunks, metadata)
+
+        return self.build_result(prepared, chunk_count)
+
+    async def prepare_file(
+        self,
+        file_path: str,
+        use_vlm: bool = False,
+        collection_name: Optional[str] = None,
+        user_id: Optional[str] = None,
+        refine_type: bool = True,
+        parsed: Optional[Dict[str, Any]] = None,
+        page_chunks: Optional[Dict[int, List[Dict[str, Any]]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run every step before embedding: detect, extract metadata, register, chunk.
+
+        Used by ingest_file and by the batch IngestionPipeline, which parses
+        and chunks in worker processes and embeds across file boundaries.
+
+        Args:
+            file_path: Path to file
+            use_vlm: Whether to use VLM for metadata extraction and scanned PDF transcription
+            collection_name: Override default collection
+            user_id: Override default user
+            refine_type: Whether to refine doc_type based on content
+            parsed: Optional PDFParser.parse() result computed elsewhere
+            page_chunks: Optional {page_number: raw chunks} computed from `parsed`
+
+        Returns:
+            Dict with doc_id, metadata and chunks, or an error result
+        """
         collection = collection_name or self.collection_name
         user = user_id or self.user_id
 
@@ -193,36 +247,53 @@ class SmartIngestor:
                 "chunk_count": 0
             }
 
-        # Step 2: Extract metadata
-        metadata = await self._extract_metadata(
-            file_path, doc_type, use_vlm, collection, user
-        )
-
-        # Step 2.5: Optionally refine type based on content
-        if refine_type and doc_type == DocumentType.PAPER:
+        # Parse once; metadata, type refinement, chunking and page
+        # rendering all reuse the same ParsedDocument
+        if parsed is None and doc_type in self._PDF_DOC_TYPES:
             parsed = self.pdf_parser.parse(file_path)
-            refined_type = FileRouter.classify_by_content(file_path, parsed['text'][:2000])
-            if refined_type != doc_type:
-                logger.info(f"Refined type from {doc_type.value} to {refined_type.value}")
-                metadata.doc_type = refined_type
 
-        # Step 3: Register in registry
-        doc_id = self.registry.register(metadata)
-        logger.info(f"Registered: {metadata.file_name} as {doc_id}")
+        try:
+            # Step 2: Extract metadata
+            metadata = await self._extract_metadata(
+                file_path, doc_type, use_vlm, collection, user, parsed=parsed
+            )
 
-        # Step 4: Extract and chunk content
-        chunks = await self._extract_chunks(file_path, metadata.doc_type, metadata, use_vlm)
+            # Step 2.5: Optionally refine type based on content
+            if refine_type and doc_type == DocumentType.PAPER:
+                refined_type = FileRouter.classify_by_content(file_path, parsed['text'][:2000])
+                if refined_type != doc_type:
+                    logger.info(f"Refined type from {doc_type.value} to {refined_type.value}")
+                    metadata.doc_type = refined_type
+
+            # Step 3: Register in registry
+            doc_id = self.registry.register(metadata)
+            logger.info(f"Registered: {metadata.file_name} as {doc_id}")
+
+            # Step 4: Extract and chunk content
+            chunks = await self._extract_chunks(
+                file_path, metadata.doc_type, metadata, use_vlm,
+                parsed=parsed, page_chunks=page_chunks,
+            )
+        finally:
+            if isinstance(parsed, ParsedDocument):
+                parsed.close()
 
-        # Step 5: Embed and store chunks
-        chunk_count = 0
-        if chunks:
-            chunk_count = await self._store_chunks(chunks, metadata)
+        return {
+            "doc_id": doc_id,
+            "file_path": file_path,
+            "metadata": metadata,
+            "chunks": chunks,
+        }
+
+    def build_result(self, prepared: Dict[str, Any], chunk_count: int) -> Dict[str, Any]:
+        """Summarize an ingested file (shape returned by ingest_file)."""
+        metadata: DocumentMetadata = prepared["metadata"]
 
         # Build result with comprehensive metadata
         confidence = metadata.extraction_confidence
         result = {
-            "doc_id": doc_id,
-            "file_path": file_path,
+            "doc_id": prepared["doc_id"],
+            "file_path": prepared["file_path"],
             "file_name": metadata.file_name,
             "doc_type": metadata.doc_type.value,
             "title": metadata.title,
@@ -257,7 +328,8 @@ class SmartIngestor:
         doc_type: DocumentType,
         use_vlm: bool,
         collection_name: Optional[str],
-        user_id: Optional[str]
+        user_id: Optional[str],
+        parsed: Optional[ParsedDocument] = None
     ) -> DocumentMetadata:
         """
         Extract metadata using comprehensive per-page VLM analysis.
@@ -269,8 +341,7 @@ class SmartIngestor:
         """
         path = Path(file_path)
 
-        if doc_type in [DocumentType.PAPER, DocumentType.REPORT, DocumentType.GRANT,
-                        DocumentType.MEETING, DocumentType.PRESENTATION]:
+        if doc_type in self._PDF_DOC_TYPES:
 
             # Try comprehensive VLM analysis first
             if use_vlm:
@@ -281,7 +352,8 @@ class SmartIngestor:
                         file_path=file_path,
                         page_analyzer=page_analyzer,
                         collection_name=collection_name,
-                        user_id=user_id
+                        user_id=user_id,
+                        parsed=parsed
                     )
 
             # Fall back to legacy extractor (regex-based)
@@ -290,7 +362,8 @@ class SmartIngestor:
                 file_path,
                 use_vlm=False,  # Already tried VLM above
                 collection_name=collection_name,
-                user_id=user_id
+                user_id=user_id,
+                parsed=parsed
             )
         else:
             # Basic metadata for unsupported types
@@ -307,7 +380,8 @@ class SmartIngestor:
         file_path: str,
         page_analyzer: PageAnalyzer,
         collection_name: Optional[str],
-        user_id: Optional[str]
+        user_id: Optional[str],
+        parsed: Optional[ParsedDocument] = None
     ) -> DocumentMetadata:
         """
         Extract metadata using comprehensive per-page VLM analysis.
@@ -319,25 +393,20 @@ class SmartIngestor:
         - Equations
         - References
         """
-        import hashlib
-
         path = Path(file_path)
 
         # Get OCR text for validation
-        parsed = self.pdf_parser.parse(file_path)
+        if parsed is None:
+            parsed = self.pdf_parser.parse(file_path)
         ocr_texts = [page['text'] for page in parsed.get('pages', [])]
 
         # Compute file hash
-        hash_md5 = hashlib.md5()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        file_hash = hash_md5.hexdigest()
+        file_hash = parsed.file_hash
 
         # Analyze all pages with VLM
         logger.info(f"Analyzing {len(ocr_texts)} pages with VLM for {path.name}")
         try:
-            page_results = await page_analyzer.analyze_pdf(file_path, ocr_texts)
+            page_results = await page_analyzer.analyze_pdf(file_path, ocr_texts, document=parsed)
         except Exception as e:
             logger.error(f"VLM analysis failed for {path.name}: {e}")
             # Return empty page results - chunking will still work from OCR
@@ -388,7 +457,9 @@ class SmartIngestor:
         file_path: str,
         doc_type: DocumentType,
         metadata: DocumentMetadata,
-        use_vlm: bool = False
+        use_vlm: bool = False,
+        parsed: Optional[Dict[str, Any]] = None,
+        page_chunks: Optional[Dict[int, List[Dict[str, Any]]]] = None
     ) -> List[Dict[str, Any]]:
         """
         Extract and chunk document content with citation resolution.
@@ -398,14 +469,16 @@ class SmartIngestor:
             doc_type: Document type
             metadata: Document metadata
             use_vlm: Whether to use VLM for scanned PDF transcription
+            parsed: Optional pre-computed PDFParser.parse() result
+            page_chunks: Optional pre-computed raw chunks per page of `parsed`
 
         IMPORTANT: This uses OCR text extraction (pdf_parser) by default.
         VLM transcription for scanned PDFs only happens if use_vlm=True.
         """
 
-        if doc_type in [DocumentType.PAPER, DocumentType.REPORT, DocumentType.GRANT,
-                        DocumentType.MEETING, DocumentType.PRESENTATION]:
-            parsed = self.pdf_parser.parse(file_path)
+        if doc_type in self._PDF_DOC_TYPES:
+            if parsed is None:
+                parsed = self.pdf_parser.parse(file_path)
             logger.info(f"OCR extracted {len(parsed.get('pages', []))} pages, {len(parsed.get('text', ''))} chars from {Path(file_path).name}")
 
             # Check for scanned PDF - only use VLM transcription if use_vlm is enabled
@@ -415,6 +488,7 @@ class SmartIngestor:
                     logger.info(f"Engaging Transcriber Agent for scanned document: {Path(file_path).name}")
                     try:
                         parsed = await self._transcribe_scanned_pdf(file_path, parsed, transcriber)
+                        page_chunks = None  # pages were replaced
                     except Exception as e:
                         logger.error(f"Failed to transcribe scanned PDF: {e}")
                         # Continue with whatever text we have (or empty)
@@ -432,11 +506,14 @@ class SmartIngestor:
                     logger.debug(f"Page {page_num} has no text, skipping")
                     continue
 
-                page_chunks = self.chunker.chunk_text(
-                    text=page_text,
-                    page_num=page_num
-                )
-                for chunk in page_chunks:
+                if page_chunks is not None and page_num in page_chunks:
+                    chunks_for_page = page_chunks[page_num]
+                else:
+                    chunks_for_page = self.chunker.chunk_text(
+                        text=page_text,
+                        page_num=page_num
+                    )
+                for chunk in chunks_for_page:
                     # Build chunk with context, citations, and figure/table info
                     chunk['text_with_prefix'] = self._build_chunk_with_context(
                         chunk_text=chunk['text'],
@@ -445,7 +522,7 @@ class SmartIngestor:
                         prefix=prefix
                     )
                     chunk['doc_id'] = metadata.doc_id
-                all_chunks.extend(page_chunks)
+                all_chunks.extend(chunks_for_page)
 
             logger.info(f"Created {len(all_chunks)} chunks from OCR text for {Path(file_path).name}")
             return all_chunks
@@ -475,10 +552,29 @@ class SmartIngestor:
 
         logger.info(f"Embedding {len(texts)} chunks ({non_empty} non-empty) for {metadata.file_name}")
 
-        # Embed in batches if needed
-        embeddings = self.embedder.embed_documents(texts)
+        # Embed in batches if needed (unchanged chunks come from the cache)
+        embeddings = self.embedder.embed_documents(texts, use_cache=True)
 
-        # Build metadata for each chunk
+        chunk_metadatas = self.build_chunk_metadatas(chunks, metadata)
+
+        # Store in vector store
+        logger.info(f"Storing {len(texts)} chunks in collection '{self.collection_name}'")
+        self.vector_store.add_documents(
+            texts=texts,
+            embeddings=embeddings,
+            metadatas=chunk_metadatas,
+            collection_name=self.collection_name
+        )
+
+        logger.info(f"Successfully stored {len(chunks)} chunks for {metadata.file_name} in '{self.collection_name}'")
+        return len(chunks)
+
+    def build_chunk_metadatas(
+        self,
+        chunks: List[Dict[str, Any]],
+        metadata: DocumentMetadata
+    ) -> List[Dict[str, Any]]:
+        """Build the vector store metadata for each chunk of a document."""
         chunk_metadatas = []
         for i, chunk in enumerate(chunks):
             chunk_meta = {
@@ -494,18 +590,7 @@ class SmartIngestor:
                 "title": metadata.title or "",
             }
             chunk_metadatas.append(chunk_meta)
-
-        # Store in vector store
-        logger.info(f"Storing {len(texts)} chunks in collection '{self.collection_name}'")
-        self.vector_store.add_documents(
-            texts=texts,
-            embeddings=embeddings,
-            metadatas=chunk_metadatas,
-            collection_name=self.collection_name
-        )
-
-        logger.info(f"Successfully stored {len(chunks)} chunks for {metadata.file_name} in '{self.collection_name}'")
-        return len(chunks)
+        return chunk_metadatas
 
     def _build_chunk_prefix(self, metadata: DocumentMetadata) -> str:
         """
@@ -591,14 +676,18 @@ class SmartIngestor:
         try:
             # Convert PDF to images
             with tempfile.TemporaryDirectory() as temp_dir:
-                images = convert_from_path(file_path, dpi=200)
-                logger.info(f"Transcribing {len(images)} pages for {Path(file_path).name}...")
+                # Pages are rendered one at a time, never all in memory
+                if isinstance(parsed_result, ParsedDocument):
+                    images = parsed_result.iter_page_images(dpi=200)
+                else:
+                    images = iter_page_images(file_path, dpi=200)
+                page_total = parsed_result['num_pages']
+                logger.info(f"Transcribing {page_total} pages for {Path(file_path).name}...")
                 
                 new_pages = []
                 full_text_list = []
                 
-                for i, image in enumerate(images):
-                    page_num = i + 1
+                for i, (page_num, image) in enumerate(images):
                     page_path = os.path.join(temp_dir, f"page_{page_num}.png")
                     image.save(page_path, "PNG")
                     
@@ -617,7 +706,7 @@ class SmartIngestor:
                     })
                     full_text_list.append(page_md)
                     
-                    logger.info(f"Transcribed page {page_num}/{len(images)}")
+                    logger.info(f"Transcribed page {page_num}/{page_total}")
                 
                 # Update result
                 parsed_result["pages"] = new_pages
@@ -647,34 +736,19 @@ class SmartIngestor:
             user_id: User ID
 
         Returns:
-            Summary with results for each file
+            Summary with results for each file, in input order
         """
-        results = []
-        successful = 0
-        failed = 0
-
-        for path in file_paths:
-            try:
-                result = await self.ingest_file(
-                    path,
-                    use_vlm=use_vlm,
-                    collection_name=collection_name,
-                    user_id=user_id
-                )
-                results.append(result)
-                if result.get('doc_id'):
-                    successful += 1
-                else:
-                    failed += 1
-            except Exception as e:
-                logger.error(f"Failed to ingest {path}: {e}")
-                results.append({
-                    "file_path": path,
-                    "file_name": Path(path).name,
-                    "error": str(e),
-                    "chunk_count": 0
-                })
-                failed += 1
+        from backend.retrieval.ingest_pipeline import IngestionPipeline
+
+        # Parse, embed and store overlap across files (see ingest_pipeline)
+        results = await IngestionPipeline(self).run(
+            file_paths,
+            use_vlm=use_vlm,
+            collection_name=collection_name,
+            user_id=user_id,
+        )
+        successful = sum(1 for r in results if r.get('doc_id') and not r.get('error'))
+        failed = len(results) - successful
 
         return {
             "total": len(file_paths),
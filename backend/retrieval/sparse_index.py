@@ -0,0 +1,532 @@
+"""
+Persistent Sparse Index for BM25
+
+Disk-backed inverted index that replaces the in-memory rank_bm25 corpus
+for RRF hybrid search.
+
+Layout (one directory per collection):
+    manifest.json            segment list + tokenizer version
+    .lock                    inter-process lock for manifest changes
+    seg_<pid>_<uuid>/
+        lexicon.json         [[term, offset, length], ...] in first-seen order
+        postings_doc.npy     int32 local doc index per posting
+        postings_tf.npy      int32 term frequency per posting
+        doc_len.npy          int32 token count per document
+        doc_ids.json         chunk IDs in insertion order
+
+Segments are immutable: new chunks are appended as a new segment and
+segments are merged once there are too many. Arrays are memory-mapped at
+query time, and scoring only touches the postings of the query terms.
+Every caller in a process shares one SparseIndex per directory (see
+shared_sparse_index). Several processes (the backend and the tool server)
+may open the same directory: segment names are unique per process, every
+manifest change happens under a file lock after re-reading the manifest,
+and an index that looks stale is first reloaded from the manifest.
+
+Scores are computed with exactly the same formula, idf floor and
+summation order as rank_bm25.BM25Okapi over `_scientific_tokenize`
+tokens, so rankings are identical to the in-memory implementation.
+"""
+
+import json
+import logging
+import math
+import os
+import shutil
+import uuid
+from contextlib import contextmanager
+from threading import Lock, RLock
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # not POSIX: in-process locking only
+    fcntl = None
+
+from backend.retrieval.hybrid_search import _scientific_tokenize
+
+logger = logging.getLogger(__name__)
+
+# Bump when _scientific_tokenize changes so stale indexes are rebuilt
+TOKENIZER_VERSION = 1
+
+MANIFEST_FILE = "manifest.json"
+LOCK_FILE = ".lock"
+
+# One index per directory for the whole process
+_shared_indexes: Dict[str, "SparseIndex"] = {}
+_shared_lock = Lock()
+
+
+class _Segment:
+    """An immutable block of postings for a contiguous range of documents."""
+
+    def __init__(
+        self,
+        lexicon: Dict[str, Tuple[int, int]],
+        docs: np.ndarray,
+        tfs: np.ndarray,
+        doc_len: np.ndarray,
+        doc_ids: List[str],
+        name: Optional[str] = None,
+    ):
+        self.lexicon = lexicon
+        self.docs = docs
+        self.tfs = tfs
+        self.doc_len = doc_len
+        self.doc_ids = doc_ids
+        self.name = name
+        self.base = 0  # global index of this segment's first document
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    @classmethod
+    def build(cls, ids: Sequence[str], token_lists: Sequence[List[str]]) -> "_Segment":
+        """Build a segment from tokenized documents."""
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        doc_len = np.empty(len(token_lists), dtype=np.int32)
+
+        for local_idx, tokens in enumerate(token_lists):
+            doc_len[local_idx] = len(tokens)
+            frequencies: Dict[str, int] = {}
+            for tok in tokens:
+                frequencies[tok] = frequencies.get(tok, 0) + 1
+            for tok, freq in frequencies.items():
+                postings.setdefault(tok, []).append((local_idx, freq))
+
+        total = sum(len(p) for p in postings.values())
+        docs = np.empty(total, dtype=np.int32)
+        tfs = np.empty(total, dtype=np.int32)
+        lexicon: Dict[str, Tuple[int, int]] = {}
+
+        offset = 0
+        for term, plist in postings.items():
+            n = len(plist)
+            docs[offset:offset + n] = [p[0] for p in plist]
+            tfs[offset:offset + n] = [p[1] for p in plist]
+            lexicon[term] = (offset, n)
+            offset += n
+
+        return cls(lexicon, docs, tfs, doc_len, list(ids))
+
+    def save(self, path: str):
+        """Write the segment to a directory."""
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "postings_doc.npy"), self.docs)
+        np.save(os.path.join(path, "postings_tf.npy"), self.tfs)
+        np.save(os.path.join(path, "doc_len.npy"), self.doc_len)
+        with open(os.path.join(path, "lexicon.json"), "w") as f:
+            json.dump([[t, o, n] for t, (o, n) in self.lexicon.items()], f)
+        with open(os.path.join(path, "doc_ids.json"), "w") as f:
+            json.dump(self.doc_ids, f)
+        self.name = os.path.basename(path)
+
+    @classmethod
+    def load(cls, path: str) -> "_Segment":
+        """Load a segment, memory-mapping the posting arrays."""
+        with open(os.path.join(path, "lexicon.json")) as f:
+            lexicon = {t: (o, n) for t, o, n in json.load(f)}
+        with open(os.path.join(path, "doc_ids.json")) as f:
+            doc_ids = json.load(f)
+        return cls(
+            lexicon=lexicon,
+            docs=np.load(os.path.join(path, "postings_doc.npy"), mmap_mode="r"),
+            tfs=np.load(os.path.join(path, "postings_tf.npy"), mmap_mode="r"),
+            doc_len=np.load(os.path.join(path, "doc_len.npy"), mmap_mode="r"),
+            doc_ids=doc_ids,
+            name=os.path.basename(path),
+        )
+
+
+class SparseIndex:
+    """
+    Segmented BM25 inverted index with optional on-disk persistence.
+
+    Usage:
+        index = SparseIndex("/data/chroma_db/sparse_index/collection_x")
+        index.add_documents(ids, texts)          # at ingest time
+        ranking = index.top_n(tokens, n=30)      # [(global_idx, score), ...]
+        index.doc_id(ranking[0][0])
+
+    Passing index_dir=None keeps everything in memory.
+    """
+
+    def __init__(
+        self,
+        index_dir: Optional[str] = None,
+        k1: float = 1.5,
+        b: float = 0.75,
+        epsilon: float = 0.25,
+        max_segments: int = 8,
+    ):
+        """
+        Open (or create) an index.
+
+        Args:
+            index_dir: Directory for persistence. None = in-memory only.
+            k1: BM25 term-frequency saturation (rank_bm25 default)
+            b: BM25 length normalization (rank_bm25 default)
+            epsilon: Floor for negative idf, as a fraction of the average idf
+            max_segments: Merge all segments once this many exist
+        """
+        self.index_dir = index_dir
+        self.k1 = k1
+        self.b = b
+        self.epsilon = epsilon
+        self.max_segments = max_segments
+
+        self._lock = RLock()
+        self._segments: List[_Segment] = []
+        # Identity of the manifest file our segment list reflects
+        self._manifest_stamp: Optional[Tuple[int, int, int]] = None
+        self._reset_stats()
+
+        if index_dir:
+            self._load()
+
+    # ============== STATS ==============
+
+    def _reset_stats(self):
+        self._df: Dict[str, int] = {}
+        self._idf: Dict[str, float] = {}
+        self._num_docs = 0
+        self._total_len = 0
+        self.avgdl = 0.0
+
+    def _absorb_segment_stats(self, segment: _Segment):
+        """Fold a segment into the corpus statistics (in insertion order)."""
+        segment.base = self._num_docs
+        self._num_docs += len(segment)
+        self._total_len += int(np.sum(segment.doc_len, dtype=np.int64))
+        for term, (_, n) in segment.lexicon.items():
+            self._df[term] = self._df.get(term, 0) + n
+
+    def _recompute_idf(self):
+        """BM25Okapi idf with the epsilon floor on negative values."""
+        self._idf = {}
+        if self._num_docs == 0:
+            self.avgdl = 0.0
+            return
+
+        self.avgdl = self._total_len / self._num_docs
+
+        idf_sum = 0
+        negative = []
+        for term, freq in self._df.items():
+            idf = math.log(self._num_docs - freq + 0.5) - math.log(freq + 0.5)
+            self._idf[term] = idf
+            idf_sum += idf
+            if idf < 0:
+                negative.append(term)
+
+        eps = self.epsilon * (idf_sum / len(self._idf)) if self._idf else 0.0
+        for term in negative:
+            self._idf[term] = eps
+
+    def __len__(self) -> int:
+        return self._num_docs
+
+    # ============== PERSISTENCE ==============
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.index_dir, MANIFEST_FILE)
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock on the index directory, shared with other processes."""
+        if not self.index_dir:
+            yield
+            return
+        os.makedirs(self.index_dir, exist_ok=True)
+        with open(os.path.join(self.index_dir, LOCK_FILE), "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _stat_manifest(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self._manifest_path())
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _load(self):
+        with self._lock, self._file_lock():
+            self._refresh()
+        if self._segments:
+            logger.info(
+                f"Loaded sparse index ({self._num_docs} docs, {len(self._df)} terms, "
+                f"{len(self._segments)} segments) from {self.index_dir}"
+            )
+
+    def _refresh(self):
+        """
+        Re-read the manifest if another process changed it. Caller holds both locks.
+
+        Segments already open are reused; any inconsistency leaves the index empty.
+        """
+        stamp = self._stat_manifest()
+        if stamp == self._manifest_stamp:
+            return
+        self._manifest_stamp = stamp
+        segments: List[_Segment] = []
+        if stamp is not None:
+            try:
+                with open(self._manifest_path()) as f:
+                    manifest = json.load(f)
+                if manifest.get("tokenizer_version") != TOKENIZER_VERSION:
+                    logger.info(f"Sparse index at {self.index_dir} uses an old tokenizer, ignoring it")
+                else:
+                    opened = {seg.name: seg for seg in self._segments}
+                    segments = [
+                        opened.get(name) or _Segment.load(os.path.join(self.index_dir, name))
+                        for name in manifest.get("segments", [])
+                    ]
+            except Exception as e:
+                logger.warning(f"Could not load sparse index at {self.index_dir}: {e}")
+                segments = []
+        self._set_segments(segments)
+
+    def _set_segments(self, segments: List[_Segment]):
+        """Replace the segment list and recompute corpus statistics. Caller holds the lock."""
+        self._segments = segments
+        self._reset_stats()
+        for seg in segments:
+            self._absorb_segment_stats(seg)
+        self._recompute_idf()
+
+    def _write_manifest(self):
+        """Atomically replace the manifest so readers never see a partial one."""
+        manifest = {
+            "tokenizer_version": TOKENIZER_VERSION,
+            "segments": [seg.name for seg in self._segments],
+            "num_docs": self._num_docs,
+        }
+        tmp_path = f"{self._manifest_path()}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self._manifest_path())
+        self._manifest_stamp = self._stat_manifest()
+
+    def _persist_segment(self, segment: _Segment):
+        if not self.index_dir:
+            return
+        # Unique across processes sharing the directory
+        name = f"seg_{os.getpid()}_{uuid.uuid4().hex[:12]}"
+        segment.save(os.path.join(self.index_dir, name))
+
+    def _remove_segment_files(self, names: List[Optional[str]]):
+        if not self.index_dir:
+            return
+        for name in names:
+            if name:
+                shutil.rmtree(os.path.join(self.index_dir, name), ignore_errors=True)
+
+    def reload(self) -> int:
+        """
+        Pick up segments written by other processes since the last read.
+
+        Returns:
+            Number of indexed documents
+        """
+        if self.index_dir:
+            with self._lock, self._file_lock():
+                self._refresh()
+        return self._num_docs
+
+    # ============== WRITES ==============
+
+    def add_documents(self, ids: Sequence[str], texts: Sequence[str]):
+        """
+        Append documents as a new segment.
+
+        Args:
+            ids: Chunk IDs (same IDs as in the vector store)
+            texts: Chunk texts
+        """
+        if not ids:
+            return
+
+        token_lists = [_scientific_tokenize(text or "") for text in texts]
+        segment = _Segment.build(ids, token_lists)
+
+        with self._lock, self._file_lock():
+            if self.index_dir:
+                self._refresh()
+            self._persist_segment(segment)
+            self._segments.append(segment)
+            self._absorb_segment_stats(segment)
+            if len(self._segments) > self.max_segments:
+                self._merge_segments()
+            self._recompute_idf()
+            if self.index_dir:
+                self._write_manifest()
+
+        logger.info(f"Sparse index: appended {len(ids)} docs (total {self._num_docs})")
+
+    def rebuild(self, ids: Sequence[str], texts: Sequence[str]):
+        """
+        Replace the whole index with the given documents.
+
+        The new segment is written first and swapped in with one manifest
+        write, so readers see either the old index or the new one.
+        """
+        segment = None
+        if ids:
+            token_lists = [_scientific_tokenize(text or "") for text in texts]
+            segment = _Segment.build(ids, token_lists)
+        self._swap([segment] if segment is not None else [])
+        logger.info(f"Sparse index: rebuilt with {len(ids)} docs")
+
+    def clear(self):
+        """Remove every segment (and its files)."""
+        self._swap([])
+
+    def _swap(self, segments: List[_Segment]):
+        with self._lock, self._file_lock():
+            if self.index_dir:
+                self._refresh()
+            old = [seg.name for seg in self._segments]
+            for segment in segments:
+                self._persist_segment(segment)
+            self._set_segments(segments)
+            if self.index_dir:
+                self._write_manifest()
+            self._remove_segment_files(old)
+
+    def _merge_segments(self):
+        """Merge all segments into one. Caller holds the lock."""
+        lexicon: Dict[str, Tuple[int, int]] = {}
+        doc_parts: List[np.ndarray] = []
+        tf_parts: List[np.ndarray] = []
+        offset = 0
+
+        # self._df is in global first-seen order, which keeps idf summation
+        # order identical to a single BM25Okapi build over the same corpus.
+        for term in self._df:
+            n_term = 0
+            for seg in self._segments:
+                loc = seg.lexicon.get(term)
+                if loc is None:
+                    continue
+                start, n = loc
+                doc_parts.append(np.asarray(seg.docs[start:start + n]) + seg.base)
+                tf_parts.append(np.asarray(seg.tfs[start:start + n]))
+                n_term += n
+            lexicon[term] = (offset, n_term)
+            offset += n_term
+
+        merged = _Segment(
+            lexicon=lexicon,
+            docs=np.concatenate(doc_parts).astype(np.int32) if doc_parts else np.empty(0, np.int32),
+            tfs=np.concatenate(tf_parts).astype(np.int32) if tf_parts else np.empty(0, np.int32),
+            doc_len=np.concatenate([np.asarray(s.doc_len) for s in self._segments]).astype(np.int32),
+            doc_ids=[doc_id for s in self._segments for doc_id in s.doc_ids],
+        )
+
+        old = [seg.name for seg in self._segments]
+        self._persist_segment(merged)
+        self._segments = [merged]
+        merged.base = 0
+        if self.index_dir:
+            self._write_manifest()
+        self._remove_segment_files(old)
+        logger.info(f"Sparse index: merged {len(old)} segments ({self._num_docs} docs)")
+
+    # ============== READS ==============
+
+    def doc_id(self, global_idx: int) -> str:
+        """Chunk ID for a global document index."""
+        with self._lock:
+            for seg in self._segments:
+                if global_idx < seg.base + len(seg):
+                    return seg.doc_ids[global_idx - seg.base]
+        raise IndexError(global_idx)
+
+    def get_scores(self, query_tokens: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        BM25 scores for every document containing at least one query term.
+
+        Args:
+            query_tokens: Tokenized query (duplicates count, as in rank_bm25)
+
+        Returns:
+            (global doc indices, scores) — documents not returned score 0
+        """
+        idx_parts: List[np.ndarray] = []
+        score_parts: List[np.ndarray] = []
+        k1, b = self.k1, self.b
+
+        # Writers swap segments and statistics under the lock
+        with self._lock:
+            avgdl = self.avgdl
+            for q in query_tokens:
+                idf = self._idf.get(q) or 0
+                if not idf:
+                    continue
+                for seg in self._segments:
+                    loc = seg.lexicon.get(q)
+                    if loc is None:
+                        continue
+                    start, n = loc
+                    docs = np.asarray(seg.docs[start:start + n])
+                    q_freq = np.asarray(seg.tfs[start:start + n], dtype=np.int64)
+                    doc_len = np.asarray(seg.doc_len[docs], dtype=np.int64)
+                    score = idf * (q_freq * (k1 + 1) /
+                                   (q_freq + k1 * (1 - b + b * doc_len / avgdl)))
+                    idx_parts.append(docs.astype(np.int64) + seg.base)
+                    score_parts.append(score)
+
+        if not idx_parts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        all_idx = np.concatenate(idx_parts)
+        all_scores = np.concatenate(score_parts)
+        doc_idx, inverse = np.unique(all_idx, return_inverse=True)
+        # bincount adds in array order, i.e. query-term order per document
+        scores = np.bincount(inverse, weights=all_scores, minlength=len(doc_idx))
+        return doc_idx, scores
+
+    def top_n(self, query_tokens: Sequence[str], n: int) -> List[Tuple[int, float]]:
+        """
+        Highest-scoring documents for a query.
+
+        Ties are broken by insertion order, matching a stable sort over
+        rank_bm25's full score array.
+
+        Returns:
+            List of (global doc index, score), best first
+        """
+        doc_idx, scores = self.get_scores(query_tokens)
+        if len(doc_idx) == 0 or n <= 0:
+            return []
+        order = np.lexsort((doc_idx, -scores))[:n]
+        return [(int(doc_idx[i]), float(scores[i])) for i in order]
+
+
+def shared_sparse_index(index_dir: str) -> SparseIndex:
+    """
+    Get the process-wide SparseIndex for a directory.
+
+    Separate instances over one directory would each track their own
+    segment counter and manifest, and overwrite each other's segments.
+
+    Args:
+        index_dir: Directory of the persistent index
+
+    Returns:
+        The SparseIndex shared by every caller using this directory
+    """
+    key = os.path.realpath(index_dir)
+    with _shared_lock:
+        index = _shared_indexes.get(key)
+        if index is None:
+            index = _shared_indexes[key] = SparseIndex(key)
+        return index
@@ -9,8 +9,11 @@ import chromadb
 from chromadb.config import Settings
 import numpy as np
 import logging
+import os
 import uuid
 
+from backend.retrieval.sparse_index import SparseIndex, shared_sparse_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -59,6 +62,7 @@ class VectorStore:
 
         self.default_collection_name = collection_name  # Store default collection name
         self.collections = {}
+        self.sparse_indexes: Dict[str, SparseIndex] = {}
 
     def get_collection(
         self,
@@ -138,8 +142,58 @@ class VectorStore:
         )
 
         logger.info(f"Added {len(texts)} documents to {collection.name}")
+
+        self._append_to_sparse_index(collection, ids, texts)
         return ids
 
+    def _sparse_index_dir(self, name: str) -> Optional[str]:
+        """Directory holding the BM25 index for a collection (None = in-memory)."""
+        if not self.persist_directory:
+            return None
+        return os.path.join(self.persist_directory, "sparse_index", name)
+
+    def get_sparse_index(self, collection_name: Optional[str] = None) -> SparseIndex:
+        """
+        Get the persistent BM25 index for a collection.
+
+        The index may lag behind the collection (e.g. collections ingested
+        before the index existed); callers compare len(index) with count()
+        and rebuild when they differ.
+
+        Args:
+            collection_name: Collection name. None = default.
+
+        Returns:
+            SparseIndex for the collection
+        """
+        name = collection_name or self.default_collection_name
+        if name not in self.sparse_indexes:
+            index_dir = self._sparse_index_dir(name)
+            # Persistent indexes are shared with every other VectorStore on the same directory
+            self.sparse_indexes[name] = (
+                shared_sparse_index(index_dir) if index_dir else SparseIndex()
+            )
+        return self.sparse_indexes[name]
+
+    def _append_to_sparse_index(self, collection, ids: List[str], texts: List[str]) -> None:
+        """Keep the BM25 index in step with the collection. Never fails an ingest."""
+        try:
+            index = self.get_sparse_index(collection.name)
+            # Only append when the index covered the collection before this
+            # write; otherwise leave it stale and let the retriever rebuild.
+            if len(index) == collection.count() - len(ids):
+                index.add_documents(ids, texts)
+        except Exception as e:
+            logger.warning(f"Sparse index update failed for {collection.name}: {e}")
+
+    def _drop_sparse_index(self, name: str) -> None:
+        """Empty the BM25 index for a collection so it is rebuilt on next use."""
+        if self._sparse_index_dir(name):
+            # Cleared in place: other stores and searchers hold the shared instance
+            self.get_sparse_index(name).clear()
+        else:
+            self.sparse_indexes.pop(name, None)
+
     def search(
         self,
         query_embedding: np.ndarray,
@@ -213,6 +267,7 @@ class VectorStore:
         """
         collection = self.get_collection(collection_name)
         collection.delete(ids=ids)
+        self._drop_sparse_index(collection.name)
         logger.info(f"Deleted {len(ids)} documents from {collection.name}")
 
     def count(self, collection_name: Optional[str] = None) -> int:
@@ -240,6 +295,7 @@ class VectorStore:
 
         if name in self.collections:
             del self.collections[name]
+        self._drop_sparse_index(name)
 
         logger.info(f"Deleted collection: {name}")
 
@@ -1,10 +1,10 @@
 # backend/routers/admin.py
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session, select
 from typing import List, Dict, Any, Optional
 from backend.database import get_session
 from backend.models.user import User
-from backend.models.task import Task, Message
 from backend.models.config import ModelConfig, UserModelPreference
 from backend.models.system_settings import SystemSettings
 from backend.auth import get_current_user, get_current_admin_user, get_password_hash
@@ -13,7 +13,6 @@ from backend.agents.models.ollama import OllamaClient
 from backend.agents.session_context import AGENT_ROLES
 from backend.config import settings
 from pydantic import BaseModel
-import json
 import os
 from datetime import datetime
 
@@ -236,37 +235,36 @@ def update_user_details(
 
 # --- Data Export ---
 
-def json_serial(obj):
-    """JSON serializer for objects not serializable by default json code"""
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    raise TypeError(f"Type {type(obj)} not serializable")
-
 @router.get("/export")
 def export_database(
-    session: Session = Depends(get_session),
+    format: str = "json",
+    user_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
     current_user: User = Depends(get_current_admin_user)
 ):
     """
-    Exports core tables (Users, Tasks, Messages) to JSON.
+    Exports core tables (Users, Tasks, Messages, ModelConfigs), streamed.
+
+    Args:
+        format: "json" (single document), "ndjson" (one row per line) or "zip" (one NDJSON file per table)
+        user_id: Only this user, their tasks and their messages
+        since: Only rows created at or after this time (ISO 8601)
+        until: Only rows created before this time (ISO 8601)
     """
-    data = {
-        "users": [u.dict() for u in session.exec(select(User)).all()],
-        "tasks": [t.dict() for t in session.exec(select(Task)).all()],
-        "messages": [m.dict() for m in session.exec(select(Message)).all()],
-        "model_configs": [mc.dict() for mc in session.exec(select(ModelConfig)).all()]
-    }
-    
-    # Exclude password hashes
-    for u in data["users"]:
-        u.pop("password_hash", None)
-        
-    json_str = json.dumps(data, default=json_serial, indent=2)
-    
-    return Response(
-        content=json_str,
-        media_type="application/json",
-        headers={"Content-Disposition": f"attachment; filename=mentori_export_{datetime.now().strftime('%Y%m%d')}.json"}
+    from backend.database import engine
+    from backend.db_export import EXPORT_FORMATS, stream_export
+
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(EXPORT_FORMATS)}")
+
+    media_types = {"json": "application/json", "ndjson": "application/x-ndjson", "zip": "application/zip"}
+    filename = f"mentori_export_{datetime.now().strftime('%Y%m%d')}.{format}"
+    # The generator opens its own session: request-scoped ones are closed before streaming starts
+    return StreamingResponse(
+        stream_export(engine, format, user_id=user_id, since=since, until=until),
+        media_type=media_types[format],
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
 
 
@@ -671,82 +669,11 @@ def get_telemetry_summary(
     session: Session = Depends(get_session),
 ):
     """
-    High-level stats across all TelemetrySnapshot rows.
+    High-level stats across all telemetry (aggregated from the daily rollups).
     Returns: total_tasks, total_tokens, avg_tokens_per_task, top_models, top_tools, error_rate, active_users.
     """
-    from sqlalchemy import func as sqlfunc
-    from backend.models.telemetry import TelemetrySnapshot
-
-    rows = session.exec(select(TelemetrySnapshot)).all()
-    if not rows:
-        return {
-            "total_tasks": 0,
-            "total_tokens": 0,
-            "avg_tokens_per_task": 0,
-            "error_rate": 0.0,
-            "active_users": 0,
-            "top_models": [],
-            "top_tools": [],
-        }
-
-    total_tasks = len(rows)
-    total_tokens = sum(r.total_tokens for r in rows)
-    avg_tokens = total_tokens // total_tasks if total_tasks else 0
-    error_tasks = sum(1 for r in rows if r.error_count > 0)
-    error_rate = round(error_tasks / total_tasks * 100, 1) if total_tasks else 0.0
-    active_users = len({r.user_id for r in rows})
-
-    # Top models by task count
-    model_counts: dict = {}
-    model_tokens: dict = {}
-    for r in rows:
-        m = r.model_identifier or "unknown"
-        model_counts[m] = model_counts.get(m, 0) + 1
-        model_tokens[m] = model_tokens.get(m, 0) + r.total_tokens
-    top_models = sorted(
-        [
-            {
-                "model_identifier": m,
-                "task_count": model_counts[m],
-                "total_tokens": model_tokens[m],
-                "avg_tokens": model_tokens[m] // model_counts[m] if model_counts[m] else 0,
-            }
-            for m in model_counts
-        ],
-        key=lambda x: x["task_count"],
-        reverse=True,
-    )[:10]
-
-    # Top tools by call count
-    tool_counts: dict = {}
-    tool_task_counts: dict = {}
-    for r in rows:
-        tc = r.tool_calls or {}
-        for tool_name, count in tc.items():
-            tool_counts[tool_name] = tool_counts.get(tool_name, 0) + count
-            tool_task_counts[tool_name] = tool_task_counts.get(tool_name, 0) + 1
-    top_tools = sorted(
-        [
-            {
-                "tool_name": t,
-                "call_count": tool_counts[t],
-                "task_count": tool_task_counts[t],
-            }
-            for t in tool_counts
-        ],
-        key=lambda x: x["call_count"],
-        reverse=True,
-    )[:10]
-
-    return {
-        "total_tasks": total_tasks,
-        "total_tokens": total_tokens,
-        "avg_tokens_per_task": avg_tokens,
-        "error_rate": error_rate,
-        "active_users": active_users,
-        "top_models": top_models,
-        "top_tools": top_tools,
-    }
+    from backend.telemetry import get_summary
+    return get_summary(session)
 
 
 @router.get("/telemetry/timeline")
@@ -756,29 +683,11 @@ def get_telemetry_timeline(
     session: Session = Depends(get_session),
 ):
     """
-    Daily task + token counts for the last N days.
+    Daily task + token counts for the last N days (whole UTC days).
     Returns: list of {date, tasks, tokens, errors}.
     """
-    from datetime import timedelta
-    from backend.models.telemetry import TelemetrySnapshot
-
-    cutoff = datetime.utcnow() - timedelta(days=days)
-    rows = session.exec(
-        select(TelemetrySnapshot).where(TelemetrySnapshot.created_at >= cutoff)
-    ).all()
-
-    # Build daily buckets
-    buckets: dict = {}
-    for r in rows:
-        day = r.created_at.strftime("%Y-%m-%d")
-        if day not in buckets:
-            buckets[day] = {"date": day, "tasks": 0, "tokens": 0, "errors": 0}
-        buckets[day]["tasks"] += 1
-        buckets[day]["tokens"] += r.total_tokens
-        buckets[day]["errors"] += r.error_count
-
-    # Return sorted by date ascending
-    return sorted(buckets.values(), key=lambda x: x["date"])
+    from backend.telemetry import get_timeline
+    return get_timeline(session, days)
 
 
 @router.get("/telemetry/models")
@@ -787,22 +696,8 @@ def get_telemetry_models(
     session: Session = Depends(get_session),
 ):
     """Per-model aggregates: task_count, total_tokens, avg_tokens."""
-    from backend.models.telemetry import TelemetrySnapshot
-
-    rows = session.exec(select(TelemetrySnapshot)).all()
-    model_stats: dict = {}
-    for r in rows:
-        m = r.model_identifier or "unknown"
-        if m not in model_stats:
-            model_stats[m] = {"model_identifier": m, "task_count": 0, "total_tokens": 0}
-        model_stats[m]["task_count"] += 1
-        model_stats[m]["total_tokens"] += r.total_tokens
-
-    result = []
-    for m, s in model_stats.items():
-        s["avg_tokens"] = s["total_tokens"] // s["task_count"] if s["task_count"] else 0
-        result.append(s)
-    return sorted(result, key=lambda x: x["task_count"], reverse=True)
+    from backend.telemetry import get_models
+    return get_models(session)
 
 
 @router.get("/telemetry/tools")
@@ -811,18 +706,20 @@ def get_telemetry_tools(
     session: Session = Depends(get_session),
 ):
     """Per-tool aggregates: call_count, task_count."""
-    from backend.models.telemetry import TelemetrySnapshot
-
-    rows = session.exec(select(TelemetrySnapshot)).all()
-    tool_stats: dict = {}
-    for r in rows:
-        tc = r.tool_calls or {}
-        for tool_name, count in tc.items():
-            if tool_name not in tool_stats:
-                tool_stats[tool_name] = {"tool_name": tool_name, "call_count": 0, "task_count": 0}
-            tool_stats[tool_name]["call_count"] += count
-            tool_stats[tool_name]["task_count"] += 1
-    return sorted(tool_stats.values(), key=lambda x: x["call_count"], reverse=True)
+    from backend.telemetry import get_tools
+    return get_tools(session)
+
+
+@router.post("/telemetry/rebuild")
+def rebuild_telemetry_rollups(
+    current_user: User = Depends(get_current_admin_user),
+    session: Session = Depends(get_session),
+):
+    """Recompute the telemetry rollup tables from the raw snapshots."""
+    from backend.telemetry import rebuild_rollups
+    count = rebuild_rollups(session)
+    session.commit()
+    return {"status": "rebuilt", "snapshots": count}
 
 
 # ─────────────────────────────────────────────────────────────────────────────
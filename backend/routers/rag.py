@@ -240,7 +240,10 @@ def delete_index(
         
     # TODO: Clean up ChromaDB collection (future improvement)
     # import chromadb...
-    
+    if index.vector_db_collection_name:
+        from backend.retrieval.jobs import invalidate_collection_caches
+        invalidate_collection_caches(index.vector_db_collection_name)
+
     session.delete(index)
     session.commit()
 
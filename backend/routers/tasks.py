@@ -1,5 +1,5 @@
 # backend/routers/tasks.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import Session, select, func
 from typing import List, Optional
 import uuid
@@ -10,6 +10,11 @@ from backend.models.task import Task, Message
 from backend.models.task import Task, Message
 from backend.models.user import User
 from backend.models.log import TaskLog
+from backend.message_history import (
+    fetch_message_page,
+    get_message_metadata,
+    message_sequence,
+)
 from backend.retrieval.models import UserCollection, IndexStatus
 # ModelConfig import removed - thinking config now parsed from model identifier suffix
 from backend.auth import get_current_user
@@ -136,6 +141,13 @@ class MessageRead(BaseModel):
     tool_name: Optional[str] = None
     agent_role: Optional[str] = None
     metadata_blob: Optional[dict] = None
+    sequence: Optional[int] = None
+    omitted_fields: Optional[List[str]] = None  # heavy metadata left out (see /metadata)
+
+class MessagePage(BaseModel):
+    messages: List[MessageRead]
+    next_cursor: Optional[int] = None  # sequence to pass as before/after for the next page
+    has_more: bool = False
 
 # --- Routes ---
 @router.post("/", response_model=TaskRead)
@@ -206,6 +218,7 @@ def delete_task(
 
     session.delete(task)
     session.commit()
+    message_sequence.forget(task_id)
 
     logger.info(f"Deleted task '{task_title}'", extra={"user_id": current_user.email, "task_id": f"task_{display_id}"})
     return {"ok": True}
@@ -341,6 +354,69 @@ def list_task_messages(
         ) for m in msgs
     ]
 
+@router.get("/{task_id}/messages/page", response_model=MessagePage)
+def list_task_messages_page(
+    task_id: str,
+    before: Optional[int] = None,
+    after: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=500),
+    include_heavy: bool = False,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Keyset-paginated message history.
+
+    Without a cursor, returns the latest `limit` messages; pass `before=next_cursor`
+    to load older ones, or `after=<last sequence>` to fetch newer ones. Thinking text
+    and tool calls are omitted unless `include_heavy` is set; their names are listed
+    in `omitted_fields` and they can be fetched per message from `/metadata`.
+    """
+    task = session.exec(select(Task).where(Task.id == task_id, Task.user_id == current_user.id)).first()
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    rows, has_more = fetch_message_page(
+        session, task_id, before=before, after=after, limit=limit, include_heavy=include_heavy
+    )
+    messages = [
+        MessageRead(
+            id=m.id,
+            role=m.role,
+            content=m.content,
+            timestamp=m.timestamp.isoformat(),
+            model=m.metadata_blob.get("model"),
+            tool_calls=m.metadata_blob.get("tool_calls"),
+            tool_name=m.metadata_blob.get("tool_name"),
+            thinking=m.metadata_blob.get("thinking"),
+            agent_role=m.metadata_blob.get("agent_role"),
+            metadata_blob=m.metadata_blob,
+            sequence=m.sequence,
+            omitted_fields=m.omitted_fields or None
+        ) for m in rows
+    ]
+    next_cursor = None
+    if rows:
+        next_cursor = rows[-1].sequence if after is not None else rows[0].sequence
+    return MessagePage(messages=messages, next_cursor=next_cursor, has_more=has_more)
+
+@router.get("/{task_id}/messages/{message_id}/metadata")
+def get_task_message_metadata(
+    task_id: str,
+    message_id: int,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Full metadata_blob of one message (lazy loading of heavy fields)."""
+    task = session.exec(select(Task).where(Task.id == task_id, Task.user_id == current_user.id)).first()
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    metadata = get_message_metadata(session, task_id, message_id)
+    if metadata is None:
+        raise HTTPException(status_code=404, detail="Message not found")
+    return metadata
+
 @router.get("/{task_id}/logs")
 def get_task_logs(
     task_id: str,
@@ -504,8 +580,7 @@ async def chat_with_task(
 
     # 2. Save User Message
     # Get current sequence
-    last_msg = session.exec(select(Message).where(Message.task_id == task_id).order_by(Message.sequence.desc())).first()
-    next_seq = (last_msg.sequence + 1) if last_msg else 1
+    next_seq = message_sequence.reserve(session, task_id)
 
     user_msg = Message(
         task_id=task_id,
@@ -703,7 +778,21 @@ async def task_events(
     current_user: User = Depends(get_current_user) 
 ):
     from backend.agents.task_manager import task_manager
-    
+    from backend.agents.notebook.kernel import KernelRegistry
+
+    # Opening a task is a good hint that a notebook may follow:
+    # warm a kernel for this user while the page loads.
+    task = session.exec(select(Task).where(Task.id == task_id, Task.user_id == current_user.id)).first()
+    if task:
+        try:
+            if task.display_id:
+                task_path = str(WorkspaceManager.get_task_path(current_user.id, f"task_{task.display_id}"))
+            else:
+                task_path = task.workspace_path
+            await KernelRegistry.prewarm(task_path)
+        except Exception as e:
+            logger.debug(f"Kernel prewarm skipped for task {task_id}: {e}")
+
     async def event_generator():
         # Subscribe
         # Yield initial connection msg?
@@ -852,8 +941,7 @@ async def coder_chat(
     logger.info(f"Coder chat: received message '{message_in.content[:50]}...'")
 
     # 5. Save User Message to DB
-    last_msg = session.exec(select(Message).where(Message.task_id == task_id).order_by(Message.sequence.desc())).first()
-    next_seq = (last_msg.sequence + 1) if last_msg else 1
+    next_seq = message_sequence.reserve(session, task_id)
 
     user_msg = Message(
         task_id=task_id,
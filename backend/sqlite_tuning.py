@@ -0,0 +1,103 @@
+# backend/sqlite_tuning.py
+"""
+Shared SQLite connection profile.
+
+The app database, the per-user document registries, the task log sink and
+the telemetry writer all hit SQLite from several threads and processes at
+once. With the default rollback journal every writer blocks every reader,
+and the 5 s default busy wait surfaces as "database is locked". This
+module applies one profile to every connection:
+
+- WAL journaling (readers never block the writer, and vice versa)
+- synchronous=NORMAL (durable at checkpoints; safe in WAL mode)
+- a larger page cache and memory-mapped reads
+- a busy timeout, plus retry_on_locked() for the cases SQLite cannot wait
+  out itself (e.g. a deferred read transaction upgraded to a write)
+"""
+
+import logging
+import random
+import sqlite3
+import time
+from functools import wraps
+from typing import Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def apply_pragmas(conn, settings=None) -> None:
+    """
+    Apply the connection profile to a DBAPI sqlite3 connection.
+
+    Args:
+        conn: sqlite3 connection (raw, or the DBAPI connection under SQLAlchemy)
+        settings: Settings object (default: backend.config.settings)
+    """
+    if settings is None:
+        from backend.config import settings
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        if settings.SQLITE_WAL:
+            # Persistent per database file; a no-op for :memory: databases
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        # Negative cache_size is in KiB
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_MB) * 1024}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_MB) * 1024 * 1024}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+
+def is_locked_error(exc: BaseException) -> bool:
+    """True for SQLITE_BUSY / SQLITE_LOCKED errors (raw or wrapped by SQLAlchemy)."""
+    orig = getattr(exc, "orig", exc)
+    if not isinstance(orig, sqlite3.OperationalError):
+        return False
+    message = str(orig).lower()
+    return "locked" in message or "busy" in message
+
+
+def retry_on_locked(
+    func: Optional[Callable[..., T]] = None,
+    *,
+    attempts: Optional[int] = None,
+    base_delay: float = 0.05,
+):
+    """
+    Retry a whole transaction when SQLite reports the database as locked.
+
+    The wrapped function must be safe to re-run from the start (it opens
+    and commits its own transaction). Delays grow exponentially with jitter.
+
+    Args:
+        func: Function to wrap (decorator use without arguments)
+        attempts: Total tries (default: settings.SQLITE_LOCK_RETRIES + 1)
+        base_delay: First backoff delay in seconds
+    """
+    def decorator(fn: Callable[..., T]) -> Callable[..., T]:
+        @wraps(fn)
+        def wrapper(*args, **kwargs) -> T:
+            tries = attempts
+            if tries is None:
+                from backend.config import settings
+                tries = settings.SQLITE_LOCK_RETRIES + 1
+            for attempt in range(tries):
+                try:
+                    return fn(*args, **kwargs)
+                except Exception as e:
+                    if attempt == tries - 1 or not is_locked_error(e):
+                        raise
+                    delay = base_delay * (2 ** attempt) * (0.5 + random.random())
+                    logger.warning(
+                        f"{fn.__name__}: database locked, retrying in {delay:.2f}s "
+                        f"({attempt + 1}/{tries - 1})"
+                    )
+                    time.sleep(delay)
+        return wrapper
+
+    return decorator(func) if func is not None else decorator
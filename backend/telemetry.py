@@ -0,0 +1,218 @@
+# backend/telemetry.py
+"""
+Telemetry rollups.
+
+Every TelemetrySnapshot is folded into daily rollup tables (and its tool
+counts exploded into telemetry_tool_calls) in the same transaction that
+inserts it. The admin dashboard aggregates the rollups in SQL, so a refresh
+reads at most one row per (day, user, model) instead of every snapshot ever
+written.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session, select
+
+from backend.models.telemetry import (
+    TelemetryDailyRollup,
+    TelemetrySnapshot,
+    TelemetryToolCall,
+    TelemetryToolDailyRollup,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _day(ts: datetime) -> str:
+    return ts.strftime("%Y-%m-%d")
+
+
+def _upsert_add(session: Session, model, keys: Dict[str, Any], values: Dict[str, Any]) -> None:
+    """INSERT a rollup row, or add `values` to the existing one."""
+    table = model.__table__
+    stmt = insert(table).values(**keys, **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={name: table.c[name] + stmt.excluded[name] for name in values},
+    )
+    session.execute(stmt)
+
+
+def record_snapshot(session: Session, snap: TelemetrySnapshot) -> None:
+    """
+    Add a snapshot and update the rollups. The caller commits.
+
+    Args:
+        session: Open session (the snapshot and rollups share its transaction)
+        snap: Snapshot to insert
+    """
+    session.add(snap)
+    session.flush()  # assigns snap.id
+
+    day = _day(snap.created_at)
+    model_identifier = snap.model_identifier or "unknown"
+    _upsert_add(
+        session,
+        TelemetryDailyRollup,
+        {"day": day, "user_id": snap.user_id, "model_identifier": model_identifier},
+        {
+            "task_count": 1,
+            "error_tasks": 1 if snap.error_count > 0 else 0,
+            "error_count": snap.error_count,
+            "step_count": snap.step_count,
+            "input_tokens": snap.input_tokens,
+            "output_tokens": snap.output_tokens,
+            "total_tokens": snap.total_tokens,
+            "duration_seconds": snap.duration_seconds or 0.0,
+        },
+    )
+    for tool_name, count in (snap.tool_calls or {}).items():
+        session.add(TelemetryToolCall(
+            snapshot_id=snap.id, day=day, user_id=snap.user_id,
+            tool_name=tool_name, call_count=count,
+        ))
+        _upsert_add(
+            session,
+            TelemetryToolDailyRollup,
+            {"day": day, "tool_name": tool_name},
+            {"call_count": count, "task_count": 1},
+        )
+
+
+def rebuild_rollups(session: Session) -> int:
+    """
+    Recompute the side tables from telemetry_snapshots (for existing
+    databases, or after snapshots were edited by hand). The caller commits.
+
+    Returns:
+        Number of snapshots folded in
+    """
+    for model in (TelemetryToolCall, TelemetryDailyRollup, TelemetryToolDailyRollup):
+        session.execute(model.__table__.delete())
+
+    session.execute(text("""
+        INSERT INTO telemetry_daily_rollups
+            (day, user_id, model_identifier, task_count, error_tasks, error_count, step_count,
+             input_tokens, output_tokens, total_tokens, duration_seconds)
+        SELECT date(created_at), user_id, COALESCE(model_identifier, 'unknown'), COUNT(*),
+               SUM(error_count > 0), SUM(error_count), SUM(step_count),
+               SUM(input_tokens), SUM(output_tokens), SUM(total_tokens),
+               COALESCE(SUM(duration_seconds), 0)
+        FROM telemetry_snapshots
+        GROUP BY 1, 2, 3
+    """))
+    session.execute(text("""
+        INSERT INTO telemetry_tool_calls (snapshot_id, day, user_id, tool_name, call_count)
+        SELECT s.id, date(s.created_at), s.user_id, j.key, j.value
+        FROM telemetry_snapshots s, json_each(s.tool_calls) j
+        WHERE json_valid(s.tool_calls)
+    """))
+    session.execute(text("""
+        INSERT INTO telemetry_tool_daily_rollups (day, tool_name, call_count, task_count)
+        SELECT day, tool_name, SUM(call_count), COUNT(*)
+        FROM telemetry_tool_calls
+        GROUP BY 1, 2
+    """))
+    return session.exec(select(func.count()).select_from(TelemetrySnapshot)).one()
+
+
+def backfill_rollups(session: Session) -> None:
+    """Build the rollups once for a database that has snapshots but no rollups yet."""
+    has_rollups = session.exec(select(TelemetryDailyRollup.day).limit(1)).first() is not None
+    has_snapshots = session.exec(select(TelemetrySnapshot.id).limit(1)).first() is not None
+    if has_snapshots and not has_rollups:
+        count = rebuild_rollups(session)
+        session.commit()
+        logger.info(f"Built telemetry rollups from {count} existing snapshots")
+
+
+# ── Dashboard queries (rollups only) ─────────────────────────────────────────
+
+def _model_rows(session: Session, limit: int = None) -> List[Dict[str, Any]]:
+    r = TelemetryDailyRollup
+    task_count = func.sum(r.task_count).label("task_count")
+    total_tokens = func.sum(r.total_tokens).label("total_tokens")
+    query = (
+        select(r.model_identifier, task_count, total_tokens)
+        .group_by(r.model_identifier)
+        .order_by(task_count.desc(), r.model_identifier)
+    )
+    if limit:
+        query = query.limit(limit)
+    return [
+        {
+            "model_identifier": model,
+            "task_count": tasks,
+            "total_tokens": tokens,
+            "avg_tokens": tokens // tasks if tasks else 0,
+        }
+        for model, tasks, tokens in session.exec(query).all()
+    ]
+
+
+def _tool_rows(session: Session, limit: int = None) -> List[Dict[str, Any]]:
+    r = TelemetryToolDailyRollup
+    call_count = func.sum(r.call_count).label("call_count")
+    query = (
+        select(r.tool_name, call_count, func.sum(r.task_count))
+        .group_by(r.tool_name)
+        .order_by(call_count.desc(), r.tool_name)
+    )
+    if limit:
+        query = query.limit(limit)
+    return [
+        {"tool_name": tool, "call_count": calls, "task_count": tasks}
+        for tool, calls, tasks in session.exec(query).all()
+    ]
+
+
+def get_summary(session: Session) -> Dict[str, Any]:
+    """Totals, error rate, active users, top 10 models and tools."""
+    r = TelemetryDailyRollup
+    total_tasks, total_tokens, error_tasks, active_users = session.exec(
+        select(
+            func.coalesce(func.sum(r.task_count), 0),
+            func.coalesce(func.sum(r.total_tokens), 0),
+            func.coalesce(func.sum(r.error_tasks), 0),
+            func.count(func.distinct(r.user_id)),
+        )
+    ).one()
+    return {
+        "total_tasks": total_tasks,
+        "total_tokens": total_tokens,
+        "avg_tokens_per_task": total_tokens // total_tasks if total_tasks else 0,
+        "error_rate": round(error_tasks / total_tasks * 100, 1) if total_tasks else 0.0,
+        "active_users": active_users,
+        "top_models": _model_rows(session, limit=10) if total_tasks else [],
+        "top_tools": _tool_rows(session, limit=10) if total_tasks else [],
+    }
+
+
+def get_timeline(session: Session, days: int = 30) -> List[Dict[str, Any]]:
+    """Daily {date, tasks, tokens, errors} from the cutoff day (UTC) onwards."""
+    r = TelemetryDailyRollup
+    cutoff = _day(datetime.utcnow() - timedelta(days=days))
+    rows = session.exec(
+        select(r.day, func.sum(r.task_count), func.sum(r.total_tokens), func.sum(r.error_count))
+        .where(r.day >= cutoff)
+        .group_by(r.day)
+        .order_by(r.day)
+    ).all()
+    return [
+        {"date": day, "tasks": tasks, "tokens": tokens, "errors": errors}
+        for day, tasks, tokens, errors in rows
+    ]
+
+
+def get_models(session: Session) -> List[Dict[str, Any]]:
+    """Per-model task_count, total_tokens, avg_tokens."""
+    return _model_rows(session)
+
+
+def get_tools(session: Session) -> List[Dict[str, Any]]:
+    """Per-tool call_count, task_count."""
+    return _tool_rows(session)
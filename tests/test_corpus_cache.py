@@ -0,0 +1,188 @@
+"""Tests for the shared corpus snapshot cache used by RLMContext."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.retrieval.corpus_cache import CorpusCache, CorpusSnapshot, CorpusView
+from backend.retrieval.rlm.context import RLMContext
+
+
+def _collection_data():
+    # Deliberately out of order: chunks are regrouped by document and chunk_index
+    rows = [
+        ("b-1", "Second chunk of B mentions CRISPR twice: crispr.", {"file_name": "b.pdf", "chunk_index": 1, "page": 3}),
+        ("a-0", "Paper A introduces CRISPR.", {"file_name": "a.pdf", "chunk_index": 0, "page": 1, "title": "A"}),
+        ("b-0", "Paper B starts here.", {"file_path": "/docs/b.pdf", "chunk_index": 0, "page": 1}),
+        ("a-1", "", {"file_name": "a.pdf", "chunk_index": 1, "page": 2}),
+        ("a-2", "A closes with Cas9.", {"file_name": "a.pdf", "chunk_index": 2, "page": 2}),
+    ]
+    return {
+        "ids": [r[0] for r in rows],
+        "documents": [r[1] for r in rows],
+        "metadatas": [r[2] for r in rows],
+    }
+
+
+def _vector_store(data):
+    store = MagicMock()
+    store.count.side_effect = lambda name: len(data["ids"])
+    store.get_collection.return_value.get.side_effect = lambda include: data
+    return store
+
+
+def _snapshot():
+    data = _collection_data()
+    return CorpusSnapshot("c1", data["ids"], data["documents"], data["metadatas"])
+
+
+class TestCorpusSnapshot:
+
+    def test_columnar_layout_and_views(self):
+        snapshot = _snapshot()
+        assert snapshot.doc_names == ["b.pdf", "a.pdf"]
+        assert list(snapshot.chunk_idx) == [0, 1, 0, 1, 2]
+        assert snapshot.empty_chunks == 1
+        assert snapshot.docs["a.pdf"].total_pages == 2 and snapshot.docs["a.pdf"].title == "A"
+        assert snapshot.docs["b.pdf"].file_path == "/docs/b.pdf"
+
+        view = snapshot.view()
+        assert "a.pdf" in view and "missing.pdf" not in view
+        chunks = view["a.pdf"]
+        assert len(chunks) == 3
+        assert [c["chunk_idx"] for c in chunks] == [0, 1, 2]
+        assert chunks[-1]["text"] == "A closes with Cas9."
+        assert dict(chunks[0]) == {
+            "id": "a-0", "text": "Paper A introduces CRISPR.", "chunk_idx": 0, "page": 1,
+            "metadata": {"file_name": "a.pdf", "chunk_index": 0, "page": 1, "title": "A"},
+        }
+
+    def test_count_matches_matches_per_chunk_counting(self):
+        snapshot = _snapshot()
+        for term, case_sensitive in (("crispr", False), ("CRISPR", True), ("a", False), ("", False)):
+            expected = []
+            for row in range(len(snapshot)):
+                text = snapshot.chunk_text(row)
+                count = text.count(term) if case_sensitive else text.lower().count(term.lower())
+                if count:
+                    expected.append((row, count))
+            assert snapshot.count_matches(term, case_sensitive=case_sensitive) == expected
+
+        # "crispr.Paper" would only match across the b.pdf / a.pdf boundary
+        assert snapshot.count_matches("crispr.paper") == []
+        assert snapshot.count_matches("crispr", doc_name="a.pdf") == [(2, 1)]
+        assert snapshot.count_matches("crispr", doc_name="missing.pdf") == []
+
+
+class TestCorpusCache:
+
+    def test_hit_invalidate_and_count_check(self):
+        data = _collection_data()
+        store = _vector_store(data)
+        cache = CorpusCache()
+
+        first = cache.get("c1", store)
+        assert cache.get("c1", store) is first
+        assert store.get_collection.return_value.get.call_count == 1
+
+        cache.invalidate("c1")
+        second = cache.get("c1", store)
+        assert second is not first and second.version == 1
+
+        data["ids"].append("a-3")
+        data["documents"].append("Appendix.")
+        data["metadatas"].append({"file_name": "a.pdf", "chunk_index": 3, "page": 4})
+        third = cache.get("c1", store)
+        assert len(third) == 6
+
+        stats = cache.get_stats()
+        assert (stats.hits, stats.misses, stats.invalidations) == (1, 3, 1)
+        assert stats.current_entries == 1
+
+    def test_lru_eviction(self):
+        store = _vector_store(_collection_data())
+        cache = CorpusCache(max_entries=1)
+        cache.get("c1", store)
+        cache.get("c2", store)
+        assert cache.get_stats().evictions == 1
+
+
+class TestRLMContextSnapshot:
+
+    @pytest.fixture
+    def context(self, monkeypatch):
+        from backend.retrieval import corpus_cache as module
+        monkeypatch.setattr(module, "corpus_cache", CorpusCache())
+        context = RLMContext(index_name="idx", user_id="u1")
+        context._collection_name = "c1"
+        context._vector_store = _vector_store(_collection_data())
+        asyncio.run(context._load_documents())
+        return context
+
+    def test_contexts_share_the_snapshot(self, context):
+        other = RLMContext(index_name="idx", user_id="u1")
+        other._collection_name = "c1"
+        other._vector_store = context._vector_store
+        asyncio.run(other._load_documents())
+
+        assert isinstance(context._chunks_by_doc, CorpusView)
+        assert other._chunks_by_doc.snapshot is context._chunks_by_doc.snapshot
+        assert context._documents["a.pdf"].total_chunks == 3
+
+    def test_navigation_and_search(self, context):
+        assert context.get_chunk("a.pdf", 2) == "A closes with Cas9."
+        assert [c.chunk_idx for c in context.get_chunks_by_page("a.pdf", 2)] == [1, 2]
+        assert context.get_document_structure("b.pdf")["pages"][1]["chunks"] == [1]
+
+        hits = context.search_keyword("crispr")
+        assert [(h.doc_name, h.chunk_idx, h.score) for h in hits] == [("b.pdf", 1, 2), ("a.pdf", 0, 1)]
+        assert hits[0].metadata["page"] == 3
+        assert [h.doc_name for h in context.search_regex(r"cas\d")] == ["a.pdf"]
+        assert context.cite("a.pdf", 1, "introduces CRISPR").verified
+
+
+class TestTrigramIndex:
+
+    @staticmethod
+    def _contexts():
+        """The same corpus behind the snapshot view and behind plain dicts (full scans)."""
+        import random
+        rng = random.Random(7)
+        words = ["CRISPR", "Cas9", "protein", "kinase", "p53", "ſigma", "İstanbul", "ΟΔΟΣ", "cell", "is", "a"]
+        data = {"ids": [], "documents": [], "metadatas": []}
+        for doc in range(4):
+            for idx in range(25):
+                data["ids"].append(f"d{doc}-{idx}")
+                data["documents"].append(" ".join(rng.choice(words) for _ in range(rng.randint(0, 30))))
+                data["metadatas"].append({"file_name": f"d{doc}.pdf", "chunk_index": idx, "page": idx // 5 + 1})
+
+        indexed = RLMContext(index_name="idx", user_id="u1")
+        indexed._chunks_by_doc = CorpusSnapshot("c1", data["ids"], data["documents"], data["metadatas"]).view()
+        scanned = RLMContext(index_name="idx", user_id="u1")
+        scanned._chunks_by_doc = {
+            name: [dict(chunk) for chunk in chunks] for name, chunks in indexed._chunks_by_doc.items()
+        }
+        return indexed, scanned
+
+    @staticmethod
+    def _key(results):
+        return [(r.doc_name, r.chunk_idx, r.score, r.metadata.get("matches")) for r in results]
+
+    def test_results_identical_to_full_scan(self):
+        indexed, scanned = self._contexts()
+        for keyword in ["crispr", "CRISPR", "cas9 p", "istanbul", "sigma", "ς", "is", "", "zzz", "ein kin"]:
+            for case_sensitive in (False, True):
+                for doc_name in (None, "d2.pdf"):
+                    args = (keyword, doc_name, case_sensitive)
+                    assert self._key(indexed.search_keyword(*args)) == self._key(scanned.search_keyword(*args)), args
+
+        for pattern in [r"protein\s+kinase", r"crispr-?cas\d", r"(p53|cell)", r"sig", r"is\b", r"ΟΔΟΣ", r"[", r"(?x) c e l l"]:
+            for doc_name in (None, "d1.pdf"):
+                assert self._key(indexed.search_regex(pattern, doc_name)) == self._key(scanned.search_regex(pattern, doc_name)), pattern
+
+    def test_regex_prefilter_narrows_candidates(self):
+        snapshot = _snapshot()
+        assert list(snapshot.regex_candidates(r"closes\s+with")) == [4]
+        assert list(snapshot.regex_candidates(r"\w+")) == list(range(len(snapshot)))
+        assert list(snapshot.regex_candidates(r"crispr", doc_name="a.pdf")) == [2]
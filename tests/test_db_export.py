@@ -0,0 +1,83 @@
+"""Tests for the streamed database export."""
+
+import io
+import json
+import zipfile
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from backend.db_export import stream_export
+from backend.models.config import ModelConfig
+from backend.models.task import Message, Task
+from backend.models.user import User
+
+NOW = datetime.now(timezone.utc)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(
+        engine, tables=[m.__table__ for m in (User, Task, Message, ModelConfig)]
+    )
+    with Session(engine) as session:
+        for user_id, age in (("u1", 10), ("u2", 1)):
+            created = NOW - timedelta(days=age)
+            session.add(User(id=user_id, email=f"{user_id}@x", password_hash="secret", created_at=created))
+            session.add(Task(id=f"task-{user_id}", user_id=user_id, model_identifier="m",
+                             workspace_path="/w", created_at=created, updated_at=created))
+            for seq in range(1, 4):
+                session.add(Message(task_id=f"task-{user_id}", role="user", content=f"{user_id}-{seq}",
+                                    sequence=seq, timestamp=created, metadata_blob={"n": seq}))
+        session.add(ModelConfig(model_identifier="ollama::m", provider="ollama"))
+        session.commit()
+    return engine
+
+
+def _collect(chunks):
+    return b"".join(chunks)
+
+
+class TestDatabaseExport:
+
+    def test_json_document(self, engine):
+        chunks = list(stream_export(engine, "json", flush_bytes=64))
+        assert len(chunks) > 1  # streamed, not one buffer
+
+        data = json.loads(_collect(chunks))
+        assert list(data) == ["users", "tasks", "messages", "model_configs"]
+        assert [u["id"] for u in data["users"]] == ["u1", "u2"]
+        assert all("password_hash" not in u for u in data["users"])
+        assert len(data["messages"]) == 6 and data["messages"][0]["metadata_blob"] == {"n": 1}
+        assert data["model_configs"][0]["model_identifier"] == "ollama::m"
+
+    def test_ndjson_with_filters(self, engine):
+        lines = _collect(stream_export(engine, "ndjson", user_id="u1")).decode().splitlines()
+        records = [json.loads(line) for line in lines]
+        messages = [r["row"]["content"] for r in records if r["table"] == "messages"]
+        assert messages == ["u1-1", "u1-2", "u1-3"]
+        assert [r["row"]["id"] for r in records if r["table"] == "users"] == ["u1"]
+
+        recent = _collect(stream_export(engine, "json", since=NOW - timedelta(days=2)))
+        data = json.loads(recent)
+        assert [u["id"] for u in data["users"]] == ["u2"]
+        assert {m["task_id"] for m in data["messages"]} == {"task-u2"}
+
+    def test_empty_sections(self, engine):
+        data = json.loads(_collect(stream_export(engine, "json", user_id="nobody")))
+        assert data["users"] == [] and data["tasks"] == [] and data["messages"] == []
+
+    def test_zip_per_table(self, engine):
+        chunks = list(stream_export(engine, "zip", flush_bytes=1))
+        assert len(chunks) > 2
+        with zipfile.ZipFile(io.BytesIO(_collect(chunks))) as archive:
+            assert archive.namelist() == ["users.ndjson", "tasks.ndjson", "messages.ndjson", "model_configs.ndjson"]
+            rows = [json.loads(line) for line in archive.read("messages.ndjson").decode().splitlines()]
+        assert len(rows) == 6
+
+    def test_unknown_format(self, engine):
+        with pytest.raises(ValueError):
+            list(stream_export(engine, "xml"))
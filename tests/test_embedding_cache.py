@@ -0,0 +1,124 @@
+"""Tests for the on-disk embedding cache."""
+
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from backend.retrieval.embedding_cache import EmbeddingCache
+
+
+def _vectors(n: int, dim: int = 8, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return EmbeddingCache(str(tmp_path / "cache" / "embeddings.db"))
+
+
+class TestEmbeddingCache:
+    """Tests for the EmbeddingCache class."""
+
+    def test_miss_then_hit(self, cache):
+        texts = ["CRISPR edits genomes.", "PCR amplifies DNA."]
+        assert cache.get_many("model", texts) == [None, None]
+
+        vecs = _vectors(2)
+        cache.put_many("model", texts, vecs)
+        hits = cache.get_many("model", texts)
+        np.testing.assert_array_equal(np.vstack(hits), vecs)
+
+        stats = cache.get_stats()
+        assert stats.hits == 2
+        assert stats.misses == 2
+        assert stats.current_entries == 2
+
+    def test_key_normalizes_whitespace(self, cache):
+        cache.put_many("model", ["PCR  amplifies\nDNA. "], _vectors(1))
+        assert cache.get_many("model", ["PCR amplifies DNA."])[0] is not None
+
+    def test_key_includes_model_and_normalize_flag(self, cache):
+        cache.put_many("model-a", ["text"], _vectors(1))
+        assert cache.get_many("model-b", ["text"]) == [None]
+        assert cache.get_many("model-a", ["text"], normalize=False) == [None]
+
+    def test_float16_storage(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path / "e.db"), dtype="float16")
+        vecs = _vectors(3)
+        cache.put_many("model", ["a", "b", "c"], vecs)
+
+        hits = np.vstack(cache.get_many("model", ["a", "b", "c"]))
+        assert hits.dtype == np.float32
+        np.testing.assert_allclose(hits, vecs, atol=1e-2)
+        assert cache.get_stats().current_bytes == 3 * 8 * 2
+
+    def test_invalid_dtype(self, tmp_path):
+        with pytest.raises(ValueError):
+            EmbeddingCache(str(tmp_path / "e.db"), dtype="int8")
+
+    def test_lru_eviction(self, tmp_path):
+        # Room for 4 vectors of 8 float32 values
+        cache = EmbeddingCache(str(tmp_path / "e.db"), max_bytes=4 * 32)
+        with patch("backend.retrieval.embedding_cache.time.time", side_effect=range(100)):
+            cache.put_many("model", ["a", "b", "c", "d"], _vectors(4))
+            cache.get_many("model", ["a"])  # refresh "a"
+            cache.put_many("model", ["e"], _vectors(1, seed=1))
+
+        assert cache.get_stats().current_bytes <= 4 * 32
+        assert cache.get_stats().evictions > 0
+        assert cache.get_many("model", ["a"])[0] is not None
+        assert cache.get_many("model", ["b"])[0] is None
+        assert cache.get_many("model", ["e"])[0] is not None
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "e.db")
+        EmbeddingCache(path).put_many("model", ["a"], _vectors(1))
+
+        reopened = EmbeddingCache(path)
+        assert reopened.get_stats().current_entries == 1
+        assert reopened.get_many("model", ["a"])[0] is not None
+
+    def test_clear(self, cache):
+        cache.put_many("model", ["a", "b"], _vectors(2))
+        cache.clear()
+        assert cache.get_stats().current_entries == 0
+        assert cache.get_many("model", ["a"]) == [None]
+
+
+class TestCachedEmbedDocuments:
+    """EmbeddingEngine.embed_documents(use_cache=True) only encodes misses."""
+
+    def _engine(self):
+        from backend.retrieval.embeddings import EmbeddingEngine
+
+        engine = object.__new__(EmbeddingEngine)
+        engine.model_name = "fake-model"
+        engine.normalize = True
+        engine.model = MagicMock()
+        engine.model.encode.side_effect = lambda texts, **kw: np.vstack(
+            [np.full(4, len(t), dtype=np.float32) for t in texts]
+        )
+        return engine
+
+    def test_only_misses_are_encoded(self, cache):
+        engine = self._engine()
+        with patch("backend.retrieval.embedding_cache.get_embedding_cache", return_value=cache):
+            first = engine.embed_documents(["aa", "bbb", "aa"], use_cache=True)
+            assert engine.model.encode.call_args[0][0] == ["aa", "bbb"]
+
+            engine.model.encode.reset_mock()
+            second = engine.embed_documents(["aa", "bbb", "cccc"], use_cache=True)
+            assert engine.model.encode.call_args[0][0] == ["cccc"]
+
+        assert first.shape == (3, 4)
+        np.testing.assert_array_equal(second[:, 0], [2, 3, 4])
+
+    def test_all_hits_skip_model(self, cache):
+        engine = self._engine()
+        with patch("backend.retrieval.embedding_cache.get_embedding_cache", return_value=cache):
+            engine.embed_documents(["aa", "bbb"], use_cache=True)
+            engine.model.encode.reset_mock()
+            engine.embed_documents(["aa", "bbb"], use_cache=True)
+
+        engine.model.encode.assert_not_called()
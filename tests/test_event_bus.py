@@ -0,0 +1,173 @@
+"""Tests for the per-task event bus behind TaskManager.broadcast_event / subscribe."""
+
+import asyncio
+import json
+
+from backend.agents.event_bus import TaskEventBus
+
+
+def _drain(sub):
+    frames = [json.loads(f) for f in sub.frames]
+    sub.frames.clear()
+    return frames
+
+
+class TestTaskEventBus:
+
+    def test_chunks_coalesce_into_one_frame(self):
+        async def run():
+            bus = TaskEventBus(snapshot=lambda: None, coalesce_window=0.01)
+            sub = bus.subscribe()
+            for token in ["Hel", "lo", " world"]:
+                bus.publish({"type": "chunk", "content": token})
+            assert not sub.frames  # still inside the window
+            await asyncio.sleep(0.03)
+            return _drain(sub), bus.get_stats()
+
+        frames, stats = asyncio.run(run())
+        assert frames == [{"type": "chunk", "content": "Hello world"}]
+        assert stats.published == 3 and stats.frames == 1 and stats.coalesced == 2
+
+    def test_other_events_flush_in_order(self):
+        async def run():
+            bus = TaskEventBus(snapshot=lambda: None, coalesce_window=10)
+            sub = bus.subscribe()
+            bus.publish({"type": "orchestrator_thinking", "content": "a", "phase": "planning"})
+            bus.publish({"type": "orchestrator_thinking", "content": "b", "phase": "planning"})
+            bus.publish({"type": "orchestrator_thinking", "content": "c", "phase": "executing"})
+            bus.publish({"type": "step_start", "step_id": "step_1"})
+            return _drain(sub)
+
+        frames = asyncio.run(run())
+        assert frames == [
+            {"type": "orchestrator_thinking", "content": "ab", "phase": "planning"},
+            {"type": "orchestrator_thinking", "content": "c", "phase": "executing"},
+            {"type": "step_start", "step_id": "step_1"},
+        ]
+
+    def test_frames_are_filtered(self):
+        async def run():
+            bus = TaskEventBus(snapshot=lambda: None, coalesce_window=10)
+            sub = bus.subscribe()
+            # The key arrives split across token chunks; the coalesced frame is filtered whole
+            bus.publish({"type": "chunk", "content": "key sk-abcdefghijkl"})
+            bus.publish({"type": "chunk", "content": "mnopqrstuvwxyz123456 done"})
+            bus.flush()
+            return _drain(sub)
+
+        frames = asyncio.run(run())
+        assert "sk-abcdefghijklmnopqrstuvwxyz123456" not in json.dumps(frames)
+
+    def test_slow_subscriber_is_resynced(self):
+        state = {"content": []}
+
+        def snapshot():
+            return {"type": "sync_state", "content": "".join(state["content"])}
+
+        async def run():
+            bus = TaskEventBus(snapshot=snapshot, coalesce_window=0, subscriber_buffer=3)
+            fast = bus.subscribe()
+            slow = bus.subscribe()
+            stream = bus.stream(slow)
+            assert json.loads(await stream.__anext__())["type"] == "sync_state"
+
+            for i in range(10):
+                state["content"].append(str(i))
+                bus.publish({"type": "chunk", "content": str(i)})
+                if len(fast.frames) == 3:
+                    fast.frames.clear()
+
+            assert slow.needs_resync and not slow.frames
+            resync = json.loads(await stream.__anext__())
+
+            state["content"].append("x")
+            bus.publish({"type": "chunk", "content": "x"})
+            after = json.loads(await stream.__anext__())
+            await stream.aclose()
+            return resync, after, bus.get_stats(), fast
+
+        resync, after, stats, fast = asyncio.run(run())
+        assert resync == {"type": "sync_state", "content": "0123456789"}
+        assert after == {"type": "chunk", "content": "x"}
+        assert stats.resyncs == 1 and stats.dropped > 0
+        assert not fast.needs_resync
+
+    def test_resync_after_task_finished_ends_stream(self):
+        state = {"running": True}
+
+        def snapshot():
+            return {"type": "sync_state", "content": ""} if state["running"] else None
+
+        async def run():
+            bus = TaskEventBus(snapshot=snapshot, coalesce_window=0, subscriber_buffer=2)
+            sub = bus.subscribe()
+            stream = bus.stream(sub)
+            await stream.__anext__()
+            for i in range(3):
+                bus.publish({"type": "chunk", "content": str(i)})
+            bus.publish({"type": "complete"})
+            state["running"] = False  # task state cleaned up after the terminal event
+            return [f async for f in stream]
+
+        assert asyncio.run(asyncio.wait_for(run(), timeout=5)) == []
+
+    def test_new_subscriber_does_not_repeat_pending_text(self):
+        state = {"content": []}
+
+        def snapshot():
+            return {"type": "sync_state", "content": "".join(state["content"])}
+
+        async def run():
+            bus = TaskEventBus(snapshot=snapshot, coalesce_window=10)
+            first = bus.subscribe()
+            for token in ["Hel", "lo"]:
+                state["content"].append(token)
+                bus.publish({"type": "chunk", "content": token})
+
+            late = bus.subscribe()
+            stream = bus.stream(late)
+            sync = json.loads(await stream.__anext__())
+            state["content"].append("!")
+            bus.publish({"type": "chunk", "content": "!"})
+            bus.flush()
+            after = json.loads(await stream.__anext__())
+            await stream.aclose()
+            return sync, after, _drain(first)
+
+        sync, after, first_frames = asyncio.run(run())
+        assert sync == {"type": "sync_state", "content": "Hello"}
+        assert after == {"type": "chunk", "content": "!"}
+        assert [f["content"] for f in first_frames] == ["Hello", "!"]
+
+    def test_no_subscribers_is_a_noop(self):
+        bus = TaskEventBus(snapshot=lambda: None)
+        bus.publish({"type": "chunk", "content": "x"})
+        assert bus.get_stats().published == 0
+
+
+class TestTaskManagerFanOut:
+
+    def test_subscribe_receives_sync_then_events(self):
+        from backend.agents.task_manager import TaskManager
+
+        manager = TaskManager()
+        manager.task_states["t1"] = {"content": ["par", "tial"], "thinking": [], "orchestrated": True,
+                                     "phase": "executing"}
+
+        async def run():
+            stream = manager.subscribe("t1")
+            sync = json.loads(await stream.__anext__())
+            await manager.broadcast_event("t1", {"type": "status", "status": "Executing"})
+            event = json.loads(await stream.__anext__())
+            await stream.aclose()
+            return sync, event
+
+        try:
+            sync, event = asyncio.run(run())
+        finally:
+            manager.task_states.pop("t1", None)
+
+        assert sync["type"] == "sync_state" and sync["content"] == "partial"
+        assert sync["orchestrated"] and sync["phase"] == "executing"
+        assert event == {"type": "status", "status": "Executing"}
+        assert "t1" not in manager.buses
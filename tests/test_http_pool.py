@@ -0,0 +1,141 @@
+"""Tests for the pooled HTTP client layer used by OllamaClient."""
+
+import asyncio
+import json
+import threading
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from backend.agents.models.http_pool import HTTPClientPool
+
+
+class TestHTTPClientPool:
+
+    def test_client_reused_within_loop(self):
+        pool = HTTPClientPool()
+
+        async def run():
+            a = pool.get_client("http://ollama:11434")
+            b = pool.get_client("http://ollama:11434")
+            c = pool.get_client("http://other:11434")
+            await pool.aclose()
+            return a, b, c
+
+        a, b, c = asyncio.run(run())
+        assert a is b
+        assert a is not c
+        assert a.is_closed and c.is_closed
+        assert pool.get_stats().clients_created == 2
+
+    def test_separate_client_per_event_loop(self):
+        pool = HTTPClientPool()
+
+        async def get():
+            return pool.get_client("http://ollama:11434")
+
+        first = asyncio.run(get())
+        second = asyncio.run(get())
+        assert first is not second
+
+    def test_closed_client_is_replaced(self):
+        pool = HTTPClientPool()
+
+        async def run():
+            a = pool.get_client("http://ollama:11434")
+            await a.aclose()
+            b = pool.get_client("http://ollama:11434")
+            await pool.aclose()
+            return a, b
+
+        a, b = asyncio.run(run())
+        assert a is not b
+
+    def test_http2_requires_h2(self):
+        with patch("backend.agents.models.http_pool._http2_available", return_value=False):
+            assert HTTPClientPool(http2=True).http2 is False
+
+    def test_aclose_closes_clients_of_other_loops(self):
+        pool = HTTPClientPool()
+        other = asyncio.new_event_loop()
+        thread = threading.Thread(target=other.run_forever, daemon=True)
+        thread.start()
+
+        async def get():
+            return pool.get_client("http://ollama:11434")
+
+        try:
+            remote = asyncio.run_coroutine_threadsafe(get(), other).result(5)
+
+            async def run():
+                local = pool.get_client("http://ollama:11434")
+                await pool.aclose()
+                return local
+
+            local = asyncio.run(run())
+            assert local.is_closed and remote.is_closed
+            assert pool.get_stats().clients_open == 0
+        finally:
+            other.call_soon_threadsafe(other.stop)
+            thread.join(5)
+            other.close()
+
+
+class TestOllamaClientUsesPool:
+
+    def _mock_pool(self, handler):
+        pool = HTTPClientPool()
+        transport = httpx.MockTransport(handler)
+        clients = {}
+
+        def get_client(base_url):
+            loop = asyncio.get_running_loop()
+            if loop not in clients:
+                clients[loop] = httpx.AsyncClient(transport=transport)
+            return clients[loop]
+
+        pool.get_client = get_client
+        return pool, clients
+
+    def test_requests_share_one_client(self):
+        from backend.agents.models.ollama import OllamaClient
+
+        seen = []
+
+        def handler(request):
+            seen.append(request.url.path)
+            if request.url.path == "/api/tags":
+                return httpx.Response(200, json={"models": [{"name": "qwen3:8b"}]})
+            body = json.loads(request.content)
+            return httpx.Response(200, json={"model": body["model"], "message": {"content": "ok"}})
+
+        pool, clients = self._mock_pool(handler)
+
+        async def run():
+            a, b = OllamaClient("http://ollama:11434"), OllamaClient("http://ollama:11434")
+            models = await a.list_models()
+            healthy = await b.check_health()
+            reply = await b.chat_completion("qwen3:8b[think:true]", [{"role": "user", "content": "hi"}])
+            return models, healthy, reply
+
+        with patch("backend.agents.models.ollama.http_pool", pool):
+            models, healthy, reply = asyncio.run(run())
+
+        assert models == ["qwen3:8b"]
+        assert healthy is True
+        assert reply["model"] == "qwen3:8b"
+        assert seen == ["/api/tags", "/api/tags", "/api/chat"]
+        assert len(clients) == 1
+
+    def test_error_status_raises(self):
+        from backend.agents.models.ollama import OllamaClient
+
+        pool, _ = self._mock_pool(lambda request: httpx.Response(404, json={"error": "model not found"}))
+
+        async def run():
+            await OllamaClient("http://ollama:11434").generate_completion("missing", "hi")
+
+        with patch("backend.agents.models.ollama.http_pool", pool):
+            with pytest.raises(httpx.HTTPStatusError, match="model not found"):
+                asyncio.run(run())
@@ -0,0 +1,183 @@
+"""Tests for the pipelined batch ingestion."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from backend.retrieval.ingest_pipeline import IngestionPipeline, parse_and_chunk
+
+
+class FakeIngestor:
+    """Minimal stand-in for SmartIngestor's pipeline-facing API."""
+
+    def __init__(self, chunks_per_file=3, fail_files=()):
+        self.chunker = object()  # custom chunker: chunking stays in prepare_file
+        self.chunking_strategy = "simple"
+        self.chunk_size = 512
+        self.chunk_overlap = 2
+        self.collection_name = "coll"
+        self.chunks_per_file = chunks_per_file
+        self.fail_files = set(fail_files)
+
+        self.embedder = MagicMock()
+        self.embedder.embed_documents.side_effect = lambda texts, **kw: np.ones((len(texts), 4))
+        self.vector_store = MagicMock()
+
+    async def prepare_file(self, file_path, **kwargs):
+        name = Path(file_path).name
+        if name in self.fail_files:
+            raise ValueError("broken file")
+        return {
+            "doc_id": f"doc_{name}",
+            "file_path": file_path,
+            "metadata": name,
+            "chunks": [{"text_with_prefix": f"{name}-{i}"} for i in range(self.chunks_per_file)],
+        }
+
+    def build_chunk_metadatas(self, chunks, metadata):
+        return [{"file_name": metadata, "chunk_index": i} for i in range(len(chunks))]
+
+    def build_result(self, prepared, chunk_count):
+        return {"doc_id": prepared["doc_id"], "file_path": prepared["file_path"],
+                "chunk_count": chunk_count}
+
+
+def _files(tmp_path, n):
+    paths = []
+    for i in range(n):
+        p = tmp_path / f"f{i}.txt"
+        p.write_text("x")
+        paths.append(str(p))
+    return paths
+
+
+def _run(pipeline, paths, **kwargs):
+    return asyncio.run(pipeline.run(paths, **kwargs))
+
+
+class TestIngestionPipeline:
+
+    def test_every_file_reported_once(self, tmp_path):
+        ingestor = FakeIngestor()
+        done = []
+        results = _run(
+            IngestionPipeline(ingestor, parse_workers=2),
+            _files(tmp_path, 10),
+            on_file_done=lambda name, result: done.append(name),
+        )
+
+        assert len(results) == 10
+        assert sorted(done) == sorted(f"f{i}.txt" for i in range(10))
+        assert all(r["chunk_count"] == 3 for r in results)
+
+    def test_embedding_batches_span_files(self, tmp_path):
+        ingestor = FakeIngestor(chunks_per_file=2)
+        _run(IngestionPipeline(ingestor, parse_workers=4, queue_size=8), _files(tmp_path, 8))
+
+        embedded = [c.args[0] for c in ingestor.embedder.embed_documents.call_args_list]
+        assert sum(len(t) for t in embedded) == 16
+        assert len(embedded) < 8
+        assert all(c.kwargs["use_cache"] for c in ingestor.embedder.embed_documents.call_args_list)
+
+    def test_writes_are_batched_with_per_document_metadata(self, tmp_path):
+        ingestor = FakeIngestor(chunks_per_file=2)
+        _run(IngestionPipeline(ingestor, parse_workers=4, queue_size=8), _files(tmp_path, 6))
+
+        calls = ingestor.vector_store.add_documents.call_args_list
+        texts = [t for c in calls for t in c.kwargs["texts"]]
+        metadatas = [m for c in calls for m in c.kwargs["metadatas"]]
+        assert len(texts) == 12
+        assert len(calls) < 6
+        for text, meta in zip(texts, metadatas):
+            assert text.startswith(meta["file_name"])
+            assert text.endswith(str(meta["chunk_index"]))
+        assert sum(len(c.kwargs["embeddings"]) for c in calls) == 12
+
+    def test_prepare_failure_is_isolated(self, tmp_path):
+        ingestor = FakeIngestor(fail_files={"f1.txt"})
+        results = _run(IngestionPipeline(ingestor, parse_workers=2), _files(tmp_path, 3))
+
+        failed = [r for r in results if r.get("error")]
+        assert len(failed) == 1
+        assert failed[0]["file_name"] == "f1.txt"
+        assert sum(1 for r in results if r.get("doc_id")) == 2
+
+    def test_embedding_failure_marks_batch_failed(self, tmp_path):
+        ingestor = FakeIngestor()
+        ingestor.embedder.embed_documents.side_effect = RuntimeError("OOM")
+        results = _run(IngestionPipeline(ingestor, parse_workers=1), _files(tmp_path, 3))
+
+        assert len(results) == 3
+        assert all("OOM" in r["error"] for r in results)
+        ingestor.vector_store.add_documents.assert_not_called()
+
+    def test_results_in_input_order(self, tmp_path):
+        ingestor = FakeIngestor()
+        paths = _files(tmp_path, 8)
+        results = _run(IngestionPipeline(ingestor, parse_workers=4), paths)
+
+        assert [r["file_path"] for r in results] == paths
+
+    def test_all_empty_chunks_are_not_embedded(self, tmp_path):
+        ingestor = FakeIngestor(chunks_per_file=2)
+        prepare = ingestor.prepare_file
+
+        async def blank_prepare(file_path, **kwargs):
+            prepared = await prepare(file_path, **kwargs)
+            if Path(file_path).name == "f0.txt":
+                for c in prepared["chunks"]:
+                    c["text_with_prefix"] = "  "
+            return prepared
+
+        ingestor.prepare_file = blank_prepare
+        results = _run(IngestionPipeline(ingestor, parse_workers=1), _files(tmp_path, 2))
+
+        assert [r["chunk_count"] for r in results] == [0, 2]
+        embedded = [t for c in ingestor.embedder.embed_documents.call_args_list for t in c.args[0]]
+        assert embedded == ["f1.txt-0", "f1.txt-1"]
+
+    def test_stage_failure_cancels_other_stages(self, tmp_path):
+        ingestor = FakeIngestor()
+        pipeline = IngestionPipeline(ingestor, parse_workers=1, queue_size=1)
+
+        async def broken_write(*args, **kwargs):
+            raise RuntimeError("writer crashed")
+
+        pipeline._write_batch = broken_write
+
+        async def run():
+            return await asyncio.wait_for(pipeline.run(_files(tmp_path, 6)), timeout=5)
+
+        with pytest.raises(RuntimeError, match="writer crashed"):
+            asyncio.run(run())
+
+    def test_empty_input(self):
+        assert _run(IngestionPipeline(FakeIngestor()), []) == []
+
+
+def test_parse_and_chunk(tmp_path):
+    fitz = pytest.importorskip("fitz")
+    pdf = tmp_path / "paper.pdf"
+    doc = fitz.open()
+    for text in ("CRISPR-Cas9 enables precise genome editing in cells. " * 5,
+                 "PCR amplifies DNA fragments for sequencing. " * 5):
+        doc.new_page().insert_text((72, 72), text)
+    doc.save(str(pdf))
+    doc.close()
+
+    with ThreadPoolExecutor(1) as executor:
+        parsed, page_chunks = executor.submit(
+            parse_and_chunk, str(pdf), ("semantic", 500, 1)
+        ).result()
+
+    assert parsed["num_pages"] == 2
+    assert set(page_chunks) == {p["page_number"] for p in parsed["pages"]}
+    assert all(page_chunks[n] for n in page_chunks)
+
+    parsed_only, none_chunks = parse_and_chunk(str(pdf), None)
+    assert none_chunks is None
+    assert parsed_only["num_pages"] == 2
@@ -0,0 +1,79 @@
+"""Tests for NotebookKernel.execute output routing over the async kernel client."""
+
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip("ipykernel")
+
+from backend.agents.notebook.kernel import NotebookKernel
+
+
+async def _collect(kernel, code, timeout=30):
+    return [output async for output in kernel.execute(code, timeout=timeout)]
+
+
+def _stdout(outputs):
+    return "".join(o.text for o in outputs if o.output_type == "stream")
+
+
+@pytest.fixture
+def kernel_run(tmp_path):
+    """Run a coroutine against a started kernel (stopped afterwards)."""
+    def run(body, count=1):
+        async def main():
+            kernels = [NotebookKernel(f"nb{i}.ipynb", str(tmp_path / f"task_{i}")) for i in range(count)]
+            await asyncio.gather(*(k.start() for k in kernels))
+            try:
+                return await body(*kernels)
+            finally:
+                await asyncio.gather(*(k.stop() for k in kernels))
+        return asyncio.run(main())
+    return run
+
+
+class TestKernelIO:
+
+    def test_outputs_and_errors(self, kernel_run):
+        async def body(kernel):
+            printed = await _collect(kernel, "print('a'); print('b')")
+            result = await _collect(kernel, "6 * 7")
+            failed = await _collect(kernel, "1 / 0")
+            return printed, result, failed
+
+        printed, result, failed = kernel_run(body)
+        assert _stdout(printed) == "a\nb\n"
+        assert result[0].output_type == "execute_result" and result[0].data["text/plain"] == "42"
+        assert failed[0].ename == "ZeroDivisionError"
+        assert not any("\x1b" in line for line in failed[0].traceback)
+
+    def test_concurrent_notebooks_without_executor_threads(self, kernel_run):
+        async def body(*kernels):
+            threads_before = threading.active_count()
+            code = "import time\nfor i in range(3):\n    print(i); time.sleep(0.2)"
+            results = await asyncio.gather(*(_collect(k, code) for k in kernels))
+            return results, threading.active_count() - threads_before
+
+        results, extra_threads = kernel_run(body, count=3)
+        assert all(_stdout(r) == "0\n1\n2\n" for r in results)
+        assert extra_threads <= 0
+
+    def test_timeout_interrupts_and_kernel_stays_usable(self, kernel_run):
+        async def body(kernel):
+            timed_out = await _collect(kernel, "import time; time.sleep(30)", timeout=1)
+            after = await _collect(kernel, "print('ok')")
+            return timed_out, after
+
+        timed_out, after = kernel_run(body)
+        assert timed_out[-1].ename == "TimeoutError"
+        assert _stdout(after) == "ok\n"
+
+    def test_reconnects_on_a_new_event_loop(self, tmp_path):
+        kernel = NotebookKernel("nb.ipynb", str(tmp_path / "task"))
+        asyncio.run(kernel.start())
+        try:
+            outputs = asyncio.run(_collect(kernel, "print('again')"))
+        finally:
+            asyncio.run(kernel.stop())
+        assert _stdout(outputs) == "again\n"
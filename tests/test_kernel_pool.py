@@ -0,0 +1,166 @@
+"""Tests for pre-started notebook kernels and per-notebook locking in KernelRegistry."""
+
+import asyncio
+import os
+import weakref
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("ipykernel")
+
+from backend.agents.notebook.kernel import KernelPool, KernelRegistry
+
+
+async def _run(kernel, code):
+    out = []
+    async for output in kernel.execute(code, timeout=30):
+        if output.output_type == "stream":
+            out.append(output.text)
+        elif output.output_type == "error":
+            raise AssertionError(output.evalue)
+    return "".join(out).strip()
+
+
+async def _wait_ready(pool, count, timeout=60):
+    for _ in range(int(timeout / 0.1)):
+        if pool.ready_count() >= count:
+            return
+        await asyncio.sleep(0.1)
+    raise AssertionError("pool did not fill")
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(KernelRegistry, "_kernels", {})
+    monkeypatch.setattr(KernelRegistry, "_locks", weakref.WeakValueDictionary())
+    monkeypatch.setattr(
+        KernelRegistry, "_pool", KernelPool(sizes={"python3": 1}, idle_timeout=timedelta(minutes=5))
+    )
+    return KernelRegistry
+
+
+class TestKernelPool:
+
+    def test_second_notebook_gets_prestarted_kernel(self, registry, tmp_path):
+        user_dir = tmp_path / "user"
+        task_a, task_b = str(user_dir / "task_1"), str(user_dir / "task_2")
+
+        async def run():
+            try:
+                first = await registry.get_kernel("a.ipynb", task_a)
+                await _wait_ready(registry._pool, 1)
+                second = await registry.get_kernel("b.ipynb", task_b)
+                cwd = await _run(second, "import os; print(os.getcwd())")
+                count = await _run(second, "x = 1\nprint(x)")
+                return first, second, cwd, count, registry.get_pool_stats()
+            finally:
+                await registry.stop_all()
+
+        first, second, cwd, count, stats = asyncio.run(run())
+        assert first is not second
+        assert os.path.samefile(cwd, task_b)
+        assert second.notebook_path == "b.ipynb" and second.execution_count == 2
+        assert count == "1"
+        assert stats.cold_starts == 1 and stats.warm_hits == 1
+        assert not registry._kernels and registry._pool.ready_count() == 0
+
+    def test_notebooks_do_not_serialize_on_one_lock(self, registry, tmp_path, monkeypatch):
+        registry._pool.sizes = {}
+        started = []
+
+        class SlowKernel:
+            def __init__(self, notebook_path, working_dir, kernel_name="python3"):
+                self.notebook_path = notebook_path
+
+            async def start(self):
+                started.append(self.notebook_path)
+                await asyncio.sleep(0.2)
+
+            def is_alive(self):
+                return True
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            t0 = loop.time()
+            await asyncio.gather(
+                registry.get_kernel("a.ipynb", str(tmp_path / "t1")),
+                registry.get_kernel("b.ipynb", str(tmp_path / "t2")),
+                registry.get_kernel("a.ipynb", str(tmp_path / "t1")),
+            )
+            return loop.time() - t0
+
+        monkeypatch.setattr("backend.agents.notebook.kernel.NotebookKernel", SlowKernel)
+        elapsed = asyncio.run(run())
+
+        assert sorted(started) == ["a.ipynb", "b.ipynb"]  # same notebook started once
+        assert elapsed < 0.35
+
+    def test_notebook_locks_are_released(self, registry, tmp_path, monkeypatch):
+        registry._pool.sizes = {}
+
+        class FakeKernel:
+            def __init__(self, notebook_path, working_dir, kernel_name="python3"):
+                pass
+
+            async def start(self):
+                pass
+
+            async def stop(self):
+                pass
+
+        async def run():
+            for i in range(5):
+                await registry.get_kernel(f"{i}.ipynb", str(tmp_path / f"t{i}"))
+                await registry.stop_kernel(f"{i}.ipynb")
+            return len(registry._locks)
+
+        monkeypatch.setattr("backend.agents.notebook.kernel.NotebookKernel", FakeKernel)
+        assert asyncio.run(run()) == 0
+        assert not registry._kernels
+
+    def test_idle_pool_kernels_are_reaped(self, registry, tmp_path):
+        async def run():
+            try:
+                await registry.prewarm(str(tmp_path / "user" / "task_1"))
+                await _wait_ready(registry._pool, 1)
+                registry._pool.idle_timeout = timedelta(0)
+                reaped = await registry.cleanup_idle_kernels()
+                return reaped, registry._pool.ready_count()
+            finally:
+                await registry.stop_all()
+
+        reaped, ready = asyncio.run(run())
+        assert reaped == 1 and ready == 0
+
+    def test_replenish_does_not_count_as_use(self):
+        pool = KernelPool(sizes={"python3": 1}, idle_timeout=timedelta(minutes=5))
+        key = ("python3", "/users/u1")
+        pool._warm = lambda key, generation: asyncio.sleep(0)
+
+        async def run():
+            pool.replenish(*key)
+            first = pool._last_used[key]
+            await asyncio.sleep(0.01)
+            pool.replenish(*key)
+            return first, pool._last_used[key]
+
+        first, second = asyncio.run(run())
+        assert first == second
+
+    def test_pooled_kernel_runs_outside_user_dir(self, registry, tmp_path):
+        user_dir = tmp_path / "user"
+        registry._pool.runtime_dir = str(tmp_path / "pool_runtime")
+
+        async def run():
+            try:
+                await registry.prewarm(str(user_dir / "task_1"))
+                await _wait_ready(registry._pool, 1)
+                kernel = registry._pool._ready[("python3", str(user_dir))][0]
+                return kernel.working_dir
+            finally:
+                await registry.stop_all()
+
+        working_dir = asyncio.run(run())
+        assert working_dir.startswith(str(tmp_path / "pool_runtime"))
+        assert not (user_dir / ".jupyter_runtime").exists()
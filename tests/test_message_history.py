@@ -0,0 +1,83 @@
+"""Tests for keyset-paginated message history and the per-task sequence counter."""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from backend.message_history import (
+    MessageSequence,
+    fetch_message_page,
+    get_message_metadata,
+)
+from backend.models.task import Message
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine, tables=[Message.__table__])
+    with Session(engine) as session:
+        yield session
+
+
+def _add(session, task_id, count, sequencer):
+    first = sequencer.reserve(session, task_id, count)
+    for seq in range(first, first + count):
+        session.add(Message(
+            task_id=task_id, role="assistant", content=f"m{seq}", sequence=seq,
+            timestamp=datetime.now(timezone.utc),
+            metadata_blob={"model": "m", "thinking": "t" * 1000, "tool_calls": [{"name": "x"}]}
+            if seq % 2 else {"model": "m"},
+        ))
+    session.commit()
+
+
+class TestMessageHistory:
+
+    def test_index_exists(self, session):
+        indexes = {ix["name"]: ix["column_names"] for ix in inspect(session.get_bind()).get_indexes("message")}
+        assert indexes["ix_message_task_id_sequence"] == ["task_id", "sequence"]
+
+    def test_sequence_counter_seeds_once(self, session):
+        session.add(Message(task_id="t1", role="user", content="old", sequence=7,
+                            timestamp=datetime.now(timezone.utc)))
+        session.commit()
+        sequencer = MessageSequence()
+        assert sequencer.reserve(session, "t1", 3) == 8
+        assert sequencer.reserve(session, "t1") == 11
+        assert sequencer.reserve(session, "t2") == 1
+
+        sequencer.forget("t1")
+        assert sequencer.reserve(session, "t1") == 8  # re-seeded from the table
+
+    def test_pages_backwards_and_forwards(self, session):
+        sequencer = MessageSequence()
+        _add(session, "t1", 25, sequencer)
+        _add(session, "t2", 5, sequencer)
+
+        latest, more = fetch_message_page(session, "t1", limit=10)
+        assert [m.sequence for m in latest] == list(range(16, 26)) and more
+        older, more = fetch_message_page(session, "t1", before=latest[0].sequence, limit=10)
+        assert [m.sequence for m in older] == list(range(6, 16)) and more
+        oldest, more = fetch_message_page(session, "t1", before=older[0].sequence, limit=10)
+        assert [m.sequence for m in oldest] == list(range(1, 6)) and not more
+
+        newer, more = fetch_message_page(session, "t1", after=20, limit=10)
+        assert [m.sequence for m in newer] == list(range(21, 26)) and not more
+
+    def test_heavy_metadata_is_lazy(self, session):
+        sequencer = MessageSequence()
+        _add(session, "t1", 2, sequencer)
+
+        light, _ = fetch_message_page(session, "t1")
+        assert light[0].metadata_blob == {"model": "m"}
+        assert light[0].omitted_fields == ["thinking", "tool_calls"]
+        assert light[1].metadata_blob == {"model": "m"} and light[1].omitted_fields == []
+
+        full, _ = fetch_message_page(session, "t1", include_heavy=True)
+        assert full[0].metadata_blob["thinking"] == "t" * 1000
+        assert get_message_metadata(session, "t1", light[0].id)["tool_calls"] == [{"name": "x"}]
+        assert get_message_metadata(session, "other", light[0].id) is None
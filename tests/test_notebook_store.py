@@ -0,0 +1,145 @@
+"""Tests for journaled notebook persistence (NotebookStore + NotebookManager journal mode)."""
+
+import base64
+import json
+import os
+
+import nbformat
+import pytest
+
+from backend.agents.notebook import store as notebook_store
+from backend.agents.notebook.manager import NotebookManager
+from backend.agents.notebook.schema import CellOutput
+from backend.agents.notebook.store import BLOB_KEY, NotebookStore
+
+PNG = base64.b64encode(os.urandom(30_000)).decode()
+
+
+def _journal(store):
+    if not store.journal_path.exists():
+        return []
+    with open(store.journal_path) as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    from backend.config import settings
+    monkeypatch.setattr(settings, "NOTEBOOK_STORAGE_MODE", "journal")
+    monkeypatch.setattr(settings, "NOTEBOOK_EXPORT_INTERVAL", 3600)
+    monkeypatch.setattr(notebook_store, "_stores", {})
+    return NotebookManager(str(tmp_path / "task"), "t1")
+
+
+def _add_figure_cell(notebook, source="plot()"):
+    cell = notebook.add_cell(source)
+    cell.outputs = [CellOutput(output_type="display_data", data={"image/png": PNG, "text/plain": "<Figure>"})]
+    cell.execution_count = 1
+    return cell
+
+
+class TestNotebookStore:
+
+    def test_only_changed_cells_are_journaled(self, manager):
+        nb = manager.create_notebook("analysis")
+        store = notebook_store.get_store(manager._get_notebook_path("analysis"))
+        figure = _add_figure_cell(nb)
+        manager.save_notebook(nb)
+        other = nb.add_cell("x = 1")
+        manager.save_notebook(nb)
+        manager.save_notebook(nb)  # nothing changed
+
+        records = [r for r in _journal(store) if r["op"] != "export"]
+        ops = [(r["op"], r.get("id")) for r in records]
+        assert ops == [
+            ("cell", figure.id), ("order", None),
+            ("cell", other.id), ("order", None),
+        ]
+        # The figure went to a blob, referenced from the journal
+        stored = records[0]["cell"]["outputs"][0]["data"]
+        assert stored["text/plain"] == "<Figure>"
+        assert (store.blobs_dir / stored["image/png"][BLOB_KEY]).read_text() == PNG
+
+    def test_reload_and_export_round_trip(self, manager):
+        nb = manager.create_notebook("analysis")
+        _add_figure_cell(nb)
+        nb.add_cell("# notes", cell_type="markdown")
+        manager.save_notebook(nb)
+        nb.delete_cell(nb.cells[1].id)
+        manager.save_notebook(nb)
+
+        # The exported file lags behind (debounced) ...
+        path = manager._get_notebook_path("analysis")
+        assert nbformat.read(str(path), as_version=4).cells == []
+
+        # ... but a fresh manager (another request) sees the journaled state
+        notebook_store._stores.clear()
+        reloaded = NotebookManager(str(manager.workspace_path), "t1").load_notebook("analysis")
+        assert [c.source for c in reloaded.cells] == ["plot()"]
+        assert reloaded.cells[0].outputs[0].data["image/png"] == PNG
+
+        exported = manager.export_notebook("analysis")
+        nb_file = nbformat.read(str(exported), as_version=4)
+        nbformat.validate(nb_file)
+        assert nb_file.cells[0].outputs[0].data["image/png"] == PNG
+
+    def test_external_edit_wins_over_store(self, manager):
+        nb = manager.create_notebook("analysis")
+        nb.add_cell("a = 1")
+        manager.save_notebook(nb)
+        path = manager.export_notebook("analysis")
+
+        edited = nbformat.read(str(path), as_version=4)
+        edited.cells[0].source = "a = 2"
+        nbformat.write(edited, str(path))
+
+        notebook_store._stores.clear()
+        reloaded = manager.load_notebook("analysis")
+        assert reloaded.cells[0].source == "a = 2"
+
+    def test_external_edit_after_load_wins(self, manager):
+        nb = manager.create_notebook("analysis")
+        nb.add_cell("a = 1")
+        manager.save_notebook(nb)
+        path = manager.export_notebook("analysis")
+        assert manager.load_notebook("analysis").cells[0].source == "a = 1"
+
+        # Edited while this process keeps the store loaded (e.g. PUT /files/update)
+        edited = nbformat.read(str(path), as_version=4)
+        edited.cells[0].source = "a = 22"
+        nbformat.write(edited, str(path))
+
+        reloaded = manager.load_notebook("analysis")
+        assert reloaded.cells[0].source == "a = 22"
+        reloaded.add_cell("b = 2")
+        manager.save_notebook(reloaded)
+        manager.export_notebook("analysis")
+        assert [c.source for c in nbformat.read(str(path), as_version=4).cells] == ["a = 22", "b = 2"]
+
+    def test_compaction_drops_unreferenced_blobs(self, tmp_path):
+        store = NotebookStore(tmp_path / "nb.ipynb", export_interval=3600, blob_min_chars=10, compact_after=4)
+        header = {"nbformat": 4, "nbformat_minor": 5, "metadata": {}}
+
+        def cell(png):
+            return {"id": "c1", "cell_type": "code", "source": "", "metadata": {}, "execution_count": 1,
+                    "outputs": [{"output_type": "display_data", "metadata": {}, "data": {"image/png": png}}]}
+
+        for i in range(4):
+            store.save({**header, "cells": [cell(f"{i}" * 20)]})
+
+        # First save exported the file; saves 2-4 journaled one cell each -> compacted
+        assert not store.journal_path.exists()
+        assert len(list(store.blobs_dir.iterdir())) == 1
+        assert store.load()["cells"][0]["outputs"][0]["data"]["image/png"] == "3" * 20
+        store.remove()
+
+    def test_ipynb_mode_is_unchanged(self, tmp_path, monkeypatch):
+        from backend.config import settings
+        monkeypatch.setattr(settings, "NOTEBOOK_STORAGE_MODE", "ipynb")
+        manager = NotebookManager(str(tmp_path / "task"), "t1")
+        nb = manager.create_notebook("plain")
+        nb.add_cell("print(1)")
+        manager.save_notebook(nb)
+
+        assert nbformat.read(str(manager._get_notebook_path("plain")), as_version=4).cells[0].source == "print(1)"
+        assert not (manager.notebooks_dir / ".plain.store").exists()
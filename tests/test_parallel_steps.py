@@ -0,0 +1,160 @@
+"""Tests for depends_on edges and parallel step prefetching in the orchestrator."""
+
+import asyncio
+
+import pytest
+
+from backend.agents.orchestrator.parallel import StepPrefetcher
+from backend.agents.orchestrator.schemas import ExecutionPlan, PlanStep
+
+
+def _step(step_id, tool="web_search", depends_on=None, args=None, role="handyman"):
+    return PlanStep(
+        step_id=step_id,
+        description=step_id,
+        agent_role=role,
+        tool_name=tool,
+        tool_args=args or {},
+        expected_output="",
+        reasoning="",
+        depends_on=depends_on,
+    )
+
+
+def _plan(*steps):
+    return ExecutionPlan(plan_id="p", goal="g", steps=list(steps), reasoning="")
+
+
+class TestDependencies:
+
+    def test_default_is_previous_step(self):
+        plan = _plan(_step("step_1"), _step("step_2"), _step("step_3"))
+        assert plan.dependencies_of(plan.steps[0]) == []
+        assert plan.dependencies_of(plan.steps[2]) == ["step_2"]
+
+    def test_explicit_edges_and_references(self):
+        plan = _plan(
+            _step("step_1", depends_on=[]),
+            _step("step_2", depends_on=[]),
+            _step("step_3", depends_on=["step_2"], args={"query": "compare {{step_1.result}}"}),
+            _step("step_4", depends_on=["step_9"]),
+        )
+        assert plan.dependencies_of(plan.steps[1]) == []
+        assert plan.dependencies_of(plan.steps[2]) == ["step_1", "step_2"]
+        assert plan.dependencies_of(plan.steps[3]) == []
+
+    def test_round_trip(self):
+        plan = ExecutionPlan.from_dict({
+            "goal": "g",
+            "steps": [
+                {"step_id": "step_1", "description": "a", "agent_role": "handyman", "tool_name": "web_search"},
+                {"step_id": "step_2", "description": "b", "agent_role": "editor",
+                 "tool_name": "smart_query", "depends_on": "step_1"},
+            ],
+        })
+        assert plan.steps[0].depends_on is None
+        assert plan.steps[1].depends_on == ["step_1"]
+        assert PlanStep.from_dict(plan.steps[1].to_dict()).depends_on == ["step_1"]
+
+
+class TestStepPrefetcher:
+
+    def _prefetcher(self, log, max_parallel=3, delay=0.01):
+        async def run_step(step):
+            log.append(("start", step.step_id))
+            yield {"type": "step_start", "step_id": step.step_id}
+            await asyncio.sleep(delay)
+            yield {"type": "_step_result", "step_id": step.step_id}
+
+        return StepPrefetcher(
+            run_step=run_step,
+            can_prefetch=lambda s: s.agent_role != "coder" and s.tool_name != "ask_user",
+            is_barrier=lambda s: s.tool_name == "ask_user",
+            max_parallel=max_parallel,
+        )
+
+    def test_independent_steps_start_ahead(self):
+        log = []
+        plan = _plan(
+            _step("step_1", depends_on=[]),
+            _step("step_2", depends_on=[]),
+            _step("step_3", depends_on=["step_1", "step_2"]),
+        )
+
+        async def run():
+            prefetcher = self._prefetcher(log)
+            assert prefetcher.launch_ready(plan) == ["step_2"]
+            await asyncio.sleep(0.05)
+            plan.advance()
+            # step_2 is the cursor now; step_3 still waits for it
+            assert prefetcher.launch_ready(plan) == []
+            events = [e async for e in prefetcher.take(plan.steps[1])]
+            assert prefetcher.take(plan.steps[1]) is None
+            return events
+
+        events = asyncio.run(run())
+        assert log == [("start", "step_2")]
+        assert [e["type"] for e in events] == ["step_start", "_step_result"]
+
+    def test_sequential_plans_are_untouched(self):
+        plan = _plan(_step("step_1"), _step("step_2"), _step("step_3"))
+
+        async def run():
+            return self._prefetcher([]).launch_ready(plan)
+
+        assert asyncio.run(run()) == []
+
+    def test_parallel_limit_barrier_and_coder(self):
+        plan = _plan(
+            _step("step_1", depends_on=[]),
+            _step("step_2", depends_on=[], role="coder"),
+            _step("step_3", depends_on=[]),
+            _step("step_4", depends_on=[]),
+            _step("step_5", tool="ask_user", depends_on=[]),
+            _step("step_6", depends_on=[]),
+        )
+
+        async def run():
+            limited = self._prefetcher([], max_parallel=2)
+            first = limited.launch_ready(plan)
+            await limited.aclose()
+            wide = self._prefetcher([], max_parallel=10)
+            second = wide.launch_ready(plan)
+            await wide.aclose()
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert first == ["step_3"]
+        assert second == ["step_3", "step_4"]
+
+    def test_step_errors_surface_on_take(self):
+        async def failing(step):
+            yield {"type": "step_start", "step_id": step.step_id}
+            raise RuntimeError("tool server went away")
+
+        plan = _plan(_step("step_1", depends_on=[]), _step("step_2", depends_on=[]))
+        prefetcher = StepPrefetcher(failing, lambda s: True, lambda s: False)
+
+        async def run():
+            prefetcher.launch_ready(plan)
+            seen = []
+            with pytest.raises(RuntimeError):
+                async for event in prefetcher.take(plan.steps[1]):
+                    seen.append(event)
+            return seen
+
+        assert len(asyncio.run(run())) == 1
+
+    def test_aclose_cancels_untaken_steps(self):
+        plan = _plan(_step("step_1", depends_on=[]), _step("step_2", depends_on=[]))
+        log = []
+
+        async def run():
+            prefetcher = self._prefetcher(log, delay=10)
+            prefetcher.launch_ready(plan)
+            await asyncio.sleep(0)
+            await prefetcher.aclose()
+            return prefetcher.take(plan.steps[1])
+
+        assert asyncio.run(run()) is None
+        assert log == [("start", "step_2")]
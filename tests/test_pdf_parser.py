@@ -140,5 +140,71 @@ def test_text_cleaning(parser):
         assert page_text == page_text.strip()
 
 
+@pytest.fixture
+def generated_pdf(tmp_path):
+    """Small two-page text PDF built with PyMuPDF."""
+    import fitz
+
+    pdf_path = tmp_path / "generated.pdf"
+    doc = fitz.open()
+    for text in ("CRISPR-Cas9 enables precise genome editing in human cells.",
+                 "The polymerase chain reaction amplifies DNA fragments."):
+        doc.new_page().insert_text((72, 72), text)
+    doc.save(str(pdf_path))
+    doc.close()
+    return pdf_path
+
+
+def test_parsed_document_extras(parser, generated_pdf):
+    """ParsedDocument keeps the dict API and adds hash and rendering."""
+    import hashlib
+    import pickle
+    from backend.retrieval.parsers.pdf import ParsedDocument
+
+    result = parser.parse(str(generated_pdf))
+
+    assert isinstance(result, ParsedDocument)
+    assert result['num_pages'] == 2
+    assert result.file_hash == hashlib.md5(generated_pdf.read_bytes()).hexdigest()
+
+    image = result.render_page(2, dpi=72)
+    assert image.mode == "RGB"
+    assert image.size[0] > 0
+
+    # The open fitz handle is not pickled (worker processes return these)
+    restored = pickle.loads(pickle.dumps(result))
+    assert restored == result
+    assert restored._doc is None
+    assert restored.file_hash == result.file_hash
+    result.close()
+
+
+def test_smart_ingestor_parses_once(generated_pdf):
+    """prepare_file parses the PDF once for metadata, type refinement and chunks."""
+    import asyncio
+    from unittest.mock import MagicMock, patch
+    from backend.retrieval.smart_ingestor import SmartIngestor
+
+    chunker = MagicMock()
+    chunker.chunk_text.side_effect = lambda text, page_num: [{"text": text, "page_num": page_num}]
+    registry = MagicMock()
+    registry.register.return_value = "doc_1"
+    ingestor = SmartIngestor(
+        registry=registry,
+        vector_store=MagicMock(),
+        embedder=MagicMock(),
+        chunker=chunker,
+        collection_name="coll",
+        user_id="user",
+    )
+
+    with patch.object(PDFParser, "parse", autospec=True, side_effect=PDFParser.parse) as parse:
+        prepared = asyncio.run(ingestor.prepare_file(str(generated_pdf)))
+
+    assert parse.call_count == 1
+    assert prepared["doc_id"] == "doc_1"
+    assert len(prepared["chunks"]) == 2
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
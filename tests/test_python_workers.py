@@ -0,0 +1,117 @@
+"""Tests for venv readiness fingerprints and the pre-warmed execute_python workers."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from backend.mcp.custom import dependencies
+from backend.mcp.custom.python_workers import PythonWorkerPool
+
+
+@pytest.fixture
+def fake_uv(monkeypatch):
+    """Record uv calls; `uv venv` creates a venv python that points at sys.executable."""
+    calls = []
+
+    def run_uv(args, cwd):
+        calls.append(args[:2])
+        if args[0] == "venv":
+            bin_dir = os.path.join(cwd, ".venv", "bin")
+            os.makedirs(bin_dir, exist_ok=True)
+            os.symlink(sys.executable, os.path.join(bin_dir, "python"))
+        return ""
+
+    monkeypatch.setattr(dependencies, "_run_uv_command", run_uv)
+    return calls
+
+
+class TestVenvFingerprint:
+
+    def test_provisions_once(self, tmp_path, fake_uv):
+        user_root = str(tmp_path / "user")
+        python_exec = dependencies.ensure_venv(user_root)
+        assert fake_uv == [["venv", ".venv"], ["pip", "install"]]
+        assert dependencies.is_venv_ready(user_root)
+
+        assert dependencies.ensure_venv(user_root) == python_exec
+        assert len(fake_uv) == 2
+
+    def test_package_set_change_reprovisions(self, tmp_path, fake_uv, monkeypatch):
+        user_root = str(tmp_path / "user")
+        dependencies.ensure_venv(user_root)
+
+        monkeypatch.setattr(dependencies, "DEFAULT_PACKAGES", dependencies.DEFAULT_PACKAGES + ["polars"])
+        assert not dependencies.is_venv_ready(user_root)
+        dependencies.ensure_venv(user_root)
+        # The venv already exists: only the install is redone
+        assert fake_uv[2:] == [["pip", "install"]]
+        assert dependencies.is_venv_ready(user_root)
+
+    def test_corrupt_marker_is_not_ready(self, tmp_path, fake_uv):
+        user_root = tmp_path / "user"
+        dependencies.ensure_venv(str(user_root))
+        (user_root / ".venv" / dependencies.READY_MARKER).write_text("{not json")
+        assert not dependencies.is_venv_ready(str(user_root))
+
+
+class TestPythonWorkerPool:
+
+    def _run(self, pool, tmp_path, code, timeout=30):
+        script = tmp_path / "job.py"
+        script.write_text(code)
+        return pool.run(sys.executable, str(script), cwd=str(tmp_path), timeout=timeout,
+                        env=dict(os.environ))
+
+    def test_runs_script_in_cwd_with_warm_worker(self, tmp_path):
+        pool = PythonWorkerPool(pool_size=1, preload=["json"])
+        try:
+            first = self._run(pool, tmp_path, "import os\nprint(os.getcwd())\n")
+            second = self._run(pool, tmp_path, "print(__name__)\n")
+        finally:
+            pool.invalidate()
+
+        assert first.returncode == 0
+        assert os.path.samefile(first.stdout.strip(), tmp_path)
+        assert second.stdout == "__main__\n"
+        stats = pool.get_stats()
+        assert stats.cold_starts == 1 and stats.warm_starts == 1
+
+    def test_workers_are_single_use(self, tmp_path):
+        pool = PythonWorkerPool(pool_size=1, preload=[])
+        try:
+            self._run(pool, tmp_path, "import builtins\nbuiltins.leaked = 1\n")
+            result = self._run(pool, tmp_path, "import builtins\nprint(hasattr(builtins, 'leaked'))\n")
+        finally:
+            pool.invalidate()
+        assert result.stdout == "False\n"
+
+    def test_errors_and_exit_codes(self, tmp_path):
+        pool = PythonWorkerPool(pool_size=0, preload=[])
+        failed = self._run(pool, tmp_path, "print('before')\nraise ValueError('boom')\n")
+        exited = self._run(pool, tmp_path, "import sys\nsys.exit(3)\n")
+
+        assert failed.returncode == 1 and failed.stdout == "before\n"
+        assert "ValueError: boom" in failed.stderr
+        assert "runpy" not in failed.stderr
+        assert exited.returncode == 3
+
+    def test_timeout_kills_worker(self, tmp_path):
+        pool = PythonWorkerPool(pool_size=0, preload=[])
+        with pytest.raises(subprocess.TimeoutExpired):
+            self._run(pool, tmp_path, "import time\ntime.sleep(30)\n", timeout=0.5)
+        assert pool.get_stats().timeouts == 1
+
+    def test_env_change_discards_idle_workers(self, tmp_path):
+        pool = PythonWorkerPool(pool_size=1, preload=[])
+        try:
+            self._run(pool, tmp_path, "pass\n")
+            script = tmp_path / "env.py"
+            script.write_text("import os\nprint(os.environ['MENTORI_TEST_FLAG'])\n")
+            result = pool.run(sys.executable, str(script), cwd=str(tmp_path), timeout=30,
+                              env={**os.environ, "MENTORI_TEST_FLAG": "new"})
+        finally:
+            pool.invalidate()
+        assert result.stdout == "new\n"
+        assert pool.get_stats().discarded >= 1
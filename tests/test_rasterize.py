@@ -0,0 +1,112 @@
+"""Tests for page-selective, streaming rasterization (OCR and VLM paths)."""
+
+import asyncio
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import fitz
+import pytest
+
+from backend.retrieval.parsers import rasterize
+from backend.retrieval.parsers.ocr import OCRParser
+from backend.retrieval.parsers.rasterize import iter_page_images
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "scan.pdf"
+    doc = fitz.open()
+    for i in range(6):
+        doc.new_page().insert_text((72, 72), f"Page {i + 1}")
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+class TestIterPageImages:
+
+    def test_renders_only_requested_pages(self, pdf_path):
+        with patch.object(rasterize, "render_page", wraps=rasterize.render_page) as render:
+            pages = [n for n, _ in iter_page_images(pdf_path, [2, 5], dpi=36)]
+
+        assert pages == [2, 5]
+        assert [c.args[1] for c in render.call_args_list] == [2, 5]
+
+    def test_is_lazy(self, pdf_path):
+        with patch.object(rasterize, "render_page", wraps=rasterize.render_page) as render:
+            images = iter_page_images(pdf_path, dpi=36)
+            assert render.call_count == 0
+            next(images)
+            assert render.call_count == 1
+            images.close()
+
+    def test_out_of_range_pages_skipped(self, pdf_path):
+        assert [n for n, _ in iter_page_images(pdf_path, [0, 3, 99], dpi=36)] == [3]
+
+
+class TestOCRParser:
+
+    def test_only_requested_pages_in_order(self, pdf_path):
+        with patch("backend.retrieval.parsers.ocr.pytesseract.image_to_string",
+                   side_effect=lambda img: f"{img.size[0]}px"):
+            results = OCRParser(dpi=36).parse(pdf_path, page_numbers=[4, 1])
+
+        assert [r["page_number"] for r in results] == [4, 1]
+        assert all(r["method"] == "ocr" for r in results)
+
+    def test_bounded_concurrency(self, pdf_path):
+        active, peak = 0, 0
+        lock = threading.Lock()
+
+        def fake_ocr(image):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return "text"
+
+        with patch("backend.retrieval.parsers.ocr.pytesseract.image_to_string", side_effect=fake_ocr):
+            results = OCRParser(dpi=36, max_concurrent=2).parse(pdf_path)
+
+        assert [r["page_number"] for r in results] == [1, 2, 3, 4, 5, 6]
+        assert peak <= 2
+
+    def test_page_failure_is_isolated(self, pdf_path):
+        def fake_ocr(image):
+            raise RuntimeError("tesseract crashed")
+
+        with patch("backend.retrieval.parsers.ocr.pytesseract.image_to_string", side_effect=fake_ocr):
+            results = OCRParser(dpi=36).parse(pdf_path, page_numbers=[1])
+
+        assert results[0]["method"] == "ocr_failed"
+
+
+class TestPageAnalyzerStreaming:
+
+    def test_pages_rendered_within_semaphore(self, pdf_path):
+        from backend.retrieval.extractors.page_analyzer import PageAnalyzer
+        from backend.retrieval.schema.document import PageAnalysisResult
+
+        analyzer = PageAnalyzer(model_name="fake-vlm", dpi=36)
+        live_pngs = set()
+        peak = 0
+
+        async def fake_analyze(page_path, page_number, ocr_text=None):
+            nonlocal peak
+            assert os.path.exists(page_path)
+            live_pngs.add(page_path)
+            peak = max(peak, len(live_pngs))
+            await asyncio.sleep(0.01)
+            live_pngs.discard(page_path)
+            return PageAnalysisResult(page_number=page_number, ocr_text=ocr_text)
+
+        with patch.object(analyzer, "analyze_page", side_effect=fake_analyze):
+            results = asyncio.run(analyzer.analyze_pdf(pdf_path, max_concurrent=2))
+
+        assert [r.page_number for r in results] == [1, 2, 3, 4, 5, 6]
+        assert peak <= 2
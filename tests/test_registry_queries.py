@@ -0,0 +1,92 @@
+"""Tests for batched author lookups and ranked full-text search in DocumentRegistry."""
+
+import pytest
+
+from backend.retrieval.schema import registry as registry_module
+from backend.retrieval.schema.document import DocumentMetadata, DocumentType
+from backend.retrieval.schema.registry import DocumentRegistry
+
+
+def _doc(i, title, text="", authors=None):
+    return DocumentMetadata(
+        doc_id=f"doc-{i}", file_path=f"/data/doc_{i}.pdf", file_name=f"doc_{i}.pdf",
+        doc_type=DocumentType.PAPER, title=title, searchable_text=text,
+        authors=authors if authors is not None else [f"Author {i}", "Valerio Bianchi"],
+        user_id="u1", collection_name="c1",
+    )
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry_module, "_pool", registry_module._ConnectionPool())
+    monkeypatch.setattr(registry_module, "_author_caches", {})
+    registry = DocumentRegistry(str(tmp_path / "registry.db"))
+    yield registry
+    registry.close()
+
+
+@pytest.fixture
+def statements(registry):
+    """SQL statements executed on this thread's registry connection."""
+    executed = []
+    registry_module._pool.get(registry.db_path).set_trace_callback(executed.append)
+    yield executed
+    registry_module._pool.get(registry.db_path).set_trace_callback(None)
+
+
+def _author_queries(statements):
+    return [s for s in statements if "FROM document_authors" in s and "author_name LIKE" not in s]
+
+
+class TestRegistryQueries:
+
+    def test_authors_are_loaded_in_one_query_and_cached(self, registry, statements):
+        for i in range(20):
+            registry.register(_doc(i, f"Paper {i}"))
+
+        statements.clear()
+        docs = registry.get_by_author("Bianchi")
+        assert len(docs) == 20
+        assert all(d["authors"] == [f"Author {d['doc_id'][4:]}", "Valerio Bianchi"] for d in docs)
+        assert len(_author_queries(statements)) == 1
+
+        statements.clear()
+        registry.get_all_documents()
+        registry.get_document("doc-3")
+        assert _author_queries(statements) == []  # served from the cache
+
+    def test_cache_is_invalidated_on_register_and_delete(self, registry, tmp_path):
+        registry.register(_doc(1, "Paper"))
+        assert registry.get_document("doc-1")["authors"] == ["Author 1", "Valerio Bianchi"]
+
+        # Another registry on the same file shares (and invalidates) the cache
+        other = DocumentRegistry(str(tmp_path / "registry.db"))
+        other.register(_doc(1, "Paper", authors=["Someone Else"]))
+        assert registry.get_document("doc-1")["authors"] == ["Someone Else"]
+
+        assert registry.delete_document("doc-1")
+        assert registry.get_document("doc-1") is None
+
+    def test_fulltext_is_ranked_and_paged(self, registry):
+        registry.register(_doc(1, "Notes", "a remark about proteomics in passing"))
+        registry.register(_doc(2, "Proteomics of yeast", "proteomics proteomics methods"))
+        registry.register(_doc(3, "Unrelated", "nothing to see"))
+        registry.register(_doc(4, "Genomics", "proteomics and genomics"))
+
+        ranked = registry.search_fulltext("proteomics")
+        assert [d["doc_id"] for d in ranked][0] == "doc-2"
+        assert {d["doc_id"] for d in ranked} == {"doc-1", "doc-2", "doc-4"}
+        assert ranked[0]["score"] >= ranked[-1]["score"]
+        assert all(d["authors"] for d in ranked)
+
+        page = registry.search_fulltext("proteomics", limit=1, offset=1)
+        assert [d["doc_id"] for d in page] == [ranked[1]["doc_id"]]
+
+        with_snippet = registry.search_fulltext("yeast", snippet=True)
+        assert "[yeast]" in with_snippet[0]["snippet"].lower()
+
+    def test_title_search_is_restricted_to_titles(self, registry):
+        registry.register(_doc(1, "Deep Learning for Cells", "learning"))
+        registry.register(_doc(2, "Other", "deep learning everywhere"))
+        assert [d["doc_id"] for d in registry.search_title("Deep Learning")] == ["doc-1"]
+        assert registry.search_title('quote " inside') == []
@@ -0,0 +1,259 @@
+"""Tests for the priority/fairness request scheduler used by ModelRouter."""
+
+import asyncio
+import json
+
+import pytest
+
+from backend.agents.request_scheduler import (
+    Priority,
+    RequestScheduler,
+    get_request_priority,
+    request_priority,
+)
+
+
+async def _hold(scheduler, order, name, release, model="m", **kwargs):
+    async with scheduler.slot("ollama", model, **kwargs):
+        order.append(name)
+        await release.wait()
+
+
+async def _start(coro):
+    """Start a task and let it reach the scheduler."""
+    task = asyncio.create_task(coro)
+    await asyncio.sleep(0)
+    return task
+
+
+class TestRequestScheduler:
+
+    def test_limit_resolution(self):
+        s = RequestScheduler(limits={"ollama": 2, "ollama::big": 1}, default_limit=5)
+        assert s.limit_for("ollama", "small") == 2
+        assert s.limit_for("ollama", "big") == 1
+        assert s.limit_for("gemini", "flash") == 5
+        assert RequestScheduler(limits={"ollama": 2, "ollama::big": 4}).limit_for("ollama", "big") == 2
+
+    def test_cap_is_enforced(self):
+        s = RequestScheduler(limits={"ollama": 2})
+        peak = 0
+        running = 0
+
+        async def call():
+            nonlocal peak, running
+            async with s.slot("ollama", "m"):
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        async def run():
+            await asyncio.gather(*(call() for _ in range(8)))
+            return s.get_stats()
+
+        stats = asyncio.run(run())
+        assert peak == 2
+        assert stats.lanes["orchestration"].granted == 8
+        assert stats.resources["ollama::m"] == {"limit": 2, "active": 0, "queued": 0}
+
+    def test_priority_order(self):
+        s = RequestScheduler(limits={"ollama": 1})
+        order = []
+
+        async def run():
+            gate = asyncio.Event()
+            release = asyncio.Event()
+            blocker = await _start(_hold(s, order, "blocker", gate))
+            tasks = [
+                await _start(_hold(s, order, "bg", release, priority=Priority.BACKGROUND)),
+                await _start(_hold(s, order, "orch", release, priority=Priority.ORCHESTRATION)),
+                await _start(_hold(s, order, "chat", release, priority=Priority.INTERACTIVE)),
+            ]
+            assert s.get_stats().resources["ollama::m"]["queued"] == 3
+            release.set()
+            gate.set()
+            await asyncio.gather(blocker, *tasks)
+
+        asyncio.run(run())
+        assert order == ["blocker", "chat", "orch", "bg"]
+
+    def test_models_share_provider_slots(self):
+        s = RequestScheduler(limits={"ollama": 1})
+        order = []
+
+        async def run():
+            gate = asyncio.Event()
+            release = asyncio.Event()
+            blocker = await _start(_hold(s, order, "blocker", gate, model="vlm"))
+            bg = await _start(_hold(s, order, "bg", release, model="llava", priority=Priority.BACKGROUND))
+            chat = await _start(_hold(s, order, "chat", release, model="llama3", priority=Priority.INTERACTIVE))
+            stats = s.get_stats().resources
+            assert stats["ollama"] == {"limit": 1, "active": 1, "queued": 2}
+            assert stats["ollama::llama3"]["queued"] == 1
+            release.set()
+            gate.set()
+            await asyncio.gather(blocker, bg, chat)
+
+        asyncio.run(run())
+        assert order == ["blocker", "chat", "bg"]
+
+    def test_model_cap_nests_inside_provider_cap(self):
+        s = RequestScheduler(limits={"ollama": 3, "ollama::big": 1})
+        order = []
+
+        async def run():
+            release = asyncio.Event()
+            tasks = [
+                await _start(_hold(s, order, "big1", release, model="big")),
+                await _start(_hold(s, order, "big2", release, model="big")),
+                await _start(_hold(s, order, "small", release, model="small")),
+            ]
+            # big2 waits on its model cap without holding back other models
+            assert order == ["big1", "small"]
+            assert s.get_stats().resources["ollama::big"] == {"limit": 1, "active": 1, "queued": 1}
+            release.set()
+            await asyncio.gather(*tasks)
+            assert s.get_stats().resources["ollama"]["active"] == 0
+
+        asyncio.run(run())
+        assert order == ["big1", "small", "big2"]
+
+    def test_round_robin_between_users(self):
+        s = RequestScheduler(limits={"ollama": 1})
+        order = []
+
+        async def run():
+            gate = asyncio.Event()
+            release = asyncio.Event()
+            release.set()
+            blocker = await _start(_hold(s, order, "blocker", gate))
+            tasks = [await _start(_hold(s, order, f"a{i}", release, user_id="alice")) for i in range(3)]
+            tasks.append(await _start(_hold(s, order, "b0", release, user_id="bob")))
+            gate.set()
+            await asyncio.gather(blocker, *tasks)
+
+        asyncio.run(run())
+        assert order == ["blocker", "a0", "b0", "a1", "a2"]
+
+    def test_background_keeps_last_slot_free(self):
+        s = RequestScheduler(limits={"ollama": 2})
+        order = []
+
+        async def run():
+            release = asyncio.Event()
+            first = await _start(_hold(s, order, "bg1", release, priority=Priority.BACKGROUND))
+            second = await _start(_hold(s, order, "bg2", release, priority=Priority.BACKGROUND))
+            chat = await _start(_hold(s, order, "chat", release, priority=Priority.INTERACTIVE))
+            assert order == ["bg1", "chat"]
+            release.set()
+            await asyncio.gather(first, second, chat)
+
+        asyncio.run(run())
+        assert order == ["bg1", "chat", "bg2"]
+
+    def test_context_priority_and_user(self):
+        s = RequestScheduler(limits={"ollama": 1})
+        order = []
+
+        async def run():
+            gate = asyncio.Event()
+            release = asyncio.Event()
+            blocker = await _start(_hold(s, order, "blocker", gate))
+            with request_priority(Priority.BACKGROUND, user_id="ingest"):
+                assert get_request_priority() == (Priority.BACKGROUND, "ingest")
+                bg = await _start(_hold(s, order, "bg", release))
+            orch = await _start(_hold(s, order, "orch", release))
+            release.set()
+            gate.set()
+            await asyncio.gather(blocker, bg, orch)
+
+        asyncio.run(run())
+        assert get_request_priority() == (None, None)
+        assert order == ["blocker", "orch", "bg"]
+        assert s.get_stats().lanes["background"].granted == 1
+
+    def test_cancelled_waiter_leaves_queue(self):
+        s = RequestScheduler(limits={"ollama": 1})
+        order = []
+
+        async def run():
+            gate = asyncio.Event()
+            release = asyncio.Event()
+            release.set()
+            blocker = await _start(_hold(s, order, "blocker", gate))
+            doomed = await _start(_hold(s, order, "doomed", release))
+            after = await _start(_hold(s, order, "after", release))
+            doomed.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await doomed
+            gate.set()
+            await asyncio.gather(blocker, after)
+            return s.get_stats()
+
+        stats = asyncio.run(run())
+        assert order == ["blocker", "after"]
+        lane = stats.lanes["orchestration"]
+        assert lane.cancelled == 1
+        assert lane.queued == 0
+        assert stats.resources["ollama::m"]["active"] == 0
+
+    def test_wait_metrics(self):
+        s = RequestScheduler(limits={"ollama": 1})
+
+        async def call():
+            async with s.slot("ollama", "m"):
+                await asyncio.sleep(0.02)
+
+        async def run():
+            await asyncio.gather(call(), call())
+
+        asyncio.run(run())
+        lane = s.get_stats().lanes["orchestration"]
+        assert lane.submitted == lane.granted == 2
+        assert lane.max_wait >= 0.015
+        assert 0 < lane.avg_wait <= lane.max_wait
+
+    def test_unlimited_bypasses_queue(self):
+        s = RequestScheduler(limits={"ollama": 0})
+
+        async def run():
+            async with s.slot("ollama", "m"):
+                pass
+
+        asyncio.run(run())
+        assert s.get_stats().lanes["orchestration"].submitted == 0
+
+
+class TestModelRouterScheduling:
+
+    def test_router_routes_through_scheduler(self):
+        from backend.agents.model_router import ModelRouter
+
+        scheduler = RequestScheduler(limits={"ollama": 1})
+        router = ModelRouter(scheduler=scheduler)
+        seen = []
+
+        async def fake_chat(**kwargs):
+            seen.append(scheduler.get_stats().resources["ollama"]["active"])
+            return {"message": {"content": "ok"}}
+
+        async def fake_stream(**kwargs):
+            yield json.dumps({"message": {"content": "hi"}})
+
+        router.ollama.chat_completion = fake_chat
+        router.ollama.chat_completion_stream = fake_stream
+
+        async def run():
+            await router.chat("ollama::llama3[think:high]", [{"role": "user", "content": "x"}])
+            chunks = [c async for c in router.chat_stream(
+                "ollama::llama3", [], priority=Priority.INTERACTIVE
+            )]
+            return chunks
+
+        chunks = asyncio.run(run())
+        assert seen == [1]
+        assert len(chunks) == 1
+        lanes = scheduler.get_stats().lanes
+        assert lanes["orchestration"].granted == 1
+        assert lanes["interactive"].granted == 1
@@ -0,0 +1,105 @@
+"""Tests for the process-wide retriever pool."""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from backend.retrieval.retriever_pool import RetrieverPool
+
+
+def _fake_retriever(count: int = 10):
+    """A SimpleRetriever stand-in whose collection reports `count` chunks."""
+    retriever = MagicMock()
+    retriever.vector_store.count.return_value = count
+    retriever.bm25_build_count = 0
+    return retriever
+
+
+@pytest.fixture
+def patched_retriever():
+    """Patch SimpleRetriever construction inside the pool module."""
+    with patch("backend.retrieval.retriever_pool.SimpleRetriever") as cls:
+        cls.side_effect = lambda **kwargs: _fake_retriever()
+        yield cls
+
+
+class TestRetrieverPool:
+    """Tests for the RetrieverPool class."""
+
+    def test_same_key_reuses_retriever(self, patched_retriever):
+        """Second lookup for the same collection/model should be a hit."""
+        pool = RetrieverPool()
+        first = pool.get("collection_a", "BAAI/bge-m3")
+        second = pool.get("collection_a", "BAAI/bge-m3")
+
+        assert first is second
+        assert patched_retriever.call_count == 1
+        stats = pool.get_stats()
+        assert stats.hits == 1
+        assert stats.misses == 1
+
+    def test_default_model_shares_entry(self, patched_retriever):
+        """No embedding model means the default model, not a separate entry."""
+        pool = RetrieverPool()
+        assert pool.get("collection_a") is pool.get("collection_a", "BAAI/bge-m3")
+
+    def test_different_models_do_not_collide(self, patched_retriever):
+        """Same collection with different embedding models gets separate retrievers."""
+        pool = RetrieverPool()
+        a = pool.get("collection_a", "BAAI/bge-m3")
+        b = pool.get("collection_a", "all-MiniLM-L6-v2")
+        assert a is not b
+        assert pool.get_stats().current_entries == 2
+
+    def test_invalidate_forces_rebuild(self, patched_retriever):
+        """Invalidation drops every entry for the collection only."""
+        pool = RetrieverPool()
+        a = pool.get("collection_a")
+        other = pool.get("collection_b")
+
+        pool.invalidate("collection_a")
+
+        assert pool.get("collection_a") is not a
+        assert pool.get("collection_b") is other
+        assert pool.get_stats().invalidations == 1
+
+    def test_chunk_count_change_forces_rebuild(self, patched_retriever):
+        """Chunks added outside the pool's knowledge are detected on lookup."""
+        pool = RetrieverPool()
+        first = pool.get("collection_a")
+        first.vector_store.count.return_value = 25
+
+        second = pool.get("collection_a")
+
+        assert second is not first
+        assert pool.get_stats().invalidations == 1
+
+    def test_lru_eviction(self, patched_retriever):
+        """Least recently used entry is evicted when the pool is full."""
+        pool = RetrieverPool(max_entries=2)
+        a = pool.get("a")
+        pool.get("b")
+        pool.get("a")  # touch a so b is the oldest
+        pool.get("c")
+
+        stats = pool.get_stats()
+        assert stats.current_entries == 2
+        assert stats.evictions == 1
+        assert pool.get("a") is a
+
+    def test_rebuild_count_survives_eviction(self, patched_retriever):
+        """BM25 builds are still counted after the retriever leaves the pool."""
+        pool = RetrieverPool()
+        retriever = pool.get("collection_a")
+        retriever.bm25_build_count = 1
+
+        assert pool.get_stats().rebuilds == 1
+        pool.invalidate("collection_a")
+        assert pool.get_stats().rebuilds == 1
+
+    def test_hit_rate(self, patched_retriever):
+        """Hit rate reflects hits over total lookups."""
+        pool = RetrieverPool()
+        pool.get("collection_a")
+        pool.get("collection_a")
+        pool.get("collection_a")
+        assert pool.hit_rate == pytest.approx(2 / 3)
@@ -452,6 +452,142 @@ for i in range(10000):
         assert "my_list" in user_vars
         assert "my_dict" in user_vars
 
+    def test_reassigned_variables_are_captured(self, mock_context, mock_model_router):
+        """Later assignments win, and nothing is reset on the next execution."""
+        executor = RLMExecutor(mock_context, mock_model_router, "test-model")
+
+        executor.execute_code("x = 1")
+        executor.execute_code("x = 2")
+        _, result = executor.execute_code("x")
+
+        assert result == 2
+        assert executor.get_user_variables()["x"] == 2
+        assert "list_documents" not in executor.get_user_variables()
+
+    def test_trailing_expression_spanning_lines(self, mock_context, mock_model_router):
+        """The final expression is split off by the parser, not by lines."""
+        executor = RLMExecutor(mock_context, mock_model_router, "test-model")
+
+        output, result = executor.execute_code("items = [3, 1, 2]\nsorted(\n    items\n)\n# done")
+
+        assert result == [1, 2, 3]
+        assert output == ""
+
+    def test_variables_before_error_are_kept(self, mock_context, mock_model_router):
+        """Assignments that ran before an exception are still captured."""
+        executor = RLMExecutor(mock_context, mock_model_router, "test-model")
+
+        output, _ = executor.execute_code("partial = 5\n1 / 0")
+
+        assert "ZeroDivisionError" in output
+        assert executor.get_user_variables()["partial"] == 5
+
+    def test_compiled_snippets_are_cached(self, mock_context, mock_model_router):
+        """Repeated snippets are compiled once."""
+        from backend.retrieval.rlm.executor import _compile_snippet
+
+        executor = RLMExecutor(mock_context, mock_model_router, "test-model")
+        _compile_snippet.cache_clear()
+
+        for _ in range(3):
+            executor.execute_code("docs = list_documents()\nlen(docs)")
+
+        info = _compile_snippet.cache_info()
+        assert (info.hits, info.misses) == (2, 1)
+
+
+class TestRLMExecutorBatch:
+    """Tests for the batched sub-LLM primitives (llm_query_batch / llm_map)."""
+
+    @staticmethod
+    def _slow_router(delays):
+        """Router whose answer echoes the prompt after a per-prompt delay; tracks calls in flight."""
+        router = MagicMock()
+        state = {"in_flight": 0, "peak": 0}
+
+        async def generate(model_identifier, prompt, options=None):
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            key = prompt.rsplit("Task: ", 1)[-1]
+            await asyncio.sleep(delays.get(key, 0.01))
+            state["in_flight"] -= 1
+            return {"response": f"answer:{key}", "eval_count": 10, "prompt_eval_count": 20}
+
+        router.generate = AsyncMock(side_effect=generate)
+        return router, state
+
+    def test_query_batch_runs_concurrently_in_order(self, mock_context):
+        """Results keep prompt order even when later prompts finish first."""
+        router, state = self._slow_router({"q0": 0.2, "q1": 0.1, "q2": 0.0})
+        executor = RLMExecutor(mock_context, router, "test-model")
+
+        answers = executor.namespace["llm_query_batch"](
+            ["q0", "q1", "q2"], context_chunks=[["c"], "c", []], concurrency=3
+        )
+
+        assert answers == ["answer:q0", "answer:q1", "answer:q2"]
+        assert state["peak"] == 3
+        assert mock_context.llm_calls_made == 3
+        assert mock_context.total_tokens_used == 90
+
+    def test_concurrency_cap(self, mock_context):
+        """No more than `concurrency` calls are in flight."""
+        router, state = self._slow_router({})
+        executor = RLMExecutor(mock_context, router, "test-model")
+
+        executor._sync_llm_query_batch([f"q{i}" for i in range(6)], concurrency=2)
+
+        assert state["peak"] == 2
+
+    def test_budget_stops_remaining_calls(self, mock_context):
+        """Calls not yet started once max_tokens is spent are skipped."""
+        router, _ = self._slow_router({})
+        mock_context.max_tokens = 25
+        executor = RLMExecutor(mock_context, router, "test-model")
+
+        answers = executor._sync_llm_query_batch(["q0", "q1", "q2"], concurrency=1)
+
+        assert answers[0] == "answer:q0"
+        assert all(a.startswith("[ERROR] Token budget exhausted") for a in answers[1:])
+        assert router.generate.await_count == 1
+
+    def test_llm_map_modes(self, mock_context, mock_model_router, sample_chunks):
+        """llm_map returns what the single-call function would, per group."""
+        executor = RLMExecutor(mock_context, mock_model_router, "test-model")
+
+        summaries = executor._sync_llm_map("Summarize the methods", [sample_chunks[:2], sample_chunks[2]])
+        assert len(summaries) == 2
+        assert all("CRISPR" in s["summary"] for s in summaries)
+
+        answers = executor._sync_llm_map("What is this about?", ["text one", "text two"], mode="query")
+        assert answers == ["This is a mock LLM response about the content."] * 2
+
+        with pytest.raises(ValueError):
+            executor._sync_llm_map("task", [sample_chunks], mode="extract")
+        with pytest.raises(ValueError):
+            executor._sync_llm_query_batch(["a", "b"], context_chunks=[["only one group"]])
+
+    def test_batch_available_in_repl(self, mock_context, mock_model_router):
+        """The primitives are exposed to generated code."""
+        executor = RLMExecutor(mock_context, mock_model_router, "test-model")
+
+        executor.execute_code('answers = llm_query_batch(["a", "b"])')
+        _, result = executor.execute_code("len(answers)")
+
+        assert result == 2
+
+    def test_gemini_uses_async_client_on_background_loop(self, mock_context, mock_model_router):
+        """Gemini sub-calls on the background loop go through the async client."""
+        executor = RLMExecutor(mock_context, mock_model_router, "gemini::gemini-test")
+        fake = AsyncMock(return_value={"response": "async", "eval_count": 1, "prompt_eval_count": 1})
+
+        with patch("backend.retrieval.rlm.executor._run_async_gemini", fake), \
+                patch("backend.retrieval.rlm.executor._run_sync_gemini", side_effect=AssertionError):
+            answers = executor._sync_llm_query_batch(["a", "b"])
+
+        assert answers == ["async", "async"]
+        assert fake.await_count == 2
+
 
 # ============== SUMMARIZER TESTS ==============
 
@@ -622,6 +758,98 @@ results = search_keyword("CRISPR")
         assert "final" in event_types or "error" in event_types
 
 
+# ============== VERIFICATION TESTS ==============
+
+class TestReportVerifier:
+    """Tests for concurrent, batched claim verification."""
+
+    REPORT = (
+        "## Findings\n"
+        "CRISPR-Cas9 enables precise genome editing in many organisms [1]. "
+        "Off-target effects remain a concern for clinical use [2]. "
+        "This sentence has no citation but is long enough to count. "
+        "Guide RNA design strongly affects editing efficiency [1][2]. "
+        "A claim citing a source that does not exist at all [9].\n"
+        "## Sources\n[1] paper1.pdf"
+    )
+
+    @pytest.fixture
+    def cited_context(self, mock_context):
+        mock_context.citations = [
+            Citation(doc_name="paper1.pdf", page=1, chunk_idx=0, quote="CRISPR-Cas9 is a genome editing tool"),
+            Citation(doc_name="paper1.pdf", page=2, chunk_idx=1, quote="off-target effects"),
+        ]
+        return mock_context
+
+    @staticmethod
+    def _router(batched_answer):
+        """Router answering batched prompts with `batched_answer(prompt)` and single prompts with YES."""
+        router = MagicMock()
+
+        async def generate(model_identifier, prompt, options=None):
+            if "CLAIM 1:" in prompt:
+                return {"response": batched_answer(prompt)}
+            return {"response": "VERDICT: YES\nREASON: single"}
+
+        router.generate = AsyncMock(side_effect=generate)
+        return router
+
+    def test_claims_are_packed_into_one_prompt(self, cited_context):
+        from backend.retrieval.rlm.verification import ReportVerifier
+
+        answer = json.dumps([
+            {"claim": 1, "verdict": "YES", "reason": "stated"},
+            {"claim": 2, "verdict": "PARTIAL", "reason": "hedged"},
+            {"claim": 3, "verdict": "NO", "reason": "not there"},
+        ])
+        router = self._router(lambda prompt: f"```json\n{answer}\n```")
+        verifier = ReportVerifier(router, "test-model", concurrency=2, batch_size=5)
+
+        result = asyncio.run(verifier.verify_report(self.REPORT, cited_context))
+
+        assert router.generate.await_count == 1
+        assert (result.total_claims, result.verified, result.partial, result.unverified, result.no_citation) == (5, 1, 1, 2, 1)
+        assert [c.evidence for c in result.flagged_claims] == ["hedged", "not there", "Citation number(s) out of range"]
+        assert result.flagged_claims[1].citation_numbers == [1, 2]
+
+    def test_unparsed_claims_fall_back_to_single_calls(self, cited_context):
+        from backend.retrieval.rlm.verification import ReportVerifier
+
+        partial_answer = json.dumps([{"claim": 1, "verdict": "NO", "reason": "batched"}])
+        router = self._router(lambda prompt: partial_answer)
+        result = asyncio.run(ReportVerifier(router, "test-model", batch_size=5).verify_report(self.REPORT, cited_context))
+
+        assert router.generate.await_count == 3  # one batch + claims 2 and 3 individually
+        assert (result.verified, result.unverified) == (2, 2)
+
+        router = self._router(lambda prompt: "I cannot answer in JSON.")
+        result = asyncio.run(ReportVerifier(router, "test-model", batch_size=5).verify_report(self.REPORT, cited_context))
+        assert router.generate.await_count == 4
+        assert result.verified == 3
+
+    def test_single_claim_mode_runs_concurrently_in_order(self, cited_context):
+        from backend.retrieval.rlm.verification import ReportVerifier
+
+        router = MagicMock()
+        state = {"in_flight": 0, "peak": 0}
+
+        async def generate(model_identifier, prompt, options=None):
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            slow = "precise genome editing" in prompt
+            await asyncio.sleep(0.1 if slow else 0.01)
+            state["in_flight"] -= 1
+            return {"response": "VERDICT: PARTIAL\nREASON: first" if slow else "VERDICT: NO\nREASON: later"}
+
+        router.generate = AsyncMock(side_effect=generate)
+        verifier = ReportVerifier(router, "test-model", concurrency=3, batch_size=1)
+
+        result = asyncio.run(verifier.verify_report(self.REPORT, cited_context))
+
+        assert state["peak"] == 3
+        assert [c.evidence for c in result.flagged_claims][:3] == ["first", "later", "later"]
+
+
 # ============== INTEGRATION TESTS ==============
 
 class TestRLMIntegration:
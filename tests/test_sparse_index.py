@@ -0,0 +1,170 @@
+"""Tests for the persistent BM25 sparse index."""
+
+import random
+
+import numpy as np
+import pytest
+from rank_bm25 import BM25Okapi
+
+from backend.retrieval.hybrid_search import RRFHybridSearch, _scientific_tokenize
+from backend.retrieval.sparse_index import SparseIndex, shared_sparse_index
+
+
+VOCAB = [
+    "CRISPR-Cas9", "genome", "editing", "H2O2", "signaling", "PCR", "amplifies",
+    "DNA", "Doudna", "Bianchi", "off-target", "effects", "IC50", "p53", "tumor",
+    "RNA-seq", "DESeq2", "salmon", "quantification", "cells", "protein",
+]
+
+
+def _corpus(n_docs: int, seed: int = 0):
+    rng = random.Random(seed)
+    texts = [
+        " ".join(rng.choice(VOCAB) for _ in range(rng.randint(3, 25)))
+        for _ in range(n_docs)
+    ]
+    ids = [f"chunk_{i}" for i in range(n_docs)]
+    return ids, texts
+
+
+def _reference_scores(texts, query):
+    bm25 = BM25Okapi([_scientific_tokenize(t) for t in texts])
+    return bm25.get_scores(_scientific_tokenize(query))
+
+
+def _dense_scores(index: SparseIndex, query: str, n_docs: int) -> np.ndarray:
+    doc_idx, scores = index.get_scores(_scientific_tokenize(query))
+    full = np.zeros(n_docs)
+    full[doc_idx] = scores
+    return full
+
+
+QUERIES = ["CRISPR-Cas9 genome editing", "Doudna Bianchi", "p53 p53 tumor cells", "unknownterm"]
+
+
+class TestSparseIndex:
+    """Scores must match rank_bm25.BM25Okapi exactly."""
+
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_scores_match_bm25okapi(self, query):
+        ids, texts = _corpus(60)
+        index = SparseIndex()
+        index.add_documents(ids, texts)
+
+        expected = _reference_scores(texts, query)
+        np.testing.assert_array_equal(_dense_scores(index, query, len(texts)), expected)
+
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_appended_segments_match_single_build(self, query):
+        ids, texts = _corpus(90, seed=1)
+        index = SparseIndex(max_segments=100)
+        for start in range(0, 90, 20):
+            index.add_documents(ids[start:start + 20], texts[start:start + 20])
+
+        expected = _reference_scores(texts, query)
+        np.testing.assert_array_equal(_dense_scores(index, query, len(texts)), expected)
+
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_merge_preserves_scores(self, query):
+        ids, texts = _corpus(90, seed=2)
+        index = SparseIndex(max_segments=2)
+        for start in range(0, 90, 10):
+            index.add_documents(ids[start:start + 10], texts[start:start + 10])
+
+        assert len(index._segments) <= 2
+        expected = _reference_scores(texts, query)
+        np.testing.assert_array_equal(_dense_scores(index, query, len(texts)), expected)
+        assert [index.doc_id(i) for i in range(len(ids))] == ids
+
+    def test_persistence_roundtrip(self, tmp_path):
+        ids, texts = _corpus(40, seed=3)
+        index = SparseIndex(str(tmp_path / "idx"))
+        index.add_documents(ids[:25], texts[:25])
+        index.add_documents(ids[25:], texts[25:])
+
+        reopened = SparseIndex(str(tmp_path / "idx"))
+        assert len(reopened) == 40
+        query = "genome editing DNA"
+        assert reopened.top_n(_scientific_tokenize(query), 10) == index.top_n(
+            _scientific_tokenize(query), 10
+        )
+
+    def test_clear(self, tmp_path):
+        ids, texts = _corpus(10)
+        index = SparseIndex(str(tmp_path / "idx"))
+        index.add_documents(ids, texts)
+        index.clear()
+
+        assert len(index) == 0
+        assert len(SparseIndex(str(tmp_path / "idx"))) == 0
+
+    def test_shared_index_per_directory(self, tmp_path):
+        ids, texts = _corpus(20, seed=5)
+        first = shared_sparse_index(str(tmp_path / "idx"))
+        second = shared_sparse_index(str(tmp_path / "idx" / "."))
+        assert first is second
+
+        first.add_documents(ids[:10], texts[:10])
+        second.add_documents(ids[10:], texts[10:])
+        assert len(SparseIndex(str(tmp_path / "idx"))) == 20
+
+    def test_other_process_appends_are_picked_up(self, tmp_path):
+        ids, texts = _corpus(30, seed=7)
+        # Two instances on one directory stand in for the backend and the tool server
+        writer = SparseIndex(str(tmp_path / "idx"))
+        reader = SparseIndex(str(tmp_path / "idx"))
+        writer.add_documents(ids[:10], texts[:10])
+        reader.add_documents(ids[10:20], texts[10:20])
+        writer.add_documents(ids[20:], texts[20:])
+
+        assert len(reader) == 20
+        assert reader.reload() == 30
+        assert [reader.doc_id(i) for i in range(30)] == ids
+        segments = [seg.name for seg in reader._segments]
+        assert len(set(segments)) == 3
+        np.testing.assert_array_equal(
+            _dense_scores(reader, "genome editing", 30), _reference_scores(texts, "genome editing")
+        )
+
+    def test_rebuild_swaps_in_new_segments(self, tmp_path):
+        ids, texts = _corpus(20, seed=9)
+        index = SparseIndex(str(tmp_path / "idx"))
+        index.add_documents(ids[:5], texts[:5])
+        other = SparseIndex(str(tmp_path / "idx"))
+        old = [seg.name for seg in index._segments]
+
+        other.rebuild(ids, texts)
+
+        assert not any((tmp_path / "idx" / name).exists() for name in old)
+        assert index.reload() == 20
+        assert len(SparseIndex(str(tmp_path / "idx"))) == 20
+
+    def test_top_n_ties_follow_insertion_order(self):
+        index = SparseIndex()
+        index.add_documents(["a", "b", "c"], ["PCR DNA", "PCR DNA", "salmon"])
+        ranking = index.top_n(["pcr"], 3)
+        assert [index.doc_id(i) for i, _ in ranking] == ["a", "b"]
+
+
+class TestRRFWithSparseIndex:
+    """RRF results must be identical with the in-memory and persistent indexes."""
+
+    @pytest.mark.parametrize("query", QUERIES[:3])
+    def test_rrf_rankings_match(self, query):
+        ids, texts = _corpus(80, seed=4)
+        metadatas = [{"page": i} for i in range(len(ids))]
+        dense = [{"id": ids[i], "text": texts[i], "score": 0.9 - i * 0.01, "metadata": metadatas[i]}
+                 for i in (5, 17, 33)]
+
+        in_memory = RRFHybridSearch()
+        in_memory.index_documents(texts, ids, metadatas)
+
+        index = SparseIndex()
+        index.add_documents(ids, texts)
+        by_id = {i: (t, m) for i, t, m in zip(ids, texts, metadatas)}
+        persistent = RRFHybridSearch()
+        persistent.attach_index(index, lambda wanted: {i: by_id[i] for i in wanted})
+
+        expected = in_memory.search(query, [dict(d) for d in dense], top_k=10)
+        actual = persistent.search(query, [dict(d) for d in dense], top_k=10)
+        assert actual == expected
@@ -0,0 +1,132 @@
+"""Tests for the shared SQLite profile and the document registry connection pool."""
+
+import sqlite3
+import threading
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from backend.retrieval.schema import registry as registry_module
+from backend.retrieval.schema.document import DocumentMetadata, DocumentType
+from backend.retrieval.schema.registry import DocumentRegistry
+from backend.sqlite_tuning import apply_pragmas, retry_on_locked
+
+
+def _doc(i):
+    return DocumentMetadata(
+        doc_id=f"doc-{i}", file_path=f"/data/doc_{i}.pdf", file_name=f"doc_{i}.pdf",
+        doc_type=DocumentType.PAPER, title=f"Paper {i}", authors=[f"Author {i}"],
+        user_id="u1", collection_name="c1",
+    )
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry_module, "_pool", registry_module._ConnectionPool())
+    registry = DocumentRegistry(str(tmp_path / "registry.db"))
+    yield registry
+    registry.close()
+
+
+class TestSQLiteProfile:
+
+    def test_engine_connections_use_wal(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+        event.listen(engine, "connect", lambda conn, record: apply_pragmas(conn))
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 15000
+
+    def test_retry_on_locked(self):
+        calls = []
+
+        @retry_on_locked(attempts=3, base_delay=0)
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise sqlite3.OperationalError("database is locked")
+            return "ok"
+
+        assert flaky() == "ok" and len(calls) == 3
+
+        @retry_on_locked(attempts=3, base_delay=0)
+        def broken():
+            calls.append(1)
+            raise sqlite3.OperationalError("no such table: docs")
+
+        calls.clear()
+        with pytest.raises(sqlite3.OperationalError):
+            broken()
+        assert len(calls) == 1
+
+
+class TestRegistryConnectionPool:
+
+    def test_connection_is_reused_per_thread(self, registry):
+        pool = registry_module._pool
+        main_conn = pool.get(registry.db_path)
+        registry.register(_doc(1))
+        assert pool.get(registry.db_path) is main_conn
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(pool.get(registry.db_path)))
+        thread.start()
+        thread.join()
+        assert other[0] is not main_conn
+
+        assert registry.get_document("doc-1")["title"] == "Paper 1"
+        assert main_conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_close_all_from_other_thread_reopens(self, registry):
+        pool = registry_module._pool
+        stale = pool.get(registry.db_path)
+        thread = threading.Thread(target=pool.close_all)
+        thread.start()
+        thread.join()
+
+        registry.register(_doc(1))
+        assert pool.get(registry.db_path) is not stale
+        assert registry.get_document("doc-1")["title"] == "Paper 1"
+
+    def test_exited_threads_connections_are_closed(self, registry):
+        pool = registry_module._pool
+        pool.get(registry.db_path)
+        threads = [threading.Thread(target=pool.get, args=(registry.db_path,)) for _ in range(5)]
+        for t in threads:
+            t.start()
+            t.join()
+
+        # Opening another connection drops the exited threads' ones
+        thread = threading.Thread(target=pool.get, args=(registry.db_path,))
+        thread.start()
+        thread.join()
+        assert len(pool._all) == 2
+
+    def test_failed_transaction_is_rolled_back(self, registry):
+        registry.register(_doc(1))
+        with pytest.raises(RuntimeError):
+            with registry._get_connection() as conn:
+                conn.execute("DELETE FROM documents")
+                raise RuntimeError("boom")
+        assert registry.get_document("doc-1") is not None
+
+    def test_concurrent_writers(self, registry):
+        errors = []
+
+        def worker(start):
+            try:
+                for i in range(start, start + 25):
+                    registry.register(_doc(i))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n * 25,)) for n in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert not errors
+        assert len(registry.get_all_documents(limit=200)) == 150
+        assert registry_module._pool.close_all() == 7  # one per writer thread + main
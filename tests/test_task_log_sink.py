@@ -0,0 +1,99 @@
+"""Tests for the batched task log sink (DatabaseHandler)."""
+
+import logging
+import threading
+
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from backend.logging_config import DatabaseHandler
+from backend.models.log import TaskLog
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine, tables=[TaskLog.__table__])
+    return engine
+
+
+def _record(msg, task_id="t1", level=logging.INFO):
+    record = logging.LogRecord("mentori", level, __file__, 1, msg, None, None)
+    record.task_id = task_id
+    return record
+
+
+def _rows(engine):
+    with Session(engine) as session:
+        return session.exec(select(TaskLog).order_by(TaskLog.id)).all()
+
+
+class TestTaskLogSink:
+
+    def test_records_are_written_in_batches(self, engine):
+        handler = DatabaseHandler(batch_size=50, flush_interval=60, engine=engine)
+        for i in range(120):
+            handler.emit(_record(f"line {i}"))
+        handler.emit(_record("no task", task_id="N/A"))
+        handler.close()
+
+        rows = _rows(engine)
+        assert [r.message for r in rows] == [f"line {i}" for i in range(120)]
+        assert rows[0].level == "INFO" and rows[0].task_id == "t1"
+        stats = handler.get_stats()
+        assert stats.written == 120 and stats.batches == 3 and stats.dropped == 0
+
+    def test_interval_flush_and_explicit_flush(self, engine):
+        handler = DatabaseHandler(batch_size=1000, flush_interval=0.05, engine=engine)
+        try:
+            handler.emit(_record("first"))
+            for _ in range(100):
+                if _rows(engine):
+                    break
+                threading.Event().wait(0.02)
+            assert [r.message for r in _rows(engine)] == ["first"]
+
+            handler.flush_interval = 60
+            handler.emit(_record("second"))
+            assert handler.flush()
+            assert [r.message for r in _rows(engine)] == ["first", "second"]
+        finally:
+            handler.close()
+
+    def test_full_queue_drops_info_but_keeps_warnings(self, engine):
+        handler = DatabaseHandler(max_queue=2, block_timeout=2.0, engine=engine)
+        # Stall the writer so the queue fills up
+        writing, gate = threading.Event(), threading.Event()
+        original = handler._write_batch
+        handler._write_batch = lambda batch: (writing.set(), gate.wait(), original(batch))
+        handler.flush_interval = 0
+        handler.emit(_record("taken by writer"))
+        assert writing.wait(5)
+
+        handler.emit(_record("q1"))
+        handler.emit(_record("q2"))
+        handler.emit(_record("dropped"))
+        threading.Timer(0.2, gate.set).start()
+        handler.emit(_record("kept", level=logging.ERROR))  # waits for room
+        handler.close()
+
+        messages = [r.message for r in _rows(engine)]
+        assert "dropped" not in messages
+        assert messages[-1] == "kept" and len(messages) == 4
+        assert handler.get_stats().dropped == 1
+
+    def test_write_errors_do_not_stop_the_sink(self, engine, capsys):
+        handler = DatabaseHandler(batch_size=1, engine=engine)
+        SQLModel.metadata.drop_all(engine, tables=[TaskLog.__table__])
+        handler.emit(_record("lost"))
+        handler.flush()
+        SQLModel.metadata.create_all(engine, tables=[TaskLog.__table__])
+        handler.emit(_record("saved"))
+        handler.close()
+
+        assert [r.message for r in _rows(engine)] == ["saved"]
+        assert handler.get_stats().failed == 1
+        assert "failed to write 1 record" in capsys.readouterr().err
@@ -0,0 +1,106 @@
+"""Tests for incremental telemetry rollups and the SQL-aggregated dashboard queries."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from backend import telemetry
+from backend.models.telemetry import (
+    TelemetryDailyRollup,
+    TelemetrySnapshot,
+    TelemetryToolCall,
+    TelemetryToolDailyRollup,
+)
+
+TABLES = [m.__table__ for m in (TelemetrySnapshot, TelemetryToolCall, TelemetryDailyRollup, TelemetryToolDailyRollup)]
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine, tables=TABLES)
+    with Session(engine) as session:
+        yield session
+
+
+def _snapshots():
+    now = datetime.now(timezone.utc)
+    specs = [
+        # (days ago, user, model, tokens, errors, tools)
+        (0, "u1", "ollama::a", 100, 0, {"rag_search": 2, "execute_python": 1}),
+        (0, "u2", "ollama::a", 300, 1, {"rag_search": 1}),
+        (1, "u1", "ollama::b", 50, 0, {}),
+        (3, "u3", "ollama::a", 10, 2, {"web_search": 4}),
+        (40, "u1", "ollama::b", 7, 0, {"rag_search": 1}),
+    ]
+    return [
+        TelemetrySnapshot(
+            task_id=f"t{i}", user_id=user, created_at=now - timedelta(days=ago),
+            model_identifier=model, total_tokens=tokens, input_tokens=tokens // 2,
+            output_tokens=tokens - tokens // 2, error_count=errors, step_count=3,
+            tool_calls=tools, duration_seconds=1.5,
+        )
+        for i, (ago, user, model, tokens, errors, tools) in enumerate(specs)
+    ]
+
+
+def _dashboard(session):
+    return (
+        telemetry.get_summary(session),
+        telemetry.get_timeline(session, days=30),
+        telemetry.get_models(session),
+        telemetry.get_tools(session),
+    )
+
+
+class TestTelemetryRollups:
+
+    def test_empty(self, session):
+        assert telemetry.get_summary(session) == {
+            "total_tasks": 0, "total_tokens": 0, "avg_tokens_per_task": 0, "error_rate": 0.0,
+            "active_users": 0, "top_models": [], "top_tools": [],
+        }
+
+    def test_incremental_rollups(self, session):
+        for snap in _snapshots():
+            telemetry.record_snapshot(session, snap)
+            session.commit()
+
+        summary, timeline, models, tools = _dashboard(session)
+        assert summary["total_tasks"] == 5 and summary["total_tokens"] == 467
+        assert summary["avg_tokens_per_task"] == 93
+        assert summary["error_rate"] == 40.0 and summary["active_users"] == 3
+        assert models == [
+            {"model_identifier": "ollama::a", "task_count": 3, "total_tokens": 410, "avg_tokens": 136},
+            {"model_identifier": "ollama::b", "task_count": 2, "total_tokens": 57, "avg_tokens": 28},
+        ]
+        assert tools[0] == {"tool_name": "rag_search", "call_count": 4, "task_count": 3}
+        assert [t["tool_name"] for t in tools] == ["rag_search", "web_search", "execute_python"]
+
+        assert len(timeline) == 3  # the 40-day-old snapshot is outside the window
+        assert timeline[-1]["tasks"] == 2 and timeline[-1]["tokens"] == 400 and timeline[-1]["errors"] == 1
+
+        exploded = session.exec(select(TelemetryToolCall).where(TelemetryToolCall.tool_name == "rag_search")).all()
+        assert sorted(t.call_count for t in exploded) == [1, 1, 2]
+
+    def test_rebuild_matches_incremental(self, session):
+        for snap in _snapshots():
+            telemetry.record_snapshot(session, snap)
+        session.commit()
+        incremental = _dashboard(session)
+
+        assert telemetry.rebuild_rollups(session) == 5
+        session.commit()
+        assert _dashboard(session) == incremental
+        assert len(session.exec(select(TelemetryToolCall)).all()) == 5
+
+    def test_backfill_existing_snapshots(self, session):
+        for snap in _snapshots():
+            session.add(snap)
+        session.commit()
+        assert telemetry.get_summary(session)["total_tasks"] == 0
+
+        telemetry.backfill_rollups(session)
+        assert telemetry.get_summary(session)["total_tasks"] == 5